@@ -0,0 +1,74 @@
+"""
+Compare training throughput of the gradient boosting backends.
+
+Usage:
+    python benchmarks/bench_gradient_boost.py --rows 10000 100000 1000000 --output results.json
+
+The classic backend is skipped above --classic-max-rows, where a single fit
+takes many minutes.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from modeling_gui.models import ModelManager
+
+
+def make_data(n_rows, n_features=10, task='classification', random_state=0):
+    rng = np.random.default_rng(random_state)
+    X = pd.DataFrame(rng.normal(size=(n_rows, n_features)), columns=[f"x{i}" for i in range(n_features)])
+    signal = X['x0'] * 2 - X['x1'] + np.sin(X['x2'] * 3) + rng.normal(scale=0.5, size=n_rows)
+    Y = pd.Series(np.where(signal > 0, 'yes', 'no')) if task == 'classification' else signal
+    return X, Y
+
+
+def run(rows, backends, n_estimators, task, classic_max_rows, repeat):
+    results = []
+    for n_rows in rows:
+        X, Y = make_data(n_rows, task=task)
+        for backend in backends:
+            if backend == 'classic' and n_rows > classic_max_rows:
+                continue
+            timings = []
+            for _ in range(repeat):
+                manager = ModelManager()
+                start = time.perf_counter()
+                model = manager.gradient_boost(X, Y, n_estimators=n_estimators, max_depth=3, backend=backend)
+                timings.append(time.perf_counter() - start)
+            seconds = min(timings)
+            result = {
+                'backend': backend,
+                'rows': n_rows,
+                'n_estimators': n_estimators,
+                'seconds': seconds,
+                'rows_per_second': n_rows / seconds,
+                'train_score': model.score(X, Y),
+            }
+            results.append(result)
+            print(f"{backend:>9} {n_rows:>9} rows: {seconds:8.2f} s, "
+                  f"{result['rows_per_second']:12.0f} rows/s, score {result['train_score']:.3f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--backends', nargs='+', default=['classic', 'histogram'])
+    parser.add_argument('--n-estimators', type=int, default=100)
+    parser.add_argument('--task', choices=['classification', 'regression'], default='classification')
+    parser.add_argument('--classic-max-rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--output', help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.backends, args.n_estimators, args.task, args.classic_max_rows, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
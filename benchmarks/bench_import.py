@@ -0,0 +1,68 @@
+"""
+Measure cold import time of the package's entry points.
+
+Each statement runs in a fresh interpreter; the best of --repeat runs is
+reported. With --max-seconds the script exits with status 1 when any entry
+point is slower, so it can guard against import-time regressions in CI.
+
+Usage:
+    python benchmarks/bench_import.py --repeat 5 --max-seconds 1.5 --output imports.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# Heavy modules that plain package/ModelManager imports must not load
+HEAVY_MODULES = ('PyQt5', 'matplotlib', 'seaborn', 'statsmodels', 'sklearn', 'scipy')
+
+ENTRY_POINTS = {
+    'package': "import modeling_gui",
+    'model_manager': "from modeling_gui.models import ModelManager; ModelManager()",
+    'main_window_module': "import modeling_gui.main",
+}
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+loaded = sorted({{m.split('.')[0] for m in sys.modules}} & set({heavy!r}))
+import json
+print(json.dumps([elapsed, loaded]))
+"""
+
+
+def measure(statement, repeat):
+    timings, loaded = [], []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        elapsed, loaded = json.loads(output.strip().splitlines()[-1])
+        timings.append(elapsed)
+    return min(timings), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-seconds', type=float, help="Fail when an entry point takes longer.")
+    parser.add_argument('--output', help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = []
+    for name, statement in ENTRY_POINTS.items():
+        seconds, loaded = measure(statement, args.repeat)
+        results.append({'entry_point': name, 'seconds': seconds, 'heavy_modules': loaded})
+        print(f"{name:>20}: {seconds:6.3f} s  heavy modules: {', '.join(loaded) or 'none'}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.max_seconds is not None and any(r['seconds'] > args.max_seconds for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare the statsmodels and sufficient-statistics OLS engines.
+
+Usage:
+    python benchmarks/bench_ols.py --rows 100000 1000000 10000000 --targets 1 20 --output results.json
+
+With several targets statsmodels fits each one separately, as a user looping
+over Y columns would.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from modeling_gui.models import ModelManager
+
+
+def make_data(n_rows, n_features=10, n_targets=1, random_state=0):
+    rng = np.random.default_rng(random_state)
+    X = pd.DataFrame(rng.normal(size=(n_rows, n_features)), columns=[f"x{i}" for i in range(n_features)])
+    coefficients = rng.normal(size=(n_features, n_targets))
+    Y = pd.DataFrame(X.to_numpy() @ coefficients + rng.normal(size=(n_rows, n_targets)),
+                     columns=[f"y{j}" for j in range(n_targets)])
+    return X, Y
+
+
+def fit(engine, X, Y):
+    manager = ModelManager()
+    if engine == 'sufficient':
+        return manager.ols(X, Y, engine='sufficient')
+    for target in Y:
+        manager.ols(X, Y[target])
+
+
+def run(rows, targets, engines, repeat):
+    results = []
+    for n_rows in rows:
+        for n_targets in targets:
+            X, Y = make_data(n_rows, n_targets=n_targets)
+            for engine in engines:
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    fit(engine, X, Y)
+                    timings.append(time.perf_counter() - start)
+                seconds = min(timings)
+                results.append({'engine': engine, 'rows': n_rows, 'targets': n_targets, 'seconds': seconds})
+                print(f"{engine:>11} {n_rows:>9} rows x {n_targets:>3} targets: {seconds:8.3f} s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--targets', type=int, nargs='+', default=[1, 20])
+    parser.add_argument('--engines', nargs='+', default=['statsmodels', 'sufficient'])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--output', help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.targets, args.engines, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,421 @@
+"""
+Benchmark every ModelManager method, CSV loading and preprocessing across data sizes.
+
+Usage:
+    python benchmarks/bench_suite.py --rows 1000 100000 1000000 --widths 5 50 --output results.json
+    python benchmarks/bench_suite.py --rows 1000 100000 --baseline baseline.json --threshold 0.25
+    python benchmarks/bench_suite.py --cases ols random_forest load_csv --rows 10000000 --widths 5
+
+Synthetic datasets are generated once per (rows, width) with a fixed seed
+and kept in --work-dir, so reruns time the same data. Each case runs in a
+fresh worker process, so its peak RSS is its own; --in-process trades that
+for speed. Cases skip sizes above their row cap, where a single fit would
+take many minutes (raise the caps with --no-caps).
+
+The JSON output holds run metadata (versions, commit, machine) and one
+record per (case, rows, width). --history appends the same document as one
+line to a JSONL file for charting trends across releases. With --baseline,
+cases slower (or using more memory) than the baseline by more than
+--threshold are reported as regressions and the exit status is 1.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from modeling_gui.models import ModelManager, preload_backends
+from modeling_gui.profiling import max_rss_mb, rss_mb
+from modeling_gui.utils.data_preprocessing import handle_missing_values, normalize_data
+from modeling_gui.utils.file_helper import default_cache_dir, load_csv
+
+# Absolute differences below these are noise, whatever the ratio
+MIN_SECONDS = 0.05
+MIN_MEMORY_MB = 50
+
+
+def make_dataset(n_rows, width, random_state=0):
+    """
+    Synthetic data with `width` numeric features and targets for every model family.
+
+    Columns: x0..x{width-1} features, 'y' linear target, 'label' two-class
+    target, 'weight' row weights, 'curve_x'/'gaussian'/'decay' curve data,
+    'category' with 20 levels and 'gappy' (x0 with 5% missing values).
+    """
+    rng = np.random.default_rng(random_state)
+    data = pd.DataFrame(rng.normal(size=(n_rows, width)), columns=[f"x{i}" for i in range(width)])
+    coefficients = rng.normal(size=width)
+    data['y'] = 1.0 + data.to_numpy() @ coefficients + rng.normal(size=n_rows)
+    data['label'] = np.where(data['x0'] + rng.normal(scale=0.5, size=n_rows) > 0, 'yes', 'no')
+    data['weight'] = rng.uniform(0.5, 2.0, n_rows)
+    data['curve_x'] = np.linspace(-5, 5, n_rows)
+    data['gaussian'] = 3 * np.exp(-(data['curve_x'] - 0.5) ** 2 / 2) + rng.normal(scale=0.05, size=n_rows)
+    data['decay'] = 2 * np.exp(-0.4 * data['curve_x']) + 1 + rng.normal(scale=0.05, size=n_rows)
+    data['category'] = pd.Categorical(rng.integers(0, 20, n_rows).astype(str))
+    data['gappy'] = data['x0'].mask(rng.random(n_rows) < 0.05)
+    return data
+
+
+class Dataset:
+    """A generated dataset, loaded in the worker, plus its CSV copy for the loading cases."""
+
+    def __init__(self, frame, csv_path, width):
+        self.frame = frame
+        self.csv_path = str(csv_path)
+        self.x_columns = [f"x{i}" for i in range(width)]
+        # At most five features for the models whose cost explodes with width
+        self.few_columns = self.x_columns[:5]
+
+    @property
+    def X(self):
+        return self.frame[self.x_columns]
+
+    @property
+    def Y(self):
+        return self.frame['y']
+
+
+def _fitted(method, *args, **kwargs):
+    manager = ModelManager()
+    getattr(manager, method)(*args, **kwargs)
+    return manager
+
+
+def _curve_series(d):
+    """One Gaussian per feature column, on the shared curve_x axis."""
+    x = d.frame['curve_x'].to_numpy()
+    centres = np.linspace(-2, 2, len(d.x_columns))
+    return x, pd.DataFrame(np.exp(-(x[:, None] - centres) ** 2 / 2) + 0.01 * d.frame[d.x_columns].to_numpy(),
+                           columns=d.x_columns)
+
+
+# name: (ModelManager method or None, setup(dataset) -> args for run, run(*args), row cap)
+CASES = {
+    'load_csv': (None, lambda d: (d.csv_path,), load_csv, None),
+    'load_csv_compact': (None, lambda d: (d.csv_path,), lambda path: load_csv(path, compact=True), None),
+    'normalize_data': (None, lambda d: (d.frame[d.x_columns].copy(), d.x_columns), normalize_data, None),
+    'handle_missing_values': (None, lambda d: (d.frame[d.x_columns + ['gappy']],), handle_missing_values, None),
+    'handle_missing_values_mode': (
+        None, lambda d: (d.frame[d.few_columns + ['gappy']],), lambda f: handle_missing_values(f, 'mode'), 100_000,
+    ),
+    'ols': ('ols', lambda d: (ModelManager(), d.X, d.Y), lambda m, X, Y: m.ols(X, Y), None),
+    'ols_sufficient': (
+        'ols', lambda d: (ModelManager(), d.X, d.Y), lambda m, X, Y: m.ols(X, Y, engine='sufficient'), None,
+    ),
+    'ols_streamed': (
+        'ols_streamed', lambda d: (ModelManager(), d.csv_path, d.x_columns),
+        lambda m, path, columns: m.ols_streamed(path, columns, 'y'), None,
+    ),
+    'wls': (
+        'wls', lambda d: (ModelManager(), d.X, d.Y, d.frame['weight']), lambda m, X, Y, w: m.wls(X, Y, w), None,
+    ),
+    'gls': (
+        'gls', lambda d: (ModelManager(), d.X, d.Y, d.frame['weight'].to_numpy()),
+        lambda m, X, Y, sigma: m.gls(X, Y, sigma), 1_000_000,
+    ),
+    'recursive_ls': (
+        'recursive_ls', lambda d: (ModelManager(), d.frame[d.few_columns], d.Y),
+        lambda m, X, Y: m.recursive_ls(X, Y), 100_000,
+    ),
+    'rlm': ('rlm', lambda d: (ModelManager(), d.X, d.Y), lambda m, X, Y: m.rlm(X, Y), 1_000_000),
+    'rolling_ls': (
+        'rolling_ls', lambda d: (ModelManager(), d.frame[d.few_columns], d.Y),
+        lambda m, X, Y: m.rolling_ls(X, Y, window=50), 1_000_000,
+    ),
+    'random_forest': (
+        'random_forest', lambda d: (ModelManager(), d.X, d.Y),
+        lambda m, X, Y: m.random_forest(X, Y, n_estimators=50, max_depth=8), 1_000_000,
+    ),
+    'gradient_boost_classic': (
+        'gradient_boost', lambda d: (ModelManager(), d.X, d.frame['label']),
+        lambda m, X, Y: m.gradient_boost(X, Y, n_estimators=50, max_depth=3), 100_000,
+    ),
+    'gradient_boost_histogram': (
+        'gradient_boost', lambda d: (ModelManager(), d.X, d.frame['label']),
+        lambda m, X, Y: m.gradient_boost(X, Y, n_estimators=50, max_depth=3, backend='histogram'), None,
+    ),
+    'gradient_boost_streamed': (
+        'gradient_boost_streamed', lambda d: (ModelManager(), d.csv_path, d.x_columns),
+        lambda m, path, columns: m.gradient_boost_streamed(path, columns, 'label', n_estimators=50, max_depth=3),
+        None,
+    ),
+    'hyperparameter_search': (
+        'hyperparameter_search', lambda d: (ModelManager(), d.frame[d.few_columns], d.Y),
+        lambda m, X, Y: m.hyperparameter_search(
+            X, Y, 'random_forest', {'n_estimators': [10, 20], 'max_depth': [3, 6]}, cv=3, refit=False,
+        ),
+        100_000,
+    ),
+    'kmeans_clustering': (
+        'kmeans_clustering', lambda d: (ModelManager(), d.X),
+        lambda m, X: m.kmeans_clustering(X, n_clusters=8), 1_000_000,
+    ),
+    'kmeans_minibatch': (
+        'kmeans_clustering', lambda d: (ModelManager(), d.X),
+        lambda m, X: m.kmeans_clustering(X, n_clusters=8, mode='minibatch'), None,
+    ),
+    'kmeans_streamed': (
+        'kmeans_streamed', lambda d: (ModelManager(), d.csv_path, d.x_columns),
+        lambda m, path, columns: m.kmeans_streamed(path, columns, n_clusters=8), None,
+    ),
+    'kmeans_sweep': (
+        'kmeans_sweep', lambda d: (ModelManager(), d.X),
+        lambda m, X: m.kmeans_sweep(X, range(2, 9), mode='minibatch'), 1_000_000,
+    ),
+    'gaussian_fitting': (
+        'gaussian_fitting', lambda d: (ModelManager(), d.frame['curve_x'], d.frame['gaussian']),
+        lambda m, X, Y: m.gaussian_fitting(X, Y), None,
+    ),
+    'exponential_fitting': (
+        'exponential_fitting', lambda d: (ModelManager(), d.frame['curve_x'], d.frame['decay']),
+        lambda m, X, Y: m.exponential_fitting(X, Y), None,
+    ),
+    'batch_curve_fit': (
+        'batch_curve_fit', lambda d: (ModelManager(), *_curve_series(d)),
+        lambda m, x, Y: m.batch_curve_fit(x, Y, n_workers=1), 100_000,
+    ),
+    'predict_random_forest': (
+        'predict', lambda d: (_fitted('random_forest', d.X, d.Y, n_estimators=50, max_depth=8), d.X),
+        lambda m, X: m.predict(X), 1_000_000,
+    ),
+    'get_summary': (
+        'get_summary', lambda d: (_fitted('ols', d.X, d.Y),), lambda m: m.get_summary().as_text(), None,
+    ),
+}
+
+
+def _dataset_paths(work_dir, n_rows, width):
+    stem = Path(work_dir) / f"rows{n_rows}_width{width}"
+    return stem.with_suffix('.pkl'), stem.with_suffix('.csv')
+
+
+def prepare_dataset(work_dir, n_rows, width):
+    """Generate and store a dataset unless it already exists; returns its (pickle, CSV) paths."""
+    pickle_path, csv_path = _dataset_paths(work_dir, n_rows, width)
+    if not (pickle_path.exists() and csv_path.exists()):
+        data = make_dataset(n_rows, width)
+        data.to_pickle(pickle_path)
+        data.to_csv(csv_path, index=False)
+    return pickle_path, csv_path
+
+
+def warm_up():
+    """Import every backend a case may use, so import time and memory are not charged to the first case."""
+    import importlib
+    preload_backends()
+    for module in ('modeling_gui.boosting', 'modeling_gui.clustering', 'modeling_gui.curve_fitting',
+                   'modeling_gui.search', 'sklearn.preprocessing', 'statsmodels.iolib.summary'):
+        importlib.import_module(module)
+
+
+def run_case(name, pickle_path, csv_path, n_rows, width, repeat):
+    """
+    Time one case on one dataset; failures are recorded, not raised.
+
+    Returns:
+    dict: Timings (best and median of `repeat`) and memory in MB. 'delta_rss_mb'
+    is the peak above the RSS with the dataset loaded, so it includes the
+    case's setup.
+    """
+    method, setup, run, _ = CASES[name]
+    record = {'case': name, 'method': method, 'rows': n_rows, 'width': width}
+    warm_up()
+    dataset = Dataset(pd.read_pickle(pickle_path), csv_path, width)
+    loaded_rss = rss_mb()
+    peak_before = max_rss_mb()
+    timings = []
+    try:
+        for _ in range(repeat):
+            args = setup(dataset)
+            start = time.perf_counter()
+            run(*args)
+            timings.append(time.perf_counter() - start)
+            del args
+        record['status'] = 'ok'
+    except Exception as e:
+        record['status'] = 'failed'
+        record['error'] = str(e)
+    if timings:
+        record['seconds'] = min(timings)
+        record['seconds_median'] = statistics.median(timings)
+        record['rows_per_second'] = n_rows / record['seconds'] if record['seconds'] > 0 else None
+    record['peak_rss_mb'] = max_rss_mb()
+    if loaded_rss is not None and record['peak_rss_mb'] is not None:
+        record['delta_rss_mb'] = max(0.0, record['peak_rss_mb'] - loaded_rss)
+        # ru_maxrss never goes down: a case that stays below the unpickling peak is reported at that peak
+        record['delta_is_upper_bound'] = record['peak_rss_mb'] <= peak_before
+    return record
+
+
+def environment():
+    """Versions, machine and commit, so results can be charted across releases."""
+    import scipy
+    import sklearn
+    import statsmodels
+    import modeling_gui
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'modeling_gui': modeling_gui.__version__,
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'scikit-learn': sklearn.__version__,
+        'statsmodels': statsmodels.__version__,
+        'scipy': scipy.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run_suite(cases, rows, widths, work_dir, repeat=3, in_process=False, caps=True, on_record=None):
+    """
+    Run every case on every (rows, width) dataset.
+
+    Returns:
+    list: One record per (case, rows, width), including skipped sizes.
+    """
+    records = []
+    context = multiprocessing.get_context('spawn')
+    for n_rows in rows:
+        for width in widths:
+            pickle_path, csv_path = prepare_dataset(work_dir, n_rows, width)
+            for name in cases:
+                cap = CASES[name][3]
+                arguments = (name, pickle_path, csv_path, n_rows, width, repeat)
+                if caps and cap is not None and n_rows > cap:
+                    record = {'case': name, 'method': CASES[name][0], 'rows': n_rows, 'width': width,
+                              'status': 'skipped', 'error': f"above the {cap}-row cap"}
+                elif in_process:
+                    record = run_case(*arguments)
+                else:
+                    # A fresh process per case: ru_maxrss is a process-lifetime peak
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                        record = executor.submit(run_case, *arguments).result()
+                records.append(record)
+                if on_record is not None:
+                    on_record(record)
+    return records
+
+
+def compare(records, baseline, threshold=0.2):
+    """
+    Compare timings and memory with a baseline run.
+
+    A case regresses when its best time or its memory above the loaded
+    dataset grows by more than `threshold` (a fraction) and by more than the
+    noise floor (MIN_SECONDS, MIN_MEMORY_MB).
+
+    Returns:
+    list: One row per case present and successful in both runs.
+    """
+    reference = {(r['case'], r['rows'], r['width']): r for r in baseline if r.get('status') == 'ok'}
+    rows = []
+    for record in records:
+        base = reference.get((record['case'], record['rows'], record['width']))
+        if base is None or record.get('status') != 'ok':
+            continue
+        row = {'case': record['case'], 'rows': record['rows'], 'width': record['width'],
+               'seconds': record['seconds'], 'baseline_seconds': base['seconds'],
+               'time_ratio': record['seconds'] / base['seconds'] if base['seconds'] > 0 else None}
+        slower = record['seconds'] > base['seconds'] * (1 + threshold) and \
+            record['seconds'] - base['seconds'] > MIN_SECONDS
+        heavier = False
+        if record.get('delta_rss_mb') is not None and base.get('delta_rss_mb') is not None:
+            row['delta_rss_mb'] = record['delta_rss_mb']
+            row['baseline_delta_rss_mb'] = base['delta_rss_mb']
+            heavier = record['delta_rss_mb'] > base['delta_rss_mb'] * (1 + threshold) and \
+                record['delta_rss_mb'] - base['delta_rss_mb'] > MIN_MEMORY_MB
+        row['regression'] = [kind for kind, flagged in (('time', slower), ('memory', heavier)) if flagged]
+        rows.append(row)
+    return rows
+
+
+def format_record(record):
+    text = f"{record['case']:>26} {record['rows']:>9} x {record['width']:<3}"
+    if record['status'] != 'ok':
+        return f"{text} {record['status']}: {record.get('error', '')}"
+    delta = record.get('delta_rss_mb')
+    memory = f", +{delta:.0f} MB" if delta is not None else ""
+    return f"{text} {record['seconds']:9.3f} s (median {record['seconds_median']:.3f}){memory}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 100_000, 1_000_000],
+                        help="Dataset sizes; the full matrix adds 10000000.")
+    parser.add_argument('--widths', type=int, nargs='+', default=[5, 50])
+    parser.add_argument('--cases', nargs='+', help="Case names or name prefixes (default: all).")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--work-dir', help="Where generated datasets are kept (default: the user cache).")
+    parser.add_argument('--in-process', action='store_true', help="Run cases in this process (memory is less precise).")
+    parser.add_argument('--no-caps', action='store_true', help="Run every case at every size.")
+    parser.add_argument('--output', help="Write metadata and records as JSON to this file.")
+    parser.add_argument('--history', help="Append the JSON document as one line to this JSONL file.")
+    parser.add_argument('--baseline', help="JSON output of an earlier run to compare with.")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown as a fraction (default 0.2).")
+    parser.add_argument('--list', action='store_true', help="List the cases and exit.")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (method, _, _, cap) in CASES.items():
+            print(f"{name:>26}  {method or '-':<24} {'cap ' + str(cap) if cap else ''}")
+        return 0
+    cases = list(CASES)
+    if args.cases:
+        cases = [name for name in CASES if any(name.startswith(prefix) for prefix in args.cases)]
+        if not cases:
+            parser.error(f"No cases match {', '.join(args.cases)}.")
+    work_dir = Path(args.work_dir) if args.work_dir else default_cache_dir("benchmarks")
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    document = {'metadata': environment(), 'config': {
+        'rows': args.rows, 'widths': args.widths, 'cases': cases, 'repeat': args.repeat,
+        'in_process': args.in_process, 'caps': not args.no_caps,
+    }}
+    document['records'] = run_suite(
+        cases, args.rows, args.widths, work_dir, repeat=args.repeat, in_process=args.in_process,
+        caps=not args.no_caps, on_record=lambda record: print(format_record(record), flush=True),
+    )
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        document['baseline'] = {'file': args.baseline, 'metadata': baseline.get('metadata'), 'threshold': args.threshold}
+        document['comparison'] = compare(document['records'], baseline['records'], args.threshold)
+        regressions = [row for row in document['comparison'] if row['regression']]
+        for row in regressions:
+            print(f"REGRESSION {row['case']} {row['rows']} x {row['width']}: {', '.join(row['regression'])} "
+                  f"({row['baseline_seconds']:.3f} s -> {row['seconds']:.3f} s)")
+        print(f"{len(regressions)} regressions in {len(document['comparison'])} compared cases.")
+        status = 1 if regressions else 0
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2, default=str)
+    if args.history:
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(document, default=str) + '\n')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
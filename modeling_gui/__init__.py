@@ -1,15 +1,22 @@
 # __init__.py for modeling_gui package
 
-# Import key modules and classes
-from .models import ModelManager
-from .visualization import (
-    plot_data,
-    plot_regression,
-    plot_confusion_matrix,
-    plot_tree_diagram,
-    plot_curve_fit
-)
-from .dialogs import RandomForestDialog, GradientBoostDialog, KMeansDialog
+# Key classes and functions are loaded on first access (PEP 562), so importing
+# the package, or only ModelManager, does not pull in PyQt5, matplotlib,
+# statsmodels or scikit-learn.
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'ModelManager': '.models',
+    'plot_data': '.visualization',
+    'plot_regression': '.visualization',
+    'plot_confusion_matrix': '.visualization',
+    'plot_tree_diagram': '.visualization',
+    'plot_curve_fit': '.visualization',
+    'RandomForestDialog': '.dialogs',
+    'GradientBoostDialog': '.dialogs',
+    'KMeansDialog': '.dialogs',
+    'RollingLSDialog': '.dialogs',
+}
 
 # Version of the modeling_gui package
 __version__ = '1.0.0'
@@ -25,5 +32,18 @@ __all__ = [
     'RandomForestDialog',
     'GradientBoostDialog',
     'KMeansDialog',
+    'RollingLSDialog',
 ]
 
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,423 @@
+"""
+Saved models: self-describing directories that reload without refitting.
+
+A saved model is a directory with `manifest.json` (the ModelManager
+method, a fingerprint of the data, the columns, hyperparameters, fit time
+and library versions) next to one payload, chosen by model type:
+
+- Random forests and extra-trees are flattened into a few .npy node arrays
+  (`CompactForest`). They load memory-mapped, so opening a forest takes
+  milliseconds whatever its size, and processes scoring with the same file
+  share its pages instead of each holding a copy.
+- statsmodels results are stored after `remove_data()`, which drops the
+  copies of the fit's data they carry; coefficients, covariances and
+  `predict` are kept.
+- Curve-fit parameters are a short JSON file.
+- Everything else (boosting, k-means, the least-squares engines, tables)
+  is written with joblib uncompressed, so its numpy arrays are
+  memory-mapped on load.
+
+A model fitted through a preprocessor keeps it in `preprocessor.joblib`.
+"""
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import fingerprint
+from .utils.data_preprocessing import PreprocessedModel
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+_LIBRARIES = ('numpy', 'pandas', 'sklearn', 'statsmodels', 'scipy')
+
+
+class CompactForest:
+    """
+    A random forest's trees as flat node arrays, predicted with numpy.
+
+    All trees share one set of arrays indexed by global node number, and
+    every (tree, row) pair advances one level per vectorized step, with no
+    loop over trees. Leaves point to themselves with an infinite threshold,
+    which is how a pair knows it has arrived. Predictions match the
+    scikit-learn forest it was built from; they take about twice as long as
+    scikit-learn's compiled traversal, in exchange for loading in
+    milliseconds from memory-mapped arrays.
+
+    Parameters:
+    left, right (np.ndarray): Child node of every node (a leaf's own index).
+    feature (np.ndarray): Split feature of every node.
+    threshold (np.ndarray): Split threshold; rows with X <= threshold go left.
+    missing_left (np.ndarray): Whether missing values go left, per node.
+    value (np.ndarray): Leaf predictions, shape (nodes, outputs) for
+        regression or (nodes, classes) class probabilities.
+    roots (np.ndarray): Root node of every tree.
+    depth (int): Depth of the deepest tree.
+    classes (np.ndarray): Class labels for classifiers, None for regressors.
+    feature_names (list): Column names the forest was fitted on, if any.
+    """
+
+    ARRAYS = ('left', 'right', 'feature', 'threshold', 'missing_left', 'value', 'roots')
+
+    def __init__(self, left, right, feature, threshold, missing_left, value, roots, depth, classes=None,
+                 feature_names=None):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.depth = int(depth)
+        self.classes_ = classes
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object) if feature_names is not None else None
+        self.n_features_in_ = None
+
+    @staticmethod
+    def supports(model):
+        """True for fitted single-output scikit-learn forests (random forests, extra-trees)."""
+        estimators = getattr(model, 'estimators_', None)
+        return (isinstance(estimators, list) and len(estimators) > 0
+                and all(hasattr(tree, 'tree_') for tree in estimators)
+                and getattr(model, 'n_outputs_', 1) == 1)
+
+    @classmethod
+    def from_forest(cls, forest):
+        """Flatten a fitted forest (see `supports`)."""
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        counts = np.array([tree.node_count for tree in trees])
+        roots = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+        total = int(counts.sum())
+        left = np.empty(total, dtype=np.int64)
+        right = np.empty(total, dtype=np.int64)
+        feature = np.empty(total, dtype=np.int32)
+        threshold = np.empty(total, dtype=np.float64)
+        missing_left = np.zeros(total, dtype=bool)
+        classifier = hasattr(forest, 'classes_')
+        value = np.empty((total, trees[0].value.shape[2] if classifier else 1), dtype=np.float64)
+        for tree, start in zip(trees, roots):
+            nodes = np.arange(start, start + tree.node_count)
+            leaf = tree.children_left < 0
+            left[nodes] = np.where(leaf, nodes, tree.children_left + start)
+            right[nodes] = np.where(leaf, nodes, tree.children_right + start)
+            feature[nodes] = np.where(leaf, 0, tree.feature)
+            threshold[nodes] = np.where(leaf, np.inf, tree.threshold)
+            if hasattr(tree, 'missing_go_to_left'):
+                missing_left[nodes] = np.where(leaf, True, tree.missing_go_to_left.astype(bool))
+            values = tree.value[:, 0, :]
+            if classifier:
+                # Per-leaf class fractions, as the trees' predict_proba returns them
+                sums = values.sum(axis=1, keepdims=True)
+                values = values / np.where(sums > 0, sums, 1.0)
+            value[nodes] = values
+        compact = cls(
+            left, right, feature, threshold, missing_left, value, roots,
+            depth=max(tree.max_depth for tree in trees),
+            classes=forest.classes_ if classifier else None,
+            feature_names=getattr(forest, 'feature_names_in_', None),
+        )
+        compact.n_features_in_ = forest.n_features_in_
+        return compact
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    def apply(self, X):
+        """Global leaf index of every row in every tree, shape (rows, trees)."""
+        X = self._validate(X)
+        n_rows = len(X)
+        columns = np.ascontiguousarray(X.T).reshape(-1)  # Feature-major, so a split reads columns[feature * rows + row]
+        has_missing = bool(np.isnan(columns).any())
+        leaves = np.empty((n_rows, self.n_estimators), dtype=np.int64)
+        # Rows are walked in blocks of about two million (tree, row) pairs to bound the index arrays
+        block = max(1, 2 ** 21 // self.n_estimators)
+        for start in range(0, n_rows, block):
+            size = min(block, n_rows - start)
+            node = np.repeat(np.asarray(self.roots), size)
+            row = np.tile(np.arange(start, start + size), self.n_estimators)
+            position = np.arange(len(node))
+            found = np.empty(len(node), dtype=np.int64)
+            while len(node):
+                values = columns[self.feature[node].astype(np.int64) * n_rows + row]
+                go_left = values <= self.threshold[node]
+                if has_missing:
+                    go_left |= np.isnan(values) & self.missing_left[node]
+                step = np.where(go_left, self.left[node], self.right[node])
+                # Leaves point to themselves; pairs that reached one leave the active set once
+                # they are a quarter of it, so deep trees do not keep shallow rows walking
+                done = step == node
+                n_done = np.count_nonzero(done)
+                if 4 * n_done > len(node):
+                    found[position[done]] = node[done]
+                    keep = ~done
+                    node, row, position = step[keep], row[keep], position[keep]
+                else:
+                    node = step
+            leaves[start:start + size] = found.reshape(self.n_estimators, size).T
+        return leaves
+
+    def _mean_value(self, X):
+        leaves = self.apply(X)
+        output = np.zeros((len(leaves), self.value.shape[1]))
+        for column in leaves.T:  # Summed tree by tree to avoid a (rows, trees, outputs) array
+            output += self.value[column]
+        return output / self.n_estimators
+
+    def predict(self, X):
+        values = self._mean_value(X)
+        if self.classes_ is None:
+            return values[:, 0]
+        return np.asarray(self.classes_)[values.argmax(axis=1)]
+
+    def predict_proba(self, X):
+        if self.classes_ is None:
+            raise AttributeError("predict_proba is only available for classifiers.")
+        return self._mean_value(X)
+
+    def score(self, X, Y):
+        Y = np.asarray(Y)
+        predictions = self.predict(X)
+        if self.classes_ is not None:
+            return float(np.mean(predictions == Y))
+        return 1.0 - float(np.sum((Y - predictions) ** 2) / np.sum((Y - Y.mean()) ** 2))
+
+    def _validate(self, X):
+        if isinstance(X, pd.DataFrame) and self.feature_names_in_ is not None:
+            X = X[list(self.feature_names_in_)]
+        # scikit-learn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        if self.n_features_in_ is not None and X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, but the forest was fitted with {self.n_features_in_}.")
+        return X
+
+    def save(self, directory):
+        directory = Path(directory)
+        for name in self.ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        meta = {
+            'depth': self.depth,
+            'n_features_in': self.n_features_in_,
+            'classes': self.classes_.tolist() if self.classes_ is not None else None,
+            'feature_names': [str(n) for n in self.feature_names_in_] if self.feature_names_in_ is not None else None,
+        }
+        (directory / 'forest.json').write_text(json.dumps(meta))
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        directory = Path(directory)
+        meta = json.loads((directory / 'forest.json').read_text())
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode) for name in cls.ARRAYS}
+        classes = np.asarray(meta['classes']) if meta['classes'] is not None else None
+        compact = cls(**arrays, depth=meta['depth'], classes=classes, feature_names=meta['feature_names'])
+        compact.n_features_in_ = meta['n_features_in']
+        return compact
+
+
+def _json_safe(value):
+    """Hyperparameters as JSON: numbers, strings and containers as they are, anything else as its repr."""
+    return json.loads(json.dumps(value, default=lambda v: v.item() if isinstance(v, np.generic) else repr(v)))
+
+
+def build_manifest(method, X=None, Y=None, params=None, fit_seconds=None, **extra):
+    """
+    Describe a fit for the manifest of a saved model.
+
+    Parameters:
+    method (str): The ModelManager method that fitted the model.
+    X, Y: The data it was fitted on (fingerprinted, never stored).
+    params (dict): Hyperparameters.
+    fit_seconds (float): Wall time of the fit.
+    **extra: Further JSON-safe entries, e.g. the source file.
+
+    Returns:
+    dict: Manifest entries for `save_model`.
+    """
+    manifest = {'method': method, 'params': _json_safe(params or {}), 'fit_seconds': fit_seconds}
+    data = [value for value in (X, Y) if value is not None]
+    if data:
+        manifest['data_fingerprint'] = fingerprint(*data)
+    if X is not None:
+        manifest['rows'] = len(X)
+        manifest['x_columns'] = [str(c) for c in X.columns] if isinstance(X, pd.DataFrame) else None
+    if Y is not None:
+        if isinstance(Y, pd.Series):
+            manifest['y_columns'] = [str(Y.name)]
+        elif isinstance(Y, pd.DataFrame):
+            manifest['y_columns'] = [str(c) for c in Y.columns]
+    manifest.update(_json_safe(extra))
+    return manifest
+
+
+def _payload_kind(model):
+    if CompactForest.supports(model):
+        return 'forest'
+    if hasattr(model, 'remove_data') or hasattr(getattr(model, 'results', None), 'remove_data'):
+        return 'statsmodels'
+    if isinstance(model, np.ndarray) and model.ndim == 1 and model.dtype.kind in 'if' \
+            or isinstance(model, (tuple, list)) and all(isinstance(v, (int, float, np.number)) for v in model):
+        return 'json'
+    return 'joblib'
+
+
+def _write_payload(model, directory, compact=True):
+    import joblib
+    kind = _payload_kind(model)
+    if kind == 'forest' and not compact:
+        kind = 'joblib'
+    if kind == 'forest':
+        CompactForest.from_forest(model).save(directory)
+    elif kind == 'statsmodels':
+        # A copy is slimmed; the caller's results keep their data for plots and summaries
+        slim = pickle.loads(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+        (slim.results if hasattr(slim, 'results') else slim).remove_data()
+        joblib.dump(slim, directory / 'model.joblib')
+    elif kind == 'json':
+        (directory / 'params.json').write_text(json.dumps([float(v) for v in model]))
+    else:
+        joblib.dump(model, directory / 'model.joblib')
+    return kind
+
+
+def _read_payload(kind, directory, mmap=True):
+    import joblib
+    if kind == 'forest':
+        return CompactForest.load(directory, mmap_mode='r' if mmap else None)
+    if kind == 'json':
+        return np.array(json.loads((directory / 'params.json').read_text()))
+    return joblib.load(directory / 'model.joblib', mmap_mode='r' if mmap else None)
+
+
+def save_model(model, path, manifest=None, compact=True, overwrite=False):
+    """
+    Save a fitted model to the directory `path`.
+
+    The directory is written under a temporary name and renamed when
+    complete, so a crash never leaves a half-written model behind.
+
+    Parameters:
+    model: The fitted model, a PreprocessedModel, or a result such as
+        curve-fit parameters.
+    path (str): Directory to create.
+    manifest (dict): Entries from `build_manifest`, stored in manifest.json.
+    compact (bool): Store forests as `CompactForest` arrays. With False they
+        are pickled whole, which keeps the scikit-learn object (e.g. for
+        plotting trees) at the cost of slow loads.
+    overwrite (bool): Replace an existing saved model at `path`.
+
+    Returns:
+    dict: The manifest as written.
+
+    Raises:
+    FileExistsError: If `path` exists and `overwrite` is False.
+    """
+    path = Path(path)
+    if path.exists() and not overwrite:
+        raise FileExistsError(f"{path} already exists.")
+    start = time.perf_counter()
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.mkdir(parents=True)
+    try:
+        inner = model
+        if isinstance(model, PreprocessedModel):
+            import joblib
+            joblib.dump(model.preprocessor, tmp_path / 'preprocessor.joblib')
+            inner = model.model
+        kind = _write_payload(inner, tmp_path, compact=compact)
+        manifest = {
+            **(manifest or {}),
+            'format': FORMAT_VERSION,
+            'kind': kind,
+            'model_class': type(inner).__name__,
+            'preprocessed': isinstance(model, PreprocessedModel),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'versions': {name: getattr(sys.modules[name], '__version__', None)
+                         for name in _LIBRARIES if name in sys.modules},
+        }
+        manifest['size_bytes'] = sum(f.stat().st_size for f in tmp_path.iterdir())
+        manifest['save_seconds'] = time.perf_counter() - start
+        (tmp_path / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+        if path.exists():
+            shutil.rmtree(path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    return manifest
+
+
+def read_manifest(path):
+    """The manifest of a saved model directory."""
+    return json.loads((Path(path) / MANIFEST_NAME).read_text())
+
+
+def load_model(path, mmap=True):
+    """
+    Load a model saved with `save_model`.
+
+    Parameters:
+    path (str): The saved model's directory.
+    mmap (bool): Memory-map array data instead of reading it into memory.
+
+    Returns:
+    The model, wrapped in a PreprocessedModel when it was saved with one.
+
+    Raises:
+    ValueError: If the directory was written by a newer format version.
+    """
+    path = Path(path)
+    manifest = read_manifest(path)
+    if manifest.get('format', 0) > FORMAT_VERSION:
+        raise ValueError(f"{path} was saved by a newer version of modeling_gui.")
+    model = _read_payload(manifest['kind'], path, mmap=mmap)
+    if manifest.get('preprocessed'):
+        import joblib
+        model = PreprocessedModel(joblib.load(path / 'preprocessor.joblib'), model)
+    return model
+
+
+def is_saved_model(path):
+    return (Path(path) / MANIFEST_NAME).is_file()
+
+
+def list_models(directory):
+    """
+    Manifests of the models saved in the subdirectories of `directory`, newest first.
+
+    Returns:
+    pd.DataFrame: One row per model with its path and main manifest entries.
+    """
+    rows = []
+    directory = Path(directory)
+    if directory.is_dir():
+        for path in directory.iterdir():
+            if not path.name.startswith('.') and is_saved_model(path):
+                try:
+                    manifest = read_manifest(path)
+                except (OSError, ValueError):
+                    continue
+                rows.append({
+                    'name': path.name,
+                    'method': manifest.get('method'),
+                    'model_class': manifest.get('model_class'),
+                    'created': manifest.get('created'),
+                    'rows': manifest.get('rows'),
+                    'x_columns': ', '.join(manifest.get('x_columns') or []),
+                    'y_columns': ', '.join(manifest.get('y_columns') or []),
+                    'fit_seconds': manifest.get('fit_seconds'),
+                    'size_mb': manifest.get('size_bytes', 0) / 1e6,
+                    'path': str(path),
+                })
+    columns = ['name', 'method', 'model_class', 'created', 'rows', 'x_columns', 'y_columns', 'fit_seconds',
+               'size_mb', 'path']
+    table = pd.DataFrame(rows, columns=columns)
+    return table.sort_values('created', ascending=False, ignore_index=True)
@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.ensemble import HistGradientBoostingClassifier, HistGradientBoostingRegressor
+from sklearn.pipeline import Pipeline
+
+BACKENDS = ('classic', 'histogram')
+
+# Code reserved for missing values by StreamingBinner; ordinary values use codes below MAX_BINS
+MISSING_BIN = 255
+# With the missing code that is 255 distinct codes, which histogram boosting keeps in separate bins
+MAX_BINS = 254
+
+
+class CategoryCodes(BaseEstimator, TransformerMixin):
+    """
+    Replace categorical and text columns with category codes.
+
+    Categories are learned at fit time; unseen values and missing values
+    become NaN, which histogram boosting routes natively.
+    """
+
+    def fit(self, X, y=None):
+        X = pd.DataFrame(X)
+        self.columns_ = list(X.columns)
+        self.categories_ = {
+            column: pd.Index(X[column].astype('category').cat.categories)
+            for column in X.columns
+            if X[column].dtype.kind not in 'biuf'
+        }
+        return self
+
+    @property
+    def categorical_mask(self):
+        return [column in self.categories_ for column in self.columns_]
+
+    def transform(self, X):
+        X = pd.DataFrame(X, columns=self.columns_) if not isinstance(X, pd.DataFrame) else X
+        out = np.empty((len(X), len(self.columns_)), dtype=np.float64)
+        for j, column in enumerate(self.columns_):
+            if column in self.categories_:
+                codes = self.categories_[column].get_indexer(X[column]).astype(np.float64)
+                codes[codes < 0] = np.nan
+                out[:, j] = codes
+            else:
+                out[:, j] = X[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        return out
+
+
+class StreamingBinner(BaseEstimator, TransformerMixin):
+    """
+    Quantile binning learned from a stream of chunks, stored as uint8 codes.
+
+    `partial_fit` keeps a uniform reservoir sample of rows; `transform` maps
+    values to at most 254 bins with missing values in a bin of their own above
+    them, so the streamed training set is stored as one byte per value.
+
+    Parameters:
+    max_bins (int): Number of bins for non-missing values (at most 254).
+    subsample (int): Rows kept in the reservoir used to place bin edges.
+    random_state (int): Seed for the reservoir.
+    """
+
+    def __init__(self, max_bins=MAX_BINS, subsample=200_000, random_state=0):
+        self.max_bins = max_bins
+        self.subsample = subsample
+        self.random_state = random_state
+
+    def partial_fit(self, X, y=None):
+        X = np.asarray(X, dtype=np.float64)
+        if not hasattr(self, '_reservoir'):
+            self._reservoir = np.empty((0, X.shape[1]))
+            self._seen = 0
+            self._rng = np.random.default_rng(self.random_state)
+        take = max(0, min(self.subsample - len(self._reservoir), len(X)))
+        if take:
+            self._reservoir = np.vstack([self._reservoir, X[:take]])
+            self._seen += take
+            X = X[take:]
+        if len(X):
+            # Reservoir sampling: the i-th row seen replaces a random slot with probability subsample / i
+            positions = self._seen + np.arange(1, len(X) + 1)
+            slots = (self._rng.random(len(X)) * positions).astype(np.int64)
+            keep = slots < self.subsample
+            self._reservoir[slots[keep]] = X[keep]
+            self._seen += len(X)
+        return self
+
+    def finalize(self):
+        """Place the bin edges from the reservoir and release it."""
+        bins = min(self.max_bins, MAX_BINS)
+        quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+        self.bin_edges_ = []
+        for column in self._reservoir.T:
+            column = column[np.isfinite(column)]
+            edges = np.unique(np.quantile(column, quantiles)) if len(column) else np.empty(0)
+            self.bin_edges_.append(edges)
+        for attribute in ('_reservoir', '_seen', '_rng'):
+            self.__dict__.pop(attribute, None)
+        return self
+
+    def fit(self, X, y=None):
+        return self.partial_fit(X).finalize()
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        codes = np.empty(X.shape, dtype=np.uint8)
+        for j, edges in enumerate(self.bin_edges_):
+            column = X[:, j]
+            codes[:, j] = np.searchsorted(edges, column, side='right')
+            codes[np.isnan(column), j] = MISSING_BIN
+        return codes
+
+
+def histogram_boosting(is_regression, n_estimators=100, learning_rate=0.1, max_depth=None,
+                       early_stopping=False, validation_fraction=0.1, categorical_mask=None):
+    """
+    Build the histogram-based regressor or classifier with ModelManager's parameter names.
+    """
+    estimator_class = HistGradientBoostingRegressor if is_regression else HistGradientBoostingClassifier
+    return estimator_class(
+        max_iter=n_estimators,
+        learning_rate=learning_rate,
+        max_depth=max_depth,
+        early_stopping=early_stopping,
+        validation_fraction=validation_fraction if early_stopping else None,
+        categorical_features=categorical_mask,
+    )
+
+
+def histogram_pipeline(X, Y, n_estimators=100, learning_rate=0.1, max_depth=None,
+                       early_stopping=False, validation_fraction=0.1):
+    """
+    Build an unfitted histogram boosting pipeline for in-memory data.
+
+    Categorical and text columns of a DataFrame are encoded to codes and
+    handled natively; missing values need no imputation.
+
+    Returns:
+    Pipeline: Category encoding followed by the boosting model ('boost' step),
+    exposing the usual `predict`/`score` (and `predict_proba`, `classes_` for
+    classifiers).
+    """
+    mask = CategoryCodes().fit(X).categorical_mask
+    model = histogram_boosting(
+        Y.dtype.kind in 'if', n_estimators, learning_rate, max_depth, early_stopping,
+        validation_fraction, categorical_mask=mask if any(mask) else None,
+    )
+    return Pipeline([('encode', CategoryCodes()), ('boost', model)])
+
+
+def fit_histogram_boosting_streamed(chunks, x_columns, y_column, n_estimators=100, learning_rate=0.1,
+                                    max_depth=None, early_stopping=False, validation_fraction=0.1,
+                                    max_bins=MAX_BINS, subsample=200_000, monitor=None):
+    """
+    Train histogram boosting on data streamed in chunks.
+
+    The first pass over the chunks places quantile bin edges from a reservoir
+    sample. The second pass keeps only uint8 bin codes and the target, one
+    byte per feature value, so the file is never parsed into a full
+    DataFrame. The boosting fit itself still converts the codes to float64
+    and bins them again: it peaks at about nine bytes per feature value plus
+    a few float64 buffers per row (about 250 MB of arrays for 2M rows and 10
+    features). Text columns are not supported in this path.
+
+    Parameters:
+    chunks (callable): Returns a fresh iterator of DataFrame chunks; called twice.
+    x_columns (list): Feature column names.
+    y_column (str): Target column name.
+    monitor (JobMonitor): Optional progress/cancellation hooks; progress is
+        reported per chunk of the second pass.
+
+    Returns:
+    Pipeline: Binning followed by the boosting model; `predict` accepts raw
+    feature values.
+    """
+    binner = StreamingBinner(max_bins=max_bins, subsample=subsample)
+    n_rows = 0
+    for chunk in chunks():
+        binner.partial_fit(chunk[x_columns])
+        n_rows += len(chunk)
+        if monitor is not None and monitor.cancelled:
+            return None
+    binner.finalize()
+
+    codes = np.empty((n_rows, len(x_columns)), dtype=np.uint8)
+    targets = []
+    position = 0
+    for chunk in chunks():
+        codes[position:position + len(chunk)] = binner.transform(chunk[x_columns])
+        targets.append(chunk[y_column].to_numpy())
+        position += len(chunk)
+        if monitor is not None:
+            monitor.progress(position, n_rows)
+            if monitor.cancelled:
+                return None
+    Y = np.concatenate(targets)
+
+    model = histogram_boosting(
+        Y.dtype.kind in 'if', n_estimators, learning_rate, max_depth, early_stopping, validation_fraction,
+    )
+    # At most MAX_BINS codes plus MISSING_BIN, so every code stays in its own bin; missing values
+    # sort above all others, and a split between the two highest codes separates them
+    model.fit(codes, Y)
+    pipeline = Pipeline([('bin', binner), ('boost', model)])
+    pipeline.n_rows_ = n_rows
+    return pipeline
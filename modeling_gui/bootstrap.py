@@ -0,0 +1,387 @@
+"""
+Bootstrap confidence intervals for the parameters of ModelManager fits.
+
+Resamples are drawn in bulk: each task draws a whole batch of row-index
+vectors with one `Generator.integers` call, seeded from its own child of a
+`SeedSequence`, so the samples do not depend on how many workers run them.
+Tasks run in a process pool whose workers map the data read-only (see
+modeling_gui.design).
+
+Refits start from the full-data solution where the method iterates: curve
+fits get it as `p0`, RLM as its start parameters and scale. OLS needs no
+iterations; its resamples become row weights, and the weighted normal
+equations of a batch are solved together.
+
+Batches are collected in order. Once `min_resamples` are in, the interval
+widths are compared after every round of batches, and resampling stops
+when no width moves by more than `tol` of itself.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .design import attach, share
+
+# ModelManager methods offered for bootstrapping, with their display names; others with params work too
+BOOTSTRAP_METHODS = {
+    'ols': "OLS",
+    'rlm': "RLM",
+    'recursive_ls': "Recursive LS",
+    'random_forest': "Random Forest",
+    'gradient_boost': "Gradient Boosting",
+    'gaussian_fitting': "Gaussian Fitting",
+    'exponential_fitting': "Exponential Fitting",
+}
+INTERVALS = ('percentile', 'bca')
+CURVE_KINDS = {'gaussian_fitting': 'gaussian', 'exponential_fitting': 'exponential'}
+
+# Data shared with every worker process once, instead of once per task
+_worker_data = {}
+
+
+def parameters(model, x_names=None):
+    """
+    The parameter vector of a fitted model, with names and standard errors where the model has them.
+
+    Parameters:
+    model: What a ModelManager fitting method returned: statsmodels or
+        least-squares results (params), a tree ensemble
+        (feature_importances_), a linear scikit-learn model (coef_) or
+        curve parameters (an array).
+    x_names (list): Names for unnamed parameters.
+
+    Returns:
+    tuple: (names, values, standard errors or None).
+
+    Raises:
+    ValueError: If the model has no parameter vector.
+    """
+    bse = None
+    if hasattr(model, 'params'):
+        values, bse = model.params, getattr(model, 'bse', None)
+    elif hasattr(model, 'feature_importances_'):
+        values = model.feature_importances_
+    elif hasattr(model, 'coef_'):
+        values = np.append(np.ravel(model.coef_), np.ravel(getattr(model, 'intercept_', [])))
+    elif isinstance(model, np.ndarray) and model.ndim == 1:
+        values = model
+    else:
+        raise ValueError(f"{type(model).__name__} has no parameters to bootstrap.")
+    if isinstance(values, pd.DataFrame):
+        raise ValueError("Bootstrap one target at a time.")
+    if isinstance(values, pd.Series):
+        names = [str(name) for name in values.index]
+    elif x_names is not None and len(x_names) == len(values):
+        names = list(x_names)
+    elif x_names is not None and len(x_names) + 1 == len(values):
+        names = list(x_names) + ['intercept'] if hasattr(model, 'coef_') else ['const'] + list(x_names)
+    else:
+        names = [f"p{i}" for i in range(len(values))]
+    values = np.asarray(values, dtype=np.float64)
+    bse = None if bse is None else np.asarray(bse, dtype=np.float64).reshape(values.shape)
+    return names, values, bse
+
+
+def _design(X, n_params):
+    """X with the constant column statsmodels prepended when the fit has one more parameter than X has columns."""
+    if X.shape[1] == n_params - 1:
+        return np.column_stack([np.ones(len(X)), X])
+    return X
+
+
+def _weighted_least_squares(X, y, weights):
+    """
+    Solve the normal equations for every row of `weights` at once.
+
+    Parameters:
+    X (np.ndarray): Regressors (rows, p), including any constant.
+    y (np.ndarray): Target (rows,).
+    weights (np.ndarray): (fits, rows) row weights, e.g. resampling counts.
+
+    Returns:
+    np.ndarray: (fits, p) coefficients; collinear fits get the pseudo-inverse
+    solution of the column-scaled equations.
+    """
+    XtWX = np.einsum('bn,ni,nj->bij', weights, X, X, optimize=True)
+    XtWy = weights @ (X * y[:, None])
+    scale = np.sqrt(np.diagonal(XtWX, axis1=1, axis2=2)).copy()
+    scale[scale == 0] = 1.0
+    inverse = np.linalg.pinv(XtWX / (scale[:, :, None] * scale[:, None, :]), hermitian=True)
+    return np.einsum('bij,bj->bi', inverse, XtWy / scale) / scale
+
+
+def _init_worker(X, Y, method, params, start, start_scale):
+    _worker_data.update(X=attach(X), Y=attach(Y), method=method, params=params, start=start,
+                        start_scale=start_scale)
+
+
+def _refit(task):
+    """
+    Refit the model on each row set of one task.
+
+    Parameters:
+    task (tuple): ('bootstrap', seed, count) for `count` resamples drawn
+        from `seed`, or ('jackknife', blocks, n_blocks) to leave out each of
+        the given blocks of rows.
+
+    Returns:
+    np.ndarray: (fits, parameters); a failed refit is a row of NaN.
+    """
+    X, Y, method = _worker_data['X'], _worker_data['Y'], _worker_data['method']
+    params, start = _worker_data['params'], _worker_data['start']
+    n = len(Y)
+    kind, spec, size = task
+    if kind == 'bootstrap':
+        indices = np.random.default_rng(spec).integers(0, n, size=(size, n))
+        row_sets = list(indices)
+    else:
+        edges = np.linspace(0, n, size + 1).astype(np.intp)
+        row_sets = [np.r_[0:edges[block], edges[block + 1]:n] for block in spec]
+
+    if method == 'ols':
+        if kind == 'bootstrap':
+            weights = np.stack([np.bincount(rows, minlength=n) for rows in row_sets]).astype(np.float64)
+        else:
+            weights = np.zeros((len(row_sets), n))
+            for i, rows in enumerate(row_sets):
+                weights[i, rows] = 1.0
+        return _weighted_least_squares(_design(X, len(start)), Y, weights)
+
+    if method in CURVE_KINDS:
+        from .curve_fitting import _fit_block
+        x = X.reshape(-1)
+        if kind == 'bootstrap':
+            xs, ys = x[indices].T, Y[indices].T
+        else:
+            # Jackknife row sets differ in length; pad with NaN, which the fit ignores
+            width = max(len(rows) for rows in row_sets)
+            xs, ys = np.full((width, len(row_sets)), np.nan), np.full((width, len(row_sets)), np.nan)
+            for i, rows in enumerate(row_sets):
+                xs[:len(rows), i], ys[:len(rows), i] = x[rows], Y[rows]
+        p0 = np.tile(start, (xs.shape[1], 1))
+        return np.array([result[0] for result in _fit_block(CURVE_KINDS[method], xs, ys, p0,
+                                                            params.get('maxfev', 2000))])
+
+    from .models import ModelManager, _with_constant
+    results = np.full((len(row_sets), len(start)), np.nan)
+    for i, rows in enumerate(row_sets):
+        try:
+            if method == 'rlm':
+                import statsmodels.api as sm
+                fit = sm.RLM(Y[rows], _with_constant(X[rows])).fit(
+                    start_params=start, start_scale=_worker_data['start_scale'], **params)
+                results[i] = fit.params
+            else:
+                results[i] = parameters(getattr(ModelManager(), method)(X[rows], Y[rows], **params))[1]
+        except Exception:
+            pass  # Counted as a failed refit
+    return results
+
+
+def percentile_interval(samples, alpha=0.05):
+    """Lower and upper percentile bounds of each column of `samples`, ignoring failed (NaN) refits."""
+    return np.nanquantile(samples, [alpha / 2, 1 - alpha / 2], axis=0)
+
+
+def bca_interval(samples, estimate, jackknife, alpha=0.05):
+    """
+    Bias-corrected and accelerated (BCa) bounds of each column of `samples`.
+
+    Parameters:
+    samples (np.ndarray): (resamples, parameters) bootstrap estimates.
+    estimate (np.ndarray): The full-data estimates.
+    jackknife (np.ndarray): (blocks, parameters) leave-a-block-out estimates,
+        which give the acceleration.
+    alpha (float): One minus the confidence level.
+
+    Returns:
+    np.ndarray: (2, parameters) lower and upper bounds.
+    """
+    from scipy.stats import norm
+    valid = np.isfinite(samples)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        below = ((samples < estimate) & valid).sum(axis=0) + 0.5 * ((samples == estimate) & valid).sum(axis=0)
+        z0 = norm.ppf(below / valid.sum(axis=0))
+        deviations = np.nanmean(jackknife, axis=0) - jackknife
+        acceleration = np.nansum(deviations ** 3, axis=0) / (6 * np.nansum(deviations ** 2, axis=0) ** 1.5)
+    acceleration = np.nan_to_num(acceleration)
+    bounds = []
+    for z in norm.ppf([alpha / 2, 1 - alpha / 2]):
+        level = norm.cdf(z0 + (z0 + z) / (1 - acceleration * (z0 + z)))
+        bounds.append([np.nanquantile(samples[:, j], level[j]) if np.isfinite(level[j]) else np.nan
+                       for j in range(samples.shape[1])])
+    return np.array(bounds)
+
+
+def _converged(previous, current, tol):
+    if previous is None:
+        return False
+    width, before = current[1] - current[0], previous[1] - previous[0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        change = np.abs(width - before) / np.abs(width)
+    change = change[np.isfinite(change)]
+    return len(change) > 0 and change.max() <= tol
+
+
+def bootstrap(X, Y, method, params=None, n_resamples=1000, alpha=0.05, interval='percentile', tol=0.01,
+              min_resamples=200, n_jackknife=100, n_workers=None, random_state=0, monitor=None):
+    """
+    Bootstrap confidence intervals for the parameters of a ModelManager method.
+
+    Parameters:
+    X (pd.DataFrame or np.ndarray): Features; a single column for curve fits.
+    Y (pd.Series or np.ndarray): Target.
+    method (str): A ModelManager fitting method taking (X, Y), e.g. one of
+        BOOTSTRAP_METHODS.
+    params (dict): Keyword arguments for the method.
+    n_resamples (int): Most resamples drawn.
+    alpha (float): One minus the confidence level.
+    interval (str): 'percentile', or 'bca' (bias-corrected and
+        accelerated; adds up to `n_jackknife` leave-a-block-out refits).
+    tol (float): Stop early once no interval width changed by more than
+        this fraction between two rounds; 0 always draws `n_resamples`.
+    min_resamples (int): Resamples drawn before stopping early.
+    n_jackknife (int): Blocks of rows left out in turn for the BCa
+        acceleration; each row on its own when there are fewer rows.
+    n_workers (int): Worker processes; 1 refits in the calling process.
+        Defaults to the number of CPUs, or 1 for OLS, whose batches solve
+        faster than a pool starts.
+    random_state (int): Seed of the resamples.
+    monitor (JobMonitor): Optional progress/cancellation hooks.
+
+    Returns:
+    pd.DataFrame: One row per parameter with the full-data 'estimate', the
+    model's own 'std_error' where it reports one, the bootstrap standard
+    deviation 'boot_std_error', 'bias', and the interval's 'lower' and
+    'upper' bounds. `attrs['samples']` holds the bootstrap estimates, and
+    `attrs` also records 'n_resamples', 'failed' refits, 'converged',
+    'interval' and 'alpha'.
+
+    Raises:
+    ValueError: For an unknown interval, or a model without parameters.
+    """
+    from .models import ModelManager
+    if interval not in INTERVALS:
+        raise ValueError(f"Invalid interval. Choose one of {', '.join(INTERVALS)}.")
+    if not callable(getattr(ModelManager, method, None)):
+        raise ValueError(f"ModelManager has no method {method!r}.")
+    params = dict(params or {})
+    if method == 'random_forest':
+        params.setdefault('n_jobs', 1)  # Parallelism comes from the process pool
+    x_names = [str(c) for c in X.columns] if isinstance(X, pd.DataFrame) else None
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.asarray(Y)
+    if Y.dtype.kind in 'biuf':
+        Y = Y.astype(np.float64, copy=False)
+    X = X.reshape(len(X), -1)
+    n = len(Y)
+
+    # The full-data fit gives the estimates and the warm start of every refit
+    start_scale = None
+    if method in CURVE_KINDS:
+        from .curve_fitting import batch_curve_fit
+        full = batch_curve_fit(X.reshape(-1), Y, kind=CURVE_KINDS[method], n_workers=1)
+        names = list(full['params'].columns)
+        estimate, model_bse = full['params'].iloc[0].to_numpy(), full['bse'].iloc[0].to_numpy()
+        if np.isnan(estimate).any():
+            raise ValueError(full['stats', 'error'].iloc[0])
+    else:
+        fitted = getattr(ModelManager(), method)(
+            pd.DataFrame(X, columns=x_names) if x_names is not None else X, Y, **params)
+        names, estimate, model_bse = parameters(fitted, x_names)
+        if method == 'rlm':
+            start_scale = float(fitted.scale)
+    if names and names[0] == 'const' and x_names is not None and x_names[0] == 'const':
+        X = X[:, 1:]  # statsmodels would not add a second constant; the refits add it back
+
+    batch = int(np.clip(2 ** 22 // max(n, 1), 1, 50))
+    seeds = np.random.SeedSequence(random_state).spawn(-(-n_resamples // batch))
+    tasks = []
+    if interval == 'bca':
+        # Jackknife refits go first, so stopping early never leaves them out
+        blocks = min(n, n_jackknife)
+        tasks += [('jackknife', list(chunk), blocks) for chunk in np.array_split(np.arange(blocks), -(-blocks // batch))]
+    tasks += [('bootstrap', seed, min(batch, n_resamples - i * batch)) for i, seed in enumerate(seeds)]
+    if n_workers is None and method == 'ols':
+        n_workers = 1
+    n_workers = min(n_workers or os.cpu_count() or 1, len(tasks))
+    data = (X, Y, method, params, estimate, start_scale)
+
+    samples, jackknife = [], []
+    drawn, bounds, converged = 0, None, False
+    check_every = max(batch * n_workers, min_resamples // 4)
+    next_check = min_resamples
+    results = _run_tasks(tasks, data, n_workers)
+    try:
+        for task, result in results:
+            if task[0] == 'jackknife':
+                jackknife.append(result)
+                continue
+            samples.append(result)
+            drawn += len(result)
+            if monitor is not None:
+                monitor.progress(drawn, n_resamples)
+                if monitor.cancelled:
+                    break
+            if tol > 0 and drawn >= next_check and drawn < n_resamples:
+                current = percentile_interval(np.vstack(samples), alpha)
+                converged = _converged(bounds, current, tol)
+                bounds = current
+                next_check = drawn + check_every
+                if converged:
+                    break
+    finally:
+        results.close()
+
+    samples = np.vstack(samples) if samples else np.empty((0, len(names)))
+    if interval == 'bca' and len(jackknife) and len(samples):
+        lower, upper = bca_interval(samples, estimate, np.vstack(jackknife), alpha)
+    elif len(samples):
+        lower, upper = percentile_interval(samples, alpha)
+    else:
+        lower = upper = np.full(len(names), np.nan)
+    with np.errstate(invalid='ignore'):
+        boot_std_error = np.nanstd(samples, axis=0, ddof=1) if len(samples) > 1 else np.full(len(names), np.nan)
+        bias = np.nanmean(samples, axis=0) - estimate if len(samples) else np.full(len(names), np.nan)
+    table = pd.DataFrame({
+        'estimate': estimate,
+        'std_error': model_bse if model_bse is not None else np.nan,
+        'boot_std_error': boot_std_error,
+        'bias': bias,
+        'lower': lower,
+        'upper': upper,
+    }, index=pd.Index(names, name='parameter'))
+    table.attrs['samples'] = pd.DataFrame(samples, columns=names)
+    table.attrs['n_resamples'] = len(samples)
+    table.attrs['failed'] = int(np.isnan(samples).any(axis=1).sum())
+    table.attrs['converged'] = converged
+    table.attrs['interval'] = interval
+    table.attrs['alpha'] = alpha
+    return table
+
+
+def _run_tasks(tasks, data, n_workers):
+    """Yield (task, result) in task order, in a process pool when n_workers > 1; closing the generator cancels the rest."""
+    if n_workers <= 1:
+        _init_worker(*data)
+        try:
+            for task in tasks:
+                yield task, _refit(task)
+        finally:
+            _worker_data.clear()
+        return
+    X, Y, *rest = data
+    # Spawned workers avoid forking a process that runs Qt and worker threads
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=context, initializer=_init_worker,
+                             initargs=(share(X), share(Y), *rest)) as executor:
+        futures = [executor.submit(_refit, task) for task in tasks]
+        try:
+            for task, future in zip(tasks, futures):
+                yield task, future.result()
+        finally:
+            for future in futures:
+                future.cancel()
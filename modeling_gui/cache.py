@@ -0,0 +1,242 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(*objects):
+    """
+    Fast content hash of arrays, Series and DataFrames.
+
+    Numeric data is hashed straight from its buffer; object and categorical
+    columns go through `pd.util.hash_array`. Shapes, dtypes and column names
+    are part of the hash, so renaming or reordering columns changes it.
+
+    Returns:
+    str: Hex digest.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for obj in objects:
+        if isinstance(obj, pd.DataFrame):
+            h.update(repr(('frame', obj.shape, [str(c) for c in obj.columns])).encode())
+            for column in obj.columns:
+                _hash_values(h, obj[column])
+        elif isinstance(obj, pd.Series):
+            h.update(repr(('series', obj.shape, str(obj.name))).encode())
+            _hash_values(h, obj)
+        elif isinstance(obj, np.ndarray):
+            h.update(repr(('array', obj.shape)).encode())
+            _hash_values(h, obj)
+        else:
+            h.update(repr(('value', obj)).encode())
+    return h.hexdigest()
+
+
+def _hash_values(h, values):
+    array = values.to_numpy() if isinstance(values, pd.Series) else np.asarray(values)
+    if array.dtype.kind in 'biufcmM':
+        h.update(array.dtype.str.encode())
+        h.update(np.ascontiguousarray(array).reshape(-1).view(np.uint8))
+    else:
+        h.update(pd.util.hash_array(array.astype(object).reshape(-1)).tobytes())
+
+
+def estimated_size(obj, limit=None):
+    """
+    Approximate pickled size in bytes of a model: its arrays, frames and text.
+
+    Objects are walked through their pickled state (`__getstate__`), so
+    e.g. the node arrays of scikit-learn trees are counted. With `limit`
+    set the walk stops as soon as the total exceeds it.
+    """
+    total = 0
+    seen = {}  # id -> object, holding each object so its id is not reused by a later temporary state
+    stack = [obj]
+    while stack and (limit is None or total <= limit):
+        item = stack.pop()
+        if id(item) in seen or item is None or isinstance(item, (bool, int, float, complex, type)):
+            continue
+        seen[id(item)] = item
+        if isinstance(item, np.ndarray):
+            total += item.nbytes if item.dtype != object else 0
+            if item.dtype == object:
+                stack.extend(item.reshape(-1))
+        elif isinstance(item, (pd.DataFrame, pd.Series, pd.Index)):
+            total += int(np.sum(item.memory_usage(deep=True)))
+        elif isinstance(item, (str, bytes, bytearray)):
+            total += len(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            try:
+                state = item.__getstate__()
+            except Exception:
+                state = getattr(item, '__dict__', None)
+            if state is not item:
+                stack.append(state)
+    return total
+
+
+class ModelCache:
+    """
+    Two-level cache of fitted models keyed by data fingerprint and hyperparameters.
+
+    Recent models stay in memory with LRU eviction; with `cache_dir` set every
+    model is also stored with joblib and the directory is trimmed to
+    `max_disk_bytes`, oldest first. A model whose estimated size is already
+    over `max_disk_bytes` is kept in memory only.
+
+    Parameters:
+    max_items (int): Number of models kept in memory.
+    cache_dir (str): Directory for the on-disk cache, or None for memory only.
+    max_disk_bytes (int): Size cap for the on-disk cache.
+    """
+
+    def __init__(self, max_items=8, cache_dir=None, max_disk_bytes=2 * 1024 ** 3):
+        self.max_items = max_items
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(method, data, params):
+        """Build a cache key from a method name, its data arguments and hyperparameters."""
+        params_text = json.dumps(params, sort_keys=True, default=repr)
+        return f"{method}-{fingerprint(*data, params_text)}"
+
+    def get(self, key):
+        """
+        Return (model, source) where source is 'memory', 'disk' or None on a miss.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key], 'memory'
+        path = self._disk_path(key)
+        if path is not None and path.exists():
+            import joblib
+            try:
+                model = joblib.load(path)
+            except Exception:
+                path.unlink(missing_ok=True)
+            else:
+                os.utime(path)  # Mark as recently used for disk eviction
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._remember(key, model)
+                return model, 'disk'
+        with self._lock:
+            self.misses += 1
+        return None, None
+
+    def put(self, key, model):
+        with self._lock:
+            self._remember(key, model)
+        path = self._disk_path(key)
+        # Writing a model the trim would delete again costs a full write for nothing
+        if path is not None and estimated_size(model, limit=self.max_disk_bytes) <= self.max_disk_bytes:
+            import joblib
+            # Unique per writer: two jobs may cache the same key at once
+            tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            joblib.dump(model, tmp_path)
+            os.replace(tmp_path, path)
+            self._trim_disk()
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._memory.clear()
+        if disk and self.cache_dir is not None:
+            for path in self.cache_dir.glob("*.joblib"):
+                path.unlink(missing_ok=True)
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'memory_items': len(self._memory),
+            'disk_bytes': sum(p.stat().st_size for p in self.cache_dir.glob("*.joblib")) if self.cache_dir else 0,
+        }
+
+    def format_stats(self):
+        stats = self.stats()
+        text = (
+            f"Model cache: {stats['hits']} hits ({stats['disk_hits']} from disk), "
+            f"{stats['misses']} misses, {stats['memory_items']} models in memory"
+        )
+        if self.cache_dir is not None:
+            text += f", {stats['disk_bytes'] / 1e6:.1f} MB on disk"
+        return text + "."
+
+    def _remember(self, key, model):
+        self._memory[key] = model
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key):
+        return self.cache_dir / f"{key}.joblib" if self.cache_dir is not None else None
+
+    def _trim_disk(self):
+        files = sorted(self.cache_dir.glob("*.joblib"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        while files and total > self.max_disk_bytes:
+            oldest = files.pop(0)
+            total -= oldest.stat().st_size
+            oldest.unlink(missing_ok=True)
+
+
+def cached_fit(data_args):
+    """
+    Decorator for ModelManager fit methods that consults `self.cache`.
+
+    Parameters:
+    data_args (tuple): Names of the arguments holding data (fingerprinted);
+        every other argument is treated as a hyperparameter.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            self.last_cache_hit = None
+            if self.cache is None:
+                return method(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop('self')
+            data = [arguments.pop(name) for name in data_args]
+            key = self.cache.make_key(method.__name__, data, arguments)
+
+            model, source = self.cache.get(key)
+            if model is not None:
+                self.model = model
+                self.last_cache_hit = source
+                return model
+            model = method(self, *args, **kwargs)
+            # Models cut short by a cancelled job are never cached
+            if self.monitor is None or not self.monitor.cancelled:
+                self.cache.put(key, model)
+            return model
+        wrapper.cached = True
+        return wrapper
+    return decorator
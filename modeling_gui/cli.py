@@ -0,0 +1,327 @@
+"""
+Headless batch runner for ModelManager fits.
+
+Usage:
+    modeling_gui_batch spec.json [--workers 8] [--output-dir results] [--no-resume] [--dry-run]
+
+The spec is a JSON file:
+
+    {
+      "output_dir": "results",
+      "workers": 4,
+      "load": {"compact": true},
+      "jobs": [
+        {"name": "ols", "files": ["data/*.csv"], "model": "ols", "x": ["a", "b"], "y": "c"},
+        {"name": "forest", "files": ["data/day1.csv"], "model": "random_forest",
+         "x": ["a", "b"], "y": "label", "params": {"n_estimators": 200}, "load": {"max_rows": 100000},
+         "plot": "png"}
+      ]
+    }
+
+Every (job, file) pair is one task. Relative paths are resolved against the
+spec's directory. Each task writes <output_dir>/<job>/<file stem>/ with
+summary.json, a coefficients/table CSV where the result has one, and
+model.joblib for fitted models, plus plot.png/plot.svg when the job sets
+"plot". Finished tasks are appended to
+<output_dir>/results.jsonl as they complete; a rerun skips tasks whose
+summary matches the current spec and input file.
+"""
+import argparse
+import glob
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from modeling_gui.models import ModelManager, preload_backends
+from modeling_gui.profiling import rss_mb
+from modeling_gui.utils.file_helper import load_csv
+
+# ModelManager fitting methods a job may name, called as method(X, Y, **params)
+BATCH_METHODS = (
+    'ols', 'wls', 'gls', 'rlm', 'recursive_ls', 'rolling_ls', 'random_forest', 'gradient_boost',
+    'gaussian_fitting', 'exponential_fitting', 'batch_curve_fit', 'hyperparameter_search',
+    'compare_models', 'bootstrap', 'kmeans_clustering', 'kmeans_sweep',
+)
+# Methods of BATCH_METHODS called as method(X, **params)
+_X_ONLY_METHODS = ('kmeans_clustering', 'kmeans_sweep')
+
+
+def load_spec(path):
+    """
+    Read a job spec and expand it into tasks, one per (job, file).
+
+    Returns:
+    tuple: (spec dict, list of task dicts)
+
+    Raises:
+    ValueError: If a job is missing required keys or names an unknown model.
+    """
+    path = Path(path)
+    spec = json.loads(path.read_text())
+    base = path.parent
+    tasks = []
+    for number, job in enumerate(spec.get('jobs', [])):
+        name = job.get('name') or f"job{number}"
+        missing = [key for key in ('files', 'model', 'x') if key not in job]
+        if missing:
+            raise ValueError(f"Job {name} is missing {', '.join(missing)}.")
+        if job['model'] not in BATCH_METHODS:
+            raise ValueError(f"Job {name}: unknown model {job['model']}; choose from {', '.join(BATCH_METHODS)}.")
+        if job['model'] not in _X_ONLY_METHODS and 'y' not in job:
+            raise ValueError(f"Job {name} is missing y.")
+        patterns = [job['files']] if isinstance(job['files'], str) else job['files']
+        files = sorted({f for pattern in patterns for f in glob.glob(str(base / pattern))})
+        if not files:
+            raise ValueError(f"Job {name}: no files match {', '.join(patterns)}.")
+        for file_path in files:
+            tasks.append({
+                'job': name,
+                'file': os.path.abspath(file_path),
+                'model': job['model'],
+                'x': [job['x']] if isinstance(job['x'], str) else list(job['x']),
+                'y': job.get('y'),
+                'params': job.get('params', {}),
+                'load': {**spec.get('load', {}), **job.get('load', {})},
+                'plot': job.get('plot'),
+            })
+    # Tasks from different jobs or same-stem files in different folders must not share a directory
+    seen = {}
+    for task in tasks:
+        stem = Path(task['file']).stem
+        key = (task['job'], stem)
+        seen[key] = seen.get(key, 0) + 1
+        task['id'] = f"{task['job']}/{stem}" if seen[key] == 1 else f"{task['job']}/{stem}-{seen[key]}"
+    return spec, tasks
+
+
+def task_hash(task):
+    """Hash of a task's definition and its input file's size and modification time."""
+    stat = os.stat(task['file'])
+    definition = {k: v for k, v in task.items() if k != 'id'}
+    text = json.dumps([definition, stat.st_size, stat.st_mtime_ns], sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def is_done(task, output_dir):
+    """True when the task's summary exists, succeeded and matches the current spec and file."""
+    summary_path = Path(output_dir) / task['id'] / 'summary.json'
+    try:
+        summary = json.loads(summary_path.read_text())
+    except (OSError, ValueError):
+        return False
+    return summary.get('status') == 'ok' and summary.get('hash') == task_hash(task)
+
+
+def summarize_result(result, X, Y):
+    """
+    Reduce a ModelManager result to JSON-safe statistics and an optional table.
+
+    Returns:
+    tuple: (dict of statistics, pd.DataFrame or None)
+    """
+    stats, table = {}, None
+    if isinstance(result, pd.DataFrame):
+        table = result
+        stats['rows'] = len(result)
+    elif hasattr(result, 'params') and hasattr(result, 'bse'):  # statsmodels-style results
+        names = [name for name in ('params', 'bse', 'tvalues', 'pvalues') if hasattr(result, name)]
+        if np.ndim(result.params) == 2:  # One column per target
+            table = pd.concat({name: getattr(result, name) for name in names}, axis=1)
+        else:
+            table = pd.DataFrame({name: getattr(result, name) for name in names})
+        for name in ('nobs', 'rsquared', 'rsquared_adj', 'aic', 'bic', 'fvalue', 'f_pvalue', 'llf'):
+            value = getattr(result, name, None)
+            if np.isscalar(value):
+                stats[name] = float(value)
+            elif isinstance(value, pd.Series):
+                stats[name] = {str(target): float(v) for target, v in value.items()}
+    elif isinstance(result, np.ndarray):  # curve fit parameters
+        stats['params'] = result.tolist()
+    elif hasattr(result, 'fit'):  # scikit-learn estimator
+        if hasattr(result, 'score') and Y is not None:
+            stats['train_score'] = float(result.score(X, Y))
+        if hasattr(result, 'inertia_'):
+            stats['inertia'] = float(result.inertia_)
+        if hasattr(result, 'feature_importances_'):
+            table = pd.DataFrame({'importance': result.feature_importances_}, index=list(X.columns))
+        elif hasattr(result, 'cluster_centers_'):
+            table = pd.DataFrame(result.cluster_centers_, columns=list(X.columns))
+    return stats, table
+
+
+def run_task(task, output_dir):
+    """
+    Load one file, run one ModelManager method and write its outputs.
+
+    Failures are recorded in the summary instead of raised.
+
+    Returns:
+    dict: The task summary, also written to summary.json.
+    """
+    task_dir = Path(output_dir) / task['id']
+    task_dir.mkdir(parents=True, exist_ok=True)
+    summary = {
+        'id': task['id'], 'job': task['job'], 'file': task['file'], 'model': task['model'],
+        'hash': task_hash(task), 'pid': os.getpid(),
+    }
+    start = time.perf_counter()
+    # Pool workers run many tasks, so their lifetime peak RSS says nothing about this one
+    summary['rss_before_mb'] = rss_mb()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        data = load_csv(task['file'], **task['load'])
+        summary['load_seconds'] = time.perf_counter() - start
+        summary['rows'] = len(data)
+        X = data[task['x']]
+        Y = data[task['y']] if task['y'] is not None else None
+        manager = ModelManager()
+        method = getattr(manager, task['model'])
+        params = dict(task['params'])
+        if task['model'] == 'random_forest':
+            params.setdefault('n_jobs', 1)  # Parallelism comes from the process pool
+        if task['model'] in _X_ONLY_METHODS:
+            result = method(X, **params)
+        else:
+            result = method(X, Y, **params)
+
+        stats, table = summarize_result(result, X, Y)
+        summary['stats'] = stats
+        if table is not None:
+            if isinstance(table.columns, pd.MultiIndex):
+                table.columns = [':'.join(str(level) for level in column) for column in table.columns]
+            table.to_csv(task_dir / 'table.csv')
+            summary['table'] = 'table.csv'
+        if task['plot']:
+            # Rendered with Agg into an off-screen figure; no display is needed
+            from modeling_gui.visualization import plot_result
+            plot_path = task_dir / f"plot.{task['plot']}"
+            if plot_result(task['model'], result, X, Y, path=plot_path) is not None:
+                summary['plot'] = plot_path.name
+        model = manager.model if manager.model is not None else result
+        if not isinstance(model, (pd.DataFrame, np.ndarray)):
+            import joblib
+            joblib.dump(model, task_dir / 'model.joblib')
+            summary['model_file'] = 'model.joblib'
+        summary['status'] = 'ok'
+    except Exception as e:
+        summary['status'] = 'failed'
+        summary['error'] = str(e)
+    summary['seconds'] = time.perf_counter() - start
+    summary['peak_mb'] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    if not tracing:
+        tracemalloc.stop()
+    summary['rss_after_mb'] = rss_mb()
+
+    tmp_path = task_dir / 'summary.json.tmp'
+    tmp_path.write_text(json.dumps(summary, indent=2, default=str))
+    os.replace(tmp_path, task_dir / 'summary.json')
+    return summary
+
+
+def _init_worker(plots):
+    """Import the backends (and matplotlib when tasks plot) before the first task traces its memory."""
+    preload_backends()
+    if plots:
+        importlib.import_module('modeling_gui.visualization')
+
+
+def run_batch(tasks, output_dir, workers=None, resume=True, on_summary=None):
+    """
+    Run tasks across a process pool, streaming summaries to results.jsonl.
+
+    Parameters:
+    tasks (list): Task dicts from `load_spec`.
+    output_dir (str): Root directory for the outputs.
+    workers (int): Worker processes; defaults to the number of CPUs.
+    resume (bool): Skip tasks already completed with the same definition.
+    on_summary (callable): Called with each summary as it completes.
+
+    Returns:
+    list: Summaries of the tasks that ran (skipped tasks are not included).
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pending = [task for task in tasks if not (resume and is_done(task, output_dir))]
+    summaries = []
+    if not pending:
+        return summaries
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    context = multiprocessing.get_context('spawn')
+    # Imports are done up front: traced, they are slow and would count towards the first task's peak
+    plots = any(task['plot'] for task in pending)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(plots,)) as executor, \
+            open(output_dir / 'results.jsonl', 'a') as log:
+        futures = [executor.submit(run_task, task, str(output_dir)) for task in pending]
+        for future in as_completed(futures):
+            summary = future.result()
+            log.write(json.dumps(summary, default=str) + '\n')
+            log.flush()
+            summaries.append(summary)
+            if on_summary is not None:
+                on_summary(summary)
+    return summaries
+
+
+def format_summary(summary):
+    text = f"[{summary['status']:>6}] {summary['id']}: {summary['seconds']:.2f} s, {summary['peak_mb']:.0f} MB peak"
+    if summary['status'] != 'ok':
+        text += f" - {summary['error']}"
+    return text
+
+
+def main(argv=None):
+    """
+    Entry point for the headless batch runner.
+    """
+    parser = argparse.ArgumentParser(
+        prog='modeling_gui_batch', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('spec', help="JSON job spec.")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: spec 'workers' or CPU count).")
+    parser.add_argument('--output-dir', help="Output directory (default: spec 'output_dir' or 'results').")
+    parser.add_argument('--no-resume', action='store_true', help="Rerun tasks that already completed.")
+    parser.add_argument('--dry-run', action='store_true', help="List the tasks without running them.")
+    args = parser.parse_args(argv)
+
+    try:
+        spec, tasks = load_spec(args.spec)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    output_dir = args.output_dir or str(Path(args.spec).parent / spec.get('output_dir', 'results'))
+    resume = not args.no_resume
+
+    if args.dry_run:
+        for task in tasks:
+            state = 'done' if resume and is_done(task, output_dir) else 'pending'
+            print(f"[{state:>7}] {task['id']}: {task['model']} on {task['file']}")
+        return 0
+
+    start = time.perf_counter()
+    summaries = run_batch(
+        tasks, output_dir, workers=args.workers or spec.get('workers'), resume=resume,
+        on_summary=lambda summary: print(format_summary(summary), flush=True),
+    )
+    failed = sum(summary['status'] != 'ok' for summary in summaries)
+    print(
+        f"{len(summaries) - failed} succeeded, {failed} failed, {len(tasks) - len(summaries)} skipped "
+        f"in {time.perf_counter() - start:.1f} s. Results in {output_dir}."
+    )
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
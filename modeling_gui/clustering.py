@@ -0,0 +1,206 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans, kmeans_plusplus
+from sklearn.metrics import pairwise_distances, silhouette_score
+
+MODES = ('full', 'minibatch')
+
+
+def compact_labels(labels, n_clusters):
+    """
+    Store cluster labels in the smallest unsigned integer type that holds them.
+
+    Returns:
+    np.ndarray: uint8 labels for up to 256 clusters, uint16 up to 65536, else uint32.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n_clusters <= np.iinfo(dtype).max + 1:
+            return np.asarray(labels).astype(dtype, copy=False)
+    return np.asarray(labels)
+
+
+def _as_array(X):
+    X = X.to_numpy() if isinstance(X, pd.DataFrame) else np.asarray(X)
+    return np.ascontiguousarray(X, dtype=X.dtype if X.dtype in (np.float32, np.float64) else np.float64)
+
+
+def _estimator(n_clusters, mode, batch_size, random_state, init='k-means++'):
+    if mode not in MODES:
+        raise ValueError(f"Invalid mode. Choose one of {', '.join(MODES)}.")
+    n_init = 1 if not isinstance(init, str) else 'auto'
+    if mode == 'minibatch':
+        return MiniBatchKMeans(n_clusters=n_clusters, init=init, n_init=n_init,
+                               batch_size=batch_size, random_state=random_state)
+    return KMeans(n_clusters=n_clusters, init=init, n_init=n_init, random_state=random_state)
+
+
+def fit_kmeans(X, n_clusters=3, mode='full', batch_size=4096, random_state=0, init='k-means++'):
+    """
+    Fit KMeans on in-memory data.
+
+    Parameters:
+    X (pd.DataFrame or np.ndarray): Points to cluster.
+    n_clusters (int): Number of clusters.
+    mode (str): 'full' (Lloyd iterations over all rows) or 'minibatch'
+        (updates from random batches of `batch_size` rows).
+    init (str or np.ndarray): Seeding method or initial centroids.
+
+    Returns:
+    KMeans or MiniBatchKMeans: Fitted estimator whose `labels_` are compact
+    (see `compact_labels`).
+    """
+    model = _estimator(n_clusters, mode, batch_size, random_state, init)
+    model.fit(_as_array(X))
+    model.labels_ = compact_labels(model.labels_, n_clusters)
+    return model
+
+
+def _reservoir_sample(chunks, columns, size, random_state=0):
+    """Uniform sample of `size` rows from a stream of chunks, in one pass."""
+    rng = np.random.default_rng(random_state)
+    sample = None
+    seen = 0
+    for chunk in chunks():
+        values = _as_array(chunk[columns])
+        if sample is None:
+            sample = np.empty((0, values.shape[1]), dtype=values.dtype)
+        take = max(0, min(size - len(sample), len(values)))
+        if take:
+            sample = np.vstack([sample, values[:take]])
+            seen += take
+            values = values[take:]
+        if len(values):
+            # The i-th row seen replaces a random slot with probability size / i
+            slots = (rng.random(len(values)) * (seen + np.arange(1, len(values) + 1))).astype(np.int64)
+            keep = slots < size
+            sample[slots[keep]] = values[keep]
+            seen += len(values)
+    return sample
+
+
+def fit_kmeans_streamed(chunks, columns, n_clusters=3, batch_size=4096, n_passes=1,
+                        init_size=None, random_state=0, monitor=None):
+    """
+    Fit mini-batch KMeans on data streamed in chunks.
+
+    A first pass draws a uniform sample of `init_size` rows for k-means++
+    seeding, so sorted or clustered files seed as well as shuffled ones. Each
+    later pass splits every chunk into batches of `batch_size` rows for
+    `partial_fit`; a final pass assigns labels and sums the inertia, so only
+    the centroids and one compact label per row are ever held in memory.
+
+    Parameters:
+    chunks (callable): Returns a fresh iterator of DataFrame chunks; called
+        `n_passes + 2` times.
+    columns (list): Feature column names.
+    init_size (int): Rows sampled for seeding; defaults to 3 * batch_size.
+    monitor (JobMonitor): Optional progress/cancellation hooks; progress is
+        reported per pass.
+
+    Returns:
+    MiniBatchKMeans: Fitted estimator with compact `labels_`, `inertia_` over
+    all rows and `n_rows_`.
+    """
+    n_steps = n_passes + 2
+    sample = _reservoir_sample(chunks, columns, init_size or 3 * batch_size, random_state)
+    if len(sample) < n_clusters:
+        raise ValueError(f"At least {n_clusters} rows are needed for {n_clusters} clusters.")
+    seeds, _ = kmeans_plusplus(sample, n_clusters, random_state=random_state)
+    # No reassignment of small clusters: batches from a sorted file would pull them onto one region
+    model = MiniBatchKMeans(n_clusters=n_clusters, init=seeds, n_init=1, batch_size=batch_size,
+                            reassignment_ratio=0, random_state=random_state)
+    if monitor is not None:
+        monitor.progress(1, n_steps)
+    for epoch in range(n_passes):
+        for chunk in chunks():
+            values = _as_array(chunk[columns])
+            for start in range(0, len(values), batch_size):
+                model.partial_fit(values[start:start + batch_size])
+            if monitor is not None and monitor.cancelled:
+                return None
+        if monitor is not None:
+            monitor.progress(epoch + 2, n_steps)
+
+    labels = []
+    inertia = 0.0
+    for chunk in chunks():
+        values = _as_array(chunk[columns])
+        labels.append(compact_labels(model.predict(values), n_clusters))
+        inertia -= model.score(values)
+        if monitor is not None and monitor.cancelled:
+            return None
+    model.labels_ = np.concatenate(labels)
+    model.inertia_ = inertia
+    model.n_rows_ = len(model.labels_)
+    if monitor is not None:
+        monitor.progress(n_steps, n_steps)
+    return model
+
+
+def kmeans_sweep(X, k_values, mode='full', batch_size=4096, sample_size=2000, n_workers=None,
+                 random_state=0, monitor=None):
+    """
+    Fit KMeans for several numbers of clusters in parallel and score each.
+
+    All fits share one k-means++ seeding: the centroids are seeded once for the
+    largest k (with squared row norms computed once) and each k starts from the
+    first k of them, which is itself a k-means++ seeding. Silhouette scores are
+    estimated on one random sample whose pairwise distances are computed once.
+
+    Parameters:
+    X (pd.DataFrame or np.ndarray): Points to cluster.
+    k_values (list): Numbers of clusters to try.
+    mode (str): 'full' or 'minibatch', as in `fit_kmeans`.
+    sample_size (int): Rows used for seeding in mini-batch mode and for the
+        silhouette estimate.
+    n_workers (int): Threads fitting different k at once.
+    monitor (JobMonitor): Optional progress/cancellation hooks.
+
+    Returns:
+    tuple: (curves, models) where curves is a DataFrame indexed by k with
+    'inertia', 'silhouette' and 'fit_seconds' (the elbow and silhouette curves)
+    and models maps k to its fitted estimator.
+    """
+    X = _as_array(X)
+    k_values = sorted(set(int(k) for k in k_values))
+    if k_values[0] < 2 or k_values[-1] > len(X):
+        raise ValueError("Each k must be at least 2 and at most the number of rows.")
+    rng = np.random.default_rng(random_state)
+    sample = X[np.sort(rng.choice(len(X), size=min(sample_size, len(X)), replace=False))]
+
+    seed_data = X if mode == 'full' else sample
+    norms = np.einsum('ij,ij->i', seed_data, seed_data)
+    seeds, _ = kmeans_plusplus(seed_data, k_values[-1], x_squared_norms=norms, random_state=random_state)
+    distances = pairwise_distances(sample)
+
+    def fit(k):
+        start = time.perf_counter()
+        model = fit_kmeans(X, k, mode=mode, batch_size=batch_size, random_state=random_state, init=seeds[:k])
+        elapsed = time.perf_counter() - start
+        sample_labels = model.predict(sample)
+        if len(np.unique(sample_labels)) > 1:
+            silhouette = silhouette_score(distances, sample_labels, metric='precomputed')
+        else:
+            silhouette = np.nan
+        return k, model, {'inertia': model.inertia_, 'silhouette': silhouette, 'fit_seconds': elapsed}
+
+    models, rows = {}, {}
+    n_workers = n_workers or min(len(k_values), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        futures = [executor.submit(fit, k) for k in k_values]
+        for done, future in enumerate(futures, start=1):
+            k, model, row = future.result()
+            models[k] = model
+            rows[k] = row
+            if monitor is not None:
+                monitor.progress(done, len(k_values))
+                if monitor.cancelled:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+    curves = pd.DataFrame.from_dict(rows, orient='index').rename_axis('k')
+    return curves, models
@@ -0,0 +1,237 @@
+"""
+Cross-validated comparison of several ModelManager methods on the same folds.
+
+The rows are partitioned once, and every method is scored on the same
+train/test splits, so differences between methods are not differences
+between splits. Each (method, fold) fit runs in a process pool. Workers map
+the design matrix read-only (see modeling_gui.design) instead of receiving
+a copy per task. Preprocessing is fitted on each fold's training rows only,
+so no statistic of the held-out rows reaches the model scored on them.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from .design import attach, share
+
+# ModelManager methods that can be compared, with their display names
+COMPARABLE_METHODS = {
+    'ols': "OLS",
+    'rlm': "RLM",
+    'random_forest': "Random Forest",
+    'gradient_boost': "Gradient Boosting",
+}
+REGRESSION_ONLY = ('ols', 'rlm')
+SPLITTERS = ('kfold', 'timeseries')
+# Slowest first, so long fits do not start last and leave the other workers idle
+_ORDER = ('gradient_boost', 'random_forest', 'rlm', 'ols')
+
+# Data shared with every worker process once, instead of once per task
+_worker_data = {}
+
+
+def make_folds(Y, cv=5, splitter='kfold', random_state=0):
+    """
+    Split row positions into (train, test) folds.
+
+    Parameters:
+    Y (array-like): Target; categorical targets get stratified k-fold.
+    cv (int): Number of folds.
+    splitter (str): 'kfold' (shuffled) or 'timeseries' (expanding window:
+        each fold trains on the rows before its test rows).
+    random_state (int): Seed for the shuffled k-fold.
+
+    Returns:
+    list: (train, test) arrays of row positions.
+    """
+    from sklearn.model_selection import KFold, StratifiedKFold, TimeSeriesSplit
+    if splitter not in SPLITTERS:
+        raise ValueError(f"Invalid splitter. Choose one of {', '.join(SPLITTERS)}.")
+    Y = np.asarray(Y)
+    placeholder = np.zeros((len(Y), 1))
+    if splitter == 'timeseries':
+        return list(TimeSeriesSplit(n_splits=cv).split(placeholder))
+    if Y.dtype.kind in 'if':
+        return list(KFold(n_splits=cv, shuffle=True, random_state=random_state).split(placeholder))
+    return list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state).split(placeholder, Y))
+
+
+def held_out_metrics(Y, predictions, is_regression):
+    """Metrics of predictions for held-out rows: r2/rmse/mae for regression, accuracy/f1_macro for classification."""
+    if is_regression:
+        Y = np.asarray(Y, dtype=np.float64)
+        predictions = np.asarray(predictions, dtype=np.float64).reshape(len(Y))
+        residuals = Y - predictions
+        total = np.sum((Y - Y.mean()) ** 2)
+        return {
+            'r2': 1.0 - np.sum(residuals ** 2) / total if total > 0 else np.nan,
+            'rmse': float(np.sqrt(np.mean(residuals ** 2))),
+            'mae': float(np.mean(np.abs(residuals))),
+        }
+    from sklearn.metrics import f1_score
+    return {
+        'accuracy': float(np.mean(np.asarray(predictions) == np.asarray(Y))),
+        'f1_macro': float(f1_score(Y, predictions, average='macro')),
+    }
+
+
+def _init_worker(X, Y, folds, preprocessor=None):
+    _worker_data['X'] = attach(X)
+    _worker_data['Y'] = attach(Y)
+    _worker_data['folds'] = folds
+    _worker_data['preprocessor'] = preprocessor
+
+
+def fold_features(X, train, test, preprocessor=None):
+    """
+    The training and test rows of X as arrays, preprocessed with statistics of the training rows only.
+
+    Parameters:
+    X (pd.DataFrame or np.ndarray): Features; a DataFrame when a
+        preprocessor is given.
+    train, test (np.ndarray): Row positions.
+    preprocessor (Preprocessor): Settings to fit on X[train], or None.
+
+    Returns:
+    tuple: (X_train, X_test) as np.ndarray.
+    """
+    if preprocessor is None:
+        return X[train], X[test]
+    fold_preprocessor = preprocessor.unfitted().fit(X.iloc[train])
+    return (fold_preprocessor.transform(X.iloc[train]).to_numpy(dtype=np.float64),
+            fold_preprocessor.transform(X.iloc[test]).to_numpy(dtype=np.float64))
+
+
+def _fit_fold(method, params, fold, is_regression):
+    """Fit one method on one fold's training rows and score its test rows."""
+    from .models import ModelManager
+    X, Y, folds = _worker_data['X'], _worker_data['Y'], _worker_data['folds']
+    train, test = folds[fold]
+    X_train, X_test = fold_features(X, train, test, _worker_data['preprocessor'])
+    manager = ModelManager()
+    start = time.perf_counter()
+    getattr(manager, method)(X_train, Y[train], **params)
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    predictions = np.asarray(manager.predict(X_test))
+    predict_seconds = time.perf_counter() - start
+    row = {'method': method, 'fold': fold, 'train_rows': len(train), 'test_rows': len(test),
+           'fit_seconds': fit_seconds, 'predict_seconds': predict_seconds}
+    row.update(held_out_metrics(Y[test], predictions, is_regression))
+    return row, predictions
+
+
+def compare_models(X, Y, methods, cv=5, splitter='kfold', params=None, n_workers=None, random_state=0,
+                   preprocessor=None, on_row=None, monitor=None):
+    """
+    Cross-validate several ModelManager methods on shared folds.
+
+    Parameters:
+    X (pd.DataFrame or np.ndarray): Features.
+    Y (pd.Series or np.ndarray): Target; numerical targets are regressed,
+        others classified (OLS and RLM are then reported as unavailable).
+    methods (list): Names from COMPARABLE_METHODS.
+    cv (int): Number of folds.
+    splitter (str): 'kfold' or 'timeseries' (see `make_folds`).
+    params (dict): Keyword arguments per method, e.g.
+        {'random_forest': {'n_estimators': 200}}.
+    n_workers (int): Worker processes; defaults to the number of CPUs.
+    random_state (int): Seed for the folds.
+    preprocessor (Preprocessor): Preprocessing settings, fitted afresh on
+        the training rows of every fold (see `Preprocessor.unfitted`).
+    on_row (callable): Called with each per-fold row as it completes.
+    monitor (JobMonitor): Optional progress/cancellation hooks.
+
+    Returns:
+    pd.DataFrame: One row per method with mean (and standard deviation
+    over folds) of the held-out metrics and the mean fit and predict
+    seconds, best first. `attrs['folds']` has the per-fold rows,
+    `attrs['predictions']` the held-out predictions of every method for
+    every tested row, and `attrs['metric']` the metric ranked by.
+    """
+    unknown = [method for method in methods if method not in COMPARABLE_METHODS]
+    if unknown:
+        raise ValueError(f"Cannot compare {', '.join(unknown)}; choose from {', '.join(COMPARABLE_METHODS)}.")
+    if not methods:
+        raise ValueError("Select at least one model to compare.")
+    params = params or {}
+    is_regression = Y.dtype.kind in 'if'
+    index = X.index if isinstance(X, pd.DataFrame) else pd.RangeIndex(len(X))
+    if preprocessor is None:
+        X = np.asarray(X)
+    elif not isinstance(X, pd.DataFrame):
+        X = pd.DataFrame(X)
+    Y = np.asarray(Y)
+    folds = make_folds(Y, cv=cv, splitter=splitter, random_state=random_state)
+
+    errors = {}
+    tasks = []
+    for method in sorted(dict.fromkeys(methods), key=_ORDER.index):
+        if method in REGRESSION_ONLY and not is_regression:
+            errors[method] = "needs a numerical target"
+            continue
+        method_params = dict(params.get(method, {}))
+        if method == 'random_forest':
+            method_params.setdefault('n_jobs', 1)  # Parallelism comes from the process pool
+        tasks.extend((method, method_params, fold) for fold in range(len(folds)))
+
+    predictions = pd.DataFrame(index=index, columns=[m for m in methods if m not in errors],
+                               dtype=np.float64 if is_regression else object)
+    rows = []
+    n_workers = min(n_workers or os.cpu_count() or 1, max(1, len(tasks)))
+    # Spawned workers avoid forking a process that runs Qt and worker threads
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=context,
+                             initializer=_init_worker, initargs=(share(X), share(Y), folds, preprocessor)) as executor:
+        futures = {executor.submit(_fit_fold, method, method_params, fold, is_regression): (method, fold)
+                   for method, method_params, fold in tasks}
+        while futures:
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                method, fold = futures.pop(future)
+                try:
+                    row, fold_predictions = future.result()
+                except Exception as e:
+                    # A failing method is reported in the table; the other methods still run
+                    errors.setdefault(method, str(e))
+                    continue
+                rows.append(row)
+                predictions.iloc[folds[fold][1], predictions.columns.get_loc(method)] = fold_predictions
+                if on_row is not None:
+                    on_row(row)
+            if monitor is not None:
+                monitor.progress(len(tasks) - len(futures), len(tasks))
+                if monitor.cancelled:
+                    for future in futures:
+                        future.cancel()
+                    break
+
+    return _summarize(rows, errors, methods, is_regression, predictions, splitter)
+
+
+def _summarize(rows, errors, methods, is_regression, predictions, splitter):
+    metric_names = ['r2', 'rmse', 'mae'] if is_regression else ['accuracy', 'f1_macro']
+    folds = pd.DataFrame(rows, columns=['method', 'fold', 'train_rows', 'test_rows', 'fit_seconds',
+                                        'predict_seconds'] + metric_names)
+    summary = []
+    for method in dict.fromkeys(methods):
+        method_rows = folds[folds['method'] == method]
+        row = {'method': method, 'model': COMPARABLE_METHODS[method], 'folds': len(method_rows)}
+        for name in metric_names:
+            row[name] = method_rows[name].mean() if len(method_rows) else np.nan
+        row[f"{metric_names[0]}_std"] = method_rows[metric_names[0]].std(ddof=0) if len(method_rows) else np.nan
+        row['fit_seconds'] = method_rows['fit_seconds'].mean() if len(method_rows) else np.nan
+        row['predict_seconds'] = method_rows['predict_seconds'].mean() if len(method_rows) else np.nan
+        row['error'] = errors.get(method, "")
+        summary.append(row)
+    table = pd.DataFrame(summary).sort_values(metric_names[0], ascending=False, na_position='last',
+                                              ignore_index=True)
+    table.attrs['folds'] = folds.sort_values(['method', 'fold'], ignore_index=True)
+    table.attrs['predictions'] = predictions
+    table.attrs['metric'] = metric_names[0]
+    table.attrs['splitter'] = splitter
+    return table
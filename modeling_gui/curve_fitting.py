@@ -0,0 +1,249 @@
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import OptimizeWarning, curve_fit
+
+
+def gaussian(x, a, x0, sigma):
+    return a * np.exp(-(x - x0) ** 2 / (2 * sigma ** 2))
+
+
+def gaussian_jacobian(x, a, x0, sigma):
+    g = np.exp(-(x - x0) ** 2 / (2 * sigma ** 2))
+    return np.column_stack([
+        g,
+        a * g * (x - x0) / sigma ** 2,
+        a * g * (x - x0) ** 2 / sigma ** 3,
+    ])
+
+
+def exponential(x, a, b, c):
+    return a * np.exp(b * x) + c
+
+
+def exponential_jacobian(x, a, b, c):
+    e = np.exp(b * x)
+    return np.column_stack([e, a * x * e, np.ones_like(x)])
+
+
+def gaussian_guess(x, Y):
+    """
+    Moment-based starting values for every column of Y at once.
+
+    Parameters:
+    x (np.ndarray): Abscissae, shape (n_points, n_series); NaN marks padding.
+    Y (np.ndarray): Ordinates, same shape.
+
+    Returns:
+    np.ndarray: (n_series, 3) array of (a, x0, sigma).
+    """
+    valid = np.isfinite(x) & np.isfinite(Y)
+    weights = np.where(valid, np.clip(Y, 0, None), 0.0)
+    total = weights.sum(axis=0)
+    peak = np.nanargmax(np.where(valid, Y, -np.inf), axis=0)
+    columns = np.arange(Y.shape[1])
+    a = Y[peak, columns]
+    xs = np.where(valid, x, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x0 = (weights * xs).sum(axis=0) / total
+        sigma = np.sqrt((weights * (xs - x0) ** 2).sum(axis=0) / total)
+    # Fall back to the peak position and a quarter of the range for non-positive data
+    span = np.where(valid, x, -np.inf).max(axis=0) - np.where(valid, x, np.inf).min(axis=0)
+    bad = ~np.isfinite(x0) | ~(sigma > 0)
+    x0 = np.where(bad, x[peak, columns], x0)
+    sigma = np.where(bad, span / 4, sigma)
+    return np.column_stack([a, x0, sigma])
+
+
+def _masked_lstsq2(u, v, t, valid):
+    """Per-column least squares of t on two regressors u and v, ignoring masked rows."""
+    u, v, t = (np.where(valid, a, 0.0) for a in (u, v, t))
+    suu, suv, svv = (u * u).sum(axis=0), (u * v).sum(axis=0), (v * v).sum(axis=0)
+    sut, svt = (u * t).sum(axis=0), (v * t).sum(axis=0)
+    det = suu * svv - suv ** 2
+    return (sut * svv - svt * suv) / det, (svt * suu - sut * suv) / det
+
+
+def exponential_guess(x, Y):
+    """
+    Regression starting values for every column of Y at once.
+
+    Since y' = b (y - c), y - y_0 is linear in the running integral of y and in
+    x - x_0; a least-squares fit of that line gives b and c without iterating,
+    and a second linear fit of y on exp(b x) gives a and refines c.
+
+    Returns:
+    np.ndarray: (n_series, 3) array of (a, b, c).
+    """
+    valid = np.isfinite(x) & np.isfinite(Y)
+    # Sort each series by x; padding goes last
+    order = np.argsort(np.where(valid, x, np.inf), axis=0)
+    x, Y, valid = (np.take_along_axis(a, order, axis=0) for a in (x, Y, valid))
+    x, Y = np.where(valid, x, 0.0), np.where(valid, Y, 0.0)
+    # Empty or degenerate series produce NaN guesses here and fail individually in the fit
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        steps = np.where(valid[1:] & valid[:-1], 0.5 * (Y[1:] + Y[:-1]) * np.diff(x, axis=0), 0.0)
+        integral = np.vstack([np.zeros((1, Y.shape[1])), np.cumsum(steps, axis=0)])
+        b, _ = _masked_lstsq2(integral, x - x[0], Y - Y[0], valid)
+        growth = np.exp(b * x)
+        a, c = _masked_lstsq2(growth, np.ones_like(x), Y, valid)
+    return np.column_stack([a, b, c])
+
+
+# name: (model, Jacobian, vectorized initial guess, parameter names)
+CURVES = {
+    'gaussian': (gaussian, gaussian_jacobian, gaussian_guess, ('a', 'x0', 'sigma')),
+    'exponential': (exponential, exponential_jacobian, exponential_guess, ('a', 'b', 'c')),
+}
+
+
+def _fit_block(kind, x, Y, p0, maxfev):
+    """
+    Fit the columns of one block; failures are recorded per series.
+
+    Returns:
+    list: One (params, covariance, rsquared, nobs, error) tuple per column.
+    """
+    function, jacobian, _, names = CURVES[kind]
+    k = len(names)
+    results = []
+    for j in range(Y.shape[1]):
+        valid = np.isfinite(x[:, j]) & np.isfinite(Y[:, j])
+        xj, yj = x[valid, j], Y[valid, j]
+        try:
+            if len(xj) < k:
+                raise ValueError(f"needs at least {k} points, got {len(xj)}")
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always', OptimizeWarning)
+                params, covariance = curve_fit(function, xj, yj, p0=p0[j], jac=jacobian, maxfev=maxfev)
+            residual = yj - function(xj, *params)
+            total = ((yj - yj.mean()) ** 2).sum()
+            rsquared = 1 - (residual ** 2).sum() / total if total > 0 else np.nan
+            # A fit whose covariance cannot be estimated keeps its parameters and notes why
+            note = '; '.join(str(w.message) for w in caught if issubclass(w.category, OptimizeWarning))
+            results.append((params, covariance, rsquared, len(xj), note))
+        except Exception as e:
+            results.append((np.full(k, np.nan), np.full((k, k), np.nan), np.nan, len(xj), str(e)))
+    return results
+
+
+def _as_matrices(x, Y):
+    if isinstance(Y, pd.Series):
+        Y = Y.to_frame()
+    elif not isinstance(Y, pd.DataFrame) and np.ndim(Y) == 1:
+        Y = np.asarray(Y)[:, None]
+    names = list(Y.columns) if isinstance(Y, pd.DataFrame) else list(range(np.shape(Y)[1]))
+    Y = np.asarray(Y, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 2 and x.shape[1] == 1:
+        x = x[:, 0]
+    if x.ndim == 1:
+        x = np.broadcast_to(x[:, None], Y.shape)
+    if x.shape != Y.shape:
+        raise ValueError(f"x has shape {x.shape} but Y has shape {Y.shape}.")
+    return x, Y, names
+
+
+def series_from_groups(data, x_column, y_column, by):
+    """
+    Reshape long data into one column per group for `batch_curve_fit`.
+
+    Groups of different lengths are padded with NaN, which the fit ignores.
+
+    Returns:
+    tuple: (x, Y) DataFrames with one column per group.
+    """
+    position = data.groupby(by, sort=True).cumcount()
+    keys = data[by]
+    x = data.pivot_table(index=position, columns=keys, values=x_column, aggfunc='first', dropna=False)
+    Y = data.pivot_table(index=position, columns=keys, values=y_column, aggfunc='first', dropna=False)
+    return x, Y
+
+
+def batch_curve_fit(x, Y, kind='gaussian', n_workers=None, block_size=256, parallel_threshold=4096,
+                    maxfev=2000, monitor=None):
+    """
+    Fit one curve per series, in parallel, from vectorized starting values.
+
+    Starting values for all series are computed at once (moments for
+    Gaussians, linear regressions for exponentials); each fit then uses the
+    analytic Jacobian. Blocks of `block_size` series are fitted in a process
+    pool. A series that cannot be fitted gets NaN parameters and its error
+    message instead of aborting the batch.
+
+    Parameters:
+    x (array-like): Shared abscissae of length n_points, or one column per series.
+    Y (pd.DataFrame or np.ndarray): Ordinates, one column per series; NaN
+        values are ignored, so series may differ in length.
+    kind (str): 'gaussian' or 'exponential'.
+    n_workers (int): Worker processes; 1 fits in the calling process.
+        Defaults to the number of CPUs, capped by the number of blocks.
+    parallel_threshold (int): With n_workers unset, batches with fewer series
+        are fitted in the calling process, where they finish before a pool
+        of fresh processes would have started.
+    monitor (JobMonitor): Optional progress/cancellation hooks.
+
+    Returns:
+    pd.DataFrame: One row per series with columns grouped under 'params',
+    'bse', 'cov' (each parameter pair) and 'stats' ('rsquared', 'nobs',
+    'error').
+    """
+    if kind not in CURVES:
+        raise ValueError(f"Invalid curve. Choose one of {', '.join(CURVES)}.")
+    names = CURVES[kind][3]
+    x, Y, series = _as_matrices(x, Y)
+    p0 = CURVES[kind][2](x, Y)
+
+    blocks = [slice(start, start + block_size) for start in range(0, Y.shape[1], block_size)]
+    if n_workers is None and Y.shape[1] < parallel_threshold:
+        n_workers = 1
+    n_workers = min(n_workers or os.cpu_count() or 1, len(blocks))
+    results = []
+    if n_workers <= 1:
+        for done, block in enumerate(blocks, start=1):
+            results.extend(_fit_block(kind, x[:, block], Y[:, block], p0[block], maxfev))
+            if monitor is not None:
+                monitor.progress(done, len(blocks))
+                if monitor.cancelled:
+                    break
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(_fit_block, kind, np.ascontiguousarray(x[:, block]), Y[:, block], p0[block], maxfev)
+                for block in blocks
+            ]
+            for done, future in enumerate(futures, start=1):
+                results.extend(future.result())
+                if monitor is not None:
+                    monitor.progress(done, len(blocks))
+                    if monitor.cancelled:
+                        for pending in futures:
+                            pending.cancel()
+                        break
+    series = series[:len(results)]
+
+    k = len(names)
+    params = np.array([r[0] for r in results]).reshape(-1, k)
+    covariance = np.array([r[1] for r in results]).reshape(-1, k, k)
+    with np.errstate(invalid='ignore'):
+        bse = np.sqrt(np.diagonal(covariance, axis1=1, axis2=2))
+    pairs = [(i, j) for i in range(k) for j in range(i + 1, k)]
+    index = pd.Index(series, name='series')
+    return pd.concat(
+        {
+            'params': pd.DataFrame(params, index=index, columns=names),
+            'bse': pd.DataFrame(bse, index=index, columns=names),
+            'cov': pd.DataFrame({f"{names[i]}:{names[j]}": covariance[:, i, j] for i, j in pairs}, index=index),
+            'stats': pd.DataFrame({
+                'rsquared': [r[2] for r in results],
+                'nobs': [r[3] for r in results],
+                'error': [r[4] for r in results],
+            }, index=index),
+        },
+        axis=1,
+    )
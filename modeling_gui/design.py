@@ -0,0 +1,227 @@
+"""
+Typed, contiguous design matrices built once per column selection.
+
+Model methods receive the selected columns as one C-contiguous float64 (or
+float32) matrix wrapped in a DataFrame without copying, so statsmodels,
+scikit-learn and the least-squares engines use the buffer as it is instead
+of converting it again. Matrices are cached per selection until the data
+changes. They are allocated in memory-mapped files on a RAM-backed
+filesystem where one is available, so worker processes attach to them by
+file name (see `share` and `attach`) instead of receiving a pickled copy.
+"""
+import errno
+import os
+import tempfile
+import uuid
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def shared_directory():
+    """Directory for shared arrays: /dev/shm where it exists (RAM-backed), the temporary directory otherwise."""
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return tempfile.gettempdir()
+
+
+def shared_empty(shape, dtype, directory=None):
+    """
+    Allocate an uninitialized array in a memory-mapped .npy file.
+
+    The file's space is reserved up front, so a full filesystem shows up
+    here as None instead of as a crash when the pages are first written.
+
+    Parameters:
+    shape (tuple): Array shape.
+    dtype (np.dtype): Element type.
+    directory (str): Where the file is created; defaults to `shared_directory()`.
+
+    Returns:
+    np.memmap or None: The writable array, or None when no space is left.
+    """
+    path = os.path.join(directory or shared_directory(), f"modeling_gui-{uuid.uuid4().hex}.npy")
+    try:
+        array = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+        if hasattr(os, 'posix_fallocate') and array.nbytes:
+            with open(path, 'r+b') as f:
+                os.posix_fallocate(f.fileno(), 0, os.path.getsize(path))
+    except OSError as e:
+        if os.path.exists(path):
+            os.remove(path)
+        if e.errno in (errno.ENOSPC, errno.EDQUOT, errno.EFBIG):
+            return None
+        raise
+    return array
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:  # Already gone, or still mapped on Windows
+        pass
+
+
+class SharedArray:
+    """
+    Picklable reference to an array stored in a memory-mapped file.
+
+    Workers rebuild the array with `attach`, mapping the same pages instead
+    of receiving the data.
+    """
+
+    def __init__(self, filename, offset, shape, dtype, strides):
+        self.filename = filename
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+        self.strides = strides
+
+    def attach(self):
+        raw = np.memmap(self.filename, dtype=np.uint8, mode='r')
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=raw, offset=self.offset, strides=self.strides)
+
+
+def share(values):
+    """
+    Return a cheap stand-in for `values` to send to worker processes.
+
+    Arrays backed by a writable or read-only file mapping (not copy-on-write,
+    whose changes the file does not see) become a `SharedArray`; anything
+    else is returned unchanged and is pickled as usual.
+    """
+    array = values.to_numpy() if isinstance(values, (pd.DataFrame, pd.Series)) else values
+    if not isinstance(array, np.ndarray):
+        return values
+    base = array
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base if isinstance(base.base, np.ndarray) else None
+    if base is None or base.mode not in ('r', 'r+', 'w+') or base.filename is None:
+        return values
+    start = array.__array_interface__['data'][0] - base.__array_interface__['data'][0]
+    return SharedArray(base.filename, base.offset + start, array.shape, array.dtype.str, array.strides)
+
+
+def attach(shared):
+    """Undo `share` in a worker process."""
+    return shared.attach() if isinstance(shared, SharedArray) else shared
+
+
+class DesignMatrix:
+    """
+    The selected columns of a table as one contiguous matrix plus the target.
+
+    Parameters:
+    values (np.ndarray): Regressors, shape (rows, columns), C-contiguous.
+    x_names (list): Column names of `values`.
+    target (pd.Series): The target column, or None.
+    index (pd.Index): Row labels shared by X and Y.
+    """
+
+    def __init__(self, values, x_names, target, index):
+        self.values = values
+        self.x_names = list(x_names)
+        self.target = target
+        self.index = index
+        self.nbytes = values.nbytes + (target.to_numpy().nbytes if target is not None else 0)
+        self.shared = isinstance(values, np.memmap)
+        if self.shared:
+            # The file goes away with the last reference to the matrix
+            self._finalizer = weakref.finalize(values, _remove, values.filename)
+
+    @property
+    def X(self):
+        """The regressors as a DataFrame over `values`, without a copy."""
+        return pd.DataFrame(self.values, index=self.index, columns=self.x_names, copy=False)
+
+    @property
+    def Y(self):
+        return self.target
+
+
+class DesignCache:
+    """
+    Design matrices of a table, one per column selection, dtype and constant.
+
+    Matrices are rebuilt only when the selection or the table changes; a
+    different table object clears the cache, and callers that modify a
+    table in place call `clear`. At most `max_entries` matrices are kept,
+    least recently used first out.
+
+    Parameters:
+    max_entries (int): Number of matrices kept.
+    shared (bool): Allocate matrices in shared memory-mapped files, falling
+        back to process memory when there is no space.
+    """
+
+    def __init__(self, max_entries=4, shared=True):
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._data = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, data, x_columns, y_column=None, dtype=np.float64, add_const=False):
+        """
+        Return the DesignMatrix for a selection of `data`, building it on first use.
+
+        Parameters:
+        data (pd.DataFrame): The table.
+        x_columns (list): Regressor columns; they must be numeric.
+        y_column (str): Target column. Integer and float targets are
+            converted to float64; others (class labels) are kept as they are.
+        dtype (np.dtype): np.float64, or np.float32 for models that convert to
+            float32 anyway (scikit-learn trees).
+        add_const (bool): Prepend a 'const' column of ones for statsmodels.
+
+        Raises:
+        ValueError: If a regressor column is not numeric.
+        """
+        if self._data is None or self._data() is not data:
+            self.clear()
+            self._data = weakref.ref(data)
+        key = (tuple(x_columns), y_column, np.dtype(dtype).str, add_const)
+        design = self._entries.get(key)
+        if design is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return design
+        self.misses += 1
+        design = self._build(data, list(x_columns), y_column, np.dtype(dtype), add_const)
+        self._entries[key] = design
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return design
+
+    def clear(self):
+        self._entries.clear()
+        self._data = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _build(self, data, x_columns, y_column, dtype, add_const):
+        for column in x_columns:
+            if data[column].dtype.kind not in 'biuf':
+                raise ValueError(f"Column {column} is not numeric.")
+        offset = int(add_const)
+        shape = (len(data), len(x_columns) + offset)
+        values = shared_empty(shape, dtype) if self.shared else None
+        if values is None:
+            values = np.empty(shape, dtype=dtype)
+        if add_const:
+            values[:, 0] = 1.0
+        # Filled column by column, so at most one converted column is held besides the matrix
+        for i, column in enumerate(x_columns, start=offset):
+            values[:, i] = data[column].to_numpy(dtype=dtype, na_value=np.nan)
+        target = None
+        if y_column is not None:
+            target = data[y_column]
+            if target.dtype.kind in 'if':  # Regression targets, as ModelManager decides
+                target = pd.Series(target.to_numpy(dtype=np.float64, na_value=np.nan), index=data.index,
+                                   name=y_column, copy=False)
+        names = (['const'] if add_const else []) + x_columns
+        return DesignMatrix(values, names, target, data.index)
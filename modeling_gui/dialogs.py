@@ -1,4 +1,10 @@
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QSpinBox, QDoubleSpinBox, QWidget
+import numpy as np
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QSpinBox, QDoubleSpinBox, QWidget, QCheckBox, QComboBox, QGridLayout, QTableView, QAbstractItemView, QFileDialog, QTreeWidget, QTreeWidgetItem
+from PyQt5.QtCore import Qt
+from modeling_gui.comparison import COMPARABLE_METHODS, REGRESSION_ONLY
+from modeling_gui.grouped import CURVE_KINDS, GROUPED_METHODS, REGRESSION_ONLY as GROUPED_REGRESSION_ONLY
+from modeling_gui.bootstrap import BOOTSTRAP_METHODS
+from modeling_gui.table_model import DataFrameModel
 
 class RandomForestDialog(QDialog):
     def __init__(self, parent=None):
@@ -46,6 +52,8 @@ class RandomForestDialog(QDialog):
         return self.max_depth_input.value()
 
 class GradientBoostDialog(QDialog):
+    BACKENDS = {"Classic": "classic", "Histogram (fast)": "histogram"}
+
     def __init__(self, parent=None):
         super(GradientBoostDialog, self).__init__(parent)
         self.setWindowTitle("Gradient Boost Parameters")
@@ -80,6 +88,24 @@ class GradientBoostDialog(QDialog):
         layout.addWidget(self.max_depth_label)
         layout.addWidget(self.max_depth_input)
 
+        # Backend
+        self.backend_label = QLabel("Backend:")
+        self.backend_input = QComboBox()
+        self.backend_input.addItems(list(self.BACKENDS))
+        layout.addWidget(self.backend_label)
+        layout.addWidget(self.backend_input)
+
+        # Early stopping on a validation split
+        self.early_stopping_input = QCheckBox("Early Stopping (10% validation split)")
+        layout.addWidget(self.early_stopping_input)
+
+        # Out-of-core training on the whole file (histogram backend only)
+        self.stream_input = QCheckBox("Stream Full File (histogram backend)")
+        self.stream_input.setEnabled(False)
+        self.backend_input.currentTextChanged.connect(
+            lambda text: self.stream_input.setEnabled(self.BACKENDS[text] == 'histogram'))
+        layout.addWidget(self.stream_input)
+
         # OK/Cancel Buttons
         buttons_layout = QHBoxLayout()
         self.ok_button = QPushButton("OK")
@@ -104,7 +130,21 @@ class GradientBoostDialog(QDialog):
     def max_depth(self):
         return self.max_depth_input.value()
 
+    @property
+    def backend(self):
+        return self.BACKENDS[self.backend_input.currentText()]
+
+    @property
+    def early_stopping(self):
+        return self.early_stopping_input.isChecked()
+
+    @property
+    def stream(self):
+        return self.stream_input.isEnabled() and self.stream_input.isChecked()
+
 class KMeansDialog(QDialog):
+    MODES = {"Full": "full", "Mini-batch": "minibatch"}
+
     def __init__(self, parent=None):
         super(KMeansDialog, self).__init__(parent)
         self.setWindowTitle("KMeans Parameters")
@@ -120,6 +160,38 @@ class KMeansDialog(QDialog):
         layout.addWidget(self.n_clusters_label)
         layout.addWidget(self.n_clusters_input)
 
+        # Mode
+        self.mode_label = QLabel("Mode:")
+        self.mode_input = QComboBox()
+        self.mode_input.addItems(list(self.MODES))
+        layout.addWidget(self.mode_label)
+        layout.addWidget(self.mode_input)
+
+        # Sweep over a range of k
+        self.sweep_input = QCheckBox("Sweep Number of Clusters (elbow/silhouette)")
+        layout.addWidget(self.sweep_input)
+        sweep_layout = QHBoxLayout()
+        self.k_min_input = QSpinBox()
+        self.k_min_input.setRange(2, 100)
+        self.k_min_input.setValue(2)
+        self.k_max_input = QSpinBox()
+        self.k_max_input.setRange(2, 100)
+        self.k_max_input.setValue(10)
+        sweep_layout.addWidget(QLabel("From k:"))
+        sweep_layout.addWidget(self.k_min_input)
+        sweep_layout.addWidget(QLabel("To k:"))
+        sweep_layout.addWidget(self.k_max_input)
+        layout.addLayout(sweep_layout)
+        for widget in (self.k_min_input, self.k_max_input):
+            widget.setEnabled(False)
+            self.sweep_input.toggled.connect(widget.setEnabled)
+        self.sweep_input.toggled.connect(self.n_clusters_input.setDisabled)
+
+        # Out-of-core training on the whole file
+        self.stream_input = QCheckBox("Stream Full File (mini-batch)")
+        layout.addWidget(self.stream_input)
+        self.sweep_input.toggled.connect(self.stream_input.setDisabled)
+
         # OK/Cancel Buttons
         buttons_layout = QHBoxLayout()
         self.ok_button = QPushButton("OK")
@@ -136,3 +208,659 @@ class KMeansDialog(QDialog):
     def n_clusters(self):
         return self.n_clusters_input.value()
 
+    @property
+    def mode(self):
+        return self.MODES[self.mode_input.currentText()]
+
+    @property
+    def k_values(self):
+        """The swept numbers of clusters, or None when not sweeping."""
+        if not self.sweep_input.isChecked():
+            return None
+        k_min, k_max = sorted((self.k_min_input.value(), self.k_max_input.value()))
+        return list(range(k_min, k_max + 1))
+
+    @property
+    def stream(self):
+        return self.stream_input.isEnabled() and self.stream_input.isChecked()
+
+class RollingLSDialog(QDialog):
+    def __init__(self, parent=None):
+        super(RollingLSDialog, self).__init__(parent)
+        self.setWindowTitle("Rolling Least Squares Parameters")
+
+        layout = QVBoxLayout()
+
+        # Window size
+        self.window_label = QLabel("Window Size:")
+        self.window_input = QSpinBox()
+        self.window_input.setMinimum(2)
+        self.window_input.setMaximum(10_000_000)
+        self.window_input.setValue(5)
+        layout.addWidget(self.window_label)
+        layout.addWidget(self.window_input)
+
+        # Expanding window
+        self.expanding_input = QCheckBox("Expanding Window")
+        self.expanding_input.toggled.connect(self.window_input.setDisabled)
+        layout.addWidget(self.expanding_input)
+
+        # OK/Cancel Buttons
+        buttons_layout = QHBoxLayout()
+        self.ok_button = QPushButton("OK")
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(self.ok_button)
+        buttons_layout.addWidget(self.cancel_button)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+
+    @property
+    def window(self):
+        return self.window_input.value()
+
+    @property
+    def expanding(self):
+        return self.expanding_input.isChecked()
+
+class OnlineLSDialog(QDialog):
+    def __init__(self, parent=None):
+        super(OnlineLSDialog, self).__init__(parent)
+        self.setWindowTitle("Online Recursive Least Squares Parameters")
+
+        layout = QVBoxLayout()
+
+        # Forgetting factor
+        self.forgetting_label = QLabel("Forgetting Factor (1 = keep all rows):")
+        self.forgetting_input = QDoubleSpinBox()
+        self.forgetting_input.setDecimals(4)
+        self.forgetting_input.setMinimum(0.9)
+        self.forgetting_input.setMaximum(1.0)
+        self.forgetting_input.setSingleStep(0.001)
+        self.forgetting_input.setValue(1.0)
+        layout.addWidget(self.forgetting_label)
+        layout.addWidget(self.forgetting_input)
+
+        # Polling interval
+        self.interval_label = QLabel("Check File for New Rows Every (seconds):")
+        self.interval_input = QSpinBox()
+        self.interval_input.setMinimum(1)
+        self.interval_input.setMaximum(3600)
+        self.interval_input.setValue(10)
+        layout.addWidget(self.interval_label)
+        layout.addWidget(self.interval_input)
+
+        # Persist the state between sessions
+        self.persist_input = QCheckBox("Save State and Resume in Later Sessions")
+        self.persist_input.setChecked(True)
+        layout.addWidget(self.persist_input)
+
+        # OK/Cancel Buttons
+        buttons_layout = QHBoxLayout()
+        self.ok_button = QPushButton("OK")
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(self.ok_button)
+        buttons_layout.addWidget(self.cancel_button)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+
+    @property
+    def forgetting(self):
+        return self.forgetting_input.value()
+
+    @property
+    def interval(self):
+        return self.interval_input.value()
+
+    @property
+    def persist(self):
+        return self.persist_input.isChecked()
+
+class PreprocessingDialog(QDialog):
+    """Choose the imputation, outlier clipping, scaling and encoding applied to model inputs."""
+
+    IMPUTERS = {"Mean": "mean", "Median": "median", "None": None}
+    SCALERS = {"Standard (Mean/Std)": "standard", "Min-Max": "minmax", "Robust (Median/IQR)": "robust", "None": None}
+    ENCODERS = {"One-Hot": "onehot", "Ordinal": "ordinal", "None": None}
+
+    def __init__(self, parent=None):
+        super(PreprocessingDialog, self).__init__(parent)
+        self.setWindowTitle("Preprocessing")
+
+        layout = QVBoxLayout()
+
+        # Apply to later fits, or switch preprocessing off
+        self.enabled_input = QCheckBox("Preprocess Model Inputs")
+        self.enabled_input.setChecked(True)
+        layout.addWidget(self.enabled_input)
+
+        # Missing values
+        self.impute_label = QLabel("Fill Missing Numeric Values With:")
+        self.impute_input = QComboBox()
+        self.impute_input.addItems(list(self.IMPUTERS))
+        layout.addWidget(self.impute_label)
+        layout.addWidget(self.impute_input)
+
+        # Outlier clipping quantiles
+        self.clip_input = QCheckBox("Clip Outliers to Quantiles")
+        layout.addWidget(self.clip_input)
+        clip_layout = QHBoxLayout()
+        self.clip_lower_input = QDoubleSpinBox()
+        self.clip_upper_input = QDoubleSpinBox()
+        for spin, value in [(self.clip_lower_input, 0.01), (self.clip_upper_input, 0.99)]:
+            spin.setDecimals(3)
+            spin.setMinimum(0.0)
+            spin.setMaximum(1.0)
+            spin.setSingleStep(0.005)
+            spin.setValue(value)
+            clip_layout.addWidget(spin)
+        layout.addLayout(clip_layout)
+
+        # Scaling
+        self.scale_label = QLabel("Scaling:")
+        self.scale_input = QComboBox()
+        self.scale_input.addItems(list(self.SCALERS))
+        layout.addWidget(self.scale_label)
+        layout.addWidget(self.scale_input)
+
+        # Categorical encoding
+        self.encode_label = QLabel("Categorical Encoding:")
+        self.encode_input = QComboBox()
+        self.encode_input.addItems(list(self.ENCODERS))
+        layout.addWidget(self.encode_label)
+        layout.addWidget(self.encode_input)
+
+        self.max_categories_label = QLabel("Categories Encoded per Column:")
+        self.max_categories_input = QSpinBox()
+        self.max_categories_input.setMinimum(1)
+        self.max_categories_input.setMaximum(1000)
+        self.max_categories_input.setValue(50)
+        layout.addWidget(self.max_categories_label)
+        layout.addWidget(self.max_categories_input)
+
+        # One indicator fewer than levels, so linear models stay full rank
+        self.drop_reference_input = QCheckBox("One-Hot: Leave Out the Most Frequent Category (Reference Level)")
+        self.drop_reference_input.setChecked(True)
+        layout.addWidget(self.drop_reference_input)
+
+        # OK/Cancel Buttons
+        buttons_layout = QHBoxLayout()
+        self.ok_button = QPushButton("OK")
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(self.ok_button)
+        buttons_layout.addWidget(self.cancel_button)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+
+    @property
+    def enabled(self):
+        return self.enabled_input.isChecked()
+
+    @property
+    def options(self):
+        """Keyword arguments for ModelManager.fit_preprocessor."""
+        clip = None
+        if self.clip_input.isChecked():
+            clip = (self.clip_lower_input.value(), self.clip_upper_input.value())
+        return {
+            'impute': self.IMPUTERS[self.impute_input.currentText()],
+            'scale': self.SCALERS[self.scale_input.currentText()],
+            'clip': clip,
+            'encode': self.ENCODERS[self.encode_input.currentText()],
+            'max_categories': self.max_categories_input.value(),
+            'drop_reference': self.drop_reference_input.isChecked(),
+        }
+
+class HyperparameterSearchDialog(QDialog):
+    """Collect parameter ranges and the search strategy for Random Forest or Gradient Boosting."""
+
+    STRATEGIES = {"Grid": "grid", "Random": "random", "Successive Halving": "halving"}
+
+    def __init__(self, method, parent=None):
+        super(HyperparameterSearchDialog, self).__init__(parent)
+        self.setWindowTitle("Hyperparameter Search")
+        self.method = method
+
+        layout = QVBoxLayout()
+
+        # Search strategy
+        self.strategy_label = QLabel("Strategy:")
+        self.strategy_input = QComboBox()
+        self.strategy_input.addItems(list(self.STRATEGIES))
+        layout.addWidget(self.strategy_label)
+        layout.addWidget(self.strategy_input)
+
+        # Parameter ranges: minimum, maximum and number of values
+        grid = QGridLayout()
+        for column, title in enumerate(["Parameter", "Min", "Max", "Values"]):
+            grid.addWidget(QLabel(title), 0, column)
+        self.n_estimators_range = self._add_range(grid, 1, "Number of Estimators", QSpinBox, 1, 1000, 50, 300, 3)
+        self.max_depth_range = self._add_range(grid, 2, "Max Depth", QSpinBox, 1, 100, 2, 8, 3)
+        self.learning_rate_range = None
+        if method == 'gradient_boost':
+            self.learning_rate_range = self._add_range(grid, 3, "Learning Rate", QDoubleSpinBox, 0.001, 1.0, 0.01, 0.3, 3)
+        layout.addLayout(grid)
+
+        # Number of random candidates
+        self.n_iter_label = QLabel("Random Candidates:")
+        self.n_iter_input = QSpinBox()
+        self.n_iter_input.setMinimum(1)
+        self.n_iter_input.setMaximum(1000)
+        self.n_iter_input.setValue(10)
+        layout.addWidget(self.n_iter_label)
+        layout.addWidget(self.n_iter_input)
+
+        # Cross-validation folds
+        self.cv_label = QLabel("Cross-Validation Folds:")
+        self.cv_input = QSpinBox()
+        self.cv_input.setMinimum(2)
+        self.cv_input.setMaximum(20)
+        self.cv_input.setValue(3)
+        layout.addWidget(self.cv_label)
+        layout.addWidget(self.cv_input)
+
+        # OK/Cancel Buttons
+        buttons_layout = QHBoxLayout()
+        self.ok_button = QPushButton("OK")
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(self.ok_button)
+        buttons_layout.addWidget(self.cancel_button)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+
+    @staticmethod
+    def _add_range(grid, row, title, spin_class, minimum, maximum, low, high, steps):
+        grid.addWidget(QLabel(title), row, 0)
+        inputs = []
+        for column, value in enumerate([low, high], start=1):
+            spin = spin_class()
+            spin.setMinimum(minimum)
+            spin.setMaximum(maximum)
+            if isinstance(spin, QDoubleSpinBox):
+                spin.setDecimals(3)
+                spin.setSingleStep(0.01)
+            spin.setValue(value)
+            grid.addWidget(spin, row, column)
+            inputs.append(spin)
+        count = QSpinBox()
+        count.setMinimum(1)
+        count.setMaximum(50)
+        count.setValue(steps)
+        grid.addWidget(count, row, 3)
+        inputs.append(count)
+        return inputs
+
+    @staticmethod
+    def _int_values(inputs):
+        low, high, count = (spin.value() for spin in inputs)
+        low, high = min(low, high), max(low, high)
+        return sorted({int(round(v)) for v in np.linspace(low, high, count)})
+
+    @property
+    def strategy(self):
+        return self.STRATEGIES[self.strategy_input.currentText()]
+
+    @property
+    def n_iter(self):
+        return self.n_iter_input.value()
+
+    @property
+    def cv(self):
+        return self.cv_input.value()
+
+    @property
+    def space(self):
+        space = {
+            'n_estimators': self._int_values(self.n_estimators_range),
+            'max_depth': self._int_values(self.max_depth_range),
+        }
+        if self.learning_rate_range is not None:
+            low, high, count = (spin.value() for spin in self.learning_rate_range)
+            # Learning rates are spread evenly on a log scale
+            space['learning_rate'] = sorted({round(float(v), 4) for v in np.geomspace(min(low, high), max(low, high), count)})
+        return space
+
+class CompareModelsDialog(QDialog):
+    """Choose the models and the cross-validation scheme for a model comparison."""
+
+    SPLITS = {"Shuffled K-Fold": "kfold", "Time Series (expanding window)": "timeseries"}
+
+    def __init__(self, is_regression=True, parent=None):
+        super(CompareModelsDialog, self).__init__(parent)
+        self.setWindowTitle("Compare Models")
+
+        layout = QVBoxLayout()
+
+        # One checkbox per comparable model; OLS and RLM need a numerical target
+        layout.addWidget(QLabel("Models:"))
+        self.method_checks = {}
+        for method, name in COMPARABLE_METHODS.items():
+            check = QCheckBox(name)
+            available = is_regression or method not in REGRESSION_ONLY
+            check.setEnabled(available)
+            check.setChecked(available)
+            layout.addWidget(check)
+            self.method_checks[method] = check
+
+        # Cross-validation folds
+        self.cv_label = QLabel("Cross-Validation Folds:")
+        self.cv_input = QSpinBox()
+        self.cv_input.setMinimum(2)
+        self.cv_input.setMaximum(20)
+        self.cv_input.setValue(5)
+        layout.addWidget(self.cv_label)
+        layout.addWidget(self.cv_input)
+
+        # How rows are split into folds
+        self.splitter_label = QLabel("Split:")
+        self.splitter_input = QComboBox()
+        self.splitter_input.addItems(list(self.SPLITS))
+        layout.addWidget(self.splitter_label)
+        layout.addWidget(self.splitter_input)
+
+        # OK/Cancel Buttons
+        buttons_layout = QHBoxLayout()
+        self.ok_button = QPushButton("OK")
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(self.ok_button)
+        buttons_layout.addWidget(self.cancel_button)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+
+    @property
+    def methods(self):
+        return [method for method, check in self.method_checks.items() if check.isEnabled() and check.isChecked()]
+
+    @property
+    def cv(self):
+        return self.cv_input.value()
+
+    @property
+    def splitter(self):
+        return self.SPLITS[self.splitter_input.currentText()]
+
+
+class GroupedFitDialog(QDialog):
+    """Choose the grouping column and the model fitted to each group."""
+
+    def __init__(self, columns, is_regression=True, n_x=1, parent=None):
+        super(GroupedFitDialog, self).__init__(parent)
+        self.setWindowTitle("Fit by Group")
+
+        layout = QVBoxLayout()
+
+        # Column whose values define the groups
+        self.group_label = QLabel("Group By:")
+        self.group_input = QComboBox()
+        self.group_input.addItems([str(c) for c in columns])
+        layout.addWidget(self.group_label)
+        layout.addWidget(self.group_input)
+
+        # Model fitted to each group; linear models and curves need a numerical target, curves a single X column
+        self.method_label = QLabel("Model:")
+        self.method_input = QComboBox()
+        for method, name in GROUPED_METHODS.items():
+            if (is_regression or method not in GROUPED_REGRESSION_ONLY) and (n_x == 1 or method not in CURVE_KINDS):
+                self.method_input.addItem(name, method)
+        layout.addWidget(self.method_label)
+        layout.addWidget(self.method_input)
+
+        # Smaller groups are skipped; 0 uses the fewest rows the model can be fitted on
+        self.min_rows_label = QLabel("Minimum Rows per Group (0 = automatic):")
+        self.min_rows_input = QSpinBox()
+        self.min_rows_input.setMinimum(0)
+        self.min_rows_input.setMaximum(1_000_000)
+        self.min_rows_input.setValue(0)
+        layout.addWidget(self.min_rows_label)
+        layout.addWidget(self.min_rows_input)
+
+        # OK/Cancel Buttons
+        buttons_layout = QHBoxLayout()
+        self.ok_button = QPushButton("OK")
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(self.ok_button)
+        buttons_layout.addWidget(self.cancel_button)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+
+    @property
+    def group_column(self):
+        return self.group_input.currentText()
+
+    @property
+    def method(self):
+        return self.method_input.currentData()
+
+    @property
+    def min_rows(self):
+        return self.min_rows_input.value() or None
+
+
+class BootstrapDialog(QDialog):
+    """Choose the model, the number of resamples and the interval for bootstrap confidence intervals."""
+
+    INTERVALS = {"Percentile": "percentile", "BCa (bias-corrected and accelerated)": "bca"}
+
+    def __init__(self, is_regression=True, n_x=1, parent=None):
+        super(BootstrapDialog, self).__init__(parent)
+        self.setWindowTitle("Bootstrap Intervals")
+
+        layout = QVBoxLayout()
+
+        # Model refitted on every resample; linear models and curves need a numerical target, curves a single X column
+        self.method_label = QLabel("Model:")
+        self.method_input = QComboBox()
+        for method, name in BOOTSTRAP_METHODS.items():
+            if (is_regression or method not in GROUPED_REGRESSION_ONLY + ('recursive_ls',)) \
+                    and (n_x == 1 or method not in CURVE_KINDS):
+                self.method_input.addItem(name, method)
+        layout.addWidget(self.method_label)
+        layout.addWidget(self.method_input)
+
+        # Most resamples; fewer are drawn once the intervals stop changing
+        self.resamples_label = QLabel("Resamples (at most):")
+        self.resamples_input = QSpinBox()
+        self.resamples_input.setMinimum(50)
+        self.resamples_input.setMaximum(100_000)
+        self.resamples_input.setSingleStep(100)
+        self.resamples_input.setValue(1000)
+        layout.addWidget(self.resamples_label)
+        layout.addWidget(self.resamples_input)
+
+        # Confidence level in percent
+        self.level_label = QLabel("Confidence Level (%):")
+        self.level_input = QDoubleSpinBox()
+        self.level_input.setRange(50.0, 99.9)
+        self.level_input.setValue(95.0)
+        layout.addWidget(self.level_label)
+        layout.addWidget(self.level_input)
+
+        self.interval_label = QLabel("Interval:")
+        self.interval_input = QComboBox()
+        self.interval_input.addItems(list(self.INTERVALS))
+        layout.addWidget(self.interval_label)
+        layout.addWidget(self.interval_input)
+
+        self.early_stop_checkbox = QCheckBox("Stop early once the intervals settle")
+        self.early_stop_checkbox.setChecked(True)
+        layout.addWidget(self.early_stop_checkbox)
+
+        # OK/Cancel Buttons
+        buttons_layout = QHBoxLayout()
+        self.ok_button = QPushButton("OK")
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(self.ok_button)
+        buttons_layout.addWidget(self.cancel_button)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+
+    @property
+    def method(self):
+        return self.method_input.currentData()
+
+    @property
+    def n_resamples(self):
+        return self.resamples_input.value()
+
+    @property
+    def alpha(self):
+        return 1 - self.level_input.value() / 100
+
+    @property
+    def interval(self):
+        return self.INTERVALS[self.interval_input.currentText()]
+
+    @property
+    def tol(self):
+        return 0.01 if self.early_stop_checkbox.isChecked() else 0.0
+
+
+class SavedModelsDialog(QDialog):
+    """Pick a saved model to reopen from a table of manifests, or browse for one elsewhere."""
+
+    def __init__(self, directory, parent=None):
+        super(SavedModelsDialog, self).__init__(parent)
+        self.setWindowTitle("Open Saved Model")
+        self.resize(900, 400)
+        self.selected_path = None
+        from modeling_gui.artifacts import list_models
+        self.models = list_models(directory)
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(f"Models saved in {directory}:"))
+
+        # One row per saved model, newest first
+        self.table_model = DataFrameModel(self.models.drop(columns=['path']))
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.doubleClicked.connect(lambda index: self.accept())
+        layout.addWidget(self.table)
+
+        # Open/Browse/Cancel Buttons
+        buttons_layout = QHBoxLayout()
+        self.ok_button = QPushButton("Open")
+        self.ok_button.clicked.connect(self.accept)
+        self.browse_button = QPushButton("Browse...")
+        self.browse_button.clicked.connect(self.browse)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(self.ok_button)
+        buttons_layout.addWidget(self.browse_button)
+        buttons_layout.addWidget(self.cancel_button)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+
+    def browse(self):
+        path = QFileDialog.getExistingDirectory(self, "Open Saved Model")
+        if path:
+            self.selected_path = path
+            super(SavedModelsDialog, self).accept()
+
+    def accept(self):
+        rows = self.table.selectionModel().selectedRows()
+        if rows:
+            self.selected_path = self.models['path'].iloc[self.table_model.row_positions()[rows[0].row()]]
+        if self.selected_path is not None:
+            super(SavedModelsDialog, self).accept()
+
+class TreeInspectorDialog(QDialog):
+    """Browse a tree ensemble: cached summary statistics, importances, and one tree expanded node by node."""
+
+    COLUMNS = ["Node", "Samples", "Impurity", "Value"]
+
+    def __init__(self, model, parent=None):
+        super(TreeInspectorDialog, self).__init__(parent)
+        self.setWindowTitle("Inspect Trees")
+        self.resize(800, 700)
+        from modeling_gui.inspection import summarize
+        self.model = model
+        self.summary = summarize(model)
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(self.summary.describe()))
+
+        # Impurity importances, split counts and root splits per feature
+        self.table_model = DataFrameModel(self.summary.table().reset_index(names='feature'))
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
+        layout.addWidget(self.table)
+
+        # Tree picker; nodes are read from the tree's arrays only when their parent is expanded
+        tree_layout = QHBoxLayout()
+        tree_layout.addWidget(QLabel("Tree:"))
+        self.tree_input = QSpinBox()
+        self.tree_input.setMinimum(1)
+        self.tree_input.setMaximum(self.summary.n_trees)
+        self.tree_input.valueChanged.connect(self.show_tree)
+        tree_layout.addWidget(self.tree_input)
+        tree_layout.addStretch()
+        layout.addLayout(tree_layout)
+        self.tree_widget = QTreeWidget()
+        self.tree_widget.setHeaderLabels(self.COLUMNS)
+        self.tree_widget.itemExpanded.connect(self.expand)
+        layout.addWidget(self.tree_widget)
+
+        # Close Button
+        self.close_button = QPushButton("Close")
+        self.close_button.clicked.connect(self.accept)
+        layout.addWidget(self.close_button)
+
+        self.setLayout(layout)
+        self.show_tree()
+
+    @property
+    def tree(self):
+        return self.tree_input.value() - 1
+
+    def show_tree(self):
+        from modeling_gui.inspection import tree_nodes
+        self.tree_widget.clear()
+        root = tree_nodes(self.model, tree=self.tree, node=0, max_depth=0).iloc[0]
+        item = self._item(root)
+        self.tree_widget.addTopLevelItem(item)
+        item.setExpanded(True)
+
+    def expand(self, item):
+        if item.data(0, Qt.UserRole + 1):  # Children already added
+            return
+        from modeling_gui.inspection import tree_nodes
+        item.takeChildren()  # The placeholder that made the item expandable
+        nodes = tree_nodes(self.model, tree=self.tree, node=item.data(0, Qt.UserRole), max_depth=1)
+        for side, (_, row) in zip(("<=", ">"), nodes.iloc[1:].iterrows()):
+            child = self._item(row)
+            child.setText(0, f"{side} {child.text(0)}")
+            item.addChild(child)
+        item.setData(0, Qt.UserRole + 1, True)
+
+    @staticmethod
+    def _item(row):
+        value = row['value'] if isinstance(row['value'], str) else f"{row['value']:.4g}"
+        label = "leaf" if row['is_leaf'] else f"{row['feature']} <= {row['threshold']:.4g}"
+        item = QTreeWidgetItem([f"#{row['node']} {label}", f"{row['samples']:,}", f"{row['impurity']:.4g}", value])
+        item.setData(0, Qt.UserRole, int(row['node']))
+        if not row['is_leaf']:
+            item.addChild(QTreeWidgetItem(["..."]))
+        return item
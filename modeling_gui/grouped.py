@@ -0,0 +1,394 @@
+"""
+One model per group of rows, e.g. per category, fitted in one call.
+
+The rows are partitioned once: a stable sort on the group codes puts every
+group in a contiguous block, so each group is a slice rather than a boolean
+filter over the whole table. Linear models are then solved for all groups
+at once from per-group cross-products with batched linear algebra. Curve
+fits go through `batch_curve_fit` with one padded series per group. Other
+methods fit blocks of groups in a process pool whose workers map the sorted
+rows read-only (see modeling_gui.design).
+
+Groups with too few rows are skipped, and a group whose fit fails is
+recorded with its error; neither stops the other groups.
+"""
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from .design import attach, share, shared_empty
+
+# ModelManager methods that can be fitted per group, with their display names
+GROUPED_METHODS = {
+    'ols': "OLS",
+    'rlm': "RLM",
+    'random_forest': "Random Forest",
+    'gradient_boost': "Gradient Boosting",
+    'gaussian_fitting': "Gaussian Fitting",
+    'exponential_fitting': "Exponential Fitting",
+}
+REGRESSION_ONLY = ('ols', 'rlm', 'gaussian_fitting', 'exponential_fitting')
+CURVE_KINDS = {'gaussian_fitting': 'gaussian', 'exponential_fitting': 'exponential'}
+
+# Data shared with every worker process once, instead of once per task
+_worker_data = {}
+
+
+def partition(groups, mask=None):
+    """
+    Sort rows by group once so that each group is a contiguous slice.
+
+    Parameters:
+    groups (array-like): Group key of every row; rows with a missing key are left out.
+    mask (np.ndarray): Optional boolean per row; rows where it is False are left out.
+
+    Returns:
+    tuple: (order, labels, starts): row positions in group order, the
+    sorted group labels, and the offsets of each group's first row in
+    `order` followed by the total, so group g is order[starts[g]:starts[g + 1]].
+    A group whose rows are all left out keeps its label and an empty slice.
+    """
+    codes, labels = pd.factorize(pd.Series(groups), sort=True)
+    valid = codes >= 0 if mask is None else (codes >= 0) & mask
+    codes = np.where(valid, codes, -1)
+    counts = np.bincount(codes[valid], minlength=len(labels))
+    order = np.argsort(codes, kind='stable')[len(codes) - counts.sum():]  # Left-out rows (-1) sort first
+    starts = np.concatenate([[0], np.cumsum(counts)])
+    return order, labels, starts
+
+
+def minimum_rows(method, n_x):
+    """The fewest rows a group needs for `method` with `n_x` regressors: one more than its parameters, 2 for ensembles."""
+    if method in ('ols', 'rlm'):
+        return n_x + 2
+    if method in CURVE_KINDS:
+        return 4
+    return 2
+
+
+def batched_least_squares(Z, starts, n_x, add_const=True):
+    """
+    OLS of the last column of Z on the others, separately for every group of rows.
+
+    Per-group means and centred cross-products are summed with
+    `np.add.reduceat` over the group slices, and the normal equations of
+    all groups are solved together from one batched eigendecomposition, so
+    thousands of small regressions cost a few passes over the rows.
+    Collinear regressors get the slopes of smallest norm, in units of each
+    regressor's spread, and the intercept takes up the rest: a regressor
+    that is constant within a group gets a slope of 0. The fitted values
+    match statsmodels, but its pinv solution spreads the collinear part
+    over the intercept too, so the coefficients differ.
+
+    Parameters:
+    Z (np.ndarray): Rows [X, y] sorted by group, shape (rows, n_x + 1),
+        without missing values.
+    starts (np.ndarray): Offset of each group's first row, followed by the
+        number of rows; every group must have at least one row.
+    n_x (int): Number of regressor columns.
+    add_const (bool): Include an intercept.
+
+    Returns:
+    dict: 'params' and 'bse' of shape (groups, parameters), 'rsquared',
+    'nobs' and 'rank' of shape (groups,).
+    """
+    Z = np.asarray(Z, dtype=np.float64)
+    counts = np.diff(starts)
+    first = starts[:-1]
+    means = np.add.reduceat(Z, first, axis=0) / counts[:, None]
+    centred = Z - np.repeat(means, counts, axis=0)
+    q = n_x + 1
+    S = np.empty((len(counts), q, q))
+    for i in range(q):
+        for j in range(i, q):
+            S[:, i, j] = S[:, j, i] = np.add.reduceat(centred[:, i] * centred[:, j], first)
+    if not add_const:
+        S += counts[:, None, None] * means[:, :, None] * means[:, None, :]
+    Sxx, Sxy, Syy = S[:, :n_x, :n_x], S[:, :n_x, n_x], S[:, n_x, n_x]
+
+    # Scale each X'X to unit diagonal; constant columns keep a scale of 1
+    scale = np.sqrt(np.diagonal(Sxx, axis1=1, axis2=2)).copy()
+    scale[scale == 0] = 1.0
+    scaled = Sxx / (scale[:, :, None] * scale[:, None, :])
+    w, V = np.linalg.eigh(scaled)
+    tolerance = w.max(axis=1, keepdims=True) * n_x * np.finfo(np.float64).eps
+    kept = w > tolerance
+    with np.errstate(divide='ignore'):
+        inverse_w = np.where(kept, 1.0 / w, 0.0)
+    inverse = (V * inverse_w[:, None, :]) @ V.transpose(0, 2, 1)
+    inverse /= scale[:, :, None] * scale[:, None, :]
+    slopes = np.einsum('gij,gj->gi', inverse, Sxy)
+
+    ssr = np.maximum(Syy - np.einsum('gi,gi->g', slopes, Sxy), 0.0)
+    rank = kept.sum(axis=1) + int(add_const)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma2 = ssr / (counts - rank)
+        rsquared = 1 - ssr / Syy
+    if add_const:
+        x_mean = means[:, :n_x]
+        intercept = means[:, n_x] - np.einsum('gi,gi->g', x_mean, slopes)
+        params = np.column_stack([intercept, slopes])
+        variance = np.column_stack([
+            1 / counts + np.einsum('gi,gij,gj->g', x_mean, inverse, x_mean),
+            np.diagonal(inverse, axis1=1, axis2=2),
+        ])
+    else:
+        params = slopes
+        variance = np.diagonal(inverse, axis1=1, axis2=2)
+    with np.errstate(invalid='ignore'):
+        bse = np.sqrt(variance * sigma2[:, None])
+    return {'params': params, 'bse': bse, 'rsquared': rsquared, 'nobs': counts, 'rank': rank}
+
+
+def _score(Y, predictions, is_regression):
+    if not is_regression:
+        return float(np.mean(np.asarray(predictions) == Y))
+    residual = Y - np.asarray(predictions, dtype=np.float64).reshape(len(Y))
+    total = np.sum((Y - Y.mean()) ** 2)
+    return 1 - np.sum(residual ** 2) / total if total > 0 else np.nan
+
+
+def _init_worker(X, Y, starts, x_names):
+    _worker_data['X'] = attach(X)
+    _worker_data['Y'] = attach(Y)
+    _worker_data['starts'] = starts
+    _worker_data['x_names'] = x_names
+
+
+def _fit_groups(method, params, groups, is_regression):
+    """
+    Fit `method` to each of the given groups of the sorted rows.
+
+    Returns:
+    list: (group, terms, estimates, std_errors, score, message) per group;
+    a failed fit has None for terms and its error message as the message.
+    """
+    from .models import ModelManager
+    X, Y, starts, x_names = (_worker_data[key] for key in ('X', 'Y', 'starts', 'x_names'))
+    results = []
+    for group in groups:
+        rows = slice(starts[group], starts[group + 1])
+        x, y = X[rows], Y[rows]
+        try:
+            manager = ModelManager()
+            note = ""
+            if method == 'rlm':
+                # A leading 'const' column is kept as is, so a regressor constant within the group cannot replace it
+                terms = ['const'] + x_names
+                x = pd.DataFrame(np.column_stack([np.ones(len(x)), x]), columns=terms)
+                if np.linalg.matrix_rank(x.to_numpy()) < len(terms):
+                    note = "collinear regressors; minimum-norm solution"
+            with warnings.catch_warnings():
+                if note:
+                    warnings.simplefilter('ignore')  # Reported in the group's message instead
+                model = getattr(manager, method)(x, y, **params)
+            if method == 'rlm':
+                estimates, errors = np.asarray(model.params), np.asarray(model.bse)
+            else:
+                terms = x_names
+                estimates, errors = model.feature_importances_, np.full(len(x_names), np.nan)
+            if len(estimates) != len(terms):
+                raise ValueError(f"{len(estimates)} estimates for {len(terms)} terms")
+            results.append((group, terms, estimates, errors, _score(y, manager.predict(x), is_regression), note))
+        except Exception as e:
+            results.append((group, None, None, None, np.nan, str(e)))
+    return results
+
+
+def _sorted_copy(values, order):
+    """values[order], in a shared memory-mapped file when there is room, so workers map it instead of receiving a copy."""
+    sorted_values = shared_empty((len(order),) + values.shape[1:], values.dtype) if values.dtype != object else None
+    if sorted_values is None:
+        return values[order]
+    np.take(values, order, axis=0, out=sorted_values)
+    return sorted_values
+
+
+def _release(*arrays):
+    for array in arrays:
+        if isinstance(array, np.memmap) and array.filename is not None:
+            try:
+                os.remove(array.filename)
+            except OSError:
+                pass
+
+
+def grouped_fit(X, Y, groups, method='ols', params=None, min_rows=None, n_workers=None, monitor=None):
+    """
+    Fit one model per group of rows and collect their parameters in one table.
+
+    Parameters:
+    X (pd.DataFrame or np.ndarray): Features, numeric.
+    Y (pd.Series or np.ndarray): Target; class labels only for the ensembles.
+    groups (array-like): Group key of every row, e.g. a category column.
+    method (str): A name from GROUPED_METHODS. 'ols' is solved for all
+        groups at once; the curve fits need a single X column.
+    params (dict): Keyword arguments for the method, e.g. {'n_estimators': 50}.
+    min_rows (int): Groups with fewer complete rows are skipped; defaults
+        to `minimum_rows(method, ...)`.
+    n_workers (int): Worker processes for RLM, the ensembles and the curve
+        fits; 1 fits in the calling process. Defaults to the number of CPUs.
+    monitor (JobMonitor): Optional progress/cancellation hooks.
+
+    Returns:
+    pd.DataFrame: Tidy parameters, one row per group and term, with columns
+    'group', 'term', 'estimate' and 'std_error'. Linear models and curves
+    report coefficients; ensembles report feature importances (without a
+    standard error). `attrs['groups']` has one row per group with its
+    'rows', 'status' ('fitted', 'skipped' or 'failed'), the fit's
+    `attrs['metric']` (training R-squared, or accuracy for class labels)
+    and a 'message' saying why a group was skipped or failed.
+
+    Raises:
+    ValueError: For an unknown method, or one that cannot fit this target.
+    """
+    if method not in GROUPED_METHODS:
+        raise ValueError(f"Invalid method. Choose one of {', '.join(GROUPED_METHODS)}.")
+    params = dict(params or {})
+    if isinstance(X, pd.Series):
+        X = X.to_frame()
+    x_names = [str(c) for c in X.columns] if isinstance(X, pd.DataFrame) else None
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X[:, None]
+    x_names = x_names or [f"x{i + 1}" for i in range(X.shape[1])]
+    Y = np.asarray(Y)
+    is_regression = Y.dtype.kind in 'biuf'
+    if is_regression:
+        Y = Y.astype(np.float64, copy=False)
+    elif method in REGRESSION_ONLY:
+        raise ValueError(f"{GROUPED_METHODS[method]} needs a numerical target.")
+    if method in CURVE_KINDS and X.shape[1] != 1:
+        raise ValueError(f"{GROUPED_METHODS[method]} needs a single X column.")
+    groups = np.asarray(groups)
+    if not len(X) == len(Y) == len(groups):
+        raise ValueError("X, Y and the groups must have the same number of rows.")
+
+    # Incomplete rows are dropped before partitioning, so group sizes count only rows that are fitted
+    complete = np.isfinite(X).all(axis=1) & (np.isfinite(Y) if is_regression else pd.notna(Y))
+    order, labels, starts = partition(groups, mask=complete)
+    counts = np.diff(starts)
+    min_rows = minimum_rows(method, X.shape[1]) if min_rows is None else max(int(min_rows), 1)
+    eligible = np.flatnonzero(counts >= min_rows)
+
+    status = np.where(counts >= min_rows, 'fitted', 'skipped').astype(object)
+    messages = np.full(len(labels), "", dtype=object)
+    for g in np.flatnonzero(counts < min_rows):
+        messages[g] = f"{counts[g]} complete rows; at least {min_rows} are needed"
+    scores = np.full(len(labels), np.nan)
+    fitted = []  # (group, terms, estimates, std_errors)
+
+    if method == 'ols':
+        keep = np.repeat(counts >= min_rows, counts)
+        Z = np.column_stack([X[order], Y[order]])[keep]
+        if len(eligible):
+            result = batched_least_squares(Z, np.concatenate([[0], np.cumsum(counts[eligible])]), X.shape[1])
+            terms = ['const'] + x_names
+            for position, g in enumerate(eligible):
+                fitted.append((g, terms, result['params'][position], result['bse'][position]))
+                if result['rank'][position] < len(terms):
+                    messages[g] = "collinear regressors; smallest slopes, the intercept takes the rest"
+            scores[eligible] = result['rsquared']
+        if monitor is not None:
+            monitor.progress(1, 1)
+    elif method in CURVE_KINDS:
+        from .curve_fitting import CURVES, batch_curve_fit
+        keep = np.repeat(counts >= min_rows, counts)
+        x_sorted, y_sorted = X[order, 0][keep], Y[order][keep]
+        lengths = counts[eligible]
+        columns = np.repeat(np.arange(len(eligible)), lengths)
+        positions = np.arange(len(columns)) - np.repeat(np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        x_padded = np.full((lengths.max() if len(lengths) else 0, len(eligible)), np.nan)
+        y_padded = x_padded.copy()
+        x_padded[positions, columns] = x_sorted
+        y_padded[positions, columns] = y_sorted
+        table = batch_curve_fit(x_padded, y_padded, kind=CURVE_KINDS[method], n_workers=n_workers,
+                                monitor=monitor, **params) if len(eligible) else None
+        names = list(CURVES[CURVE_KINDS[method]][3])
+        for position in range(0 if table is None else len(table)):
+            g = eligible[position]
+            error = table['stats', 'error'].iloc[position]
+            estimates = table['params'].iloc[position].to_numpy()
+            if np.isnan(estimates).any():
+                status[g], messages[g] = 'failed', error
+                continue
+            fitted.append((g, names, estimates, table['bse'].iloc[position].to_numpy()))
+            scores[g] = table['stats', 'rsquared'].iloc[position]
+            messages[g] = error
+    else:
+        if method == 'random_forest':
+            params.setdefault('n_jobs', 1)  # Parallelism comes from the process pool
+        X_sorted, Y_sorted = _sorted_copy(X, order), _sorted_copy(Y, order)
+        # Largest groups first, in blocks small enough to keep every worker busy until the end
+        by_size = eligible[np.argsort(-counts[eligible], kind='stable')]
+        n_workers = min(n_workers or os.cpu_count() or 1, max(1, len(by_size)))
+        n_blocks = min(len(by_size), 4 * n_workers)
+        blocks = [block for block in np.array_split(by_size, max(n_blocks, 1)) if len(block)]
+        try:
+            for results in _run_blocks(method, params, blocks, is_regression, n_workers,
+                                       (X_sorted, Y_sorted, starts, x_names), monitor):
+                for g, terms, estimates, errors, score, message in results:
+                    if terms is None:
+                        status[g], messages[g] = 'failed', message
+                    else:
+                        fitted.append((g, terms, estimates, errors))
+                        scores[g], messages[g] = score, message
+        finally:
+            _release(X_sorted, Y_sorted)
+        done = {g for g, *_ in fitted} | set(np.flatnonzero(status == 'failed'))
+        for g in eligible:
+            if g not in done:  # Cancelled before its block ran
+                status[g], messages[g] = 'skipped', "cancelled"
+
+    fitted.sort(key=lambda item: item[0])
+    table = pd.DataFrame({
+        'group': np.repeat(labels[[g for g, *_ in fitted]] if fitted else labels[:0],
+                           [len(terms) for _, terms, *_ in fitted]),
+        'term': [term for _, terms, *_ in fitted for term in terms],
+        'estimate': np.concatenate([estimates for _, _, estimates, _ in fitted]) if fitted else [],
+        'std_error': np.concatenate([errors for *_, errors in fitted]) if fitted else [],
+    })
+    metric = 'rsquared' if is_regression else 'accuracy'
+    table.attrs['groups'] = pd.DataFrame({
+        'group': labels, 'rows': counts, 'status': status, metric: scores, 'message': messages,
+    })
+    table.attrs['method'] = method
+    table.attrs['metric'] = metric
+    return table
+
+
+def _run_blocks(method, params, blocks, is_regression, n_workers, data, monitor):
+    """Yield the results of `_fit_groups` for each block of groups, in a process pool when n_workers > 1."""
+    if n_workers <= 1:
+        _init_worker(*data)
+        try:
+            for done, block in enumerate(blocks, start=1):
+                yield _fit_groups(method, params, block, is_regression)
+                if monitor is not None:
+                    monitor.progress(done, len(blocks))
+                    if monitor.cancelled:
+                        return
+        finally:
+            _worker_data.clear()
+        return
+    X, Y, starts, x_names = data
+    # Spawned workers avoid forking a process that runs Qt and worker threads
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=context, initializer=_init_worker,
+                             initargs=(share(X), share(Y), starts, x_names)) as executor:
+        futures = [executor.submit(_fit_groups, method, params, block, is_regression) for block in blocks]
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
+            if monitor is not None:
+                monitor.progress(len(futures) - len(pending), len(futures))
+                if monitor.cancelled:
+                    for future in pending:
+                        future.cancel()
+                    return
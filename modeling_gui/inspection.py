@@ -0,0 +1,359 @@
+"""
+Structure, statistics and feature importances of fitted tree ensembles.
+
+Everything is read from the trees' `tree_` arrays (children, split feature,
+threshold, impurity, sample counts) with vectorized numpy, never by drawing
+or walking the trees in Python. `summarize` computes the ensemble-wide
+aggregates once per fitted model and caches them. `tree_nodes` returns one
+tree's nodes below any node down to a few levels, so views can show the
+top of a deep tree and expand it on demand. `permutation_importance` scores
+shuffled copies of each column in a process pool.
+"""
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from .design import attach, share
+
+# Data shared with every worker process once, instead of once per task
+_worker_data = {}
+
+_summaries = weakref.WeakKeyDictionary()
+_summaries_lock = threading.Lock()
+
+
+def _unwrap(model):
+    """The model itself, without a PreprocessedModel around it."""
+    from .utils.data_preprocessing import PreprocessedModel
+    return model.model if isinstance(model, PreprocessedModel) else model
+
+
+def estimator_trees(model):
+    """
+    The fitted decision trees of a model, in order.
+
+    Parameters:
+    model: A fitted random forest, extra-trees or (classic) gradient
+        boosting model, or a single decision tree.
+
+    Returns:
+    list: The trees' estimators (each with a `tree_`).
+
+    Raises:
+    ValueError: If the model has no tree_ arrays, e.g. histogram boosting
+        or a forest saved as a CompactForest.
+    """
+    model = _unwrap(model)
+    if hasattr(model, 'tree_'):
+        return [model]
+    estimators = getattr(model, 'estimators_', None)
+    if estimators is not None:
+        estimators = list(np.ravel(np.asarray(estimators, dtype=object)))
+    if not estimators or not all(hasattr(estimator, 'tree_') for estimator in estimators):
+        raise ValueError(f"{type(model).__name__} has no decision trees to inspect.")
+    return estimators
+
+
+def feature_names(model):
+    """Names of the columns the trees split on; x0, x1... for models fitted on arrays."""
+    model = _unwrap(model)
+    names = getattr(model, 'feature_names_in_', None)
+    if names is not None:
+        return [str(name) for name in names]
+    return [f"x{i}" for i in range(model.n_features_in_)]
+
+
+def node_depths(tree):
+    """Depth of every node of a sklearn `Tree`, filled one level at a time."""
+    depths = np.zeros(tree.node_count, dtype=np.int64)
+    left, right = tree.children_left, tree.children_right
+    level = np.array([0])
+    depth = 0
+    while level.size:
+        depths[level] = depth
+        children = np.concatenate([left[level], right[level]])
+        level = children[children >= 0]
+        depth += 1
+    return depths
+
+
+def impurity_decrease(tree, n_features):
+    """
+    Weighted impurity decrease of every feature in one tree, normalized to sum to 1.
+
+    The same quantity as the tree's `feature_importances_`, computed from
+    the node arrays in one vectorized pass.
+    """
+    left, right = tree.children_left, tree.children_right
+    split = np.flatnonzero(left >= 0)
+    weight = tree.weighted_n_node_samples
+    impurity = tree.impurity
+    decrease = (weight[split] * impurity[split]
+                - weight[left[split]] * impurity[left[split]]
+                - weight[right[split]] * impurity[right[split]])
+    totals = np.bincount(tree.feature[split], weights=decrease, minlength=n_features)
+    total = totals.sum()
+    return totals / total if total > 0 else totals
+
+
+class EnsembleSummary:
+    """
+    Aggregate statistics of a fitted tree ensemble, computed once by `summarize`.
+
+    Attributes:
+    n_trees (int): Number of trees.
+    feature_names (list): Columns the trees split on.
+    nodes, leaves, depths (np.ndarray): Node count, leaf count and depth per tree.
+    importances (pd.DataFrame): Mean impurity-based importance ('importance')
+        and its standard deviation over trees ('std') per feature, largest
+        first. For forests the mean matches `feature_importances_`.
+    splits (pd.Series): Number of splits on each feature over all trees.
+    root_splits (pd.Series): Number of trees whose first split is on each feature.
+    leaf_depths (pd.Series): Number of leaves at each depth over all trees.
+    """
+
+    def __init__(self, model):
+        trees = [estimator.tree_ for estimator in estimator_trees(model)]
+        self.feature_names = feature_names(model)
+        n_features = len(self.feature_names)
+        self.n_trees = len(trees)
+        self.nodes = np.array([tree.node_count for tree in trees])
+        self.leaves = np.array([tree.n_leaves for tree in trees])
+        self.depths = np.array([tree.max_depth for tree in trees])
+
+        # Trees that never split carry no importance and are left out, as scikit-learn does
+        per_tree = np.array([impurity_decrease(tree, n_features) for tree in trees if tree.node_count > 1])
+        if len(per_tree):
+            mean = per_tree.mean(axis=0)
+            total = mean.sum()
+            mean = mean / total if total > 0 else mean
+            std = per_tree.std(axis=0)
+        else:
+            mean = std = np.zeros(n_features)
+        self.importances = pd.DataFrame({'importance': mean, 'std': std}, index=self.feature_names)
+        self.importances = self.importances.sort_values('importance', ascending=False)
+
+        features = np.concatenate([tree.feature[tree.children_left >= 0] for tree in trees])
+        self.splits = pd.Series(np.bincount(features, minlength=n_features), index=self.feature_names, name='splits')
+        roots = np.array([tree.feature[0] for tree in trees if tree.node_count > 1], dtype=np.int64)
+        self.root_splits = pd.Series(np.bincount(roots, minlength=n_features), index=self.feature_names,
+                                     name='root_splits')
+        leaf_depths = np.concatenate([node_depths(tree)[tree.children_left < 0] for tree in trees])
+        self.leaf_depths = pd.Series(np.bincount(leaf_depths), name='leaves').rename_axis('depth')
+
+    def table(self):
+        """Importances, split counts and root splits per feature in one table."""
+        return self.importances.join(self.splits).join(self.root_splits)
+
+    def describe(self):
+        """A few lines of text describing the ensemble's size and shape."""
+        return (
+            f"{self.n_trees} trees, {self.nodes.sum():,} nodes, {self.leaves.sum():,} leaves\n"
+            f"Depth: min {self.depths.min()}, median {np.median(self.depths):g}, max {self.depths.max()}\n"
+            f"Nodes per tree: min {self.nodes.min():,}, median {np.median(self.nodes):g}, max {self.nodes.max():,}"
+        )
+
+
+def summarize(model):
+    """
+    The EnsembleSummary of a fitted model, cached until the model is refitted or freed.
+
+    Raises:
+    ValueError: If the model has no decision trees (see `estimator_trees`).
+    """
+    key = _unwrap(model)
+    # Refitting (e.g. warm-started growth) replaces the trees, which changes the signature
+    signature = tuple(id(estimator.tree_) for estimator in estimator_trees(key))
+    with _summaries_lock:
+        cached = _summaries.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    summary = EnsembleSummary(key)
+    with _summaries_lock:
+        _summaries[key] = (signature, summary)
+    return summary
+
+
+def tree_nodes(model, tree=0, node=0, max_depth=3):
+    """
+    The nodes of one tree below `node`, down to `max_depth` levels under it.
+
+    Parameters:
+    model: A fitted tree model (see `estimator_trees`).
+    tree (int): Index of the tree in the ensemble.
+    node (int): Node to start from; 0 is the root.
+    max_depth (int): Levels shown below `node`; None shows the whole subtree.
+
+    Returns:
+    pd.DataFrame: One row per node in breadth-first order with the node id,
+    parent, depth in the tree, left and right child (-1 for leaves),
+    split feature and threshold, samples, impurity, the node's prediction
+    ('value'; the majority class for classifiers), whether it is a leaf and
+    whether its children were left out ('truncated').
+    """
+    estimators = estimator_trees(model)
+    estimator = estimators[tree]
+    structure = estimator.tree_
+    left, right = structure.children_left, structure.children_right
+    if not 0 <= node < structure.node_count:
+        raise ValueError(f"Tree {tree} has no node {node}.")
+
+    levels = []
+    level = np.array([node])
+    depth = 0
+    while level.size and (max_depth is None or depth <= max_depth):
+        levels.append(level)
+        children = np.concatenate([left[level], right[level]])
+        level = children[children >= 0]
+        depth += 1
+    nodes = np.concatenate(levels)
+
+    parents = np.full(structure.node_count, -1, dtype=np.int64)
+    split = np.flatnonzero(left >= 0)
+    parents[left[split]] = split
+    parents[right[split]] = split
+    start_depth = node_depths(structure)[node] if node else 0
+    depths = np.concatenate([np.full(len(level), start_depth + i) for i, level in enumerate(levels)])
+
+    is_leaf = left[nodes] < 0
+    names = np.array(feature_names(model) + [''], dtype=object)
+    values = structure.value[nodes, 0, :]
+    classes = getattr(estimator, 'classes_', None)
+    if classes is not None and values.shape[1] > 1:
+        value = np.asarray(classes)[values.argmax(axis=1)]
+    else:
+        value = values[:, 0]
+    shown = set(nodes.tolist())
+    return pd.DataFrame({
+        'node': nodes,
+        'parent': np.where(nodes == node, -1, parents[nodes]),
+        'depth': depths,
+        'left': left[nodes],
+        'right': right[nodes],
+        'feature': names[np.where(is_leaf, -1, structure.feature[nodes])],
+        'threshold': np.where(is_leaf, np.nan, structure.threshold[nodes]),
+        'samples': structure.n_node_samples[nodes],
+        'impurity': structure.impurity[nodes],
+        'value': value,
+        'is_leaf': is_leaf,
+        'truncated': ~is_leaf & ~np.isin(left[nodes], list(shown)),
+    })
+
+
+def _load(model, X, Y, columns):
+    X = attach(X)
+    if columns is not None:
+        X = pd.DataFrame(X, columns=columns)
+    # Columns are shuffled in place in the scratch copy and put back after each task
+    return {'model': model, 'X': X, 'Y': attach(Y), 'scratch': X.copy()}
+
+
+def _init_worker(model, X, Y, columns):
+    _worker_data.update(_load(model, X, Y, columns))
+
+
+def _score(model, X, Y):
+    """R² for numerical targets, accuracy otherwise: the scores `permutation_importance` compares."""
+    predictions = np.asarray(model.predict(X))
+    if Y.dtype.kind in 'if':
+        Y = np.asarray(Y, dtype=np.float64)
+        residual = np.sum((Y - predictions.reshape(len(Y))) ** 2)
+        total = np.sum((Y - Y.mean()) ** 2)
+        return 1.0 - residual / total if total > 0 else np.nan
+    return float(np.mean(predictions == Y))
+
+
+def _permute_column(column, n_repeats, seed, baseline, data=None):
+    model, X, Y, scratch = ((data or _worker_data)[name] for name in ('model', 'X', 'Y', 'scratch'))
+    rng = np.random.default_rng(seed)
+    drops = np.empty(n_repeats)
+    if isinstance(X, pd.DataFrame):
+        original = X.iloc[:, column].to_numpy()
+        for repeat in range(n_repeats):
+            scratch.iloc[:, column] = original[rng.permutation(len(original))]
+            drops[repeat] = baseline - _score(model, scratch, Y)
+        scratch.iloc[:, column] = original
+    else:
+        original = X[:, column]
+        for repeat in range(n_repeats):
+            scratch[:, column] = original[rng.permutation(len(original))]
+            drops[repeat] = baseline - _score(model, scratch, Y)
+        scratch[:, column] = original
+    return column, drops
+
+
+def permutation_importance(model, X, Y, n_repeats=5, n_workers=None, random_state=0, monitor=None):
+    """
+    Drop in score when each column is shuffled, for any fitted model.
+
+    Columns are spread over a process pool. Every worker receives the model
+    once and maps numeric data shared by file (see modeling_gui.design).
+    Scores are R² for numerical targets and accuracy otherwise.
+
+    Parameters:
+    model: A fitted model with `predict`.
+    X (pd.DataFrame or np.ndarray): Features, e.g. held-out rows.
+    Y (pd.Series or np.ndarray): Target.
+    n_repeats (int): Shuffles per column.
+    n_workers (int): Worker processes; defaults to the number of CPUs, and
+        1 computes in this process.
+    random_state (int): Seed; results do not depend on n_workers.
+    monitor (JobMonitor): Optional progress/cancellation hooks.
+
+    Returns:
+    pd.DataFrame: 'importance' (mean drop) and 'std' per column, largest
+    first; `attrs['baseline']` is the unshuffled score.
+    """
+    columns = list(X.columns) if isinstance(X, pd.DataFrame) else None
+    if columns is None or all(X[column].dtype.kind in 'biuf' for column in columns):
+        # A memory-mapped design matrix stays mapped, so workers attach to it (see `share`)
+        payload = np.asarray(X)
+    else:
+        payload, columns = X, None  # Mixed column types stay a DataFrame and are pickled
+    Y = np.asarray(Y)
+    names = [str(name) for name in X.columns] if isinstance(X, pd.DataFrame) else [f"x{i}" for i in range(X.shape[1])]
+    # One seed per column, so the shuffles do not depend on which worker gets the column
+    seeds = [int(seed.generate_state(1)[0]) for seed in np.random.SeedSequence(random_state).spawn(len(names))]
+
+    data = _load(model, payload, Y, columns)
+    baseline = _score(model, data['X'], Y)
+    drops = {}
+    n_workers = min(n_workers or os.cpu_count() or 1, len(names))
+    if n_workers <= 1:
+        for column in range(len(names)):
+            drops[column] = _permute_column(column, n_repeats, seeds[column], baseline, data)[1]
+            if monitor is not None:
+                monitor.progress(len(drops), len(names))
+                if monitor.cancelled:
+                    break
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(model, share(payload), share(Y), columns)) as executor:
+            futures = {executor.submit(_permute_column, column, n_repeats, seeds[column], baseline)
+                       for column in range(len(names))}
+            while futures:
+                finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    column, column_drops = future.result()
+                    drops[column] = column_drops
+                if monitor is not None:
+                    monitor.progress(len(drops), len(names))
+                    if monitor.cancelled:
+                        for future in futures:
+                            future.cancel()
+                        futures = set()
+
+    order = sorted(drops)
+    table = pd.DataFrame({
+        'importance': [drops[column].mean() for column in order],
+        'std': [drops[column].std() for column in order],
+    }, index=[names[column] for column in order])
+    table = table.sort_values('importance', ascending=False)
+    table.attrs['baseline'] = baseline
+    return table
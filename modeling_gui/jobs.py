@@ -0,0 +1,158 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .models import ModelManager
+
+_job_ids = itertools.count(1)
+
+
+class JobMonitor:
+    """
+    Progress and cancellation hooks handed to a ModelManager while a job runs.
+
+    Long fits poll `cancelled` between boosting stages or forest batches and
+    call `progress(done, total)` as they go.
+    """
+
+    def __init__(self, report=None):
+        self._cancelled = threading.Event()
+        self.report = report
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def progress(self, done, total):
+        if self.report is not None:
+            self.report(done, total)
+
+
+class Job:
+    """A single queued ModelManager call and its outcome."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, method, args=(), kwargs=None, label=None):
+        self.id = next(_job_ids)
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.label = label or method
+        self.state = Job.PENDING
+        self.monitor = JobMonitor()
+        self.model_manager = None
+        self.result = None
+        self.error = None
+        self.elapsed = None
+        self.future = None
+
+    @property
+    def done(self):
+        return self.state in (Job.FINISHED, Job.FAILED, Job.CANCELLED)
+
+    def __repr__(self):
+        return f"Job({self.id}, {self.label!r}, {self.state})"
+
+
+class JobQueue:
+    """
+    Run ModelManager methods on worker threads, in submission order.
+
+    Parameters:
+    max_workers (int): Number of jobs allowed to run at the same time. The
+        default of one runs queued jobs back to back, which avoids
+        oversubscribing cores for estimators that are already parallel.
+    on_start (callable): Called with the job when it starts running.
+    on_progress (callable): Called with (job, done, total) during a fit.
+    on_done (callable): Called with the job once it is finished, failed or cancelled.
+    manager_factory (callable): Builds the ModelManager used by each job.
+    """
+
+    def __init__(self, max_workers=1, on_start=None, on_progress=None, on_done=None,
+                 manager_factory=ModelManager):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="modeling-job")
+        self._lock = threading.Lock()
+        self._jobs = []
+        self.on_start = on_start
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.manager_factory = manager_factory
+
+    def submit(self, method, *args, label=None, **kwargs):
+        """
+        Queue `ModelManager.<method>(*args, **kwargs)` and return its Job.
+        """
+        if not callable(getattr(ModelManager, method, None)):
+            raise ValueError(f"Unknown ModelManager method: {method}")
+        job = Job(method, args, kwargs, label=label)
+        job.monitor.report = lambda done, total: self._notify(self.on_progress, job, done, total)
+        with self._lock:
+            self._jobs.append(job)
+        job.future = self._executor.submit(self._run, job)
+        return job
+
+    def cancel(self, job=None):
+        """
+        Cancel one job, or every unfinished job when `job` is None.
+
+        Pending jobs are dropped before they start; running jobs stop at the
+        next checkpoint reported by the model.
+        """
+        jobs = [job] if job is not None else self.active()
+        for item in jobs:
+            item.monitor.cancel()
+            if item.future is not None and item.future.cancel():
+                item.state = Job.CANCELLED
+                self._notify(self.on_done, item)
+
+    def active(self):
+        """Jobs that are pending or running, oldest first."""
+        with self._lock:
+            self._jobs = [job for job in self._jobs if not job.done]
+            return list(self._jobs)
+
+    def pending(self):
+        """Jobs that have not started yet."""
+        return [job for job in self.active() if job.state == Job.PENDING]
+
+    def shutdown(self, wait=True, cancel=False):
+        if cancel:
+            self.cancel()
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job):
+        if job.monitor.cancelled:
+            job.state = Job.CANCELLED
+            self._notify(self.on_done, job)
+            return job
+        job.state = Job.RUNNING
+        self._notify(self.on_start, job)
+        start = time.perf_counter()
+        try:
+            job.model_manager = self.manager_factory()
+            job.model_manager.monitor = job.monitor
+            job.result = getattr(job.model_manager, job.method)(*job.args, **job.kwargs)
+            job.state = Job.CANCELLED if job.monitor.cancelled else Job.FINISHED
+        except Exception as e:
+            job.error = e
+            job.state = Job.FAILED
+        finally:
+            job.elapsed = time.perf_counter() - start
+            if job.model_manager is not None:
+                job.model_manager.monitor = None
+        self._notify(self.on_done, job)
+        return job
+
+    @staticmethod
+    def _notify(callback, *args):
+        if callback is not None:
+            callback(*args)
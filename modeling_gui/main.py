@@ -1,21 +1,123 @@
+import hashlib
+import json
+import os
 import sys
+import threading
+import time
+import numpy as np
 import pandas as pd
-from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog, QMessageBox, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QSpinBox, QComboBox, QLabel, QTextEdit, QListWidget, QTableWidget, QTableWidgetItem, QAbstractItemView
-from PyQt5.QtGui import QIcon
-from modeling_gui.models import ModelManager
-from modeling_gui.visualization import plot_data, plot_confusion_matrix, plot_tree_diagram, plot_curve_fit
-from modeling_gui.dialogs import RandomForestDialog, GradientBoostDialog, KMeansDialog
+from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog, QMessageBox, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QSpinBox, QComboBox, QLabel, QTextEdit, QListWidget, QTableView, QHeaderView, QLineEdit, QAbstractItemView, QProgressBar, QCheckBox, QDialog, QSplashScreen
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QIcon, QPixmap
+from modeling_gui.models import ModelManager, preload_backends
+from modeling_gui.cache import ModelCache
+from modeling_gui.design import DesignCache
+from modeling_gui.dialogs import RandomForestDialog, GradientBoostDialog, KMeansDialog, RollingLSDialog, OnlineLSDialog, HyperparameterSearchDialog, CompareModelsDialog, GroupedFitDialog, BootstrapDialog, PreprocessingDialog, SavedModelsDialog, TreeInspectorDialog
+from modeling_gui.workers import ModelJobRunner
+from modeling_gui.table_model import DataFrameModel
+from modeling_gui.plot_panel import PlotPanel
+from modeling_gui.profiling import PROFILER, instrument_methods
+from modeling_gui.scoring import format_report, model_columns, predicts_inputs
+from modeling_gui.utils.file_helper import format_load_report, default_cache_dir
+from modeling_gui.workspace import Workspace
+from modeling_gui.grouped import GROUPED_METHODS
+from modeling_gui.bootstrap import BOOTSTRAP_METHODS
 
+# From this many rows OLS is solved from X'X instead of with statsmodels
+SUFFICIENT_OLS_ROWS = 1_000_000
+
+# Jobs that use or store a model rather than fit one
+SERVICE_METHODS = ('fit_preprocessor', 'fit_preprocessor_streamed', 'predict_file', 'save_model', 'load_model',
+                   'compare_models', 'grouped_fit', 'bootstrap', 'tree_summary', 'permutation_importance')
+
+# Handlers are timed when profiling is enabled; Qt may pass them extra signal arguments
+@instrument_methods(prefixes=('run_', 'show_', 'load_'), trim_args=True)
 class MainApp(QMainWindow):
+    leaderboard_row = pyqtSignal(object)
+    performance_record = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Modeling GUI")
         self.setWindowIcon(QIcon("icon.png"))
         self.data = None
-        self.model_manager = ModelManager()
+        self.data_path = None
+        # Named datasets (memory-mapped from disk) and fitted models, reopened at the next launch
+        self.workspace = Workspace(default_cache_dir("workspace"))
+        self.dataset_name = None
+        # Fitted models are cached by data fingerprint and hyperparameters
+        self.model_cache = ModelCache(cache_dir=default_cache_dir("models"))
+        self.model_manager = ModelManager(cache=self.model_cache)
+        # Typed matrices of the selected columns, reused until the selection or data changes
+        self.design_cache = DesignCache()
+        # Fitted preprocessing statistics; model inputs go through them while set
+        self.preprocessor = None
+        # The last fitting job, described in the manifest when its model is saved
+        self.last_fit = None
+        # (path, model) of the last model reopened from disk
+        self.saved_model = None
+
+        # Model fits run on a background worker; results come back as signals
+        self.job_runner = ModelJobRunner(
+            self, manager_factory=lambda: ModelManager(cache=self.model_cache, preprocessor=self.preprocessor)
+        )
+        self.job_runner.job_queued.connect(lambda job: self.refresh_job_list())
+        self.job_runner.job_started.connect(self.on_job_started)
+        self.job_runner.job_progress.connect(self.on_job_progress)
+        self.job_runner.job_done.connect(self.on_job_done)
+        self._job_handlers = {}
+
+        # Online recursive LS: the file is polled for appended rows and the state carried between jobs
+        self.online_timer = QTimer(self)
+        self.online_timer.timeout.connect(self.poll_online_ls)
+        self.online_request = None
+        self.online_model = None
+        self.online_rows = 0
+        self.online_job = None
 
         # Setup UI elements
         self.setup_ui()
+        self.refresh_workspace()
+        if self.workspace.active is not None:
+            # Carry on with the dataset of the last session; it is memory-mapped, not parsed again
+            try:
+                self.show_dataset(self.workspace.active)
+            except Exception as e:
+                self.load_status_label.setText(f"Could not reopen {self.workspace.active}: {str(e)}")
+
+        # Search leaderboard, filled as candidates finish
+        self.leaderboard_rows = []
+        self.leaderboard_model = DataFrameModel()
+        self.leaderboard_window = QDialog(self)
+        leaderboard_view = QTableView()
+        leaderboard_view.setModel(self.leaderboard_model)
+        leaderboard_layout = QVBoxLayout()
+        leaderboard_layout.addWidget(leaderboard_view)
+        self.leaderboard_window.setLayout(leaderboard_layout)
+        self.leaderboard_window.resize(700, 400)
+        self.leaderboard_row.connect(self.add_leaderboard_row)
+
+        # Performance window listing the last profiled runs
+        self.performance_model = DataFrameModel()
+        self.performance_window = QDialog(self)
+        self.performance_window.setWindowTitle("Performance")
+        performance_layout = QVBoxLayout()
+        self.profiling_checkbox = QCheckBox("Record timings (wall/CPU time, memory, shapes, parameters)")
+        self.profiling_checkbox.setChecked(PROFILER.enabled)
+        self.profiling_checkbox.toggled.connect(self.toggle_profiling)
+        performance_layout.addWidget(self.profiling_checkbox)
+        performance_view = QTableView()
+        performance_view.setModel(self.performance_model)
+        performance_layout.addWidget(performance_view)
+        self.save_performance_button = QPushButton("Save Log...")
+        self.save_performance_button.clicked.connect(self.save_performance_log)
+        performance_layout.addWidget(self.save_performance_button)
+        self.performance_window.setLayout(performance_layout)
+        self.performance_window.resize(900, 400)
+        # Records arrive on whichever thread ran the call; the signal hands them to the GUI thread
+        self.performance_record.connect(lambda record: self.refresh_performance())
+        PROFILER.add_listener(self.performance_record.emit)
+        self.refresh_performance()
 
     def setup_ui(self):
         """
@@ -25,14 +127,51 @@ class MainApp(QMainWindow):
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout()
 
-        # Add Load CSV button
+        # Add Load CSV button with large-file options
+        load_layout = QHBoxLayout()
         self.load_button = QPushButton("Load CSV")
         self.load_button.clicked.connect(self.load_csv)
-        layout.addWidget(self.load_button)
+        load_layout.addWidget(self.load_button)
+        self.compact_checkbox = QCheckBox("Large file mode (compact dtypes, cached)")
+        load_layout.addWidget(self.compact_checkbox)
+        load_layout.addWidget(QLabel("Max rows (0 = all):"))
+        self.max_rows_input = QSpinBox()
+        self.max_rows_input.setRange(0, 2_000_000_000)
+        self.max_rows_input.setSingleStep(100_000)
+        load_layout.addWidget(self.max_rows_input)
+        layout.addLayout(load_layout)
+        self.load_status_label = QLabel("")
+        layout.addWidget(self.load_status_label)
+
+        # Add workspace of loaded datasets and fitted models
+        workspace_layout = QHBoxLayout()
+        workspace_layout.addWidget(QLabel("Dataset:"))
+        self.dataset_combo = QComboBox()
+        self.dataset_combo.activated.connect(lambda index: self.show_dataset(self.dataset_combo.itemText(index)))
+        workspace_layout.addWidget(self.dataset_combo)
+        self.remove_dataset_button = QPushButton("Remove")
+        self.remove_dataset_button.clicked.connect(self.remove_dataset)
+        workspace_layout.addWidget(self.remove_dataset_button)
+        workspace_layout.addWidget(QLabel("Fitted model:"))
+        self.workspace_model_combo = QComboBox()
+        self.workspace_model_combo.activated.connect(
+            lambda index: self.use_workspace_model(self.workspace_model_combo.itemText(index))
+        )
+        workspace_layout.addWidget(self.workspace_model_combo)
+        workspace_layout.addWidget(QLabel("Memory budget (MB):"))
+        self.memory_budget_input = QSpinBox()
+        self.memory_budget_input.setRange(64, 1_000_000)
+        self.memory_budget_input.setSingleStep(256)
+        self.memory_budget_input.setValue(self.workspace.memory_budget // 1024 ** 2)
+        self.memory_budget_input.editingFinished.connect(
+            lambda: setattr(self.workspace, 'memory_budget', self.memory_budget_input.value() * 1024 ** 2)
+        )
+        workspace_layout.addWidget(self.memory_budget_input)
+        layout.addLayout(workspace_layout)
 
         # Add model selection combo box
         self.model_combo = QComboBox()
-        self.model_combo.addItems(["OLS", "Rolling Least Squares", "Random Forest", "Gradient Boosting", "KMeans Clustering", "Gaussian Fitting", "Exponential Fitting"])
+        self.model_combo.addItems(["OLS", "Rolling Least Squares", "Online Recursive LS", "Random Forest", "Gradient Boosting", "KMeans Clustering", "Gaussian Fitting", "Exponential Fitting", "Batch Gaussian Fitting", "Batch Exponential Fitting"])
         layout.addWidget(self.model_combo)
 
         # Add multi-selection widget for selecting X columns
@@ -46,78 +185,302 @@ class MainApp(QMainWindow):
         layout.addWidget(QLabel("Select Y Column:"))
         layout.addWidget(self.y_combo)
 
-        # Add a table to display the loaded CSV file
-        self.csv_preview_table = QTableWidget()
+        # Add a lazily rendered table to display the loaded CSV file
+        self.csv_preview_model = DataFrameModel()
+        self.csv_preview_table = QTableView()
+        self.csv_preview_table.setModel(self.csv_preview_model)
+        self.csv_preview_table.setSortingEnabled(True)
+        self.csv_preview_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.csv_preview_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         layout.addWidget(QLabel("CSV Preview:"))
         layout.addWidget(self.csv_preview_table)
 
+        # Add a filter for the preview rows
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Filter:"))
+        self.filter_column_combo = QComboBox()
+        filter_layout.addWidget(self.filter_column_combo)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("text, or a comparison such as > 5 for numeric columns")
+        self.filter_input.returnPressed.connect(self.apply_preview_filter)
+        filter_layout.addWidget(self.filter_input)
+        layout.addLayout(filter_layout)
+
         # Add Run Model button
         self.run_button = QPushButton("Run Model")
         self.run_button.clicked.connect(self.run_model)
         layout.addWidget(self.run_button)
 
+        # Add stop button for live online updates
+        self.stop_online_button = QPushButton("Stop Online Updates")
+        self.stop_online_button.setEnabled(False)
+        self.stop_online_button.clicked.connect(self.stop_online_ls)
+        layout.addWidget(self.stop_online_button)
+
+        # Add preprocessing button; the statistics are fitted on the selected X columns
+        preprocessing_layout = QHBoxLayout()
+        self.preprocessing_button = QPushButton("Preprocessing...")
+        self.preprocessing_button.clicked.connect(self.run_preprocessing)
+        preprocessing_layout.addWidget(self.preprocessing_button)
+        self.preprocessing_label = QLabel("Preprocessing: off")
+        preprocessing_layout.addWidget(self.preprocessing_label)
+        layout.addLayout(preprocessing_layout)
+
+        # Add hyperparameter search button for the ensemble models
+        self.search_button = QPushButton("Tune Hyperparameters")
+        self.search_button.clicked.connect(self.run_hyperparameter_search)
+        layout.addWidget(self.search_button)
+
+        # Add cross-validated comparison of several models on the same folds
+        self.compare_button = QPushButton("Compare Models...")
+        self.compare_button.clicked.connect(self.run_model_comparison)
+        layout.addWidget(self.compare_button)
+
+        # Add one model per group of rows, e.g. per category
+        self.grouped_button = QPushButton("Fit by Group...")
+        self.grouped_button.clicked.connect(self.run_grouped_fit)
+        layout.addWidget(self.grouped_button)
+
+        # Add bootstrap confidence intervals for a model's parameters
+        self.bootstrap_button = QPushButton("Bootstrap Intervals...")
+        self.bootstrap_button.clicked.connect(self.run_bootstrap)
+        layout.addWidget(self.bootstrap_button)
+
+        # Add inspection of the fitted model: tree structure and feature importances
+        inspect_layout = QHBoxLayout()
+        self.inspect_trees_button = QPushButton("Inspect Trees...")
+        self.inspect_trees_button.clicked.connect(self.inspect_trees)
+        inspect_layout.addWidget(self.inspect_trees_button)
+        self.permutation_button = QPushButton("Permutation Importance")
+        self.permutation_button.clicked.connect(self.run_permutation_importance)
+        inspect_layout.addWidget(self.permutation_button)
+        layout.addLayout(inspect_layout)
+
+        # Add batch scoring of a CSV file with the last fitted model
+        self.score_button = QPushButton("Score CSV...")
+        self.score_button.clicked.connect(self.run_scoring)
+        layout.addWidget(self.score_button)
+
+        # Add saving and reopening of fitted models
+        saved_layout = QHBoxLayout()
+        self.save_model_button = QPushButton("Save Model...")
+        self.save_model_button.clicked.connect(self.save_model)
+        saved_layout.addWidget(self.save_model_button)
+        self.open_model_button = QPushButton("Open Saved Model...")
+        self.open_model_button.clicked.connect(self.open_saved_model)
+        saved_layout.addWidget(self.open_model_button)
+        layout.addLayout(saved_layout)
+
+        # Add performance window toggle
+        self.performance_button = QPushButton("Performance")
+        self.performance_button.clicked.connect(lambda: self.performance_window.show())
+        layout.addWidget(self.performance_button)
+
+        # Add job queue with progress and cancellation
+        job_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(0)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_jobs)
+        job_layout.addWidget(self.progress_bar)
+        job_layout.addWidget(self.cancel_button)
+        layout.addLayout(job_layout)
+        self.job_status_label = QLabel("No jobs running.")
+        layout.addWidget(self.job_status_label)
+        self.job_list = QListWidget()
+        self.job_list.setMaximumHeight(80)
+        layout.addWidget(self.job_list)
+
         # Add result display box
         self.result_label = QLabel("Results:")
         layout.addWidget(self.result_label)
         self.result_box = QTextEdit()
         layout.addWidget(self.result_box)
 
+        # Plots are rendered off the GUI thread and shown here as tabs
+        self.plot_panel = PlotPanel()
+        self.plot_panel.setMinimumHeight(300)
+        self.plot_panel.render_failed.connect(
+            lambda title, error: QMessageBox.critical(self, "Error", f"Failed to plot {title}: {error}")
+        )
+        layout.addWidget(self.plot_panel)
+
         central_widget.setLayout(layout)
 
 
     def load_csv(self):
-    	"""
-    	Load a CSV file and populate the X and Y selection widgets.
-    	"""
-    	# Open file dialog to load CSV
-    	file_path, _ = QFileDialog.getOpenFileName(self, "Open CSV", "", "CSV Files (*.csv)")
-    	if not file_path:
-            return
-
-    	try:
-            # Load CSV into a pandas DataFrame
-            self.data = pd.read_csv(file_path)
-        
-            # Populate the X (features) list widget and Y (target) combo box
+        """
+        Load a CSV file and populate the X and Y selection widgets.
+        """
+        # Open file dialog to load CSV
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open CSV", "", "CSV Files (*.csv)")
+        if not file_path:
+            return
+
+        try:
+            # Load CSV into the workspace; a file loaded before with the same options is reopened without parsing
+            compact = self.compact_checkbox.isChecked()
+            name, data = self.workspace.load_csv(
+                file_path,
+                compact=compact,
+                max_rows=self.max_rows_input.value() or None,
+                cache_dir=default_cache_dir("csv") if compact else None,
+            )
+            self.show_dataset(name, data.attrs['load_report'])
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load CSV: {str(e)}")
+
+    def show_dataset(self, name, load_report=None):
+        """
+        Make a workspace dataset the current data and populate the X and Y selection widgets.
+        """
+        self.data = self.workspace.get(name)
+        self.dataset_name = name
+        self.data_path = self.workspace.source(name)
+        self.workspace.active = name
+        self.design_cache.clear()
+        self.clear_preprocessing()
+        if load_report is not None:
+            self.load_status_label.setText(format_load_report(load_report))
+        else:
+            self.load_status_label.setText(
+                f"Opened {name} from the workspace: {len(self.data):,} rows x {self.data.shape[1]} columns."
+            )
+
+        # Populate the X (features) list widget and Y (target) combo box
+        self.x_list_widget.clear()
+        self.y_combo.clear()
+
+        # Add all column names to both widgets
+        self.x_list_widget.addItems(self.data.columns)
+        self.y_combo.addItems(self.data.columns)
+
+        # Display the CSV preview; cells are rendered on demand by the model
+        self.csv_preview_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.csv_preview_model.set_dataframe(self.data)
+        self.filter_column_combo.clear()
+        self.filter_column_combo.addItems([str(c) for c in self.data.columns])
+        self.filter_input.clear()
+        self.refresh_workspace()
+
+    def refresh_workspace(self):
+        """
+        List the workspace's datasets and fitted models in their combo boxes.
+        """
+        self.dataset_combo.clear()
+        self.dataset_combo.addItems(self.workspace.names)
+        if self.dataset_name is not None:
+            self.dataset_combo.setCurrentText(self.dataset_name)
+        self.remove_dataset_button.setEnabled(self.dataset_combo.count() > 0)
+        current = self.workspace_model_combo.currentText()
+        self.workspace_model_combo.clear()
+        self.workspace_model_combo.addItems(self.workspace.model_names)
+        self.workspace_model_combo.setCurrentText(current)
+
+    def remove_dataset(self):
+        """
+        Delete the dataset shown in the dataset box from the workspace.
+        """
+        name = self.dataset_combo.currentText()
+        if not name:
+            return
+        answer = QMessageBox.question(self, "Remove Dataset", f"Remove {name} and its stored columns from the workspace?")
+        if answer != QMessageBox.Yes:
+            return
+        if name == self.dataset_name:
+            self.data = None
+            self.dataset_name = None
+            self.data_path = None
+            self.design_cache.clear()
             self.x_list_widget.clear()
             self.y_combo.clear()
-        
-            # Add all column names to both widgets
-            self.x_list_widget.addItems(self.data.columns)
-            self.y_combo.addItems(self.data.columns)
-        
-            # Display the CSV preview in the table widget
-            self.csv_preview_table.setRowCount(min(10, len(self.data)))  # Show only first 10 rows
-            self.csv_preview_table.setColumnCount(len(self.data.columns))
-            self.csv_preview_table.setHorizontalHeaderLabels(self.data.columns)
-
-            for i in range(min(10, len(self.data))):  # Display up to 10 rows
-                for j, column in enumerate(self.data.columns):
-                    self.csv_preview_table.setItem(i, j, QTableWidgetItem(str(self.data.iloc[i, j])))
-
-    	except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load CSV: {str(e)}")
+            self.filter_column_combo.clear()
+            self.csv_preview_model.set_dataframe(pd.DataFrame())
+            self.load_status_label.setText("")
+        self.workspace.remove(name)
+        self.refresh_workspace()
 
-    def run_model(self):
+    def use_workspace_model(self, name):
         """
-        Run the selected model based on user input.
+        Make a fitted model of the workspace the current one for predictions, scoring and saving.
+        """
+        path = self.workspace.model_path(name)
+        job = self.workspace.model_info(name)
+        if job is None and path is not None:
+            # Saved in an earlier session: reopened memory-mapped, selecting its columns
+            self.submit_job("Open Model", "load_model", str(path),
+                            on_result=lambda load_job: self.show_saved_model(str(path), load_job))
+            return
+        self.model_manager.model = self.workspace.model(name)
+        self.last_fit = job
+        self.result_box.setPlainText(f"Using {name}: {self.model_manager.model}")
+
+    def apply_preview_filter(self):
+        """
+        Filter the preview rows by the selected column.
+        """
+        try:
+            self.csv_preview_model.set_filter(self.filter_column_combo.currentIndex(), self.filter_input.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Filter Error", str(e))
+
+    def selected_columns(self):
+        """
+        Return (x_columns, y_column) for the selection, or None after warning the user.
         """
         # Get selected X columns (features)
         selected_x_items = self.x_list_widget.selectedItems()
         x_columns = [item.text() for item in selected_x_items]
-    
+
         # Get selected Y column (target)
         y_column = self.y_combo.currentText()
-    
+
         if not x_columns or not y_column:
             QMessageBox.warning(self, "Selection Error", "Please select at least one X column and one Y column.")
-            return
+            return None
+        return x_columns, y_column
+
+    def selected_data(self, dtype=np.float64, add_const=False):
+        """
+        Return (X, Y) for the selected columns, or None after warning the user.
 
-        X = self.data[x_columns]  # Extract X as a DataFrame
-        Y = self.data[y_column]   # Extract Y as a Series
+        Numeric selections come from the design cache as one contiguous matrix,
+        built once and reused by later runs and by worker processes.
+        """
+        selection = self.selected_columns()
+        if selection is None:
+            return None
+        x_columns, y_column = selection
+        if not all(self.data[column].dtype.kind in 'biuf' for column in x_columns):
+            # Categorical features are handed over as they are, e.g. for histogram boosting
+            return self.data[x_columns], self.data[y_column]
+        design = self.design_cache.get(self.data, x_columns, y_column, dtype=dtype, add_const=add_const)
+        return design.X, design.Y
 
+    def run_model(self):
+        """
+        Run the selected model based on user input.
+        """
         # Get selected model from the dropdown
         model_choice = self.model_combo.currentText()
+        if model_choice == "Online Recursive LS":
+            # Reads the file itself; only the column names are needed
+            selection = self.selected_columns()
+            if selection is not None:
+                self.run_online_ls(*selection)
+            return
+
+        # Tree ensembles convert to float32 anyway; statsmodels OLS gets its constant column up front
+        dtype = np.float32 if model_choice == "Random Forest" else np.float64
+        add_const = model_choice == "OLS" and self.data is not None and len(self.data) < SUFFICIENT_OLS_ROWS
+        selection = self.selected_data(dtype=dtype, add_const=add_const)
+        if selection is None:
+            return
+        X, Y = selection
+
         if model_choice == "OLS":
             self.run_ols(X, Y)
         elif model_choice == "Rolling Least Squares":
@@ -132,27 +495,328 @@ class MainApp(QMainWindow):
             self.run_gaussian_fitting(X, Y)
         elif model_choice == "Exponential Fitting":
             self.run_exponential_fitting(X, Y)
+        elif model_choice == "Batch Gaussian Fitting":
+            self.run_batch_curve_fit(X, Y, 'gaussian')
+        elif model_choice == "Batch Exponential Fitting":
+            self.run_batch_curve_fit(X, Y, 'exponential')
+
+    def submit_job(self, label, method, *args, on_result=None, **kwargs):
+        """
+        Queue a ModelManager call on the background worker.
+
+        `on_result` is invoked on the GUI thread with the finished job.
+        """
+        job = self.job_runner.submit(method, *args, label=label, **kwargs)
+        self._job_handlers[job.id] = on_result
+        return job
+
+    def cancel_jobs(self):
+        """
+        Cancel the running job and drop all pending ones.
+        """
+        self.job_runner.cancel()
+
+    def refresh_job_list(self):
+        """
+        Show running and pending jobs in the queue widget.
+        """
+        self.job_list.clear()
+        for job in self.job_runner.active():
+            self.job_list.addItem(f"#{job.id} {job.label} ({job.state})")
+        self.cancel_button.setEnabled(self.job_list.count() > 0)
+
+    def on_job_started(self, job):
+        self.progress_bar.setRange(0, 0)  # Busy indicator until the model reports progress
+        self.job_status_label.setText(f"Running {job.label}...")
+        self.refresh_job_list()
+
+    def on_job_progress(self, job, done, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+
+    def on_job_done(self, job):
+        handler = self._job_handlers.pop(job.id, None)
+        self.refresh_job_list()
+        if not self.job_runner.active():
+            self.progress_bar.setRange(0, 1)
+            self.progress_bar.setValue(0)
+
+        if job is self.online_job and job.state != job.FINISHED:
+            self.stop_online_ls()
+
+        if job.state == job.CANCELLED:
+            self.job_status_label.setText(f"{job.label} cancelled.")
+        elif job.state == job.FAILED:
+            self.job_status_label.setText(f"{job.label} failed.")
+            QMessageBox.critical(self, "Error", f"Failed to run {job.label}: {str(job.error)}")
+        else:
+            source = job.model_manager.last_cache_hit
+            if source is not None:
+                self.job_status_label.setText(f"{job.label} loaded from {source} cache in {job.elapsed:.2f} s.")
+            else:
+                self.job_status_label.setText(f"{job.label} finished in {job.elapsed:.2f} s.")
+            if job.model_manager.model is not None:  # Preprocessing and scoring jobs fit no model
+                self.model_manager.model = job.model_manager.model
+            if job.method not in SERVICE_METHODS:
+                self.last_fit = job
+                if job.model_manager.model is not None:
+                    # Every fit of the session stays available from the fitted model box
+                    self.workspace.add_model(f"#{job.id} {job.label}", job.model_manager.model, info=job)
+                    self.refresh_workspace()
+            if handler is not None:
+                try:
+                    handler(job)
+                except Exception as e:
+                    QMessageBox.critical(self, "Error", f"Failed to display {job.label} results: {str(e)}")
+            if getattr(getattr(ModelManager, job.method), 'cached', False):
+                self.result_box.append(self.model_cache.format_stats())
+
+    def toggle_profiling(self, enabled):
+        if enabled and not PROFILER.enabled:
+            PROFILER.enable(default_cache_dir("profiles") / "runs.jsonl")
+        elif not enabled:
+            PROFILER.disable()
+
+    def refresh_performance(self):
+        """
+        Show the most recent profiled runs, newest first.
+        """
+        columns = ['name', 'status', 'wall_seconds', 'cpu_seconds', 'rss_mb', 'max_rss_mb', 'python_peak_mb',
+                   'cache_hit', 'shapes', 'params', 'thread', 'error', 'profile']
+        records = PROFILER.records()[::-1]
+        table = pd.DataFrame(records).reindex(columns=columns) if records else pd.DataFrame(columns=columns)
+        self.performance_model.set_dataframe(table.dropna(axis=1, how='all'))
+
+    def save_performance_log(self):
+        """
+        Save the recorded runs as JSON lines, e.g. to attach to a bug report.
+        """
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Performance Log", "runs.jsonl", "JSON Lines (*.jsonl)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'w') as f:
+                for record in PROFILER.records():
+                    f.write(json.dumps(record, default=str) + '\n')
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to save the log: {str(e)}")
+
+    def closeEvent(self, event):
+        self.online_timer.stop()
+        PROFILER.remove_listener(self.performance_record.emit)
+        self.job_runner.shutdown()
+        self.plot_panel.shutdown()
+        self.design_cache.clear()
+        super().closeEvent(event)
+
+    def run_preprocessing(self):
+        """
+        Fit imputation, clipping, scaling and encoding statistics on the selected X columns.
+        """
+        x_columns = [item.text() for item in self.x_list_widget.selectedItems()]
+        if self.data is None or not x_columns:
+            QMessageBox.warning(self, "Selection Error", "Please load a CSV file and select at least one X column.")
+            return
+
+        dialog = PreprocessingDialog(self)
+        if dialog.exec_() == dialog.Accepted:
+            if not dialog.enabled:
+                self.clear_preprocessing()
+                return
+            self.submit_job("Preprocessing", "fit_preprocessor", self.data[x_columns], **dialog.options,
+                            on_result=self.show_preprocessing)
+
+    def show_preprocessing(self, job):
+        self.preprocessor = job.result
+        self.preprocessing_label.setText(f"Preprocessing: {self.preprocessor.describe()}")
+        self.result_box.setPlainText(
+            f"Preprocessing for later fits: {self.preprocessor.describe()}\n\n"
+            + self.preprocessor.statistics().to_string()
+        )
+
+    def clear_preprocessing(self):
+        self.preprocessor = None
+        self.preprocessing_label.setText("Preprocessing: off")
+
+    def run_scoring(self):
+        """
+        Predict every row of a CSV file with the last fitted model, writing the predictions to another file.
+        """
+        model = self.model_manager.model
+        if model is None or not predicts_inputs(model):
+            QMessageBox.warning(self, "Scoring Error", "Please fit a model that predicts new rows first.")
+            return
+        x_columns = model_columns(model)
+        if x_columns is None:
+            # Fitted on unnamed arrays; the current X selection names the input columns
+            x_columns = [item.text() for item in self.x_list_widget.selectedItems()]
+            if not x_columns:
+                QMessageBox.warning(self, "Selection Error", "Please select the X columns the model was fitted on.")
+                return
+        input_path, _ = QFileDialog.getOpenFileName(self, "Score CSV", "", "CSV Files (*.csv)")
+        if not input_path:
+            return
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Predictions", os.path.splitext(input_path)[0] + "_predictions.csv",
+            "CSV Files (*.csv);;Parquet Files (*.parquet)",
+        )
+        if not output_path:
+            return
+        if self.saved_model is not None and self.saved_model[1] is model:
+            # Workers map the saved files instead of receiving a pickled copy
+            model = self.saved_model[0]
+        self.submit_job("Scoring", "predict_file", input_path, output_path, x_columns=x_columns, model=model,
+                        on_result=lambda job: self.result_box.setPlainText(format_report(job.result)))
+
+    def save_model(self):
+        """
+        Save the last fitted model with a manifest of its data, columns, settings and fit time.
+        """
+        job = self.last_fit
+        if job is None:
+            QMessageBox.warning(self, "Save Error", "Please fit a model first.")
+            return
+        model = job.model_manager.model if job.model_manager.model is not None else job.result
+        directory = default_cache_dir("saved_models")
+        os.makedirs(directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{job.method}"
+        path, _ = QFileDialog.getSaveFileName(self, "Save Model", os.path.join(directory, name), "Saved Models (*)")
+        if not path:
+            return
+        # Data arguments are fingerprinted; other arguments and keywords are recorded as settings
+        data = [arg for arg in job.args if isinstance(arg, (pd.DataFrame, pd.Series, np.ndarray))]
+        params = {key: value for key, value in job.kwargs.items() if not callable(value)}
+        if len(job.args) > len(data):
+            params['args'] = [arg for arg in job.args if not isinstance(arg, (pd.DataFrame, pd.Series, np.ndarray))]
+        self.submit_job(
+            "Save Model", "save_model", path, model=model, fit_method=job.method,
+            X=data[0] if data else None, Y=data[1] if len(data) > 1 else None, params=params,
+            fit_seconds=job.elapsed, fit_label=job.label, source=self.data_path, overwrite=True,
+            on_result=lambda save_job: self.show_saved(job, path, save_job),
+        )
+
+    def show_saved(self, job, path, save_job):
+        # Saved models are listed in the workspace at later launches
+        self.workspace.register_model(f"{job.label} ({os.path.basename(path)})", path)
+        self.refresh_workspace()
+        self.result_box.append(
+            f"Saved {job.label} to {path} ({save_job.result['size_bytes'] / 1e6:.1f} MB, "
+            f"{save_job.result['save_seconds']:.2f} s)."
+        )
+
+    def open_saved_model(self):
+        """
+        Reopen a saved model for predictions and scoring without refitting.
+        """
+        dialog = SavedModelsDialog(default_cache_dir("saved_models"), self)
+        if dialog.exec_() == dialog.Accepted and dialog.selected_path:
+            path = dialog.selected_path
+            self.submit_job("Open Model", "load_model", path, on_result=lambda job: self.show_saved_model(path, job))
+
+    def show_saved_model(self, path, job):
+        from modeling_gui.artifacts import read_manifest
+        self.saved_model = (path, job.result)
+        manifest = read_manifest(path)
+        # Select the columns the model was fitted on when they are in the loaded data
+        columns = manifest.get('x_columns') or []
+        if self.data is not None and columns and all(column in self.data.columns for column in columns):
+            for i in range(self.x_list_widget.count()):
+                item = self.x_list_widget.item(i)
+                item.setSelected(item.text() in columns)
+            targets = manifest.get('y_columns') or []
+            if len(targets) == 1 and targets[0] in self.data.columns:
+                self.y_combo.setCurrentText(targets[0])
+        self.result_box.setPlainText(
+            f"Opened {manifest.get('fit_label') or manifest.get('method')} ({manifest.get('model_class')}) from {path}\n\n"
+            + json.dumps(manifest, indent=2)
+        )
 
     def run_ols(self, X, Y):
         """
         Run OLS model on the data.
         """
-        try:
-            model = self.model_manager.ols(X, Y)
-            self.result_box.setPlainText(self.model_manager.get_summary().as_text())
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to run OLS: {str(e)}")
+        # Tall tables are solved from X'X without building a full statsmodels model
+        engine = 'sufficient' if len(X) >= SUFFICIENT_OLS_ROWS else 'statsmodels'
+        self.submit_job("OLS", "ols", X, Y, engine=engine, on_result=self.show_ols)
+
+    def show_ols(self, job):
+        self.result_box.setPlainText(self.model_manager.get_summary().as_text())
 
     def run_rolling_ls(self, X, Y):
         """
         Run Rolling Least Squares model on the data.
         """
-        try:
-            window = 5  # Adjust window as per user input
-            rolling_model = self.model_manager.rolling_ls(X, Y, window=window)
-            # Display rolling model parameters (code omitted for brevity)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to run Rolling LS: {str(e)}")
+        dialog = RollingLSDialog(self)
+        if dialog.exec_() == dialog.Accepted:
+            self.submit_job(
+                "Rolling LS", "rolling_ls", X, Y,
+                window=dialog.window, expanding=dialog.expanding,
+                on_result=self.show_rolling_ls,
+            )
+
+    def show_rolling_ls(self, job):
+        rolling_model = job.result
+        fitted = rolling_model.dropna(subset=[('stats', 'rsquared')])
+        mode = "expanding window" if job.kwargs['expanding'] else f"window={job.kwargs['window']}"
+        self.result_box.setPlainText(
+            f"Rolling LS ({mode}): {len(fitted)} of {len(rolling_model)} windows fitted.\n\n"
+            + fitted.to_string(max_rows=50)
+        )
+
+    def run_online_ls(self, x_columns, y_column):
+        """
+        Start online Recursive LS on the loaded file, updated as rows are appended to it.
+        """
+        if self.data_path is None:
+            QMessageBox.warning(self, "Selection Error", "Online Recursive LS reads the loaded CSV file; load one first.")
+            return
+        dialog = OnlineLSDialog(self)
+        if dialog.exec_() == dialog.Accepted:
+            self.stop_online_ls()
+            state_path = None
+            if dialog.persist:
+                key = json.dumps([str(self.data_path), [str(c) for c in x_columns], str(y_column), dialog.forgetting])
+                digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+                state_path = str(default_cache_dir("online") / f"{digest}.npz")
+            self.online_request = dict(
+                file_path=self.data_path, x_columns=x_columns, y_column=y_column,
+                forgetting=dialog.forgetting, state_path=state_path,
+            )
+            self.online_model = None
+            self.online_rows = 0
+            self.stop_online_button.setEnabled(True)
+            self.online_timer.start(dialog.interval * 1000)
+            self.poll_online_ls()
+
+    def poll_online_ls(self):
+        """
+        Queue an update with the rows appended since the last one, unless one is still queued.
+        """
+        if self.online_request is None or (self.online_job is not None and not self.online_job.done):
+            return
+        self.online_job = self.submit_job(
+            "Online Recursive LS", "recursive_ls_online", model=self.online_model,
+            on_result=self.show_online_ls, **self.online_request,
+        )
+
+    def stop_online_ls(self):
+        self.online_timer.stop()
+        self.online_request = None
+        self.stop_online_button.setEnabled(False)
+
+    def show_online_ls(self, job):
+        # The same state object is updated by every job, so rows are counted here
+        model = job.result
+        new_rows = model.nobs - self.online_rows
+        self.online_model, self.online_rows = model, model.nobs
+        if new_rows or self.plot_panel.figure("Coefficient Trajectories") is None:
+            self.plot_panel.render("Coefficient Trajectories", "plot_coefficient_trajectory", model.trajectory())
+        table = pd.DataFrame({'params': model.params, 'bse': model.bse})
+        self.result_box.setPlainText(
+            f"Online Recursive LS of {model.y_name} (forgetting factor {model.forgetting:g}): "
+            f"{model.nobs:,} rows, {new_rows:,} new; R-squared {model.rsquared:.4f}.\n\n"
+            + table.to_string()
+        )
 
     def run_random_forest(self, X, Y):
         """
@@ -160,15 +824,62 @@ class MainApp(QMainWindow):
         """
         dialog = RandomForestDialog(self)
         if dialog.exec_() == dialog.Accepted:
-            n_estimators = dialog.n_estimators
-            max_depth = dialog.max_depth
+            self.submit_job(
+                "Random Forest", "random_forest", X, Y,
+                n_estimators=dialog.n_estimators, max_depth=dialog.max_depth,
+                on_result=self.show_random_forest,
+            )
 
-            try:
-                model = self.model_manager.random_forest(X, Y, n_estimators=n_estimators, max_depth=max_depth)
-                plot_tree_diagram(model)  # Display Random Forest tree diagram
-                self.result_box.setPlainText("Random Forest model trained successfully.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to run Random Forest: {str(e)}")
+    def show_random_forest(self, job):
+        # Display the first levels of one tree; deeper levels are browsed in the tree inspector
+        self.plot_panel.render("Tree Diagram", "plot_tree_diagram", job.result, max_depth=3)
+        self.result_box.setPlainText("Random Forest model trained successfully.")
+        # The ensemble statistics are computed once in the background and cached for the inspector
+        self.submit_job("Tree Summary", "tree_summary", model=job.result, on_result=self.show_tree_summary)
+
+    def show_tree_summary(self, job):
+        summary = job.result
+        self.result_box.append("\n" + summary.describe() + "\n\n" + summary.table().to_string(max_rows=50))
+        self.plot_panel.render("Feature Importances", "plot_feature_importances", summary.importances,
+                               label="Impurity Importances")
+
+    def inspect_trees(self):
+        """
+        Browse the trees of the fitted forest or boosting model.
+        """
+        model = self.model_manager.model
+        try:
+            from modeling_gui.inspection import estimator_trees
+            estimator_trees(model)
+        except (ValueError, AttributeError):
+            QMessageBox.warning(self, "Inspection Error", "Fit a Random Forest or (classic) Gradient Boosting model first.")
+            return
+        TreeInspectorDialog(model, self).exec_()
+
+    def run_permutation_importance(self):
+        """
+        Measure how much the fitted model's score drops when each selected X column is shuffled.
+        """
+        if self.model_manager.model is None:
+            QMessageBox.warning(self, "Selection Error", "Fit a model first.")
+            return
+        selection = self.selected_data()
+        if selection is None:
+            return
+        X, Y = selection
+        self.submit_job(
+            "Permutation Importance", "permutation_importance", X, Y,
+            model=self.model_manager.model, on_result=self.show_permutation_importance,
+        )
+
+    def show_permutation_importance(self, job):
+        table = job.result
+        self.result_box.setPlainText(
+            f"Score without shuffling: {table.attrs['baseline']:.4f}\n"
+            "Drop in score when each column is shuffled:\n\n" + table.to_string(max_rows=50)
+        )
+        self.plot_panel.render("Permutation Importances", "plot_feature_importances", table,
+                               label="Permutation Importances")
 
     def run_gradient_boost(self, X, Y):
         """
@@ -176,16 +887,198 @@ class MainApp(QMainWindow):
         """
         dialog = GradientBoostDialog(self)
         if dialog.exec_() == dialog.Accepted:
-            n_estimators = dialog.n_estimators
-            learning_rate = dialog.learning_rate
-            max_depth = dialog.max_depth
+            params = dict(
+                n_estimators=dialog.n_estimators, learning_rate=dialog.learning_rate,
+                max_depth=dialog.max_depth, early_stopping=dialog.early_stopping,
+            )
+            if dialog.stream:
+                # Train on every row of the file, not just the rows loaded for the preview
+                self.submit_job(
+                    "Gradient Boost (streamed)", "gradient_boost_streamed",
+                    self.data_path, list(X.columns), Y.name, on_result=self.show_gradient_boost, **params,
+                )
+            else:
+                self.submit_job(
+                    "Gradient Boost", "gradient_boost", X, Y, backend=dialog.backend,
+                    on_result=self.show_gradient_boost, **params,
+                )
 
-            try:
-                model = self.model_manager.gradient_boost(X, Y, n_estimators=n_estimators, learning_rate=learning_rate, max_depth=max_depth)
-                plot_confusion_matrix(model, X, Y)  # Display confusion matrix
-                self.result_box.setPlainText("Gradient Boost model trained successfully.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to run Gradient Boost: {str(e)}")
+    def show_gradient_boost(self, job):
+        from sklearn.base import is_classifier
+        if job.method == 'gradient_boost_streamed':
+            _, x_columns, y_column = job.args
+            X, Y = self.data[x_columns], self.data[y_column]
+        else:
+            X, Y = job.args
+        if is_classifier(job.result):
+            self.plot_panel.render("Confusion Matrix", "plot_confusion_matrix", job.result, X, Y)
+        else:
+            def plot_predictions(figure):
+                # Predicting is done on the render thread along with the drawing
+                from modeling_gui.visualization import plot_fitted
+                return plot_fitted(Y, job.result.predict(X), figure=figure)
+            self.plot_panel.render("Actual vs Fitted", plot_predictions)
+        self.result_box.setPlainText("Gradient Boost model trained successfully.")
+
+    def run_hyperparameter_search(self):
+        """
+        Search hyperparameters for the selected ensemble model in a process pool.
+        """
+        methods = {"Random Forest": "random_forest", "Gradient Boosting": "gradient_boost"}
+        method = methods.get(self.model_combo.currentText())
+        if method is None:
+            QMessageBox.warning(self, "Selection Error", "Hyperparameter search is available for Random Forest and Gradient Boosting.")
+            return
+        selection = self.selected_data(dtype=np.float32 if method == 'random_forest' else np.float64)
+        if selection is None:
+            return
+        X, Y = selection
+
+        dialog = HyperparameterSearchDialog(method, self)
+        if dialog.exec_() == dialog.Accepted:
+            self.leaderboard_rows = []
+            self.leaderboard_model.set_dataframe(pd.DataFrame())
+            self.leaderboard_window.setWindowTitle(f"{self.model_combo.currentText()} Search Leaderboard")
+            self.leaderboard_window.show()
+            self.submit_job(
+                f"{self.model_combo.currentText()} Search", "hyperparameter_search", X, Y, method, dialog.space,
+                strategy=dialog.strategy, n_iter=dialog.n_iter, cv=dialog.cv,
+                on_result=self.show_hyperparameter_search,
+                # Rows arrive on the worker thread; the signal hands them to the GUI thread
+                on_row=self.leaderboard_row.emit,
+            )
+
+    def add_leaderboard_row(self, row):
+        self.leaderboard_rows.append(row)
+        leaderboard = pd.DataFrame(self.leaderboard_rows).sort_values('mean_score', ascending=False, ignore_index=True)
+        self.leaderboard_model.set_dataframe(leaderboard)
+
+    def show_hyperparameter_search(self, job):
+        leaderboard = job.result
+        self.leaderboard_model.set_dataframe(leaderboard)
+        self.result_box.setPlainText(
+            f"Best parameters: {leaderboard.attrs.get('best_params')}\n"
+            f"Best model refit on all rows: {job.model_manager.model}\n\n"
+            + leaderboard.to_string(max_rows=50)
+        )
+
+    def run_model_comparison(self):
+        """
+        Cross-validate the chosen models on shared folds in a process pool.
+        """
+        selection = self.selected_data()
+        if selection is None:
+            return
+        X, Y = selection
+
+        dialog = CompareModelsDialog(Y.dtype.kind in 'if', self)
+        if dialog.exec_() == dialog.Accepted:
+            if not dialog.methods:
+                QMessageBox.warning(self, "Selection Error", "Please select at least one model to compare.")
+                return
+            self.submit_job(
+                "Model Comparison", "compare_models", X, Y, dialog.methods,
+                cv=dialog.cv, splitter=dialog.splitter, on_result=self.show_model_comparison,
+            )
+
+    def show_model_comparison(self, job):
+        table = job.result
+        X, Y = job.args[:2]
+        self.leaderboard_model.set_dataframe(table)
+        self.leaderboard_window.setWindowTitle("Model Comparison")
+        self.leaderboard_window.show()
+        self.result_box.setPlainText(
+            f"Held-out metrics over {job.kwargs['cv']} folds ({table.attrs['splitter']}), "
+            f"best {table.attrs['metric']} first:\n\n"
+            + table.to_string()
+            + "\n\nPer fold:\n"
+            + table.attrs['folds'].to_string(max_rows=100)
+        )
+        best = table.loc[table['folds'] > 0, 'method']
+        if best.empty:
+            return
+        best = best.iloc[0]
+        predictions = table.attrs['predictions'][best]
+        tested = predictions.notna().to_numpy()  # Time-series splits never test the first rows
+        actual = np.asarray(Y)[tested]
+        predictions = predictions.to_numpy()[tested]
+        name = table.loc[table['method'] == best, 'model'].iloc[0]
+        if Y.dtype.kind in 'if':
+            self.plot_panel.render(f"{name} Held-out Fit", "plot_fitted", actual, predictions)
+        else:
+            self.plot_panel.render(f"{name} Held-out Confusion Matrix", "plot_confusion_matrix", None, None, actual,
+                                   predictions=predictions)
+
+    def run_grouped_fit(self):
+        """
+        Fit the chosen model to every group of a column's values in a process pool.
+        """
+        selection = self.selected_data()
+        if selection is None:
+            return
+        X, Y = selection
+
+        dialog = GroupedFitDialog(self.data.columns, Y.dtype.kind in 'if', X.shape[1], self)
+        if dialog.exec_() == dialog.Accepted:
+            if dialog.method is None:
+                QMessageBox.warning(self, "Selection Error", "No model can be fitted per group to this selection.")
+                return
+            self.submit_job(
+                f"Grouped {GROUPED_METHODS[dialog.method]} by {dialog.group_column}", "grouped_fit", X, Y,
+                self.data[dialog.group_column].to_numpy(), dialog.method, min_rows=dialog.min_rows,
+                on_result=self.show_grouped_fit,
+            )
+
+    def show_grouped_fit(self, job):
+        table = job.result
+        groups = table.attrs['groups']
+        metric = table.attrs['metric']
+        self.leaderboard_model.set_dataframe(groups)
+        self.leaderboard_window.setWindowTitle(job.label)
+        self.leaderboard_window.show()
+        counts = groups['status'].value_counts()
+        wide = table.pivot(index='group', columns='term', values='estimate')[list(dict.fromkeys(table['term']))]
+        problems = groups[groups['message'] != ""]
+        self.result_box.setPlainText(
+            f"{job.label}: {counts.get('fitted', 0)} groups fitted, {counts.get('skipped', 0)} skipped, "
+            f"{counts.get('failed', 0)} failed; median {metric} {groups[metric].median():.4f}.\n\n"
+            + "Estimates per group:\n" + wide.to_string(max_rows=100)
+            + ("\n\nSkipped, failed or noted groups:\n" + problems.to_string(max_rows=100) if len(problems) else "")
+        )
+
+    def run_bootstrap(self):
+        """
+        Refit the chosen model on resampled rows in a process pool and report confidence intervals of its parameters.
+        """
+        selection = self.selected_data()
+        if selection is None:
+            return
+        X, Y = selection
+
+        dialog = BootstrapDialog(Y.dtype.kind in 'if', X.shape[1], self)
+        if dialog.exec_() == dialog.Accepted:
+            if dialog.method is None:
+                QMessageBox.warning(self, "Selection Error", "No model can be bootstrapped on this selection.")
+                return
+            self.submit_job(
+                f"Bootstrap {BOOTSTRAP_METHODS[dialog.method]}", "bootstrap", X, Y, dialog.method,
+                n_resamples=dialog.n_resamples, alpha=dialog.alpha, interval=dialog.interval, tol=dialog.tol,
+                on_result=self.show_bootstrap,
+            )
+
+    def show_bootstrap(self, job):
+        table = job.result
+        level = 100 * (1 - table.attrs['alpha'])
+        interval = "BCa" if table.attrs['interval'] == 'bca' else "percentile"
+        stopped = " (intervals settled early)" if table.attrs['converged'] else ""
+        self.result_box.setPlainText(
+            f"{job.label}: {level:g}% {interval} intervals from {table.attrs['n_resamples']} resamples{stopped}, "
+            f"{table.attrs['failed']} failed refits.\n"
+            "std_error is the model's own standard error, boot_std_error the spread over resamples.\n\n"
+            + table.to_string()
+        )
+        self.plot_panel.render("Bootstrap Intervals", "plot_bootstrap_intervals", table,
+                               label=f"{job.label}: {level:g}% {interval} intervals")
 
     def run_kmeans(self, X):
         """
@@ -193,36 +1086,84 @@ class MainApp(QMainWindow):
         """
         dialog = KMeansDialog(self)
         if dialog.exec_() == dialog.Accepted:
-            n_clusters = dialog.n_clusters
+            if dialog.k_values is not None:
+                self.submit_job(
+                    "KMeans Sweep", "kmeans_sweep", X, dialog.k_values,
+                    mode=dialog.mode, on_result=self.show_kmeans_sweep,
+                )
+            elif dialog.stream:
+                # Train on every row of the file, not just the rows loaded for the preview
+                self.submit_job(
+                    "KMeans Clustering (streamed)", "kmeans_streamed", self.data_path, list(X.columns),
+                    n_clusters=dialog.n_clusters, on_result=self.show_kmeans,
+                )
+            else:
+                self.submit_job(
+                    "KMeans Clustering", "kmeans_clustering", X,
+                    n_clusters=dialog.n_clusters, mode=dialog.mode, on_result=self.show_kmeans,
+                )
 
-            try:
-                model = self.model_manager.kmeans_clustering(X, n_clusters=n_clusters)
-                # Display clustering result (code omitted for brevity)
-                self.result_box.setPlainText(f"KMeans Clustering with {n_clusters} clusters completed.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to run KMeans Clustering: {str(e)}")
+    def show_kmeans(self, job):
+        model = job.result
+        if job.method == 'kmeans_streamed':
+            # Labels cover the whole file; plot the rows loaded for the preview
+            X = self.data[job.args[1]]
+        else:
+            X = job.args[0]
+        self.plot_panel.render("Clusters", "plot_clusters", X, model.labels_[:len(X)], model.cluster_centers_)
+        sizes = np.bincount(model.labels_, minlength=model.n_clusters)
+        self.result_box.setPlainText(
+            f"KMeans Clustering with {model.n_clusters} clusters completed.\n"
+            f"Inertia: {model.inertia_:.6g}\n"
+            f"Cluster sizes: {', '.join(str(size) for size in sizes)}"
+        )
+
+    def show_kmeans_sweep(self, job):
+        curves = job.result
+        self.plot_panel.render("KMeans Sweep", "plot_kmeans_sweep", curves)
+        self.result_box.setPlainText(
+            f"KMeans sweep over k = {curves.index.min()}..{curves.index.max()} "
+            f"(best silhouette at k = {curves.attrs['best_k']}):\n{curves.to_string()}"
+        )
 
     def run_gaussian_fitting(self, X, Y):
         """
         Run Gaussian Fitting on the data.
         """
-        try:
-            params = self.model_manager.gaussian_fitting(X, Y)
-            plot_curve_fit(X, Y, params, 'gaussian')  # Display fitted Gaussian curve
-            self.result_box.setPlainText(f"Gaussian Fitting completed with parameters: {params}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to run Gaussian Fitting: {str(e)}")
+        self.submit_job("Gaussian Fitting", "gaussian_fitting", X, Y, on_result=self.show_gaussian_fitting)
+
+    def show_gaussian_fitting(self, job):
+        X, Y = job.args
+        self.plot_panel.render("Curve Fit", "plot_curve_fit", X, Y, job.result, 'gaussian')
+        self.result_box.setPlainText(f"Gaussian Fitting completed with parameters: {job.result}")
 
     def run_exponential_fitting(self, X, Y):
         """
         Run Exponential Fitting on the data.
         """
-        try:
-            params = self.model_manager.exponential_fitting(X, Y)
-            plot_curve_fit(X, Y, params, 'exponential')  # Display fitted Exponential curve
-            self.result_box.setPlainText(f"Exponential Fitting completed with parameters: {params}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to run Exponential Fitting: {str(e)}")
+        self.submit_job("Exponential Fitting", "exponential_fitting", X, Y, on_result=self.show_exponential_fitting)
+
+    def show_exponential_fitting(self, job):
+        X, Y = job.args
+        self.plot_panel.render("Curve Fit", "plot_curve_fit", X, Y, job.result, 'exponential')
+        self.result_box.setPlainText(f"Exponential Fitting completed with parameters: {job.result}")
+
+    def run_batch_curve_fit(self, X, Y, kind):
+        """
+        Fit one curve per selected X column, using the Y column as the shared x-axis.
+        """
+        self.submit_job(
+            f"Batch {kind.capitalize()} Fitting", "batch_curve_fit", Y, X, kind=kind,
+            on_result=self.show_batch_curve_fit,
+        )
+
+    def show_batch_curve_fit(self, job):
+        table = job.result
+        failed = table['stats', 'error'].ne('') & table['params'].isna().any(axis=1)
+        self.result_box.setPlainText(
+            f"Fitted {len(table) - failed.sum()} of {len(table)} series "
+            f"against {job.args[0].name}.\n{table.to_string()}"
+        )
 
 
 def main():
@@ -230,8 +1171,19 @@ def main():
     Entry point for running the GUI application.
     """
     app = QApplication(sys.argv)
+    # Paint a splash before building the window; the modelling backends load afterwards
+    pixmap = QPixmap(360, 120)
+    pixmap.fill(Qt.white)
+    splash = QSplashScreen(pixmap)
+    splash.showMessage("Loading Modeling GUI...", Qt.AlignCenter, Qt.black)
+    splash.show()
+    app.processEvents()
+
     window = MainApp()
     window.show()
+    splash.finish(window)
+    # Warm up statsmodels/scikit-learn/SciPy off the GUI thread so the first fit starts quickly
+    threading.Thread(target=preload_backends, name="preload-backends", daemon=True).start()
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -1,131 +1,480 @@
+import functools
+import importlib
+import os
 import numpy as np
 import pandas as pd
-import statsmodels.api as sm
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor, GradientBoostingClassifier, GradientBoostingRegressor
-from sklearn.cluster import KMeans
-from scipy.optimize import curve_fit
+from . import artifacts
+from .regression import OnlineLeastSquares, least_squares, least_squares_streamed, rolling_ols
+from .cache import cached_fit
+from .profiling import instrument_methods
+from .scoring import score_file
+from .utils.data_preprocessing import PreprocessedModel, Preprocessor
+from .utils.file_helper import CsvTail, iter_csv_chunks
 
+# statsmodels, scikit-learn and SciPy take seconds to import, so each method
+# imports the backend it needs on first use.
+BACKEND_MODULES = ('statsmodels.api', 'sklearn.ensemble', 'sklearn.cluster', 'scipy.optimize')
+
+
+def preload_backends():
+    """Import the modelling backends ahead of first use, e.g. from a background thread."""
+    for name in BACKEND_MODULES:
+        importlib.import_module(name)
+
+
+def _with_constant(X):
+    """Prepend a constant for statsmodels unless X already starts with one, as a DesignMatrix built with add_const=True does."""
+    if isinstance(X, pd.DataFrame) and len(X.columns) and X.columns[0] == 'const':
+        first = X.iloc[:, 0].to_numpy()
+        if first.dtype.kind == 'f' and (first == 1.0).all():
+            return X
+    import statsmodels.api as sm
+    return sm.add_constant(X)
+
+
+class ConstantResults:
+    """
+    statsmodels regression results of a fit whose regressors got a constant
+    prepended by `_with_constant`.
+
+    `predict` prepends the constant to new regressors given without it, so
+    they are passed the way the fit's X was; every other attribute is the
+    results' own.
+
+    Parameters:
+    results: The fitted statsmodels results.
+    """
+
+    def __init__(self, results):
+        self.results = results
+
+    def predict(self, exog=None, *args, **kwargs):
+        if exog is not None:
+            n_x = len(self.results.params) - 1
+            if np.ndim(exog) == 1 and n_x > 1 and len(exog) == n_x:
+                exog = np.reshape(exog, (1, n_x))  # One row of several regressors
+            width = 1 if np.ndim(exog) == 1 else np.shape(exog)[1]
+            if width == n_x:
+                import statsmodels.api as sm
+                exog = sm.add_constant(exog, has_constant='add')
+        return self.results.predict(exog, *args, **kwargs)
+
+    def __getattr__(self, name):
+        if name == 'results':  # Not set yet, e.g. while unpickling
+            raise AttributeError(name)
+        return getattr(self.results, name)
+
+
+def preprocessed(method):
+    """
+    Decorator for ModelManager methods taking X first: X goes through
+    `self.preprocessor` when the method runs, and the fitted model is paired
+    with the preprocessor so `predict` accepts raw inputs.
+    """
+    @functools.wraps(method)
+    def wrapper(self, X, *args, **kwargs):
+        if self.preprocessor is None or self._preprocessing:
+            return method(self, X, *args, **kwargs)
+        before = self.model
+        self._preprocessing = True  # Nested fits get X already transformed
+        try:
+            result = method(self, self.preprocessor.transform(X), *args, **kwargs)
+        finally:
+            self._preprocessing = False
+        if self.model is not None and self.model is not before:
+            fitted = self.model
+            self.model = PreprocessedModel(self.preprocessor, fitted)
+            if result is fitted:
+                result = self.model
+        return result
+    return wrapper
+
+
+@instrument_methods()
 class ModelManager:
-    def __init__(self):
+    def __init__(self, monitor=None, cache=None, preprocessor=None):
         self.model = None
+        # Optional JobMonitor: receives progress and is polled for cancellation.
+        self.monitor = monitor
+        # Optional ModelCache shared between managers; see cached_fit.
+        self.cache = cache
+        self.last_cache_hit = None
+        # Optional fitted Preprocessor applied to X by the methods marked @preprocessed
+        self.preprocessor = preprocessor
+        self._preprocessing = False
+
+    # --- Preprocessing ---
+
+    def fit_preprocessor(self, X, impute='mean', scale='standard', clip=None, encode='onehot',
+                         max_categories=50, drop_reference=True, chunksize=100_000):
+        """Collect imputation/clipping/scaling/encoding statistics in one pass; later fits transform their X with them."""
+        try:
+            self.preprocessor = Preprocessor(
+                impute=impute, scale=scale, clip=clip, encode=encode, max_categories=max_categories,
+                drop_reference=drop_reference,
+            ).fit(X, chunk_size=chunksize)
+            return self.preprocessor
+        except Exception as e:
+            raise Exception(f"Preprocessing Error: {str(e)}")
+
+    def fit_preprocessor_streamed(self, file_path, columns, impute='mean', scale='standard', clip=None,
+                                  encode='onehot', max_categories=50, drop_reference=True, chunksize=100_000):
+        """Preprocessor statistics from one pass over a CSV read in chunks, for files that do not fit in RAM."""
+        try:
+            self.preprocessor = Preprocessor(
+                impute=impute, scale=scale, clip=clip, encode=encode, max_categories=max_categories,
+                drop_reference=drop_reference,
+            ).fit_chunks(iter_csv_chunks(file_path, columns=list(columns), chunksize=chunksize))
+            return self.preprocessor
+        except Exception as e:
+            raise Exception(f"Preprocessing Error: {str(e)}")
 
     # --- Statistical Models ---
 
-    def ols(self, X, Y):
-        """Ordinary Least Squares (OLS) Regression."""
+    @preprocessed
+    def ols(self, X, Y, engine='statsmodels'):
+        """Ordinary Least Squares (OLS) Regression; engine='sufficient' solves from X'X for tall data or many Y columns."""
         try:
-            X = sm.add_constant(X)
-            self.model = sm.OLS(Y, X).fit()
+            if engine == 'sufficient':
+                self.model = least_squares(X, Y)
+                return self.model
+            import statsmodels.api as sm
+            X = _with_constant(X)
+            self.model = ConstantResults(sm.OLS(Y, X).fit())
             return self.model
         except Exception as e:
             raise Exception(f"OLS Model Error: {str(e)}")
 
-    def wls(self, X, Y, weights):
-        """Weighted Least Squares (WLS) Regression."""
+    @preprocessed
+    def wls(self, X, Y, weights, engine='statsmodels'):
+        """Weighted Least Squares (WLS) Regression; engine='sufficient' solves from X'WX."""
         try:
-            X = sm.add_constant(X)
-            self.model = sm.WLS(Y, X, weights=weights).fit()
+            if engine == 'sufficient':
+                self.model = least_squares(X, Y, weights=weights)
+                return self.model
+            import statsmodels.api as sm
+            X = _with_constant(X)
+            self.model = ConstantResults(sm.WLS(Y, X, weights=weights).fit())
             return self.model
         except Exception as e:
             raise Exception(f"WLS Model Error: {str(e)}")
 
+    def ols_streamed(self, file_path, x_columns, y_columns, weights_column=None, chunksize=100_000):
+        """OLS (or WLS with a weights column) of one or many targets over a CSV read in chunks, in one pass."""
+        try:
+            columns = list(x_columns) + ([y_columns] if isinstance(y_columns, str) else list(y_columns))
+            if weights_column is not None:
+                columns.append(weights_column)
+            self.model = least_squares_streamed(
+                iter_csv_chunks(file_path, columns=columns, chunksize=chunksize),
+                x_columns, y_columns, weights_column=weights_column, monitor=self.monitor,
+            )
+            return self.model
+        except Exception as e:
+            raise Exception(f"OLS Model Error: {str(e)}")
+
+    @preprocessed
     def gls(self, X, Y, sigma):
         """Generalized Least Squares (GLS) Regression."""
         try:
-            X = sm.add_constant(X)
-            self.model = sm.GLS(Y, X, sigma=sigma).fit()
+            import statsmodels.api as sm
+            X = _with_constant(X)
+            self.model = ConstantResults(sm.GLS(Y, X, sigma=sigma).fit())
             return self.model
         except Exception as e:
             raise Exception(f"GLS Model Error: {str(e)}")
 
+    @preprocessed
     def recursive_ls(self, X, Y):
         """Recursive Least Squares (Recursive LS) Regression."""
         try:
-            X = sm.add_constant(X)
+            import statsmodels.api as sm
+            X = _with_constant(X)
             self.model = sm.RecursiveLS(Y, X).fit()
             return self.model
         except Exception as e:
             raise Exception(f"Recursive LS Model Error: {str(e)}")
 
+    def recursive_ls_online(self, file_path, x_columns, y_column, forgetting=1.0, model=None, state_path=None,
+                            history=10_000):
+        """Recursive LS updated in O(p^2) per row with the rows appended to a CSV since the last call; resumes from `model` or `state_path`."""
+        try:
+            if model is None and state_path is not None and os.path.exists(state_path):
+                model = OnlineLeastSquares.load(state_path)
+            if model is None:
+                model = OnlineLeastSquares(x_columns, y_column, forgetting=forgetting, history=history)
+            elif model.x_names[model.add_const:] != [str(c) for c in x_columns] or model.y_name != str(y_column):
+                raise ValueError("The saved state was fitted on different columns.")
+            file_path = os.path.abspath(file_path)
+            if model.source_path != file_path:
+                # A new file (e.g. the next day's log) continues the same fit from its first row
+                model.source_path, model.source_offset = file_path, 0
+            tail = CsvTail(file_path, offset=model.source_offset, columns=list(x_columns) + [y_column])
+            for chunk in tail.chunks():
+                model.update(chunk[list(x_columns)], chunk[y_column])
+                if self.monitor is not None and self.monitor.cancelled:
+                    break
+            model.source_offset = tail.offset
+            if state_path is not None:
+                model.save(state_path)
+            self.model = model
+            return self.model
+        except Exception as e:
+            raise Exception(f"Recursive LS Model Error: {str(e)}")
+
+    @preprocessed
     def rlm(self, X, Y):
         """Robust Linear Model (RLM) Regression."""
         try:
-            X = sm.add_constant(X)
-            self.model = sm.RLM(Y, X).fit()
+            import statsmodels.api as sm
+            X = _with_constant(X)
+            self.model = ConstantResults(sm.RLM(Y, X).fit())
             return self.model
         except Exception as e:
             raise Exception(f"RLM Model Error: {str(e)}")
 
-    def rolling_ls(self, X, Y, window=5):
-        """Rolling Least Squares (RLS) Regression."""
+    @preprocessed
+    def rolling_ls(self, X, Y, window=5, expanding=False, method='cumsum'):
+        """Rolling/expanding Least Squares with per-window params, bse and R-squared."""
         try:
-            X = sm.add_constant(X)
-            rolling_model = pd.concat([X, Y], axis=1).rolling(window=window).apply(
-                lambda x: sm.OLS(x[:, 1], x[:, 0]).fit().params
-            )
+            rolling_model = rolling_ols(X, Y, window=window, expanding=expanding, method=method)
             return rolling_model
         except Exception as e:
             raise Exception(f"Rolling LS Model Error: {str(e)}")
 
     # --- Machine Learning Models ---
 
-    def random_forest(self, X, Y, n_estimators=100, max_depth=None):
-        """Random Forest (Classification/Regression)."""
+    @preprocessed
+    @cached_fit(data_args=('X', 'Y'))
+    def random_forest(self, X, Y, n_estimators=100, max_depth=None, n_jobs=-1):
+        """Random Forest (Classification/Regression), trained on all cores by default."""
         try:
+            from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
             if Y.dtype.kind in 'if':  # Regression for numerical targets
-                self.model = RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth)
+                self.model = RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth, n_jobs=n_jobs)
             else:  # Classification for categorical targets
-                self.model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth)
-            self.model.fit(X, Y)
+                self.model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, n_jobs=n_jobs)
+            if self.monitor is None:
+                self.model.fit(X, Y)
+            else:
+                self._fit_in_batches(X, Y, n_estimators)
             return self.model
         except Exception as e:
             raise Exception(f"Random Forest Model Error: {str(e)}")
 
-    def gradient_boost(self, X, Y, n_estimators=100, learning_rate=0.1, max_depth=None):
-        """Gradient Boosting (Classification/Regression)."""
+    @preprocessed
+    @cached_fit(data_args=('X', 'Y'))
+    def gradient_boost(self, X, Y, n_estimators=100, learning_rate=0.1, max_depth=None,
+                       backend='classic', early_stopping=False, validation_fraction=0.1):
+        """Gradient Boosting (Classification/Regression); backend='histogram' is multi-threaded and handles NaN/categories."""
         try:
+            from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor
+            from .boosting import BACKENDS, histogram_pipeline
+            if backend not in BACKENDS:
+                raise ValueError(f"Invalid backend. Choose one of {', '.join(BACKENDS)}.")
+            if backend == 'histogram':
+                self.model = histogram_pipeline(
+                    X, Y, n_estimators=n_estimators, learning_rate=learning_rate, max_depth=max_depth,
+                    early_stopping=early_stopping, validation_fraction=validation_fraction,
+                )
+                if self.monitor is None:
+                    self.model.fit(X, Y)
+                else:
+                    self._fit_in_batches(X, Y, n_estimators, size_param='boost__max_iter',
+                                         warm_start_param='boost__warm_start')
+                return self.model
+            if early_stopping:
+                stopping = {'n_iter_no_change': 10, 'validation_fraction': validation_fraction}
+            else:
+                stopping = {}
             if Y.dtype.kind in 'if':  # Regression for numerical targets
-                self.model = GradientBoostingRegressor(n_estimators=n_estimators, learning_rate=learning_rate, max_depth=max_depth)
+                self.model = GradientBoostingRegressor(n_estimators=n_estimators, learning_rate=learning_rate, max_depth=max_depth, **stopping)
             else:  # Classification for categorical targets
-                self.model = GradientBoostingClassifier(n_estimators=n_estimators, learning_rate=learning_rate, max_depth=max_depth)
-            self.model.fit(X, Y)
+                self.model = GradientBoostingClassifier(n_estimators=n_estimators, learning_rate=learning_rate, max_depth=max_depth, **stopping)
+            if self.monitor is None:
+                self.model.fit(X, Y)
+            else:
+                self.model.fit(X, Y, monitor=self._boosting_monitor(n_estimators))
             return self.model
         except Exception as e:
             raise Exception(f"Gradient Boosting Model Error: {str(e)}")
 
+    def gradient_boost_streamed(self, file_path, x_columns, y_column, chunksize=100_000, n_estimators=100,
+                                learning_rate=0.1, max_depth=None, early_stopping=False, validation_fraction=0.1):
+        """Histogram Gradient Boosting trained from a CSV read in chunks, for files that do not fit in RAM."""
+        try:
+            from .boosting import fit_histogram_boosting_streamed
+            columns = list(x_columns) + [y_column]
+            self.model = fit_histogram_boosting_streamed(
+                lambda: iter_csv_chunks(file_path, columns=columns, chunksize=chunksize),
+                list(x_columns), y_column, n_estimators=n_estimators, learning_rate=learning_rate,
+                max_depth=max_depth, early_stopping=early_stopping,
+                validation_fraction=validation_fraction, monitor=self.monitor,
+            )
+            return self.model
+        except Exception as e:
+            raise Exception(f"Gradient Boosting Model Error: {str(e)}")
+
+    def _fit_in_batches(self, X, Y, total, size_param='n_estimators', warm_start_param='warm_start', n_batches=20):
+        """Grow an ensemble with warm_start so progress and cancellation are checked between batches."""
+        step = max(1, total // n_batches)
+        self.model.set_params(**{warm_start_param: True})
+        for size in range(step, total + step, step):
+            size = min(size, total)
+            self.model.set_params(**{size_param: size})
+            self.model.fit(X, Y)
+            self.monitor.progress(size, total)
+            # Early stopping leaves n_iter_ short of the requested size
+            stopped = getattr(self.model[-1] if hasattr(self.model, 'steps') else self.model, 'n_iter_', size) < size
+            if self.monitor.cancelled or stopped or size == total:
+                break
+        self.model.set_params(**{warm_start_param: False})
+
+    def _boosting_monitor(self, n_estimators):
+        """Stage callback for sklearn boosting: reports progress, returns True to stop early."""
+        def monitor(stage, estimator, local_vars):
+            self.monitor.progress(stage + 1, n_estimators)
+            return self.monitor.cancelled
+        return monitor
+
+    def hyperparameter_search(self, X, Y, method, space, strategy='grid', n_iter=10, cv=3,
+                              n_workers=None, on_row=None, refit=True):
+        """Parallel grid/random/successive-halving search, preprocessed per fold; refits the best candidate on all rows."""
+        try:
+            from . import search
+            leaderboard = search.hyperparameter_search(
+                X, Y, method, space, strategy=strategy, n_iter=n_iter, cv=cv, n_workers=n_workers,
+                preprocessor=self._fold_preprocessor(), on_row=on_row, monitor=self.monitor,
+            )
+            if refit and not leaderboard.empty and (self.monitor is None or not self.monitor.cancelled):
+                monitor, self.monitor = self.monitor, None
+                try:
+                    getattr(self, method)(X, Y, **leaderboard.attrs['best_params'])
+                finally:
+                    self.monitor = monitor
+            return leaderboard
+        except Exception as e:
+            raise Exception(f"Hyperparameter Search Error: {str(e)}")
+
+    def compare_models(self, X, Y, methods, cv=5, splitter='kfold', params=None, n_workers=None, on_row=None):
+        """Cross-validate several methods in parallel on the same folds; returns held-out metrics and timings per method."""
+        try:
+            from . import comparison
+            return comparison.compare_models(
+                X, Y, methods, cv=cv, splitter=splitter, params=params, n_workers=n_workers,
+                preprocessor=self._fold_preprocessor(), on_row=on_row, monitor=self.monitor,
+            )
+        except Exception as e:
+            raise Exception(f"Model Comparison Error: {str(e)}")
+
+    def _fold_preprocessor(self):
+        """The preprocessing settings for cross-validation, which refits them on every fold's training rows."""
+        if self.preprocessor is None or self._preprocessing:
+            return None
+        return self.preprocessor.unfitted()
+
+    @preprocessed
+    def grouped_fit(self, X, Y, groups, method='ols', params=None, min_rows=None, n_workers=None):
+        """Fit one model per group (e.g. per category) and return a tidy per-group parameter table; small or failed groups are reported, not fatal."""
+        try:
+            from . import grouped
+            return grouped.grouped_fit(
+                X, Y, groups, method=method, params=params, min_rows=min_rows,
+                n_workers=n_workers, monitor=self.monitor,
+            )
+        except Exception as e:
+            raise Exception(f"Grouped Fitting Error: {str(e)}")
+
+    @preprocessed
+    def bootstrap(self, X, Y, method, params=None, n_resamples=1000, alpha=0.05, interval='percentile', tol=0.01,
+                  n_workers=None):
+        """Percentile or BCa bootstrap intervals for the parameters of `method`, refitted in parallel from warm starts."""
+        try:
+            from . import bootstrap
+            return bootstrap.bootstrap(
+                X, Y, method, params=params, n_resamples=n_resamples, alpha=alpha, interval=interval,
+                tol=tol, n_workers=n_workers, monitor=self.monitor,
+            )
+        except Exception as e:
+            raise Exception(f"Bootstrap Error: {str(e)}")
+
     # --- Clustering ---
 
-    def kmeans_clustering(self, X, n_clusters=3):
-        """KMeans Clustering with customizable number of clusters."""
+    @preprocessed
+    @cached_fit(data_args=('X',))
+    def kmeans_clustering(self, X, n_clusters=3, mode='full', batch_size=4096):
+        """KMeans Clustering; mode='minibatch' updates centroids from random batches for large tables."""
+        try:
+            from .clustering import fit_kmeans
+            self.model = fit_kmeans(X, n_clusters=n_clusters, mode=mode, batch_size=batch_size)
+            return self.model
+        except Exception as e:
+            raise Exception(f"KMeans Clustering Error: {str(e)}")
+
+    def kmeans_streamed(self, file_path, columns, n_clusters=3, chunksize=100_000, batch_size=4096, n_passes=1):
+        """Mini-batch KMeans trained from a CSV read in chunks, for files that do not fit in RAM."""
         try:
-            self.model = KMeans(n_clusters=n_clusters)
-            self.model.fit(X)
+            from .clustering import fit_kmeans_streamed
+            columns = list(columns)
+            self.model = fit_kmeans_streamed(
+                lambda: iter_csv_chunks(file_path, columns=columns, chunksize=chunksize),
+                columns, n_clusters=n_clusters, batch_size=batch_size, n_passes=n_passes,
+                monitor=self.monitor,
+            )
             return self.model
         except Exception as e:
             raise Exception(f"KMeans Clustering Error: {str(e)}")
 
+    @preprocessed
+    def kmeans_sweep(self, X, k_values, mode='full', batch_size=4096, sample_size=2000, n_workers=None):
+        """Fit KMeans for each k in parallel; returns elbow/silhouette curves and keeps the best-silhouette model."""
+        try:
+            from . import clustering
+            curves, models = clustering.kmeans_sweep(
+                X, k_values, mode=mode, batch_size=batch_size, sample_size=sample_size,
+                n_workers=n_workers, monitor=self.monitor,
+            )
+            scored = curves['silhouette'].dropna()
+            best_k = scored.idxmax() if not scored.empty else curves.index[0]
+            self.model = models[best_k]
+            curves.attrs['best_k'] = int(best_k)
+            return curves
+        except Exception as e:
+            raise Exception(f"KMeans Clustering Error: {str(e)}")
+
     # --- Advanced Data Fitting ---
 
     def gaussian_fitting(self, X, Y):
-        """Gaussian Fitting."""
+        """Gaussian Fitting from moment-based starting values with the analytic Jacobian."""
         try:
-            def gaussian(x, a, x0, sigma):
-                return a * np.exp(-(x - x0) ** 2 / (2 * sigma ** 2))
-            params, _ = curve_fit(gaussian, X, Y)
-            return params
+            return self._fit_single_curve(X, Y, 'gaussian')
         except Exception as e:
             raise Exception(f"Gaussian Fitting Error: {str(e)}")
 
     def exponential_fitting(self, X, Y):
-        """Exponential Growth/Decay Fitting."""
+        """Exponential Growth/Decay Fitting from running-integral regression starting values with the analytic Jacobian."""
         try:
-            def exponential(x, a, b, c):
-                return a * np.exp(b * x) + c
-            params, _ = curve_fit(exponential, X, Y)
-            return params
+            return self._fit_single_curve(X, Y, 'exponential')
         except Exception as e:
             raise Exception(f"Exponential Fitting Error: {str(e)}")
 
+    def batch_curve_fit(self, X, Y, kind='gaussian', n_workers=None):
+        """Fit one Gaussian or exponential per column of Y in a process pool; returns a params/bse/cov table."""
+        try:
+            from . import curve_fitting
+            return curve_fitting.batch_curve_fit(X, Y, kind=kind, n_workers=n_workers, monitor=self.monitor)
+        except Exception as e:
+            raise Exception(f"Batch Curve Fitting Error: {str(e)}")
+
+    def _fit_single_curve(self, X, Y, kind):
+        from .curve_fitting import batch_curve_fit
+        x = np.asarray(X, dtype=np.float64).reshape(-1)
+        table = batch_curve_fit(x, np.asarray(Y, dtype=np.float64).reshape(-1), kind=kind, n_workers=1)
+        params = table['params'].iloc[0].to_numpy()
+        if np.isnan(params).any():
+            raise ValueError(table['stats', 'error'].iloc[0])
+        return params
+
     def get_summary(self):
         """Get the summary of the model if available."""
         if hasattr(self.model, 'summary'):
@@ -139,3 +488,57 @@ class ModelManager:
             raise ValueError("Model has not been trained yet.")
         return self.model.predict(X)
 
+    def save_model(self, path, model=None, fit_method=None, X=None, Y=None, params=None, fit_seconds=None,
+                   compact=True, overwrite=False, **extra):
+        """Save the fitted model (or `model`) with a manifest describing its fit; returns the manifest."""
+        model = model if model is not None else self.model
+        if model is None:
+            raise ValueError("Model has not been trained yet.")
+        try:
+            manifest = artifacts.build_manifest(fit_method, X=X, Y=Y, params=params, fit_seconds=fit_seconds, **extra)
+            return artifacts.save_model(model, path, manifest=manifest, compact=compact, overwrite=overwrite)
+        except Exception as e:
+            raise Exception(f"Save Model Error: {str(e)}")
+
+    def load_model(self, path, mmap=True):
+        """Load a saved model without refitting; forests and large arrays are memory-mapped."""
+        try:
+            self.model = artifacts.load_model(path, mmap=mmap)
+            return self.model
+        except Exception as e:
+            raise Exception(f"Load Model Error: {str(e)}")
+
+    def predict_file(self, file_path, output_path, x_columns=None, keep_columns=None, chunksize=100_000,
+                     workers=None, model=None):
+        """Score a CSV in chunks across worker processes, writing predictions as they arrive; returns a throughput report."""
+        model = model if model is not None else self.model
+        if model is None:
+            raise ValueError("Model has not been trained yet.")
+        try:
+            return score_file(model, file_path, output_path, x_columns=x_columns, keep_columns=keep_columns,
+                              chunksize=chunksize, workers=workers, monitor=self.monitor)
+        except Exception as e:
+            raise Exception(f"Scoring Error: {str(e)}")
+
+    def tree_summary(self, model=None):
+        """Cached structure statistics and impurity importances of a fitted tree ensemble."""
+        model = model if model is not None else self.model
+        if model is None:
+            raise ValueError("Model has not been trained yet.")
+        try:
+            from .inspection import summarize
+            return summarize(model)
+        except Exception as e:
+            raise Exception(f"Tree Inspection Error: {str(e)}")
+
+    def permutation_importance(self, X, Y, n_repeats=5, n_workers=None, model=None):
+        """Score drop per shuffled column, computed for the columns in parallel worker processes."""
+        model = model if model is not None else self.model
+        if model is None:
+            raise ValueError("Model has not been trained yet.")
+        try:
+            from .inspection import permutation_importance
+            return permutation_importance(model, X, Y, n_repeats=n_repeats, n_workers=n_workers,
+                                          monitor=self.monitor)
+        except Exception as e:
+            raise Exception(f"Permutation Importance Error: {str(e)}")
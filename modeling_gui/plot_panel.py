@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QSize, QTimer, pyqtSignal
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtWidgets import QTabWidget, QWidget
+
+from modeling_gui.profiling import PROFILER
+
+# Logical dots per inch of the rendered figures; the device pixel ratio scales it
+_DPI = 100.0
+
+
+class FigureView(QWidget):
+    """
+    Shows an image rendered elsewhere, scaled to the widget until a render at its new size arrives.
+
+    `resize_needed` is emitted, once the widget has kept a size for a moment,
+    when the image no longer matches its size in device pixels.
+    """
+
+    resize_needed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super(FigureView, self).__init__(parent)
+        self._image = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(150)
+        self._timer.timeout.connect(self._check_size)
+
+    def image(self):
+        return self._image
+
+    def set_image(self, image):
+        self._image = image
+        self.update()
+
+    def pixel_size(self):
+        """Size of the widget in device pixels."""
+        return QSize(round(self.width() * self.devicePixelRatioF()), round(self.height() * self.devicePixelRatioF()))
+
+    def paintEvent(self, event):
+        if self._image is None:
+            return
+        painter = QPainter(self)
+        painter.drawImage(self.rect(), self._image)
+        painter.end()
+        if self._image.size() != self.pixel_size():
+            self._timer.start()
+
+    def _check_size(self):
+        if self._image is not None and self.isVisible() and self._image.size() != self.pixel_size():
+            self.resize_needed.emit()
+
+
+class PlotPanel(QTabWidget):
+    """
+    Tabs of rendered matplotlib figures, one reusable view per plot title.
+
+    Plots are drawn and rendered with Agg on a worker thread into pooled
+    figures, at the view's size in device pixels. Each title has two figures
+    used as front and back buffers: the worker always draws into the one not
+    on screen and copies its RGBA buffer into an image, and the GUI thread
+    only paints that image, so nothing is drawn on the GUI thread. A view
+    that is resized asks for the plot again at its new size. matplotlib
+    itself is imported on the worker the first time something is plotted.
+    """
+
+    figure_ready = pyqtSignal(str, object, object, int, int)
+    render_failed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None):
+        super(PlotPanel, self).__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plot-render")
+        self._pool = None
+        self._views = {}
+        self._figures = {}
+        self._requests = {}
+        self._displayed = {}
+        self._generation = {}
+        self.figure_ready.connect(self._show_figure)
+
+    def render(self, title, plot, *args, **kwargs):
+        """
+        Call plot(*args, figure=..., **kwargs) off the GUI thread and show the result.
+
+        Parameters:
+        title (str): Tab title; a new plot with the same title replaces the old one.
+        plot (str or callable): A function of `modeling_gui.visualization`, by
+            name or as a callable accepting a `figure` keyword.
+        """
+        generation = self._generation.get(title, 0) + 1
+        self._generation[title] = generation
+        self._requests[title] = (plot, args, kwargs)
+        # Every page of the tab widget has the size of the current one
+        page = self.currentWidget()
+        if page is not None:
+            size = page.size()
+        else:
+            size = QSize(self.width(), self.height() - self.tabBar().sizeHint().height())
+        width, height = max(size.width(), 100), max(size.height(), 100)
+        return self._executor.submit(self._render, title, generation, plot, args, kwargs,
+                                     width, height, self.devicePixelRatioF())
+
+    def figure(self, title):
+        """The figure currently shown under `title`, or None."""
+        return self._figures.get(title)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _render(self, title, generation, plot, args, kwargs, width, height, ratio):
+        try:
+            from modeling_gui import visualization
+            if self._pool is None:
+                self._pool = visualization.FigurePool(max_figures=64)
+            if isinstance(plot, str):
+                plot = getattr(visualization, plot)
+            # Draw into whichever buffer is not on screen
+            buffer = 1 - self._displayed.get(title, 1)
+            figure = self._pool.acquire((title, buffer), figsize=(width / _DPI, height / _DPI))
+            figure.set_dpi(_DPI * ratio)
+            arguments = dict({f"arg{i}": value for i, value in enumerate(args)}, **kwargs)
+            with PROFILER.span(f"plot:{getattr(plot, '__name__', title)}", arguments):
+                plot(*args, figure=figure, **kwargs)
+                figure.set_size_inches(width / _DPI, height / _DPI)
+                figure.canvas.draw()
+                rgba = figure.canvas.buffer_rgba()
+                image = QImage(rgba, rgba.shape[1], rgba.shape[0], rgba.strides[0], QImage.Format_RGBA8888).copy()
+                image.setDevicePixelRatio(ratio)
+        except Exception as e:
+            self.render_failed.emit(title, str(e))
+            return
+        self.figure_ready.emit(title, figure, image, generation, buffer)
+
+    def _show_figure(self, title, figure, image, generation, buffer):
+        if generation != self._generation.get(title):
+            return  # A newer plot for this title is already being drawn
+        view = self._views.get(title)
+        if view is None:
+            view = FigureView()
+            view.resize_needed.connect(lambda: self._render_again(title))
+            self._views[title] = view
+            self.addTab(view, title)
+        view.set_image(image)
+        self._figures[title] = figure
+        self._displayed[title] = buffer
+        self.setCurrentWidget(view)
+
+    def _render_again(self, title):
+        plot, args, kwargs = self._requests[title]
+        self.render(title, plot, *args, **kwargs)
@@ -0,0 +1,280 @@
+"""
+Opt-in timing and profiling of ModelManager calls and GUI handlers.
+
+Instrumented functions check one flag and call straight through while the
+profiler is disabled. Once enabled, every call produces a record with wall
+and CPU time, resident memory, input shapes and hyperparameters. Records are
+kept in memory for the GUI's Performance window and appended to a JSONL
+log. A cProfile dump and the Python allocation peak (tracemalloc) can be
+captured per run as well.
+
+Enable from the environment, e.g. for a production session:
+
+    MODELING_GUI_PROFILE=~/modeling_gui_runs.jsonl MODELING_GUI_PROFILE_CAPTURE=tracemalloc modeling_gui
+
+or in code with `PROFILER.enable(log_path, profile=True)`.
+"""
+import functools
+import inspect
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def max_rss_mb():
+    """Peak resident memory of this process in MB (kilobytes on Linux, bytes on macOS)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def rss_mb():
+    """Current resident memory of this process in MB, where /proc is available."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+
+
+def describe_arguments(arguments):
+    """
+    Split call arguments into input shapes and JSON-safe hyperparameters.
+
+    Returns:
+    tuple: (shapes dict, params dict); data is summarized by shape, other
+    objects by type name.
+    """
+    shapes, params = {}, {}
+    for name, value in arguments.items():
+        if hasattr(value, 'shape') and not isinstance(value, (int, float)):
+            shapes[name] = list(value.shape)
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            params[name] = value
+        elif isinstance(value, (list, tuple)) and len(value) <= 50 and \
+                all(v is None or isinstance(v, (bool, int, float, str)) for v in value):
+            params[name] = list(value)
+        elif isinstance(value, dict) and len(value) <= 50:
+            params[name] = json.loads(json.dumps(value, default=repr))
+        elif not callable(value):
+            params[name] = type(value).__name__
+    return shapes, params
+
+
+class Profiler:
+    """
+    Collects run records from instrumented calls.
+
+    Parameters:
+    history (int): Number of recent records kept in memory.
+    """
+
+    def __init__(self, history=200):
+        self.enabled = False
+        self.log_path = None
+        self.profile_dir = None
+        self.trace_memory = False
+        self._records = deque(maxlen=history)
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._profiling = threading.Lock()  # cProfile can only run one capture at a time
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+
+    def enable(self, log_path=None, profile=False, trace_memory=False, profile_dir=None):
+        """
+        Start recording.
+
+        Parameters:
+        log_path (str): JSONL file the records are appended to; memory only when None.
+        profile (bool): Save a cProfile dump of each top-level run.
+        trace_memory (bool): Record the peak of Python allocations per run
+            (tracemalloc; slows allocation-heavy code down noticeably).
+        profile_dir (str): Where the dumps go; defaults to a 'profiles'
+            directory next to the log, or the current directory.
+        """
+        self.log_path = Path(log_path).expanduser() if log_path else None
+        if self.log_path is not None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        if profile:
+            base = self.log_path.parent if self.log_path is not None else Path.cwd()
+            self.profile_dir = Path(profile_dir) if profile_dir else base / 'profiles'
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            self.profile_dir = None
+        self.trace_memory = trace_memory
+        if trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.stop()
+            self.trace_memory = False
+
+    def configure_from_environment(self):
+        """Enable when MODELING_GUI_PROFILE names a log file; MODELING_GUI_PROFILE_CAPTURE lists cprofile/tracemalloc."""
+        log_path = os.environ.get("MODELING_GUI_PROFILE")
+        if log_path:
+            capture = {c.strip().lower() for c in os.environ.get("MODELING_GUI_PROFILE_CAPTURE", "").split(',')}
+            self.enable(log_path, profile='cprofile' in capture, trace_memory='tracemalloc' in capture)
+
+    def records(self):
+        """The most recent records, oldest first."""
+        with self._lock:
+            return list(self._records)
+
+    def add_listener(self, callback):
+        """Call `callback(record)` for every new record, on the thread that made it."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @contextmanager
+    def span(self, name, arguments=None):
+        """
+        Record the enclosed block as one run; a no-op while disabled.
+
+        Parameters:
+        name (str): Run name, e.g. 'ModelManager.ols'.
+        arguments (dict): Call arguments, summarized by `describe_arguments`.
+        """
+        if not self.enabled:
+            yield None
+            return
+        depth = getattr(self._local, 'depth', 0)
+        record = {'id': next(self._ids), 'name': name, 'thread': threading.current_thread().name, 'depth': depth}
+        if arguments:
+            record['shapes'], record['params'] = describe_arguments(arguments)
+
+        # Captures apply to top-level runs only; nested runs are inside their dumps
+        profiler = None
+        if self.profile_dir is not None and depth == 0 and self._profiling.acquire(blocking=False):
+            import cProfile
+            profiler = cProfile.Profile()
+        tracing = self.trace_memory and depth == 0
+        if tracing:
+            import tracemalloc
+            tracemalloc.reset_peak()
+
+        self._local.depth = depth + 1
+        record['started'] = time.time()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            yield record
+            record['status'] = 'ok'
+        except BaseException as e:
+            record['status'] = 'error'
+            record['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record['wall_seconds'] = time.perf_counter() - wall
+            record['cpu_seconds'] = time.process_time() - cpu
+            self._local.depth = depth
+            record['rss_mb'] = rss_mb()
+            record['max_rss_mb'] = max_rss_mb()
+            if tracing:
+                record['python_peak_mb'] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+            if profiler is not None:
+                path = self.profile_dir / f"{record['id']:05d}-{name.replace('/', '_')}.prof"
+                profiler.dump_stats(path)
+                self._profiling.release()
+                record['profile'] = str(path)
+            self._add(record)
+
+    def _add(self, record):
+        with self._lock:
+            self._records.append(record)
+            if self.log_path is not None:
+                with open(self.log_path, 'a') as log:
+                    log.write(json.dumps(record, default=str) + '\n')
+        for callback in list(self._listeners):
+            callback(record)
+
+
+# Shared by every instrumented function
+PROFILER = Profiler()
+PROFILER.configure_from_environment()
+
+
+def instrumented(name=None, trim_args=False):
+    """
+    Decorator recording each call with `PROFILER` while it is enabled.
+
+    Parameters:
+    name (str): Run name; defaults to the function's qualified name.
+    trim_args (bool): Drop surplus positional arguments, as Qt does for
+        slots that take fewer arguments than the signal sends.
+    """
+    def decorator(function):
+        signature = inspect.signature(function)
+        run_name = name or function.__qualname__
+        parameters = list(signature.parameters.values())
+        positional = None
+        if trim_args and not any(p.kind is p.VAR_POSITIONAL for p in parameters):
+            positional = sum(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in parameters)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if positional is not None:
+                args = args[:positional]
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+            try:
+                arguments = dict(signature.bind(*args, **kwargs).arguments)
+            except TypeError:
+                arguments = None  # Let the call itself raise
+            else:
+                arguments.pop('self', None)
+                arguments.update(arguments.pop('kwargs', {}))
+            with PROFILER.span(run_name, arguments) as record:
+                result = function(*args, **kwargs)
+                source = getattr(args[0], 'last_cache_hit', None) if args else None
+                if source is not None and record is not None:
+                    record['cache_hit'] = source
+                return result
+        return wrapper
+    return decorator
+
+
+def instrument_methods(prefixes=None, trim_args=False):
+    """
+    Class decorator applying `instrumented` to public methods.
+
+    Parameters:
+    prefixes (tuple): Only methods whose names start with one of these; all
+        public methods when None.
+    trim_args (bool): See `instrumented`; needed for Qt slots.
+    """
+    def decorator(cls):
+        for attribute, value in list(vars(cls).items()):
+            if attribute.startswith('_') or not inspect.isfunction(value):
+                continue
+            if prefixes is not None and not attribute.startswith(tuple(prefixes)):
+                continue
+            setattr(cls, attribute, instrumented(f"{cls.__name__}.{attribute}", trim_args)(value))
+        return cls
+    return decorator
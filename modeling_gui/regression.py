@@ -0,0 +1,822 @@
+import json
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+
+def _design_matrix(X, Y, add_const=True):
+    """
+    Build the augmented matrix [const, X, Y] used by the closed-form engines.
+
+    Parameters:
+    X (pd.DataFrame, pd.Series or np.ndarray): Regressors.
+    Y (pd.Series or np.ndarray): Target.
+    add_const (bool): Prepend a column of ones.
+
+    Returns:
+    tuple: (augmented float64 array, regressor names, row index)
+    """
+    if isinstance(X, pd.Series):
+        X = X.to_frame()
+    if isinstance(X, pd.DataFrame):
+        names = [str(c) for c in X.columns]
+        index = X.index
+        x_values = X.to_numpy(dtype=np.float64)
+    else:
+        x_values = np.asarray(X, dtype=np.float64)
+        if x_values.ndim == 1:
+            x_values = x_values[:, None]
+        names = [f"x{i + 1}" for i in range(x_values.shape[1])]
+        index = pd.RangeIndex(x_values.shape[0])
+
+    y_values = np.asarray(Y, dtype=np.float64).reshape(-1)
+    if len(y_values) != len(x_values):
+        raise ValueError("X and Y must have the same number of rows.")
+
+    n, k = x_values.shape
+    offset = 1 if add_const else 0
+    A = np.empty((n, k + offset + 1), dtype=np.float64)
+    if add_const:
+        A[:, 0] = 1.0
+        names = ['const'] + names
+    A[:, offset:offset + k] = x_values
+    A[:, -1] = y_values
+    return A, names, index
+
+
+def _solve_windows(S, nobs, p, min_nobs, has_const, shift):
+    """
+    Solve the normal equations for a stack of windowed cross-product matrices.
+
+    Parameters:
+    S (np.ndarray): Array of shape (m, p + 1, p + 1) holding [X, y]'[X, y] per window.
+    nobs (np.ndarray): Number of valid observations in each window.
+    p (int): Number of regressors, including the constant.
+    min_nobs (int): Minimum observations required to report a window.
+    has_const (bool): Whether column 0 is the constant.
+    shift (np.ndarray): Column means subtracted from [X, y] before accumulation.
+
+    Returns:
+    tuple: (params, bse, rsquared), each with NaN for windows that cannot be solved.
+    """
+    m = len(S)
+    params = np.full((m, p), np.nan)
+    bse = np.full((m, p), np.nan)
+    rsquared = np.full(m, np.nan)
+
+    ok = nobs >= max(min_nobs, p + 1)
+    if not ok.any():
+        return params, bse, rsquared
+
+    XtX = S[ok, :p, :p]
+    Xty = S[ok, :p, p]
+    yty = S[ok, p, p]
+    n = nobs[ok].astype(np.float64)
+
+    # Rank-deficient windows are dropped rather than aborting the whole stack.
+    try:
+        inv = np.linalg.inv(XtX)
+    except np.linalg.LinAlgError:
+        full_rank = np.linalg.matrix_rank(XtX) == p
+        inv = np.full_like(XtX, np.nan)
+        if full_rank.any():
+            inv[full_rank] = np.linalg.inv(XtX[full_rank])
+    residual = np.abs(XtX @ inv - np.eye(p)).max(axis=(1, 2))
+    inv[~(residual < 1e-6)] = np.nan
+
+    beta = np.einsum('mij,mj->mi', inv, Xty)
+    ssr = np.maximum(yty - np.einsum('mi,mi->m', beta, Xty), 0.0)
+    sigma2 = ssr / (n - p)
+
+    if has_const:
+        sum_y = S[ok, 0, p]
+        sst = yty - sum_y ** 2 / n
+        # Map the intercept of the centred problem back to the original scale:
+        # const = const_c - b . x_mean + y_mean, with gradient g = [1, -x_mean].
+        x_shift = shift[1:p]
+        beta[:, 0] = beta[:, 0] - beta[:, 1:] @ x_shift + shift[p]
+        g = np.concatenate([[1.0], -x_shift])
+        var_const = np.einsum('i,mij,j->m', g, inv, g)
+    else:
+        sst = yty
+
+    var = sigma2[:, None] * np.diagonal(inv, axis1=1, axis2=2).copy()
+    if has_const:
+        var[:, 0] = sigma2 * var_const
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r2 = 1.0 - ssr / sst
+
+    params[ok] = beta
+    bse[ok] = np.sqrt(var)
+    rsquared[ok] = r2
+    return params, bse, rsquared
+
+
+def _windowed_sums(A, valid, window, expanding, chunk_size):
+    """
+    Yield (start, stop, sums, nobs) blocks of windowed cross-product sums.
+
+    The cumulative sums restart at every chunk so rounding error does not grow
+    with the length of the series.
+    """
+    n, k = A.shape
+    carry = np.zeros((k, k))
+    carry_n = 0
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        lo = start if expanding else max(0, start - window + 1)
+        block = A[lo:stop]
+        outer = np.einsum('ti,tj->tij', block, block)
+        csum = np.empty((len(block) + 1, k, k))
+        csum[0] = 0.0
+        np.cumsum(outer, axis=0, out=csum[1:])
+        ccount = np.concatenate([[0], np.cumsum(valid[lo:stop])])
+
+        rows = np.arange(start, stop)
+        upper = rows - lo + 1
+        if expanding:
+            sums = csum[upper] + carry
+            nobs = ccount[upper] + carry_n
+            carry = sums[-1].copy()
+            carry_n = nobs[-1]
+        else:
+            lower = np.maximum(rows - window + 1 - lo, 0)
+            sums = csum[upper] - csum[lower]
+            nobs = ccount[upper] - ccount[lower]
+            # Windows that would start before the first row are incomplete.
+            nobs = np.where(rows - window + 1 < 0, 0, nobs)
+        yield start, stop, sums, nobs
+
+
+def _recursive_windows(A, valid, window, expanding, min_nobs, p, has_const):
+    """
+    Sequential Sherman-Morrison update/downdate of (X'X)^-1 and the coefficients.
+
+    Costs O(p^2) per row and never forms differences of large cumulative sums,
+    which keeps long series with large offsets well conditioned.
+    """
+    n, k = A.shape
+    params = np.full((n, p), np.nan)
+    bse = np.full((n, p), np.nan)
+    rsquared = np.full(n, np.nan)
+    nobs_out = np.zeros(n, dtype=np.int64)
+
+    XtX = np.zeros((p, p))
+    Xty = np.zeros(p)
+    yty = 0.0
+    sum_y = 0.0
+    count = 0
+    P = None
+    beta = None
+
+    def add(x, y, sign):
+        nonlocal yty, sum_y, count, P, beta
+        XtX[...] += sign * np.outer(x, x)
+        Xty[...] += sign * y * x
+        yty += sign * y * y
+        sum_y += sign * y
+        count += int(sign)
+        if P is None:
+            return
+        Px = P @ x
+        denom = 1.0 + sign * (x @ Px)
+        if denom <= 1e-12:
+            P = None
+            return
+        gain = Px / denom
+        beta = beta + sign * gain * (y - x @ beta)
+        P = P - sign * np.outer(gain, Px)
+
+    for t in range(n):
+        if valid[t]:
+            add(A[t, :p], A[t, p], 1.0)
+        if not expanding and t - window >= 0 and valid[t - window]:
+            add(A[t - window, :p], A[t - window, p], -1.0)
+        nobs_out[t] = count
+        if count < max(min_nobs, p + 1):
+            continue
+        if P is None:
+            if np.linalg.matrix_rank(XtX) < p:
+                continue
+            P = np.linalg.inv(XtX)
+            beta = P @ Xty
+        ssr = max(yty - beta @ Xty, 0.0)
+        sigma2 = ssr / (count - p)
+        sst = yty - sum_y ** 2 / count if has_const else yty
+        params[t] = beta
+        bse[t] = np.sqrt(sigma2 * np.diag(P))
+        rsquared[t] = 1.0 - ssr / sst if sst > 0 else np.nan
+    return params, bse, rsquared, nobs_out
+
+
+def rolling_ols(X, Y, window=5, expanding=False, min_nobs=None, add_const=True,
+                method='cumsum', chunk_size=100_000):
+    """
+    Rolling or expanding OLS computed from windowed cross-products in one pass.
+
+    X'X and X'y for every window are obtained from cumulative sums of the row
+    outer products, so the cost is O(n p^2) plus one batched p x p solve per
+    window instead of a full model fit per window.
+
+    Parameters:
+    X (pd.DataFrame, pd.Series or np.ndarray): Regressors.
+    Y (pd.Series or np.ndarray): Target.
+    window (int): Number of rows in each window (ignored when expanding).
+    expanding (bool): Use all rows up to each point instead of a fixed window.
+    min_nobs (int): Minimum valid rows before a window is reported. Defaults to
+        `window` for rolling and to the number of regressors + 1 when expanding.
+    add_const (bool): Include an intercept.
+    method (str): 'cumsum' for the vectorized cross-product engine or
+        'recursive' for Sherman-Morrison updating/downdating.
+    chunk_size (int): Rows processed per block; bounds peak memory.
+
+    Returns:
+    pd.DataFrame: Columns grouped under 'params', 'bse' and 'stats'
+    ('rsquared', 'nobs'), one row per input row.
+    """
+    if method not in ('cumsum', 'recursive'):
+        raise ValueError("Invalid method. Choose 'cumsum' or 'recursive'.")
+    window = int(window)
+    if not expanding and window < 2:
+        raise ValueError("Window must contain at least two rows.")
+
+    A, names, index = _design_matrix(X, Y, add_const=add_const)
+    n, k = A.shape
+    p = k - 1
+    if min_nobs is None:
+        min_nobs = p + 1 if expanding else window
+
+    valid = np.isfinite(A).all(axis=1)
+    A[~valid] = 0.0
+
+    if method == 'recursive':
+        params, bse, rsquared, nobs = _recursive_windows(
+            A, valid, window, expanding, min_nobs, p, add_const
+        )
+    else:
+        # Centre the non-constant columns so the cross-product sums stay small.
+        shift = np.zeros(k)
+        if add_const and valid.any():
+            shift[1:] = A[valid, 1:].mean(axis=0)
+            A[valid, 1:] -= shift[1:]
+
+        params = np.empty((n, p))
+        bse = np.empty((n, p))
+        rsquared = np.empty(n)
+        nobs = np.empty(n, dtype=np.int64)
+        for start, stop, sums, counts in _windowed_sums(A, valid, window, expanding, chunk_size):
+            block = _solve_windows(sums, counts, p, min_nobs, add_const, shift)
+            params[start:stop], bse[start:stop], rsquared[start:stop] = block
+            nobs[start:stop] = counts
+
+    return pd.concat(
+        {
+            'params': pd.DataFrame(params, index=index, columns=names),
+            'bse': pd.DataFrame(bse, index=index, columns=names),
+            'stats': pd.DataFrame({'rsquared': rsquared, 'nobs': nobs}, index=index),
+        },
+        axis=1,
+    )
+
+
+class CrossProducts:
+    """
+    Running weighted means and centred cross-products of the columns of [X, Y].
+
+    Blocks are merged with the pairwise update of Chan et al., so the sums stay
+    centred (and well conditioned) however many rows are accumulated, and two
+    accumulators built on different chunks can be combined with `merge`.
+    """
+
+    def __init__(self):
+        self.nobs = 0
+        self.weight = 0.0
+        self.log_weight = 0.0
+        self.mean = None
+        self.comoment = None
+
+    def update(self, Z, weights=None):
+        """
+        Add a block of rows. Rows with a missing value or a non-positive weight are skipped.
+
+        Parameters:
+        Z (np.ndarray): Block of shape (rows, columns), regressors first.
+        weights (np.ndarray): Optional row weights.
+        """
+        Z = np.asarray(Z, dtype=np.float64)
+        valid = np.isfinite(Z).all(axis=1)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+            valid &= np.isfinite(weights) & (weights > 0)
+            weights = weights[valid]
+        Z = Z[valid]
+        if not len(Z):
+            return self
+        block = CrossProducts()
+        block.nobs = len(Z)
+        if weights is None:
+            block.weight = float(len(Z))
+            block.mean = Z.mean(axis=0)
+            centred = Z - block.mean
+            block.comoment = centred.T @ centred
+        else:
+            block.weight = weights.sum()
+            block.log_weight = np.log(weights).sum()
+            block.mean = weights @ Z / block.weight
+            centred = Z - block.mean
+            block.comoment = (centred * weights[:, None]).T @ centred
+        return self.merge(block)
+
+    def merge(self, other):
+        """Fold another accumulator's rows into this one."""
+        if other.nobs == 0:
+            return self
+        if self.nobs == 0:
+            self.nobs, self.weight, self.log_weight = other.nobs, other.weight, other.log_weight
+            self.mean, self.comoment = other.mean.copy(), other.comoment.copy()
+            return self
+        weight = self.weight + other.weight
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * (self.weight * other.weight / weight)
+        self.mean = self.mean + delta * (other.weight / weight)
+        self.nobs += other.nobs
+        self.weight = weight
+        self.log_weight += other.log_weight
+        return self
+
+
+class LeastSquaresResults:
+    """
+    OLS/WLS estimates solved from sufficient statistics, for one or many targets.
+
+    Attributes mirror statsmodels' RegressionResults: with a single target
+    `params`, `bse`, `tvalues` and `pvalues` are Series and `rsquared` is a
+    float; with several targets they are DataFrames (one column per target)
+    and Series. No residuals are stored.
+    """
+
+    def __init__(self, params, normalized_cov_params, ssr, sst, stats, x_names, y_names, has_const, weighted):
+        from scipy import stats as distributions
+        self.x_names = list(x_names)
+        self.y_names = list(y_names)
+        self.k_constant = int(has_const)
+        self.nobs = float(stats.nobs)
+        self.df_model = float(len(self.x_names) - self.k_constant)
+        self.df_resid = self.nobs - len(self.x_names)
+        self.normalized_cov_params = normalized_cov_params
+        self.weighted = weighted
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scale = ssr / self.df_resid
+            bse = np.sqrt(np.outer(np.diag(normalized_cov_params), scale))
+            tvalues = params / bse
+            rsquared = 1 - ssr / sst
+            rsquared_adj = 1 - (self.nobs - self.k_constant) / self.df_resid * (1 - rsquared)
+            fvalue = (sst - ssr) / self.df_model / scale
+            llf = -self.nobs / 2 * (np.log(2 * np.pi * ssr / self.nobs) + 1) + stats.log_weight / 2
+        pvalues = 2 * distributions.t.sf(np.abs(tvalues), self.df_resid)
+        f_pvalue = distributions.f.sf(fvalue, self.df_model, self.df_resid)
+        n_params = self.df_model + self.k_constant
+
+        self.params = self._frame(params)
+        self.bse = self._frame(bse)
+        self.tvalues = self._frame(tvalues)
+        self.pvalues = self._frame(pvalues)
+        self.ssr = self._series(ssr)
+        self.scale = self._series(scale)
+        self.rsquared = self._series(rsquared)
+        self.rsquared_adj = self._series(rsquared_adj)
+        self.fvalue = self._series(fvalue)
+        self.f_pvalue = self._series(f_pvalue)
+        self.llf = self._series(llf)
+        self.aic = self._series(-2 * llf + 2 * n_params)
+        self.bic = self._series(-2 * llf + np.log(self.nobs) * n_params)
+
+    def _frame(self, values):
+        frame = pd.DataFrame(values, index=self.x_names, columns=self.y_names)
+        return frame.iloc[:, 0] if len(self.y_names) == 1 else frame
+
+    def _series(self, values):
+        series = pd.Series(values, index=self.y_names)
+        return float(series.iloc[0]) if len(self.y_names) == 1 else series
+
+    def _target(self, target):
+        if target is None:
+            if len(self.y_names) > 1:
+                raise ValueError("Choose a target: the model has several.")
+            return self.y_names[0]
+        if target not in self.y_names:
+            raise ValueError(f"Unknown target {target}.")
+        return target
+
+    def _column(self, attribute, target):
+        values = getattr(self, attribute)
+        return values if len(self.y_names) == 1 else values[target]
+
+    def cov_params(self, target=None):
+        """Covariance matrix of one target's coefficients."""
+        target = self._target(target)
+        scale = self._column('scale', target)
+        return pd.DataFrame(scale * self.normalized_cov_params, index=self.x_names, columns=self.x_names)
+
+    def conf_int(self, alpha=0.05, target=None):
+        """Confidence intervals of one target's coefficients."""
+        from scipy import stats as distributions
+        target = self._target(target)
+        q = distributions.t.ppf(1 - alpha / 2, self.df_resid)
+        params, bse = self._column('params', target), self._column('bse', target)
+        return pd.DataFrame({0: params - q * bse, 1: params + q * bse})
+
+    def predict(self, X):
+        """Predictions for new regressors; one column per target when there are several."""
+        values = X.to_numpy(dtype=np.float64) if isinstance(X, (pd.DataFrame, pd.Series)) else np.asarray(X, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        params = np.asarray(self.params, dtype=np.float64).reshape(len(self.x_names), -1)
+        if self.k_constant and values.shape[1] == len(self.x_names) - 1:
+            prediction = values @ params[1:] + params[0]
+        else:
+            prediction = values @ params
+        index = X.index if isinstance(X, (pd.DataFrame, pd.Series)) else None
+        if len(self.y_names) == 1:
+            return pd.Series(prediction[:, 0], index=index, name=self.y_names[0])
+        return pd.DataFrame(prediction, index=index, columns=self.y_names)
+
+    def summary(self, target=None, alpha=0.05):
+        """
+        statsmodels-style summary of one target's fit.
+
+        Residual diagnostics (omnibus, Durbin-Watson...) need the residuals and
+        are not included; fit the model with statsmodels for those.
+
+        Returns:
+        statsmodels.iolib.summary.Summary: Supports as_text(), as_html() and as_latex().
+        """
+        from statsmodels.iolib.summary import Summary
+        target = self._target(target)
+        fit = SimpleNamespace(
+            params=self._column('params', target), bse=self._column('bse', target),
+            tvalues=self._column('tvalues', target), pvalues=self._column('pvalues', target),
+            conf_int=lambda alpha=0.05: self.conf_int(alpha, target).to_numpy(),
+            df_resid=self.df_resid,
+        )
+        model = "WLS" if self.weighted else "OLS"
+        left = [
+            ("Dep. Variable:", [str(target)]),
+            ("Model:", [model]),
+            ("Method:", ["Least Squares"]),
+            ("No. Observations:", [f"{self.nobs:.0f}"]),
+            ("Df Residuals:", [f"{self.df_resid:.0f}"]),
+            ("Df Model:", [f"{self.df_model:.0f}"]),
+        ]
+        right = [
+            ("R-squared:", [f"{self._column('rsquared', target):#8.3f}"]),
+            ("Adj. R-squared:", [f"{self._column('rsquared_adj', target):#8.3f}"]),
+            ("F-statistic:", [f"{self._column('fvalue', target):#8.4g}"]),
+            ("Prob (F-statistic):", [f"{self._column('f_pvalue', target):#6.3g}"]),
+            ("Log-Likelihood:", [f"{self._column('llf', target):#8.5g}"]),
+            ("AIC:", [f"{self._column('aic', target):#8.4g}"]),
+            ("BIC:", [f"{self._column('bic', target):#8.4g}"]),
+        ]
+        summary = Summary()
+        summary.add_table_2cols(fit, gleft=left, gright=right, yname=str(target), xname=self.x_names,
+                                title=f"{model} Regression Results")
+        summary.add_table_params(fit, yname=str(target), xname=self.x_names, alpha=alpha, use_t=True)
+        summary.add_extra_txt([
+            f"Solved from sufficient statistics of {self.nobs:.0f} rows; residual diagnostics are not available.",
+        ])
+        return summary
+
+
+def solve_least_squares(stats, n_x, x_names, y_names, add_const=True, weighted=False):
+    """
+    Solve OLS/WLS for every target from accumulated cross-products.
+
+    One Cholesky factorization of X'WX serves all targets. With a constant
+    the slopes come from the centred cross-products and the intercept from
+    the means, so large offsets in X do not cost precision.
+
+    Parameters:
+    stats (CrossProducts): Accumulated over [X, Y], regressors first.
+    n_x (int): Number of regressor columns (without the constant).
+    x_names (list): Regressor names (without the constant).
+    y_names (list): Target names.
+
+    Returns:
+    LeastSquaresResults: The fitted coefficients and statistics.
+
+    Raises:
+    ValueError: If there are no more rows than coefficients.
+    """
+    from scipy.linalg import LinAlgError, cho_factor, cho_solve
+    n_params = n_x + int(add_const)
+    if stats.nobs <= n_params:
+        raise ValueError(f"At least {n_params + 1} complete rows are needed, got {stats.nobs}.")
+    if add_const:
+        S = stats.comoment
+        x_mean = stats.mean[:n_x]
+    else:
+        S = stats.comoment + stats.weight * np.outer(stats.mean, stats.mean)
+    Sxx, Sxy, Syy = S[:n_x, :n_x], S[:n_x, n_x:], np.diag(S[n_x:, n_x:])
+
+    # Scale X'WX to unit diagonal before factorizing; constant columns keep a scale of 1
+    scale = np.sqrt(np.diag(Sxx))
+    scale[scale == 0] = 1.0
+    scaled = Sxx / np.outer(scale, scale)
+    try:
+        factor = cho_factor(scaled)
+        inverse = cho_solve(factor, np.eye(n_x))
+        slopes = cho_solve(factor, Sxy / scale[:, None])
+    except LinAlgError:
+        # Collinear regressors: slopes of smallest scaled norm; with a constant the intercept takes the rest,
+        # so the coefficients (not the fit) can differ from statsmodels' pinv solution
+        inverse = np.linalg.pinv(scaled, hermitian=True)
+        slopes = inverse @ (Sxy / scale[:, None])
+    inverse = inverse / np.outer(scale, scale)
+    slopes = slopes / scale[:, None]
+
+    ssr = np.maximum(Syy - np.einsum('ij,ij->j', slopes, Sxy), 0.0)
+    if add_const:
+        intercept = stats.mean[n_x:] - x_mean @ slopes
+        params = np.vstack([intercept, slopes])
+        cov = np.empty((n_params, n_params))
+        cov[0, 0] = 1 / stats.weight + x_mean @ inverse @ x_mean
+        cov[0, 1:] = cov[1:, 0] = -inverse @ x_mean
+        cov[1:, 1:] = inverse
+        x_names = ['const'] + list(x_names)
+    else:
+        params = slopes
+        cov = inverse
+    return LeastSquaresResults(params, cov, ssr, Syy, stats, x_names, y_names, add_const, weighted)
+
+
+def _names(values, prefix):
+    if isinstance(values, pd.Series):
+        return [str(values.name) if values.name is not None else f"{prefix}1"]
+    if isinstance(values, pd.DataFrame):
+        return [str(c) for c in values.columns]
+    return [f"{prefix}{i + 1}" for i in range(1 if np.ndim(values) == 1 else np.shape(values)[1])]
+
+
+def least_squares(X, Y, weights=None, add_const=True, chunk_size=100_000):
+    """
+    OLS (or WLS with `weights`) of one or many targets via sufficient statistics.
+
+    X'WX and X'WY are accumulated over blocks of `chunk_size` rows, so no
+    design matrix with a constant column is built and no residuals are kept.
+    Rows with a missing value in X, Y or the weights are dropped.
+
+    Parameters:
+    X (pd.DataFrame, pd.Series or np.ndarray): Regressors.
+    Y (pd.Series, pd.DataFrame or np.ndarray): One target, or one column per target.
+    weights (array-like): Optional positive row weights.
+    add_const (bool): Include an intercept.
+
+    Returns:
+    LeastSquaresResults: Coefficients, standard errors, R-squared and friends.
+    """
+    x_names, y_names = _names(X, 'x'), _names(Y, 'y')
+    x_values = X.to_numpy(dtype=np.float64) if isinstance(X, (pd.DataFrame, pd.Series)) else np.asarray(X, dtype=np.float64)
+    y_values = Y.to_numpy(dtype=np.float64) if isinstance(Y, (pd.DataFrame, pd.Series)) else np.asarray(Y, dtype=np.float64)
+    x_values = x_values.reshape(len(x_values), -1)
+    y_values = y_values.reshape(len(y_values), -1)
+    if len(x_values) != len(y_values):
+        raise ValueError("X and Y must have the same number of rows.")
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+    stats = CrossProducts()
+    for start in range(0, len(x_values), chunk_size):
+        rows = slice(start, start + chunk_size)
+        stats.update(np.hstack([x_values[rows], y_values[rows]]), None if weights is None else weights[rows])
+    return solve_least_squares(stats, len(x_names), x_names, y_names, add_const, weighted=weights is not None)
+
+
+def least_squares_streamed(chunks, x_columns, y_columns, weights_column=None, add_const=True, monitor=None):
+    """
+    OLS/WLS of one or many targets over data streamed in chunks, in one pass.
+
+    Parameters:
+    chunks (iterable): DataFrame chunks, e.g. from `iter_csv_chunks`.
+    x_columns (list): Regressor column names.
+    y_columns (str or list): Target column name(s).
+    weights_column (str): Optional column of row weights (WLS).
+    monitor (JobMonitor): Optional; polled for cancellation between chunks.
+
+    Returns:
+    LeastSquaresResults: None if cancelled.
+    """
+    x_columns = list(x_columns)
+    y_columns = [y_columns] if isinstance(y_columns, str) else list(y_columns)
+    stats = CrossProducts()
+    for chunk in chunks:
+        weights = chunk[weights_column].to_numpy() if weights_column is not None else None
+        stats.update(chunk[x_columns + y_columns].to_numpy(dtype=np.float64), weights)
+        if monitor is not None and monitor.cancelled:
+            return None
+    return solve_least_squares(
+        stats, len(x_columns), [str(c) for c in x_columns], [str(c) for c in y_columns],
+        add_const, weighted=weights_column is not None,
+    )
+
+
+class OnlineLeastSquares:
+    """
+    Recursive least squares updated one row at a time, for data that keeps arriving.
+
+    The state is the coefficient vector and P = (X'X)^-1. Each new row costs
+    one Sherman-Morrison update, O(p^2), and no earlier row is revisited, so
+    appending rows never means refitting. With a forgetting factor below 1
+    the cross-products are discounted by that factor per row: a row seen k
+    rows ago has weight forgetting**k, and the coefficients follow a drifting
+    relationship. Long stretches without variation in a regressor make P grow
+    under forgetting ("wind-up"); keep the factor close to 1, e.g. 0.99-0.9999.
+
+    Until X'X has full rank the rows are accumulated and the first state is
+    solved exactly, so with forgetting=1 the coefficients equal OLS on every
+    row seen.
+
+    Parameters:
+    x_names (list): Regressor names (without the constant).
+    y_name (str): Target name.
+    add_const (bool): Include an intercept.
+    forgetting (float): Discount factor in (0, 1]; 1 keeps every row at full weight.
+    history (int): Number of recent coefficient vectors kept for `trajectory`.
+    """
+
+    def __init__(self, x_names, y_name, add_const=True, forgetting=1.0, history=10_000):
+        if not 0 < forgetting <= 1:
+            raise ValueError("The forgetting factor must be in (0, 1].")
+        self.x_names = (['const'] if add_const else []) + [str(c) for c in x_names]
+        self.y_name = str(y_name)
+        self.add_const = add_const
+        self.forgetting = float(forgetting)
+        self.history = int(history)
+        p = len(self.x_names)
+        self.nobs = 0
+        self.weight = 0.0
+        self.sum_y = 0.0
+        self.sum_yy = 0.0
+        self.ssr = 0.0
+        self.P = None
+        self.beta = None
+        # Cross-products used only until the first exact solve
+        self.XtX = np.zeros((p, p))
+        self.Xty = np.zeros(p)
+        self.trajectory_rows = np.empty(0, dtype=np.int64)
+        self.trajectory_params = np.empty((0, p))
+        # Position in the file the rows are read from, see ModelManager.recursive_ls_online
+        self.source_path = None
+        self.source_offset = 0
+
+    def update(self, X, Y):
+        """
+        Add new rows in order. Rows with a missing value are skipped.
+
+        Parameters:
+        X (pd.DataFrame or np.ndarray): Regressors of the new rows.
+        Y (pd.Series or np.ndarray): Their targets.
+
+        Returns:
+        OnlineLeastSquares: self.
+        """
+        x_values = X.to_numpy(dtype=np.float64) if isinstance(X, (pd.DataFrame, pd.Series)) else np.asarray(X, dtype=np.float64)
+        x_values = x_values.reshape(len(x_values), -1)
+        y_values = np.asarray(Y, dtype=np.float64).reshape(-1)
+        if len(x_values) != len(y_values):
+            raise ValueError("X and Y must have the same number of rows.")
+        if self.add_const:
+            x_values = np.column_stack([np.ones(len(x_values)), x_values])
+        if x_values.shape[1] != len(self.x_names):
+            raise ValueError(f"Expected {len(self.x_names) - self.add_const} regressors, got {x_values.shape[1] - self.add_const}.")
+        valid = np.isfinite(x_values).all(axis=1) & np.isfinite(y_values)
+        x_values, y_values = x_values[valid], y_values[valid]
+
+        lam = self.forgetting
+        params = np.full((len(y_values), len(self.x_names)), np.nan)
+        P, beta, ssr = self.P, self.beta, self.ssr
+        for t in range(len(y_values)):
+            x, y = x_values[t], y_values[t]
+            self.weight = lam * self.weight + 1.0
+            self.sum_y = lam * self.sum_y + y
+            self.sum_yy = lam * self.sum_yy + y * y
+            if P is None:
+                self.XtX = lam * self.XtX + np.outer(x, x)
+                self.Xty = lam * self.Xty + y * x
+                if self.nobs + t + 1 >= len(x) and np.linalg.matrix_rank(self.XtX) == len(x):
+                    P = np.linalg.inv(self.XtX)
+                    beta = P @ self.Xty
+                    ssr = max(self.sum_yy - beta @ self.Xty, 0.0)
+                    self.XtX, self.Xty = None, None
+                    params[t] = beta
+                continue
+            # P / lam is the inverse of the discounted cross-products before this row
+            Px = P @ x / lam
+            denom = 1.0 + x @ Px
+            gain = Px / denom
+            error = y - x @ beta
+            beta = beta + gain * error
+            P = P / lam - np.outer(gain, Px)
+            # Rounding makes P drift from symmetry, and with forgetting the drift grows by 1/lam per row
+            P = (P + P.T) / 2
+            ssr = lam * ssr + error * error / denom
+            params[t] = beta
+        self.P, self.beta, self.ssr = P, beta, ssr
+
+        rows = self.nobs + np.arange(1, len(y_values) + 1)
+        self.nobs += len(y_values)
+        fitted = ~np.isnan(params[:, 0])
+        rows = np.concatenate([self.trajectory_rows, rows[fitted]])
+        keep = slice(max(len(rows) - self.history, 0), None)
+        self.trajectory_rows = rows[keep]
+        self.trajectory_params = np.concatenate([self.trajectory_params, params[fitted]])[keep]
+        return self
+
+    @property
+    def fitted(self):
+        return self.beta is not None
+
+    @property
+    def params(self):
+        values = self.beta if self.fitted else np.full(len(self.x_names), np.nan)
+        return pd.Series(values, index=self.x_names, name=self.y_name)
+
+    @property
+    def scale(self):
+        """Residual variance estimate; the degrees of freedom use the discounted row count."""
+        df_resid = self.weight - len(self.x_names)
+        return self.ssr / df_resid if self.fitted and df_resid > 0 else np.nan
+
+    @property
+    def bse(self):
+        diagonal = np.diag(self.P) if self.fitted else np.full(len(self.x_names), np.nan)
+        return pd.Series(np.sqrt(self.scale * diagonal), index=self.x_names, name=self.y_name)
+
+    @property
+    def rsquared(self):
+        if not self.fitted:
+            return np.nan
+        sst = self.sum_yy - self.sum_y ** 2 / self.weight if self.add_const else self.sum_yy
+        return 1.0 - self.ssr / sst if sst > 0 else np.nan
+
+    def trajectory(self):
+        """Coefficients after each of the last `history` rows, indexed by row number."""
+        return pd.DataFrame(self.trajectory_params, index=pd.Index(self.trajectory_rows, name='row'),
+                            columns=self.x_names)
+
+    def predict(self, X):
+        """Predictions for new regressors with the current coefficients."""
+        values = X.to_numpy(dtype=np.float64) if isinstance(X, (pd.DataFrame, pd.Series)) else np.asarray(X, dtype=np.float64)
+        values = values.reshape(len(values), -1)
+        params = self.params.to_numpy()
+        if self.add_const and values.shape[1] == len(self.x_names) - 1:
+            prediction = values @ params[1:] + params[0]
+        else:
+            prediction = values @ params
+        index = X.index if isinstance(X, (pd.DataFrame, pd.Series)) else None
+        return pd.Series(prediction, index=index, name=self.y_name)
+
+    def save(self, path):
+        """
+        Write the state to an .npz file, replacing it atomically.
+
+        Parameters:
+        path (str): Destination; a session later resumes with `load(path)`.
+        """
+        meta = {
+            'x_names': self.x_names, 'y_name': self.y_name, 'add_const': self.add_const,
+            'forgetting': self.forgetting, 'history': self.history, 'nobs': self.nobs,
+            'weight': self.weight, 'sum_y': self.sum_y, 'sum_yy': self.sum_yy, 'ssr': self.ssr,
+            'source_path': self.source_path, 'source_offset': self.source_offset,
+        }
+        if self.fitted:
+            arrays = {'P': self.P, 'beta': self.beta}
+        else:
+            arrays = {'XtX': self.XtX, 'Xty': self.Xty}
+        path = str(path)
+        temporary = f"{path}.tmp.npz"
+        np.savez(temporary, meta=np.array(json.dumps(meta)), trajectory_rows=self.trajectory_rows,
+                 trajectory_params=self.trajectory_params, **arrays)
+        os.replace(temporary, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Restore a state written by `save`."""
+        with np.load(path, allow_pickle=False) as saved:
+            meta = json.loads(str(saved['meta']))
+            x_names = meta['x_names'][1:] if meta['add_const'] else meta['x_names']
+            model = cls(x_names, meta['y_name'], add_const=meta['add_const'],
+                        forgetting=meta['forgetting'], history=meta['history'])
+            for name in ('nobs', 'weight', 'sum_y', 'sum_yy', 'ssr', 'source_path', 'source_offset'):
+                setattr(model, name, meta[name])
+            if 'P' in saved:
+                model.P, model.beta = saved['P'], saved['beta']
+                model.XtX, model.Xty = None, None
+            else:
+                model.XtX, model.Xty = saved['XtX'], saved['Xty']
+            model.trajectory_rows = saved['trajectory_rows']
+            model.trajectory_params = saved['trajectory_params']
+        return model
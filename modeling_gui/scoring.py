@@ -0,0 +1,364 @@
+"""
+Batch and online scoring with fitted models.
+
+Usage:
+    modeling_gui_score saved_model --input data.csv --output predictions.csv [--x a b] [--keep id]
+                       [--chunksize 100000] [--workers 4]
+    modeling_gui_score saved_model --serve [--host 127.0.0.1] [--port 8765]
+
+`score_file` streams a CSV in chunks, so files larger than memory can be
+scored. Chunks are predicted by a pool of worker processes that each load
+the model once, and the predictions are written in input order as they
+come back, to CSV or (with pyarrow installed) Parquet. The columns the
+model was fitted on are selected from each chunk; models fitted through a
+preprocessor (`PreprocessedModel`) transform the raw columns the same way
+as in training.
+
+`make_server` keeps a model loaded behind a small HTTP endpoint on the
+local machine for single-row predictions:
+
+    POST /predict  {"a": 1.0, "b": 2.0}              -> {"predictions": [4.1]}
+    POST /predict  [{"a": 1.0, "b": 2.0}, ...]       -> {"predictions": [4.1, ...]}
+    GET  /health                                     -> {"status": "ok", "columns": ["a", "b"], ...}
+"""
+import argparse
+import inspect
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from modeling_gui.artifacts import is_saved_model, load_model as load_saved_model
+from modeling_gui.utils.data_preprocessing import PreprocessedModel
+
+# The model of a worker process, loaded once by `_init_worker`
+_worker_model = None
+
+
+def load_model(path):
+    """Load a model saved with `artifacts.save_model`, or written with joblib (e.g. model.joblib from the batch runner)."""
+    if is_saved_model(path):
+        return load_saved_model(path)
+    import joblib
+    return joblib.load(path)
+
+
+def model_columns(model):
+    """
+    The input columns a fitted model expects, in order.
+
+    Returns:
+    list or None: The column names, or None when the model was fitted on
+    unnamed arrays.
+    """
+    if isinstance(model, PreprocessedModel):
+        names = model_columns(model.model)
+        if names is None:
+            return None
+        # One-hot indicators map back to the categorical column they came from
+        sources = {f"{column}={value}": column for column, values in model.preprocessor.categories_.items()
+                   for value in values}
+        return list(dict.fromkeys(sources.get(name, name) for name in names))
+    names = getattr(model, 'feature_names_in_', None)
+    if names is None:
+        names = getattr(model, 'x_names', None)  # LeastSquaresResults, OnlineLeastSquares
+    if names is None:
+        names = getattr(getattr(model, 'model', None), 'exog_names', None)  # statsmodels results
+    if names is None:
+        return None
+    return [str(name) for name in names if name != 'const']
+
+
+def predicts_inputs(model):
+    """
+    Whether `model.predict` takes new input rows, as estimators and regression
+    results do, rather than e.g. a start/end range of the fitted sample
+    (RecursiveLS and other state space results).
+    """
+    while isinstance(model, PreprocessedModel):
+        model = model.model
+    predict = getattr(model, 'predict', None)
+    if predict is None:
+        return False
+    try:
+        parameters = list(inspect.signature(predict).parameters)
+    except (TypeError, ValueError):  # No signature to inspect, e.g. a compiled method
+        return True
+    return bool(parameters) and parameters[0] in ('X', 'x', 'exog')
+
+
+def _check_predicts_inputs(model):
+    if not predicts_inputs(model):
+        raise ValueError(f"{type(model).__name__} cannot score new rows: its predict does not take input data.")
+
+
+def predict_frame(model, X):
+    """
+    Predict a table of input columns.
+
+    Returns:
+    pd.DataFrame: A 'prediction' column, or 'prediction_<i>' columns for
+    models with several targets, on the index of X.
+    """
+    predictions = np.asarray(model.predict(X))
+    if predictions.ndim == 1:
+        return pd.DataFrame({'prediction': predictions}, index=X.index)
+    columns = [f"prediction_{i}" for i in range(predictions.shape[1])]
+    return pd.DataFrame(predictions, index=X.index, columns=columns)
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = load_model(model) if isinstance(model, (str, os.PathLike)) else model
+
+
+def _predict_chunk(X):
+    return predict_frame(_worker_model, X)
+
+
+class _Writer:
+    """Append DataFrames to a CSV or Parquet file, creating it with the first."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.parquet = self.path.endswith('.parquet')
+        self._writer = None
+        self._started = False
+
+    def write(self, frame):
+        if self.parquet:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Writing Parquet requires pyarrow; write to a .csv file instead.")
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode='a' if self._started else 'w', header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def score_file(model, file_path, output_path, x_columns=None, keep_columns=None, chunksize=100_000,
+               workers=None, monitor=None):
+    """
+    Predict every row of a CSV file in chunks and write the predictions.
+
+    Parameters:
+    model: A fitted model, or the path of a saved model or joblib file.
+        Workers then load it from the file instead of receiving a pickled
+        copy, and share the pages of memory-mapped forests.
+    file_path (str): The input CSV.
+    output_path (str): Where the predictions go; .parquet writes Parquet,
+        anything else CSV.
+    x_columns (list): Input columns; defaults to the columns the model was
+        fitted on.
+    keep_columns (list): Input columns copied to the output ahead of the
+        predictions, e.g. an ID.
+    chunksize (int): Rows per chunk and per batch sent to a worker.
+    workers (int): Worker processes; defaults to the number of CPUs, and 1
+        predicts in this process.
+    monitor (JobMonitor): Receives progress in thousandths of the file and
+        stops the run when cancelled.
+
+    Returns:
+    dict: rows, chunks, seconds, rows_per_second, workers and output.
+
+    Raises:
+    ValueError: If the model cannot predict new rows, or the input columns
+    are not known or not in the file.
+    """
+    start = time.perf_counter()
+    loaded = load_model(model) if isinstance(model, (str, os.PathLike)) else model
+    _check_predicts_inputs(loaded)
+    if x_columns is None:
+        x_columns = model_columns(loaded)
+        if x_columns is None:
+            raise ValueError("The model does not record its input columns; pass x_columns.")
+    x_columns = list(x_columns)
+    keep_columns = list(keep_columns or [])
+    header = pd.read_csv(file_path, nrows=0).columns
+    missing = [column for column in x_columns + keep_columns if column not in header]
+    if missing:
+        raise ValueError(f"Columns not in {file_path}: {', '.join(map(str, missing))}.")
+    usecols = list(dict.fromkeys(x_columns + keep_columns))
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(file_path) or 1
+
+    writer = _Writer(output_path)
+    rows = chunks = 0
+
+    def write(chunk, predictions):
+        nonlocal rows, chunks
+        if keep_columns:
+            predictions = pd.concat([chunk[keep_columns], predictions], axis=1)
+        writer.write(predictions)
+        rows += len(chunk)
+        chunks += 1
+
+    executor = None
+    try:
+        if workers > 1:
+            context = multiprocessing.get_context('spawn')
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                           initializer=_init_worker, initargs=(model,))
+        pending = deque()
+        with open(file_path, 'rb') as f, pd.read_csv(f, usecols=usecols, chunksize=chunksize) as reader:
+            for chunk in reader:
+                if monitor is not None and monitor.cancelled:
+                    break
+                X = chunk[x_columns]
+                if executor is None:
+                    write(chunk, predict_frame(loaded, X))
+                else:
+                    # At most two chunks per worker are in flight, so memory stays bounded
+                    pending.append((chunk, executor.submit(_predict_chunk, X)))
+                    while len(pending) > 2 * workers:
+                        done, future = pending.popleft()
+                        write(done, future.result())
+                if monitor is not None:
+                    monitor.progress(min(1000, 1000 * f.tell() // size), 1000)
+            while pending:
+                done, future = pending.popleft()
+                write(done, future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        writer.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows, 'chunks': chunks, 'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else float('inf'),
+        'workers': workers, 'output': str(output_path),
+    }
+
+
+def format_report(report):
+    return (f"Scored {report['rows']:,} rows in {report['seconds']:.2f} s "
+            f"({report['rows_per_second']:,.0f} rows/s, {report['workers']} workers) to {report['output']}.")
+
+
+class _PredictHandler(BaseHTTPRequestHandler):
+    server_version = "modeling_gui_score"
+
+    def do_GET(self):
+        if self.path.rstrip('/') != '/health':
+            self._reply(404, {'error': f"Unknown path {self.path}."})
+            return
+        self._reply(200, {'status': 'ok', 'model': type(self.server.model).__name__, 'columns': self.server.x_columns})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/predict':
+            self._reply(404, {'error': f"Unknown path {self.path}."})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'null')
+            records = [body] if isinstance(body, dict) else body
+            if not isinstance(records, list) or not records:
+                raise ValueError("Send one row as a JSON object or several as a list of objects.")
+            X = pd.DataFrame.from_records(records)
+            if self.server.x_columns is not None:
+                X = X[self.server.x_columns]
+            predictions = predict_frame(self.server.model, X)
+        except Exception as e:
+            self._reply(400, {'error': str(e)})
+            return
+        values = predictions.to_numpy()
+        self._reply(200, {'predictions': (values[:, 0] if values.shape[1] == 1 else values).tolist()})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(model, x_columns=None, host='127.0.0.1', port=8765, verbose=False):
+    """
+    An HTTP server answering prediction requests with a model kept in memory.
+
+    Parameters:
+    model: A fitted model, or the path of a saved model or joblib file.
+    x_columns (list): Input columns; defaults to the columns the model was
+        fitted on.
+    host (str): Interface to listen on; the local machine only by default.
+    port (int): Port; 0 picks a free one (see `server.server_address`).
+    verbose (bool): Log every request to stderr.
+
+    Returns:
+    ThreadingHTTPServer: Call `serve_forever()` to start answering.
+    """
+    model = load_model(model) if isinstance(model, (str, os.PathLike)) else model
+    _check_predicts_inputs(model)
+    server = ThreadingHTTPServer((host, port), _PredictHandler)
+    server.model = model
+    server.x_columns = list(x_columns) if x_columns is not None else model_columns(server.model)
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    """
+    Entry point for scoring files or serving predictions.
+    """
+    parser = argparse.ArgumentParser(
+        prog='modeling_gui_score', description="Score CSV files or serve predictions with a fitted model.",
+    )
+    parser.add_argument('model', help="Saved model directory, or a joblib file such as model.joblib from modeling_gui_batch.")
+    parser.add_argument('--input', help="CSV file to score.")
+    parser.add_argument('--output', help="Output file; .parquet writes Parquet, anything else CSV.")
+    parser.add_argument('--x', nargs='+', help="Input columns; defaults to the columns the model was fitted on.")
+    parser.add_argument('--keep', nargs='+', help="Input columns copied to the output, e.g. an ID.")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="Rows per batch.")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: number of CPUs).")
+    parser.add_argument('--serve', action='store_true', help="Answer HTTP prediction requests instead.")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface for --serve.")
+    parser.add_argument('--port', type=int, default=8765, help="Port for --serve.")
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        server = make_server(args.model, x_columns=args.x, host=args.host, port=args.port, verbose=True)
+        host, port = server.server_address[:2]
+        print(f"Serving predictions on http://{host}:{port}/predict (Ctrl+C to stop).", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+
+    if not args.input or not args.output:
+        parser.error("--input and --output are required unless --serve is given.")
+    try:
+        report = score_file(args.model, args.input, args.output, x_columns=args.x, keep_columns=args.keep,
+                            chunksize=args.chunksize, workers=args.workers)
+    except (OSError, ValueError) as e:
+        print(f"Scoring failed: {e}", file=sys.stderr)
+        return 1
+    print(format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
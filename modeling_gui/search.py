@@ -0,0 +1,217 @@
+import itertools
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor, RandomForestClassifier, RandomForestRegressor
+from sklearn.model_selection import KFold, StratifiedKFold
+
+from .comparison import fold_features
+from .design import attach, share
+
+# (regressor, classifier) per searchable ModelManager method
+ESTIMATORS = {
+    'random_forest': (RandomForestRegressor, RandomForestClassifier),
+    'gradient_boost': (GradientBoostingRegressor, GradientBoostingClassifier),
+}
+STRATEGIES = ('grid', 'random', 'halving')
+
+# Data shared with every worker process once, instead of once per task
+_worker_data = {}
+
+
+def parameter_grid(space):
+    """
+    Expand {name: [values]} into a list of parameter dictionaries.
+    """
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def sample_parameters(space, n_iter, random_state=None):
+    """
+    Draw up to `n_iter` distinct parameter dictionaries from the grid of `space`.
+    """
+    grid = parameter_grid(space)
+    rng = np.random.default_rng(random_state)
+    chosen = rng.choice(len(grid), size=min(n_iter, len(grid)), replace=False)
+    return [grid[i] for i in sorted(chosen)]
+
+
+def _group_by_estimators(candidates):
+    """
+    Group candidates that differ only in n_estimators.
+
+    Each group is evaluated by one warm-started estimator that grows through
+    the group's n_estimators values in increasing order.
+    """
+    groups = {}
+    for params in candidates:
+        fixed = {k: v for k, v in params.items() if k != 'n_estimators'}
+        key = tuple(sorted(fixed.items()))
+        groups.setdefault(key, (fixed, set()))[1].add(params.get('n_estimators'))
+    return [(fixed, sorted(sizes)) for fixed, sizes in groups.values()]
+
+
+def _init_worker(X, Y, folds, preprocessor=None):
+    _worker_data['X'] = attach(X)
+    _worker_data['Y'] = attach(Y)
+    _worker_data['folds'] = folds
+    _worker_data['preprocessor'] = preprocessor
+
+
+def _evaluate_group(method, is_regression, fixed, sizes, n_samples, seed):
+    """
+    Cross-validate one parameter group, growing n_estimators with warm_start.
+
+    Returns one leaderboard row per n_estimators value.
+    """
+    X, Y, folds = _worker_data['X'], _worker_data['Y'], _worker_data['folds']
+    estimator_class = ESTIMATORS[method][0 if is_regression else 1]
+    scores = np.empty((len(folds), len(sizes)))
+    fit_seconds = np.zeros(len(sizes))
+    for f, (train, test) in enumerate(folds):
+        if n_samples is not None and n_samples < len(train):
+            train = np.random.default_rng(seed + f).choice(train, n_samples, replace=False)
+        X_train, X_test = fold_features(X, train, test, _worker_data['preprocessor'])
+        params = dict(fixed)
+        if sizes != [None]:
+            params['warm_start'] = True
+        if 'n_jobs' in estimator_class().get_params():
+            params['n_jobs'] = 1  # Parallelism comes from the process pool
+        estimator = estimator_class(**params)
+        elapsed = 0.0
+        for j, n_estimators in enumerate(sizes):
+            if n_estimators is not None:
+                estimator.set_params(n_estimators=n_estimators)
+            start = time.perf_counter()
+            estimator.fit(X_train, Y[train])
+            elapsed += time.perf_counter() - start
+            fit_seconds[j] += elapsed
+            scores[f, j] = estimator.score(X_test, Y[test])
+
+    rows = []
+    for j, n_estimators in enumerate(sizes):
+        row = dict(fixed)
+        if n_estimators is not None:
+            row['n_estimators'] = n_estimators
+        row.update({
+            'mean_score': scores[:, j].mean(),
+            'std_score': scores[:, j].std(),
+            'fit_seconds': fit_seconds[j] / len(folds),
+            'n_samples': n_samples or len(folds[0][0]),
+        })
+        rows.append(row)
+    return rows
+
+
+def hyperparameter_search(X, Y, method, space, strategy='grid', n_iter=10, cv=3, eta=3,
+                          n_workers=None, random_state=0, preprocessor=None, on_row=None, monitor=None):
+    """
+    Search hyperparameters for a random forest or gradient boosting model.
+
+    Candidates are cross-validated in a process pool. Candidates that differ
+    only in n_estimators share one warm-started estimator per fold, so larger
+    ensembles reuse the trees or boosting stages fitted for smaller ones.
+
+    Parameters:
+    X (pd.DataFrame or np.ndarray): Features.
+    Y (pd.Series or np.ndarray): Target; numerical targets are regressed,
+        others classified.
+    method (str): 'random_forest' or 'gradient_boost'.
+    space (dict): Parameter name to list of candidate values.
+    strategy (str): 'grid', 'random' (n_iter samples from the grid) or
+        'halving' (successive halving over the number of training rows).
+    n_iter (int): Number of candidates for the random strategy.
+    cv (int): Number of cross-validation folds.
+    eta (float): Halving rate; each round keeps the best 1/eta of candidates
+        and multiplies the training rows by eta.
+    n_workers (int): Worker processes; defaults to the number of CPUs.
+    random_state (int): Seed for folds, sampling and subsampling.
+    preprocessor (Preprocessor): Preprocessing settings, fitted afresh on
+        the training rows of every fold (see `Preprocessor.unfitted`).
+    on_row (callable): Called with each leaderboard row as it completes.
+    monitor (JobMonitor): Optional progress/cancellation hooks.
+
+    Returns:
+    pd.DataFrame: Leaderboard sorted by mean CV score, best first.
+    """
+    if method not in ESTIMATORS:
+        raise ValueError(f"Hyperparameter search is not available for {method}.")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Invalid strategy. Choose one of {', '.join(STRATEGIES)}.")
+
+    is_regression = Y.dtype.kind in 'if'
+    if preprocessor is None:
+        X = np.asarray(X)
+    elif not isinstance(X, pd.DataFrame):
+        X = pd.DataFrame(X)
+    Y = np.asarray(Y)
+    splitter = KFold if is_regression else StratifiedKFold
+    folds = list(splitter(n_splits=cv, shuffle=True, random_state=random_state).split(X, Y))
+
+    if strategy == 'random':
+        candidates = sample_parameters(space, n_iter, random_state)
+    else:
+        candidates = parameter_grid(space)
+
+    n_train = min(len(train) for train, _ in folds)
+    if strategy == 'halving':
+        n_rounds = max(1, math.ceil(math.log(len(candidates), eta)) + 1) if len(candidates) > 1 else 1
+        sample_sizes = [max(2 * cv, int(n_train / eta ** (n_rounds - 1 - r))) for r in range(n_rounds)]
+    else:
+        sample_sizes = [None]
+
+    n_workers = n_workers or os.cpu_count() or 1
+    # Spawned workers avoid forking a process that runs Qt and worker threads; data in
+    # shared memory-mapped files (see modeling_gui.design) is mapped by each worker, not pickled
+    context = multiprocessing.get_context('spawn')
+    rows = []
+    total = sum(max(1, math.ceil(len(candidates) / eta ** r)) for r in range(len(sample_sizes)))
+    done = 0
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=context,
+                             initializer=_init_worker, initargs=(share(X), share(Y), folds, preprocessor)) as executor:
+        for round_index, n_samples in enumerate(sample_sizes):
+            round_rows = []
+            futures = {
+                executor.submit(_evaluate_group, method, is_regression, fixed, sizes,
+                                n_samples, random_state)
+                for fixed, sizes in _group_by_estimators(candidates)
+            }
+            while futures:
+                finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    for row in future.result():
+                        if strategy == 'halving':
+                            row['round'] = round_index
+                        round_rows.append(row)
+                        if on_row is not None:
+                            on_row(row)
+                        done += 1
+                        if monitor is not None:
+                            monitor.progress(min(done, total), total)
+                if monitor is not None and monitor.cancelled:
+                    for future in futures:
+                        future.cancel()
+                    futures = set()
+            rows.extend(round_rows)
+            if monitor is not None and monitor.cancelled:
+                break
+            if round_index < len(sample_sizes) - 1:
+                keep = max(1, math.ceil(len(round_rows) / eta))
+                best = sorted(round_rows, key=lambda row: -row['mean_score'])[:keep]
+                names = list(space)
+                candidates = [{name: row[name] for name in names} for row in best]
+
+    leaderboard = pd.DataFrame(rows)
+    if leaderboard.empty:
+        return leaderboard
+    sort_keys = ['round', 'mean_score'] if strategy == 'halving' else ['mean_score']
+    leaderboard = leaderboard.sort_values(sort_keys, ascending=False, ignore_index=True)
+    best = max(round_rows or rows, key=lambda row: row['mean_score'])
+    leaderboard.attrs['best_params'] = {name: best[name] for name in space}
+    return leaderboard
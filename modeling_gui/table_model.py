@@ -0,0 +1,152 @@
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+_COMPARISONS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '!=': operator.ne,
+    '==': operator.eq,
+    '>': operator.gt,
+    '<': operator.lt,
+    '=': operator.eq,
+}
+_COMPARISON_PATTERN = re.compile(r"^\s*(>=|<=|!=|==|>|<|=)\s*(.+?)\s*$")
+# Visible rows converted to NumPy per column at a time; the view asks for neighbouring cells
+_WINDOW_ROWS = 512
+
+
+class DataFrameModel(QAbstractTableModel):
+    """
+    Read-only table model that renders a DataFrame lazily.
+
+    Only the cells the view asks for are formatted, so scrolling through all
+    rows and columns costs the same regardless of the frame's size. Each column
+    keeps only a window of the visible rows as a NumPy array, so memory does not
+    grow with the number of rows. Sorting and filtering only keep an array of
+    row positions, never a reordered copy of the frame, and a filter keeps the
+    active sort.
+    """
+
+    def __init__(self, data=None, parent=None):
+        super(DataFrameModel, self).__init__(parent)
+        self._data = pd.DataFrame()
+        self._windows = {}
+        self._rows = None
+        self._sort_order = None
+        self.set_dataframe(data if data is not None else pd.DataFrame())
+
+    def set_dataframe(self, data):
+        self.beginResetModel()
+        self._data = data
+        self._windows = {}
+        self._rows = None
+        self._sort_order = None
+        self.endResetModel()
+
+    def dataframe(self):
+        return self._data
+
+    def row_positions(self):
+        """Positions of the visible rows in the underlying frame."""
+        return np.arange(len(self._data)) if self._rows is None else self._rows
+
+    # --- QAbstractTableModel interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._data) if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._data.shape[1]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        value = self._value(index.row(), index.column())
+        if isinstance(value, (float, np.floating)):
+            return "" if np.isnan(value) else f"{value:.6g}"
+        return str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return str(self._data.columns[section])
+        row = section if self._rows is None else self._rows[section]
+        return str(self._data.index[row])
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort the visible rows by one column; missing values always go last."""
+        if not 0 <= column < self.columnCount():
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._sort_order = (column, order)
+        self._set_rows(self._sorted(self.row_positions(), column, order))
+        self.layoutChanged.emit()
+
+    def _sorted(self, rows, column, order):
+        """`rows` ordered by the values of `column`, missing values last."""
+        values = self._data.iloc[rows, column]
+        missing = values.isna().to_numpy()
+        if values.dtype.kind in 'biufmM':
+            keys = values.to_numpy()
+        else:
+            keys = pd.factorize(values.astype(str), sort=True)[0]
+        present = np.flatnonzero(~missing)
+        ordered = present[np.argsort(keys[present], kind='stable')]
+        if order == Qt.DescendingOrder:
+            ordered = ordered[::-1]
+        return rows[np.concatenate([ordered, np.flatnonzero(missing)])]
+
+    # --- Filtering ---
+
+    def set_filter(self, column, text):
+        """
+        Keep rows whose value in `column` matches `text`.
+
+        Numeric columns accept comparisons such as ">5", "<= 2.5" or "!=0" (a
+        bare number means equality); other columns match a case-insensitive
+        substring. An empty `text` clears the filter. The matching rows keep
+        the order of the last sort.
+        """
+        text = text.strip()
+        rows = np.flatnonzero(self._filter_mask(column, text)) if text else None
+        if self._sort_order is not None:
+            rows = self._sorted(np.arange(len(self._data)) if rows is None else rows, *self._sort_order)
+        self.beginResetModel()
+        self._set_rows(rows)
+        self.endResetModel()
+
+    def _filter_mask(self, column, text):
+        values = self._data.iloc[:, column]
+        if values.dtype.kind in 'biuf':
+            match = _COMPARISON_PATTERN.match(text)
+            op, operand = (_COMPARISONS[match.group(1)], match.group(2)) if match else (operator.eq, text)
+            try:
+                threshold = float(operand)
+            except ValueError:
+                raise ValueError(f"Invalid numeric filter: {text}")
+            return op(values.to_numpy(), threshold)
+        return values.astype(str).str.contains(text, case=False, regex=False).to_numpy()
+
+    def _set_rows(self, rows):
+        self._rows = rows
+        self._windows = {}
+
+    def _value(self, row, column):
+        """Value at a visible row, from the column's cached window of visible rows around it."""
+        start, array = self._windows.get(column, (0, None))
+        if array is None or not start <= row < start + len(array):
+            start = max(0, row - _WINDOW_ROWS // 2)
+            stop = start + _WINDOW_ROWS
+            rows = slice(start, stop) if self._rows is None else self._rows[start:stop]
+            array = self._data.iloc[rows, column].to_numpy()
+            self._windows[column] = (start, array)
+        return array[row - start]
@@ -2,6 +2,6 @@
 # This file is used to mark the utils directory as a package and import utility functions.
 
 # Example utility functions to import
-from .file_helper import load_csv
+from .file_helper import load_csv, format_load_report, default_cache_dir, iter_csv_chunks, CsvTail
 from .data_preprocessing import normalize_data
 
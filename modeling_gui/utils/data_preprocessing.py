@@ -1,18 +1,32 @@
-from sklearn.preprocessing import StandardScaler
+import warnings
+
+import numpy as np
+import pandas as pd
+
+SCALERS = ('standard', 'minmax', 'robust')
+IMPUTERS = ('mean', 'median')
+ENCODERS = ('onehot', 'ordinal')
+
 
 def normalize_data(df, columns):
     """
     Normalize the specified columns in a DataFrame.
 
     Parameters:
-    df (pd.DataFrame): The input DataFrame.
+    df (pd.DataFrame): The input DataFrame; the columns are replaced in place.
     columns (list): List of column names to normalize.
 
     Returns:
     pd.DataFrame: A DataFrame with normalized columns.
     """
-    scaler = StandardScaler()
-    df[columns] = scaler.fit_transform(df[columns])
+    values = df[columns].to_numpy(dtype=np.float64, copy=True)
+    # Missing values are ignored and kept, as with StandardScaler
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    std[std == 0] = 1.0  # Constant columns become zeros
+    values -= mean
+    values /= std
+    df[columns] = values
     return df
 
 def handle_missing_values(df, strategy='mean'):
@@ -26,12 +40,397 @@ def handle_missing_values(df, strategy='mean'):
     Returns:
     pd.DataFrame: DataFrame with missing values handled.
     """
+    if strategy not in ('mean', 'median', 'mode'):
+        raise ValueError("Invalid strategy. Choose 'mean', 'median', or 'mode'.")
+    # Only columns with gaps are filled, so complete columns are not recomputed
+    gappy = [column for column in df.columns if df[column].hasnans]
     if strategy == 'mean':
-        return df.fillna(df.mean())
+        fill = df[gappy].mean(numeric_only=True)
     elif strategy == 'median':
-        return df.fillna(df.median())
-    elif strategy == 'mode':
-        return df.fillna(df.mode().iloc[0])
+        fill = df[gappy].median(numeric_only=True)
     else:
-        raise ValueError("Invalid strategy. Choose 'mean', 'median', or 'mode'.")
+        fill = {}
+        for column in gappy:
+            counts = df[column].value_counts(sort=False)
+            if len(counts):
+                # Smallest of the most frequent values, like df.mode().iloc[0]
+                fill[column] = counts.index[counts.to_numpy() == counts.max()].min()
+        fill = pd.Series(fill, dtype=object)
+    return df.fillna(fill)
+
+
+class RunningMoments:
+    """
+    Per-column count, mean, sum of squared deviations, minimum and maximum, skipping NaN.
+
+    Chunks are combined with the pairwise update of Chan et al., so the
+    variance is as accurate as Welford's one-value-at-a-time algorithm.
+    """
+
+    def __init__(self, n_columns):
+        self.count = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.minimum = np.full(n_columns, np.inf)
+        self.maximum = np.full(n_columns, -np.inf)
+
+    def update(self, values):
+        observed = ~np.isnan(values)
+        count = observed.sum(axis=0).astype(np.float64)
+        seen = count > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(observed, values, 0.0).sum(axis=0) / count
+        deviations = np.where(observed, values - np.where(seen, mean, 0.0), 0.0)
+        m2 = (deviations * deviations).sum(axis=0)
+        total = self.count + count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = np.where(seen, mean - self.mean, 0.0)
+            self.mean = np.where(seen, self.mean + delta * count / total, self.mean)
+            self.m2 = np.where(seen, self.m2 + m2 + delta * delta * self.count * count / total, self.m2)
+        self.count = total
+        if values.size:
+            self.minimum = np.fmin(self.minimum, np.nanmin(np.where(observed, values, np.inf), axis=0))
+            self.maximum = np.fmax(self.maximum, np.nanmax(np.where(observed, values, -np.inf), axis=0))
+        return self
+
+    @property
+    def std(self):
+        """Population standard deviation (ddof=0, as StandardScaler uses)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(self.m2 / self.count)
+
+
+class QuantileSketch:
+    """
+    Fixed-size uniform sample of each column for approximate quantiles.
+
+    Every value gets a random priority and the `size` values with the
+    smallest priorities are kept (bottom-k sampling), so chunks can be added
+    in any order and the sample stays uniform over all values seen. The
+    rank error of a quantile is about sqrt(q (1 - q) / size), e.g. 0.5% for
+    the median with the default size.
+
+    Parameters:
+    n_columns (int): Number of columns.
+    size (int): Values kept per column.
+    random_state (int): Seed for the priorities.
+    """
+
+    def __init__(self, n_columns, size=10_000, random_state=0):
+        self.size = size
+        self.values = np.empty((0, n_columns))
+        self.priorities = np.empty((0, n_columns))
+        self._rng = np.random.default_rng(random_state)
+
+    def update(self, values):
+        priorities = self._rng.random(values.shape)
+        priorities[np.isnan(values)] = np.inf  # Missing values are never sampled
+        values = np.vstack([self.values, values])
+        priorities = np.vstack([self.priorities, priorities])
+        if len(values) > self.size:
+            keep = np.argpartition(priorities, self.size - 1, axis=0)[:self.size]
+            values = np.take_along_axis(values, keep, axis=0)
+            priorities = np.take_along_axis(priorities, keep, axis=0)
+        self.values, self.priorities = values, priorities
+        return self
+
+    def quantiles(self, q):
+        """Approximate quantiles, shape (len(q), n_columns); NaN for columns without values."""
+        sample = np.where(np.isinf(self.priorities), np.nan, self.values)
+        if not len(sample):
+            return np.full((len(q), sample.shape[1]), np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # Columns without values give NaN
+            return np.nanquantile(sample, q, axis=0)
+
+
+class FrequentItems:
+    """
+    Approximate value counts of one column in bounded memory (Misra-Gries).
+
+    At most `capacity` values are tracked. When a chunk brings more, every
+    count is lowered by the (capacity + 1)-th largest and values falling to
+    zero are dropped, so each count is underestimated by at most
+    rows / (capacity + 1) and every value more frequent than that is kept.
+
+    Parameters:
+    capacity (int): Number of values tracked.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.float64)
+        self.missing = 0
+
+    def update(self, values):
+        self.missing += int(values.isna().sum())
+        counts = values.value_counts(sort=False, dropna=True).astype(np.float64)
+        counts.index = counts.index.astype(object)
+        self.counts = self.counts.add(counts, fill_value=0.0) if len(self.counts) else counts
+        if len(self.counts) > self.capacity:
+            threshold = np.partition(self.counts.to_numpy(), -(self.capacity + 1))[-(self.capacity + 1)]
+            self.counts = self.counts - threshold
+            self.counts = self.counts[self.counts > 0]
+        return self
+
+    def most_common(self, n=None):
+        """Values by decreasing (approximate) count; ties in value order."""
+        counts = self.counts.sort_index(kind='stable') if _sortable(self.counts.index) else self.counts
+        counts = counts.sort_values(ascending=False, kind='stable')
+        return list(counts.index[:n])
+
+    @property
+    def mode(self):
+        top = self.most_common(1)
+        return top[0] if top else None
+
+
+def _sortable(index):
+    try:
+        index.sort_values()
+    except TypeError:
+        return False
+    return True
+
+
+class Preprocessor:
+    """
+    Imputation, outlier clipping, scaling and categorical encoding with statistics from one streaming pass.
+
+    `fit` (or `fit_chunks` for data read in chunks) collects per-column
+    moments, a quantile sketch and approximate category counts in a single
+    pass; nothing is transformed then. `transform` applies the steps to the
+    table a model receives, vectorized over all numeric columns at once, and
+    returns a new frame; the input is never modified. Columns the
+    preprocessor was not fitted on pass through unchanged.
+
+    Numeric columns are imputed, then clipped to the fitted quantiles, then
+    scaled. Scaling uses the statistics of the observed values: standard
+    (mean/std), minmax (min/max, after clipping the clip bounds) or robust
+    (median/IQR). Categorical columns are imputed with their most frequent
+    value and encoded as one-hot indicator columns named `column=value` or
+    as ordinal codes, over the `max_categories` most frequent values; other
+    values get all-zero indicators or code -1. One-hot encoding leaves out
+    the most frequent value as the reference level by default, so the
+    indicators of a column do not sum to the intercept of a linear model.
+
+    Parameters:
+    impute (str): 'mean' or 'median' for numeric columns (categorical
+        columns then use their mode), or None to keep missing values.
+    scale (str): 'standard', 'minmax', 'robust' or None.
+    clip (tuple): (lower, upper) quantiles for outlier clipping, e.g.
+        (0.01, 0.99), or None.
+    encode (str): 'onehot' or 'ordinal' for categorical columns, or None to
+        pass them through.
+    max_categories (int): Categories encoded per column.
+    drop_reference (bool): Whether one-hot encoding leaves out the most
+        frequent value; other values are then compared with it.
+    columns (list): Columns to fit; all columns when None.
+    sketch_size (int): Sample size of the quantile sketch per column.
+    """
+
+    # Preprocessors pickled before the reference level was left out encoded every value
+    drop_reference = False
+
+    def __init__(self, impute='mean', scale='standard', clip=None, encode='onehot', max_categories=50,
+                 drop_reference=True, columns=None, sketch_size=10_000):
+        if impute is not None and impute not in IMPUTERS:
+            raise ValueError(f"Invalid imputation. Choose one of {', '.join(IMPUTERS)} or None.")
+        if scale is not None and scale not in SCALERS:
+            raise ValueError(f"Invalid scaling. Choose one of {', '.join(SCALERS)} or None.")
+        if encode is not None and encode not in ENCODERS:
+            raise ValueError(f"Invalid encoding. Choose one of {', '.join(ENCODERS)} or None.")
+        if clip is not None and not 0 <= clip[0] < clip[1] <= 1:
+            raise ValueError("Clip quantiles must satisfy 0 <= lower < upper <= 1.")
+        self.impute = impute
+        self.scale = scale
+        self.clip = tuple(clip) if clip is not None else None
+        self.encode = encode
+        self.max_categories = max_categories
+        self.drop_reference = drop_reference
+        self.columns = list(columns) if columns is not None else None
+        self.sketch_size = sketch_size
+        self.numeric_columns = None
+        self.categorical_columns = None
+
+    def fit(self, df, chunk_size=100_000):
+        """Collect the statistics of an in-memory table, `chunk_size` rows at a time."""
+        return self.fit_chunks(df.iloc[start:start + chunk_size] for start in range(0, max(len(df), 1), chunk_size))
+
+    def fit_chunks(self, chunks):
+        """
+        Collect the statistics in one pass over DataFrame chunks, e.g. from `iter_csv_chunks`.
+
+        Returns:
+        Preprocessor: self, ready to `transform`.
+        """
+        moments = sketch = counters = None
+        for chunk in chunks:
+            if moments is None:
+                columns = self.columns if self.columns is not None else list(chunk.columns)
+                self.numeric_columns = [c for c in columns if chunk[c].dtype.kind in 'biuf']
+                self.categorical_columns = [c for c in columns if chunk[c].dtype.kind not in 'biufmM']
+                moments = RunningMoments(len(self.numeric_columns))
+                sketch = QuantileSketch(len(self.numeric_columns), self.sketch_size)
+                counters = {c: FrequentItems(capacity=max(1000, 20 * self.max_categories)) for c in self.categorical_columns}
+            values = chunk[self.numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+            moments.update(values)
+            sketch.update(values)
+            for column, counter in counters.items():
+                counter.update(chunk[column])
+        if moments is None:
+            raise ValueError("No data to fit the preprocessor on.")
+        self._set_statistics(moments, sketch, counters)
+        return self
+
+    def _set_statistics(self, moments, sketch, counters):
+        q = [0.25, 0.5, 0.75] + (list(self.clip) if self.clip is not None else [])
+        quantiles = sketch.quantiles(q)
+        self.count_ = moments.count
+        self.mean_ = moments.mean
+        self.std_ = moments.std
+        self.median_ = quantiles[1]
+        self.iqr_ = quantiles[2] - quantiles[0]
+        self.clip_lower_ = quantiles[3] if self.clip is not None else None
+        self.clip_upper_ = quantiles[4] if self.clip is not None else None
+        # After clipping the extremes are the clip bounds
+        self.min_ = self.clip_lower_ if self.clip is not None else moments.minimum
+        self.max_ = self.clip_upper_ if self.clip is not None else moments.maximum
+        self.fill_ = None
+        if self.impute is not None:
+            self.fill_ = self.mean_ if self.impute == 'mean' else self.median_
+        if self.scale == 'standard':
+            center, spread = self.mean_, self.std_
+        elif self.scale == 'minmax':
+            center, spread = self.min_, self.max_ - self.min_
+        elif self.scale == 'robust':
+            center, spread = self.median_, self.iqr_
+        else:
+            center, spread = None, None
+        if spread is not None:
+            spread = np.where(np.isfinite(spread) & (spread > 0), spread, 1.0)
+            center = np.where(np.isfinite(center), center, 0.0)
+        self.center_, self.spread_ = center, spread
+        self.categories_ = {c: counters[c].most_common(self.max_categories) for c in self.categorical_columns}
+        self.modes_ = {c: counters[c].mode for c in self.categorical_columns}
+
+    @property
+    def fitted(self):
+        return self.numeric_columns is not None
+
+    def unfitted(self):
+        """A new preprocessor with the same settings and no statistics, e.g. to fit on one fold's training rows."""
+        return Preprocessor(impute=self.impute, scale=self.scale, clip=self.clip, encode=self.encode,
+                            max_categories=self.max_categories, drop_reference=self.drop_reference,
+                            columns=self.columns, sketch_size=self.sketch_size)
+
+    def transform(self, df):
+        """
+        Apply the fitted steps to a table.
+
+        Returns:
+        pd.DataFrame: A new frame with numeric columns as float64 and
+        categorical columns encoded, in the original column order.
+        """
+        if not self.fitted:
+            raise ValueError("The preprocessor has not been fitted yet.")
+        if isinstance(df, pd.Series):
+            df = df.to_frame()
+        numeric = [c for c in self.numeric_columns if c in df.columns]
+        positions = [self.numeric_columns.index(c) for c in numeric]
+        values = df[numeric].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        if self.fill_ is not None:
+            missing = np.isnan(values)
+            if missing.any():
+                values[missing] = np.broadcast_to(self.fill_[positions], values.shape)[missing]
+        if self.clip is not None:
+            np.clip(values, self.clip_lower_[positions], self.clip_upper_[positions], out=values)
+        if self.center_ is not None:
+            values -= self.center_[positions]
+            values /= self.spread_[positions]
+
+        numeric_positions = {c: i for i, c in enumerate(numeric)}
+        output = {}
+        for column in df.columns:
+            if column in numeric_positions:
+                output[column] = values[:, numeric_positions[column]]
+            elif column in self.categories_ and self.encode is not None:
+                output.update(self._encode(column, df[column]))
+            else:
+                output[column] = df[column]
+        return pd.DataFrame(output, index=df.index, copy=False)
+
+    def _encode(self, column, series):
+        if self.impute is not None and self.modes_[column] is not None:
+            series = series.fillna(self.modes_[column])
+        categories = self.categories_[column]
+        codes = pd.Index(categories, dtype=object).get_indexer(series.astype(object))  # -1 for other values
+        if self.encode == 'ordinal':
+            return {column: codes.astype(np.float64)}
+        first = 1 if self.drop_reference else 0  # Categories are ordered by frequency
+        indicators = codes[:, None] == np.arange(first, len(categories))
+        return {f"{column}={category}": indicators[:, i].astype(np.float64)
+                for i, category in enumerate(categories[first:])}
+
+    def fit_transform(self, df, chunk_size=100_000):
+        return self.fit(df, chunk_size).transform(df)
+
+    def statistics(self):
+        """Fitted statistics per numeric column, e.g. for display."""
+        table = pd.DataFrame({
+            'count': self.count_, 'mean': self.mean_, 'std': self.std_, 'min': self.min_,
+            'median': self.median_, 'max': self.max_, 'iqr': self.iqr_,
+        }, index=pd.Index(self.numeric_columns, name='column'))
+        if self.clip is not None:
+            table['clip_lower'] = self.clip_lower_
+            table['clip_upper'] = self.clip_upper_
+        return table
+
+    def describe(self):
+        """One line per step, for the results box."""
+        steps = []
+        if self.impute is not None:
+            steps.append(f"impute numeric with {self.impute}, categorical with mode")
+        if self.clip is not None:
+            steps.append(f"clip to quantiles {self.clip[0]:g}-{self.clip[1]:g}")
+        if self.scale is not None:
+            steps.append(f"{self.scale} scaling")
+        if self.encode is not None and self.categorical_columns:
+            reference = " (most frequent value as reference)" if self.encode == 'onehot' and self.drop_reference else ""
+            steps.append(f"{self.encode} encoding{reference} of {', '.join(map(str, self.categorical_columns))}")
+        return "; ".join(steps) or "no steps"
+
+
+class PreprocessedModel:
+    """
+    A fitted model together with the preprocessor its inputs went through.
+
+    `predict` (and `predict_proba`, `score`...) transform raw inputs first;
+    every other attribute is the model's own, so summaries, trees and
+    coefficients are reached as before.
+
+    Parameters:
+    preprocessor (Preprocessor): The fitted preprocessor.
+    model: The model fitted on transformed inputs.
+    """
+
+    def __init__(self, preprocessor, model):
+        self.preprocessor = preprocessor
+        self.model = model
+
+    def predict(self, X, *args, **kwargs):
+        return self.model.predict(self.preprocessor.transform(X), *args, **kwargs)
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(self.preprocessor.transform(X))
+
+    def score(self, X, Y):
+        return self.model.score(self.preprocessor.transform(X), Y)
+
+    def __sklearn_is_fitted__(self):
+        return True
 
+    def __getattr__(self, name):
+        if name in ('preprocessor', 'model'):  # Not set yet, e.g. while unpickling
+            raise AttributeError(name)
+        return getattr(self.model, name)
@@ -1,23 +1,353 @@
+import hashlib
+import io
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
-def load_csv(file_path):
+from ..profiling import instrumented, rss_mb
+
+CACHE_VERSION = 1
+
+
+@instrumented()
+def load_csv(file_path, compact=False, chunksize=None, max_rows=None, sample_fraction=None,
+             random_state=None, cache_dir=None, category_threshold=0.5, sample_rows=10_000):
     """
     Load a CSV file from the specified file path.
-    
+
+    With the default arguments this is a plain `pd.read_csv`. The optional
+    arguments enable a low-memory mode for large files: compact dtypes inferred
+    from a sample of the file, chunked reading with a row cap or random sample,
+    and a memory-mapped per-column cache that later loads open without parsing.
+
     Parameters:
     file_path (str): The path to the CSV file.
+    compact (bool): Downcast numeric columns (float32, smallest integer type)
+        and store low-cardinality text columns as categoricals.
+    chunksize (int): Rows parsed per chunk. Defaults to 100,000 whenever any
+        of compact, max_rows or sample_fraction is used.
+    max_rows (int): Stop after this many rows have been kept.
+    sample_fraction (float): Keep a random fraction (0, 1] of the rows.
+    random_state (int): Seed for `sample_fraction`.
+    cache_dir (str): Directory for the columnar cache. When set, the first
+        load writes the cache and later loads with the same options
+        memory-map it instead of parsing the CSV again.
+    category_threshold (float): Maximum ratio of unique values to rows in the
+        sample for a text column to become categorical.
+    sample_rows (int): Rows read up front to infer compact dtypes.
 
     Returns:
-    pd.DataFrame: A DataFrame containing the CSV data.
+    pd.DataFrame: A DataFrame containing the CSV data. Load time and memory
+    statistics are stored in `df.attrs['load_report']`.
 
     Raises:
     FileNotFoundError: If the file is not found.
     ValueError: If the file is not a valid CSV.
     """
+    start = time.perf_counter()
+    start_rss = rss_mb()
+    options = {
+        'compact': compact,
+        'max_rows': max_rows,
+        'sample_fraction': sample_fraction,
+        'random_state': random_state,
+        'category_threshold': category_threshold,
+    }
     try:
-        return pd.read_csv(file_path)
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = _cache_path(file_path, cache_dir, options)
+            if (cache_path / "manifest.json").exists():
+                df = read_columns(cache_path)
+                return _finish(df, file_path, start, start_rss, 'cache', _frame_bytes(df))
+
+        if not (compact or chunksize or max_rows or sample_fraction):
+            df = pd.read_csv(file_path)
+            peak = _frame_bytes(df)
+        else:
+            df, peak = _read_chunked(
+                file_path, compact, chunksize or 100_000, max_rows, sample_fraction,
+                random_state, category_threshold, sample_rows,
+            )
+
+        if cache_path is not None:
+            write_columns(df, cache_path)
+            df = read_columns(cache_path)
+        return _finish(df, file_path, start, start_rss, 'csv', peak)
     except FileNotFoundError as e:
         raise FileNotFoundError(f"File not found: {file_path}") from e
     except ValueError as e:
         raise ValueError(f"Error reading CSV file: {file_path}") from e
 
+
+def iter_csv_chunks(file_path, columns=None, chunksize=100_000, compact=False):
+    """
+    Yield a CSV file as DataFrame chunks without loading it whole.
+
+    Parameters:
+    file_path (str): The path to the CSV file.
+    columns (list): Columns to read; all columns when None.
+    chunksize (int): Rows per chunk.
+    compact (bool): Read float columns as float32.
+
+    Returns:
+    iterator: DataFrame chunks.
+    """
+    dtypes = None
+    if compact:
+        dtypes = {c: t for c, t in infer_compact_dtypes(file_path).items() if t is np.float32}
+    with pd.read_csv(file_path, usecols=columns, chunksize=chunksize, dtype=dtypes) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+class CsvTail:
+    """
+    Read the rows appended to a growing CSV file since the last read.
+
+    Only complete lines are parsed; a line still being written is left for
+    the next read. `offset` is the number of bytes consumed so far and can be
+    stored to resume in a later session. If the file shrinks (truncated or
+    replaced by a new log), reading restarts after its header.
+
+    Parameters:
+    file_path (str): The path to the CSV file; it must start with a header line.
+    offset (int): Bytes already consumed; 0 starts at the first data row.
+    columns (list): Columns to return; all columns when None.
+    block_size (int): Maximum bytes parsed per chunk.
+    """
+
+    def __init__(self, file_path, offset=0, columns=None, block_size=64 * 1024 ** 2):
+        self.file_path = file_path
+        self.offset = offset
+        self.columns = columns
+        self.block_size = block_size
+        self.names = None
+        self.restarted = False
+
+    def chunks(self):
+        """
+        Yield the complete rows appended since the last read as DataFrame chunks.
+
+        `offset` is advanced as each chunk is yielded, so a consumer that
+        stops early resumes where it left off.
+        """
+        with open(self.file_path, 'rb') as f:
+            header = f.readline()
+            if not header.endswith(b'\n'):
+                return  # The header itself is not complete yet
+            self.names = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+            size = os.fstat(f.fileno()).st_size
+            if self.offset > size:
+                self.offset = 0
+                self.restarted = True
+            self.offset = max(self.offset, len(header))
+            f.seek(self.offset)
+            while self.offset < size:
+                data = f.read(min(self.block_size, size - self.offset))
+                end = data.rfind(b'\n') + 1
+                if end == 0:
+                    if len(data) < self.block_size:
+                        return  # Only a partial line is left
+                    raise ValueError(f"A line of {self.file_path} is longer than {self.block_size} bytes.")
+                chunk = pd.read_csv(io.BytesIO(data[:end]), header=None, names=self.names, usecols=self.columns)
+                f.seek(self.offset + end)
+                self.offset += end
+                yield chunk
+
+    def read(self):
+        """All complete rows appended since the last read, as one DataFrame."""
+        chunks = list(self.chunks())
+        if not chunks:
+            return pd.DataFrame(columns=self.columns if self.columns is not None else self.names)
+        return pd.concat(chunks, ignore_index=True)
+
+
+def infer_compact_dtypes(file_path, sample_rows=10_000, category_threshold=0.5):
+    """
+    Infer memory-efficient dtypes from the first rows of a CSV file.
+
+    Parameters:
+    file_path (str): The path to the CSV file.
+    sample_rows (int): Number of rows to sample.
+    category_threshold (float): Maximum ratio of unique values to rows for a
+        text column to be read as categorical.
+
+    Returns:
+    dict: Column name to dtype for `pd.read_csv`. Integer columns are left
+    out because their range is only known after reading every chunk.
+    """
+    sample = pd.read_csv(file_path, nrows=sample_rows)
+    dtypes = {}
+    for column in sample.columns:
+        kind = sample[column].dtype.kind
+        if kind == 'f':
+            dtypes[column] = np.float32
+        elif kind in 'OSU' or isinstance(sample[column].dtype, pd.StringDtype):
+            values = sample[column].dropna()
+            if len(values) and values.nunique() / len(values) <= category_threshold:
+                dtypes[column] = 'category'
+    return dtypes
+
+
+def _read_chunked(file_path, compact, chunksize, max_rows, sample_fraction, random_state,
+                  category_threshold, sample_rows):
+    """Parse the file chunk by chunk, keeping at most `max_rows` rows."""
+    dtypes = infer_compact_dtypes(file_path, sample_rows, category_threshold) if compact else None
+    rng = np.random.default_rng(random_state)
+    chunks = []
+    kept = 0
+    held = 0
+    peak = 0
+    with pd.read_csv(file_path, chunksize=chunksize, dtype=dtypes) as reader:
+        for chunk in reader:
+            peak = max(peak, held + _frame_bytes(chunk))
+            if sample_fraction is not None:
+                chunk = chunk[rng.random(len(chunk)) < sample_fraction]
+            if max_rows is not None:
+                chunk = chunk.iloc[:max_rows - kept]
+            if compact:
+                chunk = _downcast(chunk)
+            chunks.append(chunk)
+            kept += len(chunk)
+            held += _frame_bytes(chunk)
+            if max_rows is not None and kept >= max_rows:
+                break
+    df = _concat_chunks(chunks)
+    return df, max(peak, held + _frame_bytes(df))
+
+
+def _downcast(chunk):
+    """Shrink integer and float columns of one chunk to their smallest dtype."""
+    for column in chunk.columns:
+        kind = chunk[column].dtype.kind
+        if kind in 'iu':
+            chunk[column] = pd.to_numeric(chunk[column], downcast='integer')
+        elif kind == 'f' and chunk[column].dtype != np.float32:
+            chunk[column] = chunk[column].astype(np.float32)
+    return chunk
+
+
+def _concat_chunks(chunks):
+    """Concatenate chunks, merging categoricals whose categories differ per chunk."""
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+    columns = list(chunks[0].columns)
+    categorical = [c for c in columns if isinstance(chunks[0][c].dtype, pd.CategoricalDtype)]
+    merged = {
+        c: pd.api.types.union_categoricals([chunk[c] for chunk in chunks])
+        for c in categorical
+    }
+    df = pd.concat([chunk.drop(columns=categorical) for chunk in chunks], ignore_index=True)
+    for c in categorical:
+        df[c] = merged[c]
+    return df[columns]
+
+
+def _frame_bytes(df):
+    return int(df.memory_usage(index=False, deep=True).sum())
+
+
+def _finish(df, file_path, start, start_rss, source, peak_bytes):
+    """Attach load statistics to the frame."""
+    report = {
+        'path': str(file_path),
+        'source': source,
+        'rows': len(df),
+        'columns': df.shape[1],
+        'seconds': time.perf_counter() - start,
+        'frame_mb': _frame_bytes(df) / 1e6,
+        'peak_frame_mb': peak_bytes / 1e6,
+    }
+    end_rss = rss_mb()
+    if start_rss is not None and end_rss is not None:
+        # This load's growth of resident memory, not the process-lifetime peak
+        report['rss_growth_mb'] = end_rss - start_rss
+    df.attrs['load_report'] = report
+    return df
+
+
+def format_load_report(report):
+    """
+    Format a load report as a single human-readable line.
+    """
+    text = (
+        f"Loaded {report['rows']:,} rows x {report['columns']} columns from {report['source']} "
+        f"in {report['seconds']:.2f} s; data {report['frame_mb']:.1f} MB, "
+        f"peak {report['peak_frame_mb']:.1f} MB"
+    )
+    if 'rss_growth_mb' in report:
+        text += f", resident memory {report['rss_growth_mb']:+.0f} MB"
+    return text + "."
+
+
+# --- Memory-mapped columnar cache ---
+
+def default_cache_dir(name):
+    """
+    Return (and create) a per-user cache directory for the given cache name.
+
+    The root defaults to ~/.cache/modeling_gui and can be moved with the
+    MODELING_GUI_CACHE environment variable.
+    """
+    root = os.environ.get("MODELING_GUI_CACHE") or Path.home() / ".cache" / "modeling_gui"
+    path = Path(root) / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _cache_path(file_path, cache_dir, options):
+    """Cache directory keyed by the file's identity and the load options."""
+    stat = os.stat(file_path)
+    key = json.dumps(
+        [CACHE_VERSION, os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, options],
+        sort_keys=True, default=str,
+    )
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return Path(cache_dir) / f"{Path(file_path).stem}-{digest}"
+
+
+def write_columns(df, cache_path):
+    """Store each column as a .npy file; text columns are stored as category codes."""
+    cache_path = Path(cache_path)
+    cache_path.mkdir(parents=True, exist_ok=True)
+    columns = []
+    for i, column in enumerate(df.columns):
+        series = df[column]
+        entry = {'name': column, 'file': f"{i}.npy"}
+        if series.dtype.kind in 'biufcmM':
+            np.save(cache_path / entry['file'], series.to_numpy())
+            entry['kind'] = 'array'
+        else:
+            categorical = series.astype('category')
+            np.save(cache_path / entry['file'], categorical.cat.codes.to_numpy())
+            entry['kind'] = 'category'
+            entry['categories'] = categorical.cat.categories.tolist()
+        columns.append(entry)
+    # The manifest is written last so a partial cache is never picked up
+    with open(cache_path / "manifest.json", "w") as f:
+        json.dump({'version': CACHE_VERSION, 'rows': len(df), 'columns': columns}, f, default=str)
+
+
+def read_columns(cache_path, mmap_mode='c'):
+    """
+    Open a columnar cache as a DataFrame backed by memory-mapped arrays.
+
+    The default copy-on-write mapping shares pages until a column is
+    modified; 'r' maps read-only, so `design.share` can hand the columns to
+    worker processes by file name.
+    """
+    cache_path = Path(cache_path)
+    with open(cache_path / "manifest.json") as f:
+        manifest = json.load(f)
+    data = {}
+    for entry in manifest['columns']:
+        values = np.load(cache_path / entry['file'], mmap_mode=mmap_mode)
+        if entry['kind'] == 'category':
+            values = pd.Categorical.from_codes(values, categories=entry['categories'])
+        data[entry['name']] = values
+    return pd.DataFrame(data, copy=False)
@@ -1,74 +1,385 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay
-from sklearn.tree import plot_tree
+import threading
+from collections import OrderedDict
+
 import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
+
+# Scatters with more points are drawn as a 2D histogram image
+MAX_SCATTER_POINTS = 20_000
+DENSITY_BINS = 300
+
 
-def plot_data(X, Y):
+class FigurePool:
+    """
+    Reusable off-screen figures keyed by plot name.
+
+    Figures are built on the Agg canvas and never registered with pyplot, so
+    they can be drawn on worker threads or without a display, and the pool
+    frees the least recently used ones instead of leaking a figure per plot.
+
+    Parameters:
+    max_figures (int): Number of figures kept.
+    """
+
+    def __init__(self, max_figures=16):
+        self.max_figures = max_figures
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key, figsize=(8, 6)):
+        """Return the cleared figure for `key`, creating it on first use."""
+        with self._lock:
+            figure = self._figures.pop(key, None)
+            if figure is None:
+                figure = Figure(figsize=figsize)
+            else:
+                figure.clear()
+                figure.set_size_inches(figsize)
+            self._figures[key] = figure
+            while len(self._figures) > self.max_figures:
+                self._figures.popitem(last=False)
+        # A figure last shown in a Qt canvas goes back to a plain Agg canvas for drawing
+        if type(figure.canvas) is not FigureCanvasAgg:
+            FigureCanvasAgg(figure)
+        return figure
+
+    def __len__(self):
+        return len(self._figures)
+
+
+# Pool used when a plot function is called without a figure
+FIGURES = FigurePool()
+
+
+def export_figure(figure, path, dpi=100):
+    """
+    Save a figure without a display; the format (png, svg, pdf...) follows the file suffix.
+    """
+    figure.savefig(path, dpi=dpi, bbox_inches='tight')
+    return path
+
+
+def _prepare(name, figure, figsize):
+    return figure if figure is not None else FIGURES.acquire(name, figsize)
+
+
+def _finish(figure, path):
+    if path is not None:
+        export_figure(figure, path)
+    return figure
+
+
+def _column(values):
+    """First column of a frame or 2-D array as a flat float array."""
+    values = values.iloc[:, 0] if isinstance(values, pd.DataFrame) else values
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, 0] if values.ndim == 2 else values
+
+
+def scatter_points(ax, x, y, max_points=MAX_SCATTER_POINTS, bins=DENSITY_BINS, label="Data", color="blue"):
+    """
+    Scatter small data; bin large data into a 2D histogram drawn as one image.
+
+    Above `max_points` the cost of drawing no longer grows with the data: the
+    points are counted into `bins` x `bins` cells and shown on a log scale,
+    like a datashader density plot.
+    """
+    x, y = _column(x), _column(y)
+    finite = np.isfinite(x) & np.isfinite(y)
+    if finite.sum() <= max_points:
+        return ax.scatter(x[finite], y[finite], s=10, label=label, color=color)
+    counts, x_edges, y_edges = np.histogram2d(x[finite], y[finite], bins=bins)
+    image = ax.imshow(
+        np.ma.masked_equal(counts.T, 0), origin='lower', aspect='auto', interpolation='nearest',
+        extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]), norm=LogNorm(), cmap='Blues',
+    )
+    ax.figure.colorbar(image, ax=ax, label=f"{label} points per bin")
+    return image
+
+
+def _grid_like(X, points=200):
+    """An evenly spaced grid over X's range, shaped like X for `predict`."""
+    x = _column(X)
+    grid = np.linspace(np.nanmin(x), np.nanmax(x), points)
+    if isinstance(X, pd.DataFrame):
+        return grid, pd.DataFrame({X.columns[0]: grid})
+    return grid, grid.reshape(-1, 1) if np.ndim(X) == 2 else grid
+
+
+def plot_data(X, Y, figure=None, path=None):
     """
     Plot the input data with respect to its features and target.
+
+    Returns:
+    Figure: The drawn figure; saved to `path` when given.
     """
-    plt.figure(figsize=(8, 6))
-    plt.scatter(X, Y)
-    plt.xlabel("Feature")
-    plt.ylabel("Target")
-    plt.title("Data Plot")
-    plt.grid(True)
-    plt.show()
+    figure = _prepare('data', figure, (8, 6))
+    ax = figure.add_subplot()
+    scatter_points(ax, X, Y)
+    ax.set_xlabel("Feature")
+    ax.set_ylabel("Target")
+    ax.set_title("Data Plot")
+    ax.grid(True)
+    return _finish(figure, path)
 
-def plot_regression(X, Y, model):
+def plot_regression(X, Y, model, figure=None, path=None):
     """
     Plot regression model's fit line along with data points.
     """
-    plt.figure(figsize=(8, 6))
-    plt.scatter(X, Y, label="Data", color="blue")
-    plt.plot(X, model.predict(X), label="Fit", color="red")
-    plt.xlabel("Feature")
-    plt.ylabel("Target")
-    plt.title("Regression Plot")
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    figure = _prepare('regression', figure, (8, 6))
+    ax = figure.add_subplot()
+    scatter_points(ax, X, Y)
+    grid, grid_X = _grid_like(X)
+    ax.plot(grid, model.predict(grid_X), label="Fit", color="red")
+    ax.set_xlabel("Feature")
+    ax.set_ylabel("Target")
+    ax.set_title("Regression Plot")
+    ax.legend()
+    ax.grid(True)
+    return _finish(figure, path)
+
+def plot_fitted(Y, fitted, figure=None, path=None):
+    """
+    Plot actual against fitted values, for models with any number of features.
+    """
+    figure = _prepare('fitted', figure, (8, 6))
+    ax = figure.add_subplot()
+    scatter_points(ax, fitted, Y)
+    low, high = np.nanmin(_column(fitted)), np.nanmax(_column(fitted))
+    ax.plot([low, high], [low, high], color="red", label="y = fitted")
+    ax.set_xlabel("Fitted")
+    ax.set_ylabel("Actual")
+    ax.set_title("Actual vs Fitted")
+    ax.legend()
+    ax.grid(True)
+    return _finish(figure, path)
 
-def plot_confusion_matrix(model, X, Y):
+def plot_confusion_matrix(model, X, Y, figure=None, path=None, predictions=None):
     """
     Plot confusion matrix for classification models using ConfusionMatrixDisplay.
+
+    With `predictions` (e.g. held-out predictions from cross-validation) the
+    matrix compares them with Y, and `model` and `X` are not used.
     """
-    plt.figure(figsize=(8, 6))
-    disp = ConfusionMatrixDisplay.from_estimator(model, X, Y, cmap='Blues', xticks_rotation='vertical')
-    disp.ax_.set_title("Confusion Matrix")
-    plt.show()
+    from sklearn.metrics import ConfusionMatrixDisplay
+    figure = _prepare('confusion_matrix', figure, (8, 6))
+    ax = figure.add_subplot()
+    if predictions is None:
+        disp = ConfusionMatrixDisplay.from_estimator(model, X, Y, ax=ax, cmap='Blues', xticks_rotation='vertical')
+        disp.ax_.set_title("Confusion Matrix (training data)")
+    else:
+        disp = ConfusionMatrixDisplay.from_predictions(Y, predictions, ax=ax, cmap='Blues', xticks_rotation='vertical')
+        disp.ax_.set_title("Confusion Matrix (held-out)")
+    return _finish(figure, path)
 
 
-def plot_tree_diagram(model):
+def plot_tree_diagram(model, max_depth=3, tree=0, node=0, figure=None, path=None):
     """
-    Plot Random Forest or Decision Tree diagram for visualization.
+    Plot the top levels of one tree of a forest or boosting model (or a single decision tree).
+
+    Only the nodes within `max_depth` levels below `node` are read from the
+    tree's arrays and drawn, so a tree of any size draws in about the same
+    time. Splits with hidden children end in "...". Pass a deeper `node` (see
+    `inspection.tree_nodes`) to draw the subtree under it.
     """
-    plt.figure(figsize=(20, 10))
-    plot_tree(model.estimators_[0], filled=True)
-    plt.title("Random Forest Tree Diagram")
-    plt.show()
+    from .inspection import estimator_trees, tree_nodes
+    figure = _prepare('tree', figure, (14, 7))
+    ax = figure.add_subplot()
+    nodes = tree_nodes(model, tree=tree, node=node, max_depth=max_depth).set_index('node')
+
+    # Leaves of the drawn tree get consecutive x positions; splits sit above the middle of their children
+    x = {}
+    position = 0
+    stack = [(node, False)]
+    while stack:
+        current, visited = stack.pop()
+        row = nodes.loc[current]
+        if row['is_leaf'] or row['truncated']:
+            x[current] = position
+            position += 1
+        elif visited:
+            x[current] = (x[row['left']] + x[row['right']]) / 2
+        else:
+            stack.extend([(current, True), (row['right'], False), (row['left'], False)])
 
-def plot_curve_fit(X, Y, params, fit_type):
+    for current, row in nodes.iterrows():
+        if row['parent'] >= 0:
+            parent = row['parent']
+            ax.plot([x[parent], x[current]], [-nodes.loc[parent, 'depth'], -row['depth']], color='gray', lw=1, zorder=1)
+        value = row['value'] if isinstance(row['value'], str) else f"{row['value']:.3g}"
+        if row['is_leaf']:
+            text = f"value = {value}\nsamples = {row['samples']:,}"
+            color = '#e8f4e8'
+        else:
+            text = f"{row['feature']} <= {row['threshold']:.3g}\nsamples = {row['samples']:,}\nvalue = {value}"
+            color = '#e8eef8'
+            if row['truncated']:
+                text += "\n..."
+        ax.text(x[current], -row['depth'], text, ha='center', va='center', fontsize=8, zorder=2,
+                bbox=dict(boxstyle='round', facecolor=color, edgecolor='gray'))
+
+    ax.set_xlim(-0.75, max(position - 0.25, 0.75))
+    depths = nodes['depth']
+    ax.set_ylim(-depths.max() - 0.6, -depths.min() + 0.6)
+    ax.axis('off')
+    n_trees = len(estimator_trees(model))
+    ax.set_title(f"Tree {tree + 1} of {n_trees}" + (f", {max_depth} levels below node {node}" if max_depth is not None else ""))
+    return _finish(figure, path)
+
+
+def plot_feature_importances(importances, label="Feature Importances", max_features=20, figure=None, path=None):
+    """
+    Plot feature importances as horizontal bars with their standard deviation.
+
+    Parameters:
+    importances (pd.DataFrame): 'importance' and optionally 'std' per
+        feature, as from `inspection.summarize(model).importances` or
+        `inspection.permutation_importance`.
+    label (str): Plot title.
+    max_features (int): Number of largest importances drawn.
+    """
+    figure = _prepare('importances', figure, (8, 6))
+    ax = figure.add_subplot()
+    top = importances.sort_values('importance', ascending=False).head(max_features).iloc[::-1]
+    error = top['std'] if 'std' in top else None
+    ax.barh([str(name) for name in top.index], top['importance'], xerr=error, color='steelblue', ecolor='gray')
+    ax.set_xlabel("Importance")
+    ax.set_title(label)
+    ax.grid(True, axis='x')
+    return _finish(figure, path)
+
+def plot_bootstrap_intervals(table, label="Bootstrap Intervals", figure=None, path=None):
+    """
+    Plot each parameter's estimate with its bootstrap confidence interval.
+
+    Parameters:
+    table (pd.DataFrame): 'estimate', 'lower' and 'upper' per parameter, as
+        from `bootstrap.bootstrap`.
+    label (str): Plot title.
+    """
+    figure = _prepare('bootstrap', figure, (8, 6))
+    ax = figure.add_subplot()
+    rows = table.iloc[::-1]
+    positions = np.arange(len(rows))
+    error = np.vstack([rows['estimate'] - rows['lower'], rows['upper'] - rows['estimate']])
+    ax.errorbar(rows['estimate'], positions, xerr=np.clip(np.nan_to_num(error), 0, None), fmt='o',
+                color='steelblue', ecolor='gray', capsize=4)
+    ax.set_yticks(positions, [str(name) for name in rows.index])
+    ax.axvline(0, color='black', linewidth=0.8)
+    ax.set_xlabel("Estimate")
+    ax.set_title(label)
+    ax.grid(True, axis='x')
+    return _finish(figure, path)
+
+def plot_curve_fit(X, Y, params, fit_type, figure=None, path=None):
     """
     Plot Gaussian or Exponential curve fitting.
     """
-    plt.figure(figsize=(8, 6))
-    plt.scatter(X, Y, label="Data", color="blue")
-
-    if fit_type == 'gaussian':
-        def gaussian(x, a, x0, sigma):
-            return a * np.exp(-(x - x0) ** 2 / (2 * sigma ** 2))
-        plt.plot(X, gaussian(X, *params), label="Gaussian Fit", color="red")
-    elif fit_type == 'exponential':
-        def exponential(x, a, b, c):
-            return a * np.exp(b * x) + c
-        plt.plot(X, exponential(X, *params), label="Exponential Fit", color="green")
-
-    plt.xlabel("Feature")
-    plt.ylabel("Target")
-    plt.title(f"{fit_type.capitalize()} Curve Fitting Plot")
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    from .curve_fitting import CURVES
+    figure = _prepare('curve_fit', figure, (8, 6))
+    ax = figure.add_subplot()
+    scatter_points(ax, X, Y)
+    # The curve is evaluated on a sorted grid, not on every (unsorted) data point
+    grid, _ = _grid_like(X)
+    color = {'gaussian': "red", 'exponential': "green"}.get(fit_type, "red")
+    ax.plot(grid, CURVES[fit_type][0](grid, *params), label=f"{fit_type.capitalize()} Fit", color=color)
+    ax.set_xlabel("Feature")
+    ax.set_ylabel("Target")
+    ax.set_title(f"{fit_type.capitalize()} Curve Fitting Plot")
+    ax.legend()
+    ax.grid(True)
+    return _finish(figure, path)
+
 
+def plot_clusters(X, labels, centers, max_points=50_000, figure=None, path=None):
+    """
+    Scatter the first two features coloured by cluster, with the centroids.
+
+    At most `max_points` rows are drawn, picked by position, so large tables
+    are never copied in full.
+    """
+    positions = np.arange(len(labels))
+    if len(positions) > max_points:
+        positions = np.sort(np.random.default_rng(0).choice(positions, max_points, replace=False))
+    points = X.iloc[positions, :2].to_numpy() if hasattr(X, 'iloc') else np.asarray(X)[positions, :2]
+    if points.shape[1] == 1:
+        points = np.column_stack([points[:, 0], np.zeros(len(points))])
+        centers = np.column_stack([centers[:, 0], np.zeros(len(centers))])
+    figure = _prepare('clusters', figure, (8, 6))
+    ax = figure.add_subplot()
+    ax.scatter(points[:, 0], points[:, 1], c=labels[positions], cmap='tab10', s=5)
+    ax.scatter(centers[:, 0], centers[:, 1], c='red', marker='x', s=100, label="Centroids")
+    ax.set_xlabel(str(X.columns[0]) if hasattr(X, 'columns') else "Feature 1")
+    ax.set_ylabel(str(X.columns[1]) if hasattr(X, 'columns') and X.shape[1] > 1 else "Feature 2")
+    ax.set_title("KMeans Clusters")
+    ax.legend()
+    ax.grid(True)
+    return _finish(figure, path)
+
+def plot_kmeans_sweep(curves, figure=None, path=None):
+    """
+    Plot the elbow (inertia) and silhouette curves of a KMeans k-sweep.
+    """
+    figure = _prepare('kmeans_sweep', figure, (12, 5))
+    elbow_ax, silhouette_ax = figure.subplots(1, 2)
+    elbow_ax.plot(curves.index, curves['inertia'], marker='o')
+    elbow_ax.set_xlabel("Number of Clusters (k)")
+    elbow_ax.set_ylabel("Inertia")
+    elbow_ax.set_title("Elbow Curve")
+    elbow_ax.grid(True)
+    silhouette_ax.plot(curves.index, curves['silhouette'], marker='o', color='green')
+    silhouette_ax.set_xlabel("Number of Clusters (k)")
+    silhouette_ax.set_ylabel("Silhouette (sampled)")
+    silhouette_ax.set_title("Silhouette Curve")
+    silhouette_ax.grid(True)
+    return _finish(figure, path)
+
+
+def plot_coefficient_trajectory(trajectory, figure=None, path=None):
+    """
+    Plot each coefficient against the row after which it was estimated, e.g. for online recursive LS.
+
+    Parameters:
+    trajectory (pd.DataFrame): One column per coefficient, indexed by row number.
+    """
+    figure = _prepare('coefficient_trajectory', figure, (10, 6))
+    ax = figure.add_subplot()
+    for name in trajectory.columns:
+        ax.plot(trajectory.index, trajectory[name], label=str(name))
+    ax.set_xlabel("Row")
+    ax.set_ylabel("Coefficient")
+    ax.set_title("Coefficient Trajectories")
+    if len(trajectory.columns):
+        ax.legend()
+    ax.grid(True)
+    return _finish(figure, path)
+
+
+def plot_result(method, result, X, Y=None, figure=None, path=None):
+    """
+    Draw the standard plot for a ModelManager result, e.g. for batch exports.
+
+    Returns:
+    Figure or None: None when the method has no standard plot.
+    """
+    if method in ('gaussian_fitting', 'exponential_fitting'):
+        return plot_curve_fit(X, Y, result, method.split('_')[0], figure=figure, path=path)
+    if method == 'recursive_ls_online':
+        return plot_coefficient_trajectory(result.trajectory(), figure=figure, path=path)
+    if method == 'kmeans_sweep':
+        return plot_kmeans_sweep(result, figure=figure, path=path)
+    if hasattr(result, 'cluster_centers_') and hasattr(result, 'labels_'):
+        return plot_clusters(X, result.labels_, result.cluster_centers_, figure=figure, path=path)
+    if hasattr(result, 'fittedvalues'):  # statsmodels results
+        return plot_fitted(Y, result.fittedvalues, figure=figure, path=path)
+    if hasattr(result, 'rsquared') and Y is not None:  # Least squares solved from sufficient statistics
+        return plot_fitted(Y, result.predict(X), figure=figure, path=path)
+    if hasattr(result, 'fit') and Y is not None:
+        from sklearn.base import is_classifier
+        if is_classifier(result):
+            return plot_confusion_matrix(result, X, Y, figure=figure, path=path)
+        return plot_fitted(Y, result.predict(X), figure=figure, path=path)
+    return None
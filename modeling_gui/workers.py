@@ -0,0 +1,42 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from modeling_gui.jobs import JobQueue
+from modeling_gui.models import ModelManager
+
+
+class ModelJobRunner(QObject):
+    """
+    Qt front-end for JobQueue.
+
+    Job callbacks fire on worker threads; re-emitting them as signals lets Qt
+    deliver them to slots on the GUI thread through queued connections.
+    """
+
+    job_queued = pyqtSignal(object)
+    job_started = pyqtSignal(object)
+    job_progress = pyqtSignal(object, int, int)
+    job_done = pyqtSignal(object)
+
+    def __init__(self, parent=None, max_workers=1, manager_factory=ModelManager):
+        super(ModelJobRunner, self).__init__(parent)
+        self.queue = JobQueue(
+            max_workers=max_workers,
+            on_start=self.job_started.emit,
+            on_progress=self.job_progress.emit,
+            on_done=self.job_done.emit,
+            manager_factory=manager_factory,
+        )
+
+    def submit(self, method, *args, label=None, **kwargs):
+        job = self.queue.submit(method, *args, label=label, **kwargs)
+        self.job_queued.emit(job)
+        return job
+
+    def cancel(self, job=None):
+        self.queue.cancel(job)
+
+    def active(self):
+        return self.queue.active()
+
+    def shutdown(self):
+        self.queue.shutdown(wait=False, cancel=True)
@@ -0,0 +1,353 @@
+"""
+A session workspace of named datasets and fitted models that outlives the process.
+
+Datasets are written once, column by column, as .npy files under the
+workspace directory (the same layout as the CSV cache of `load_csv`). They
+are then opened memory-mapped, so switching between datasets, or reopening
+them in the next session, costs no parsing and almost no copying. Worker
+processes open a dataset from its `DatasetRef` instead of receiving a
+pickled copy.
+
+Open datasets are kept in least-recently-used order. When their combined
+size goes over `memory_budget`, the oldest are closed; their files stay on
+disk and `get` maps them again when they are next needed.
+
+Fitted models are kept in memory by name for the session. `add_model(...,
+persist=True)` also saves one as a model directory (see
+modeling_gui.artifacts), which later sessions reopen memory-mapped.
+
+Everything the next session needs is recorded in `workspace.json`.
+"""
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from . import artifacts
+from .utils.file_helper import default_cache_dir, load_csv, read_columns, write_columns
+
+INDEX_NAME = 'workspace.json'
+WORKSPACE_VERSION = 1
+
+
+def _slug(name):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(name)).strip('._') or 'dataset'
+
+
+def _frame_bytes(df):
+    return int(df.memory_usage(index=False, deep=False).sum())
+
+
+def _source_key(file_path, options):
+    """Identity of a CSV file and the options it was loaded with; unchanged files give the same key."""
+    stat = os.stat(file_path)
+    return json.dumps([os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, options], sort_keys=True,
+                      default=str)
+
+
+class DatasetRef:
+    """
+    Picklable handle to a workspace dataset, for worker processes.
+
+    Parameters:
+    path (str): The dataset's column directory.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+
+    def open(self, mmap_mode='r'):
+        """The dataset as a DataFrame over read-only memory-mapped columns."""
+        return read_columns(self.path, mmap_mode=mmap_mode)
+
+
+class Workspace:
+    """
+    Named datasets and fitted models kept across sessions.
+
+    Parameters:
+    directory (str): Where datasets, saved models and the index live;
+        defaults to the 'workspace' application cache directory.
+    memory_budget (int): Bytes of datasets kept open; None keeps the
+        budget recorded by the last session (2 GB at first).
+    """
+
+    def __init__(self, directory=None, memory_budget=None):
+        self.directory = Path(directory) if directory is not None else default_cache_dir("workspace")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index = {'version': WORKSPACE_VERSION, 'datasets': {}, 'models': {},
+                       'active': None, 'memory_budget': 2 * 1024 ** 3}
+        path = self.directory / INDEX_NAME
+        if path.exists():
+            with open(path) as f:
+                index = json.load(f)
+            if index.get('version') == WORKSPACE_VERSION:
+                self._index.update(index)
+        # Entries whose files were deleted outside the workspace are dropped
+        self._index['datasets'] = {name: entry for name, entry in self._index['datasets'].items()
+                                   if (self.directory / entry['path'] / "manifest.json").exists()}
+        self._index['models'] = {name: entry for name, entry in self._index['models'].items()
+                                 if artifacts.is_saved_model(self.directory / entry['path'])}
+        if memory_budget is not None:
+            self._index['memory_budget'] = int(memory_budget)
+        self._open = OrderedDict()  # name -> DataFrame, least recently used first
+        self._models = {}  # name -> fitted model
+        self._model_info = {}  # name -> whatever the caller attached, e.g. the fitting job
+
+    # --- Datasets ---
+
+    @property
+    def names(self):
+        """Dataset names, oldest first."""
+        return list(self._index['datasets'])
+
+    @property
+    def memory_budget(self):
+        return self._index['memory_budget']
+
+    @memory_budget.setter
+    def memory_budget(self, value):
+        self._index['memory_budget'] = int(value)
+        self._save_index()
+        self.trim()
+
+    @property
+    def active(self):
+        """The dataset the last session was working on, reopened at the next launch."""
+        return self._index['active']
+
+    @active.setter
+    def active(self, name):
+        if name is not None and name not in self._index['datasets']:
+            raise KeyError(f"No dataset named {name!r}.")
+        self._index['active'] = name
+        self._save_index()
+
+    def __contains__(self, name):
+        return name in self._index['datasets']
+
+    def add(self, name, df, source=None, source_key=None):
+        """
+        Store a DataFrame under `name`, replacing any dataset of that name.
+
+        Parameters:
+        name (str): Dataset name.
+        df (pd.DataFrame): The data; text columns are stored as categoricals.
+        source (str): The file it came from, e.g. for streamed fits.
+        source_key (str): Identity of the source used by `load_csv` to skip
+            parsing files already in the workspace.
+
+        Returns:
+        pd.DataFrame: The stored dataset, memory-mapped copy-on-write.
+        """
+        folder = Path("datasets") / f"{_slug(name)}-{uuid.uuid4().hex[:8]}"
+        target = self.directory / folder
+        temporary = target.with_name(target.name + ".tmp")
+        write_columns(df.reset_index(drop=True), temporary)
+        os.replace(temporary, target)
+        previous = self._index['datasets'].get(name)
+        self._index['datasets'][name] = {
+            'path': folder.as_posix(), 'source': str(source) if source is not None else None,
+            'source_key': source_key, 'rows': len(df), 'columns': int(df.shape[1]),
+            'bytes': _frame_bytes(df), 'added': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        self._open.pop(name, None)
+        self._save_index()
+        if previous is not None:
+            shutil.rmtree(self.directory / previous['path'], ignore_errors=True)
+        return self.get(name)
+
+    def load_csv(self, file_path, name=None, **options):
+        """
+        Load a CSV into the workspace, or reopen it if this file, unchanged, was loaded with the same options.
+
+        Parameters:
+        file_path (str): The CSV file.
+        name (str): Dataset name, replacing a dataset of that name;
+            defaults to the file name without suffix, numbered if taken.
+        **options: Passed to `utils.file_helper.load_csv`.
+
+        Returns:
+        tuple: (name, DataFrame). `df.attrs['load_report']['source']` is
+        'workspace' when the file was not parsed again.
+        """
+        start = time.perf_counter()
+        key = _source_key(file_path, options)
+        for existing, entry in self._index['datasets'].items():
+            if entry.get('source_key') == key and name in (None, existing):
+                df = self.get(existing)
+                df.attrs['load_report'] = {
+                    'path': str(file_path), 'source': 'workspace', 'rows': len(df), 'columns': df.shape[1],
+                    'seconds': time.perf_counter() - start, 'frame_mb': entry['bytes'] / 1e6,
+                    'peak_frame_mb': 0.0,
+                }
+                return existing, df
+        if name is None:
+            # A changed file replaces its earlier version; another file with the same name is numbered
+            path = os.path.abspath(file_path)
+            earlier = [existing for existing, entry in self._index['datasets'].items()
+                       if entry['source'] is not None and os.path.abspath(entry['source']) == path]
+            name = stem = earlier[0] if earlier else Path(file_path).stem
+            count = 1
+            while not earlier and name in self._index['datasets']:
+                count += 1
+                name = f"{stem} ({count})"
+        df = load_csv(file_path, **options)
+        report = df.attrs['load_report']
+        stored = self.add(name, df, source=file_path, source_key=key)
+        report['seconds'] = time.perf_counter() - start
+        stored.attrs['load_report'] = report
+        return name, stored
+
+    def get(self, name):
+        """
+        The dataset `name` as a memory-mapped DataFrame, opening it if it was closed.
+
+        Raises:
+        KeyError: If there is no such dataset.
+        """
+        if name not in self._index['datasets']:
+            raise KeyError(f"No dataset named {name!r}.")
+        df = self._open.pop(name, None)
+        if df is None:
+            df = read_columns(self.directory / self._index['datasets'][name]['path'])
+        self._open[name] = df
+        self.trim()
+        return df
+
+    def ref(self, name):
+        """A `DatasetRef` workers can open without the data being pickled."""
+        if name not in self._index['datasets']:
+            raise KeyError(f"No dataset named {name!r}.")
+        return DatasetRef(self.directory / self._index['datasets'][name]['path'])
+
+    def source(self, name):
+        """The file a dataset was loaded from, or None."""
+        return self._index['datasets'][name]['source']
+
+    def remove(self, name):
+        """Delete a dataset and its files."""
+        entry = self._index['datasets'].pop(name)
+        self._open.pop(name, None)
+        if self._index['active'] == name:
+            self._index['active'] = None
+        self._save_index()
+        shutil.rmtree(self.directory / entry['path'], ignore_errors=True)
+
+    def memory_usage(self):
+        """Bytes of the datasets currently open."""
+        return sum(_frame_bytes(df) for df in self._open.values())
+
+    def trim(self):
+        """
+        Close the least recently used datasets until the open ones fit the budget.
+
+        The most recently used dataset stays open even when it alone is over budget.
+
+        Returns:
+        list: Names of the closed datasets.
+        """
+        closed = []
+        while len(self._open) > 1 and self.memory_usage() > self.memory_budget:
+            name, _ = self._open.popitem(last=False)
+            closed.append(name)
+        return closed
+
+    def datasets(self):
+        """
+        One row per dataset: name, rows, columns, size in MB, whether it is open, source and when it was added.
+        """
+        columns = ['name', 'rows', 'columns', 'mb', 'open', 'source', 'added']
+        rows = [{'name': name, 'rows': entry['rows'], 'columns': entry['columns'], 'mb': entry['bytes'] / 1e6,
+                 'open': name in self._open, 'source': entry['source'], 'added': entry['added']}
+                for name, entry in self._index['datasets'].items()]
+        return pd.DataFrame(rows, columns=columns)
+
+    # --- Models ---
+
+    @property
+    def model_names(self):
+        """Fitted models of this session and saved models of earlier ones."""
+        return list(dict.fromkeys(list(self._index['models']) + list(self._models)))
+
+    def add_model(self, name, model, info=None, persist=False, manifest=None):
+        """
+        Keep a fitted model under `name`, replacing any model of that name.
+
+        Parameters:
+        name (str): Model name.
+        model: The fitted model.
+        info: Anything to keep alongside it for this session, e.g. the job that fitted it.
+        persist (bool): Also save it (see `artifacts.save_model`) so later
+            sessions can reopen it.
+        manifest (dict): Manifest for the saved model, see `artifacts.build_manifest`.
+        """
+        self._models[name] = model
+        self._model_info[name] = info
+        if persist:
+            folder = Path("models") / _slug(name)
+            artifacts.save_model(model, self.directory / folder, manifest=manifest, overwrite=True)
+            self.register_model(name, folder)
+
+    def register_model(self, name, path):
+        """
+        Record a model saved elsewhere (see `artifacts.save_model`) so later sessions list it under `name`.
+
+        Parameters:
+        name (str): Model name.
+        path (str): The saved model directory; paths inside the workspace
+            directory are stored relative to it.
+        """
+        path = Path(path)
+        if path.is_absolute() and path.is_relative_to(self.directory):
+            path = path.relative_to(self.directory)
+        self._index['models'][name] = {'path': path.as_posix(), 'added': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        self._save_index()
+
+    def model_path(self, name):
+        """The saved directory of a model, or None for a model kept only in this session."""
+        entry = self._index['models'].get(name)
+        return self.directory / entry['path'] if entry is not None else None
+
+    def model(self, name):
+        """
+        The model `name`; saved models of earlier sessions are loaded memory-mapped on first use.
+
+        Raises:
+        KeyError: If there is no such model.
+        """
+        if name not in self._models:
+            if name not in self._index['models']:
+                raise KeyError(f"No model named {name!r}.")
+            self._models[name] = artifacts.load_model(self.directory / self._index['models'][name]['path'])
+        return self._models[name]
+
+    def model_info(self, name):
+        """What was attached to a model of this session, or None."""
+        return self._model_info.get(name)
+
+    def remove_model(self, name):
+        """Forget a model; a saved directory inside the workspace is deleted, one registered from elsewhere is kept."""
+        self._models.pop(name, None)
+        self._model_info.pop(name, None)
+        entry = self._index['models'].pop(name, None)
+        if entry is not None:
+            self._save_index()
+            if not Path(entry['path']).is_absolute():
+                shutil.rmtree(self.directory / entry['path'], ignore_errors=True)
+
+    # --- Index ---
+
+    def _save_index(self):
+        # Written to a temporary file first, so a crash never leaves a truncated index
+        path = self.directory / INDEX_NAME
+        temporary = path.with_name(path.name + ".tmp")
+        with open(temporary, 'w') as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(temporary, path)
@@ -23,6 +23,7 @@ setup(
         "pandas>=1.3.3",
         "statsmodels>=0.12.2",
         "scikit-learn>=0.24.2",
+        "joblib>=1.0",
         "scipy>=1.7.1",
         "graphviz>=0.16",
         "numpy>=1.21.2"
@@ -36,6 +37,8 @@ setup(
     entry_points={
         'console_scripts': [
             'run_modeling_gui=modeling_gui.main:main',  # Entry point for running the GUI from CLI
+            'modeling_gui_batch=modeling_gui.cli:main',  # Headless batch runner for job specs
+            'modeling_gui_score=modeling_gui.scoring:main',  # Batch scoring and a local prediction endpoint
         ],
     },
 )
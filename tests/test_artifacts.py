@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from modeling_gui.artifacts import CompactForest, list_models, load_model, read_manifest, save_model
+from modeling_gui.models import ModelManager
+from modeling_gui.scoring import score_file
+
+
+class TestArtifacts(unittest.TestCase):
+
+    def setUp(self):
+        """Set up features with missing values, a regression target and class labels."""
+        self.directory = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        n = 2000
+        self.X = pd.DataFrame(rng.normal(size=(n, 3)), columns=['a', 'b', 'c'])
+        self.Y = 2.0 * self.X['a'] - self.X['b'] + rng.normal(scale=0.1, size=n)
+        self.labels = pd.Series(np.where(self.X['a'] + self.X['c'] > 0, 'up', 'down'), name='label')
+        self.X.iloc[::13, 2] = np.nan
+        self.manager = ModelManager()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_forest_round_trip(self):
+        """Forests reload as memory-mapped node arrays with the same predictions."""
+        forest = self.manager.random_forest(self.X, self.Y, n_estimators=20, max_depth=8)
+        path = os.path.join(self.directory, 'forest')
+        manifest = self.manager.save_model(path, fit_method='random_forest', X=self.X, Y=self.Y,
+                                           params={'n_estimators': 20, 'max_depth': 8}, fit_seconds=0.5)
+        self.assertEqual(manifest['kind'], 'forest')
+        loaded = load_model(path)
+        self.assertIsInstance(loaded, CompactForest)
+        self.assertIsInstance(loaded.threshold, np.memmap)
+        np.testing.assert_allclose(loaded.predict(self.X), forest.predict(self.X), rtol=1e-12)
+        self.assertEqual(list(loaded.feature_names_in_), ['a', 'b', 'c'])
+
+        classifier = self.manager.random_forest(self.X, self.labels, n_estimators=10, max_depth=6)
+        compact = CompactForest.from_forest(classifier)
+        np.testing.assert_array_equal(compact.predict(self.X), classifier.predict(self.X))
+        np.testing.assert_allclose(compact.predict_proba(self.X), classifier.predict_proba(self.X), atol=1e-12)
+
+    def test_manifest(self):
+        """The manifest records the data fingerprint, columns, settings and fit time."""
+        self.manager.ols(self.X.fillna(0), self.Y)
+        path = os.path.join(self.directory, 'ols')
+        self.manager.save_model(path, fit_method='ols', X=self.X.fillna(0), Y=self.Y, params={'engine': 'statsmodels'},
+                                fit_seconds=0.25, source='data.csv')
+        manifest = read_manifest(path)
+        self.assertEqual(manifest['method'], 'ols')
+        self.assertEqual(manifest['x_columns'], ['a', 'b', 'c'])
+        self.assertEqual(manifest['rows'], 2000)
+        self.assertEqual(manifest['params'], {'engine': 'statsmodels'})
+        self.assertEqual(manifest['fit_seconds'], 0.25)
+        self.assertEqual(manifest['source'], 'data.csv')
+        self.assertEqual(len(manifest['data_fingerprint']), 32)
+        self.assertIn('numpy', manifest['versions'])
+        with self.assertRaises(FileExistsError):
+            save_model(self.manager.model, path)
+        table = list_models(self.directory)
+        self.assertEqual(list(table['name']), ['ols'])
+
+    def test_slim_statsmodels_results(self):
+        """statsmodels results are saved without their data and still predict raw regressors."""
+        X = self.X.fillna(0)
+        results = self.manager.ols(X, self.Y)
+        path = os.path.join(self.directory, 'ols')
+        manifest = save_model(results, path)
+        self.assertEqual(manifest['kind'], 'statsmodels')
+        self.assertIsNotNone(results.model.exog)  # The fitted results keep their data
+        loaded = load_model(path)
+        self.assertIsNone(loaded.model.exog)
+        np.testing.assert_allclose(loaded.params, results.params)
+        np.testing.assert_allclose(loaded.predict(X.head()), results.predict(X.head()))
+
+    def test_curve_fit_and_preprocessed_models(self):
+        """Curve-fit parameters are JSON; preprocessed models keep their preprocessor."""
+        x = np.linspace(0, 10, 50)
+        params = self.manager.gaussian_fitting(x, 4 * np.exp(-(x - 5) ** 2 / 4.5))
+        path = os.path.join(self.directory, 'gaussian')
+        self.assertEqual(save_model(params, path)['kind'], 'json')
+        self.assertEqual(len(json.load(open(os.path.join(path, 'params.json')))), 3)
+        np.testing.assert_allclose(load_model(path), params)
+
+        self.manager.fit_preprocessor(self.X, impute='median', scale='robust')
+        model = self.manager.random_forest(self.X, self.Y, n_estimators=5, max_depth=4)
+        path = os.path.join(self.directory, 'preprocessed')
+        save_model(model, path)
+        loaded = load_model(path)
+        np.testing.assert_allclose(loaded.predict(self.X), model.predict(self.X), rtol=1e-12)
+
+        # Workers score from the saved directory
+        input_path = os.path.join(self.directory, 'input.csv')
+        self.X.to_csv(input_path, index=False)
+        output_path = os.path.join(self.directory, 'predictions.csv')
+        report = score_file(path, input_path, output_path, workers=2, chunksize=500)
+        self.assertEqual(report['rows'], 2000)
+        np.testing.assert_allclose(pd.read_csv(output_path)['prediction'], model.predict(self.X), rtol=1e-10)
+
+if __name__ == '__main__':
+    unittest.main()
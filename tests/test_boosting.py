@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.base import is_classifier
+from modeling_gui.boosting import MAX_BINS, MISSING_BIN, StreamingBinner
+from modeling_gui.jobs import JobMonitor
+from modeling_gui.models import ModelManager
+
+class TestHistogramBoosting(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a classification problem with a text column and missing values."""
+        rng = np.random.default_rng(0)
+        n = 2000
+        self.X = pd.DataFrame({
+            'a': rng.normal(size=n),
+            'b': rng.normal(size=n),
+            'colour': rng.choice(['red', 'green', 'blue'], size=n),
+        })
+        signal = self.X['a'] + np.where(self.X['colour'] == 'red', 2.0, -1.0)
+        self.Y = pd.Series(np.where(signal > 0, 'yes', 'no'))
+        self.X.loc[::17, 'b'] = np.nan
+        self.model_manager = ModelManager()
+
+    def test_histogram_backend(self):
+        """The histogram backend handles text and NaN features and predicts labels."""
+        model = self.model_manager.gradient_boost(self.X, self.Y, n_estimators=50, backend='histogram')
+        self.assertTrue(is_classifier(model))
+        self.assertEqual(list(model.classes_), ['no', 'yes'])
+        self.assertGreater(model.score(self.X, self.Y), 0.9)
+        new = pd.DataFrame({'a': [3.0], 'b': [np.nan], 'colour': ['purple']})
+        self.assertIn(model.predict(new)[0], ['no', 'yes'])
+
+    def test_regression_and_invalid_backend(self):
+        """Numerical targets get a regressor; unknown backends are rejected."""
+        Y = self.X['a'] * 2.0
+        model = self.model_manager.gradient_boost(self.X[['a', 'b']], Y, backend='histogram')
+        self.assertFalse(is_classifier(model))
+        self.assertGreater(model.score(self.X[['a', 'b']], Y), 0.95)
+        with self.assertRaises(Exception):
+            self.model_manager.gradient_boost(self.X[['a']], Y, backend='xgboost')
+
+    def test_early_stopping_with_monitor(self):
+        """Batched fits report progress and stop once early stopping triggers."""
+        progress = []
+        manager = ModelManager(monitor=JobMonitor(lambda done, total: progress.append((done, total))))
+        model = manager.gradient_boost(self.X, self.Y, n_estimators=1000, learning_rate=0.5,
+                                       backend='histogram', early_stopping=True)
+        self.assertLess(model[-1].n_iter_, 1000)
+        self.assertLess(progress[-1][0], 1000)
+
+    def test_streaming_binner(self):
+        """Bins are learned across chunks and missing values get their own code."""
+        rng = np.random.default_rng(1)
+        values = rng.normal(size=(10_000, 2))
+        binner = StreamingBinner(max_bins=16, subsample=1000)
+        for chunk in np.array_split(values, 7):
+            binner.partial_fit(chunk)
+        binner.finalize()
+        codes = binner.transform(np.vstack([values[:100], [[np.nan, 0.0]]]))
+        self.assertEqual(codes.dtype, np.uint8)
+        self.assertLess(codes[:100].max(), 16)
+        self.assertEqual(codes[-1, 0], MISSING_BIN)
+        self.assertEqual(StreamingBinner().fit(values).transform(values).max(), MAX_BINS - 1)
+
+    def test_streamed_training(self):
+        """Training from a CSV in chunks uses every row of the file."""
+        data = self.X[['a', 'b']].assign(target=self.Y)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.csv')
+            data.to_csv(path, index=False)
+            model = self.model_manager.gradient_boost_streamed(path, ['a', 'b'], 'target', chunksize=300)
+        self.assertEqual(model.n_rows_, len(data))
+        # Every code, the missing one of 'b' included, keeps a bin of its own in the boosting model
+        codes = model['bin'].transform(data[['a', 'b']])
+        n_codes = [len(np.unique(column)) for column in codes.T]
+        self.assertEqual(n_codes[1], MAX_BINS + 1)
+        self.assertEqual(list(model['boost']._bin_mapper.n_bins_non_missing_), n_codes)
+        self.assertGreater(model.score(self.X[['a', 'b']], self.Y), 0.7)
+
+if __name__ == '__main__':
+    unittest.main()
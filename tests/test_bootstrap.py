@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import pandas as pd
+from modeling_gui.bootstrap import bca_interval, bootstrap, parameters
+from modeling_gui.curve_fitting import exponential
+from modeling_gui.models import ModelManager
+from modeling_gui.visualization import FigurePool, plot_bootstrap_intervals
+
+
+class TestBootstrap(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a linear target with heavy-tailed noise."""
+        rng = np.random.default_rng(0)
+        n = 1000
+        self.X = pd.DataFrame(rng.normal(size=(n, 2)), columns=['a', 'b'])
+        self.Y = 1.0 + 2.0 * self.X['a'] - self.X['b'] + rng.standard_t(3, size=n)
+
+    def test_ols(self):
+        """Batched OLS refits agree with the model's standard errors, stop early, and do not depend on workers."""
+        table = ModelManager().bootstrap(self.X, self.Y, 'ols', n_resamples=2000)
+        self.assertEqual(list(table.index), ['const', 'a', 'b'])
+        self.assertTrue(table.attrs['converged'])
+        self.assertLess(table.attrs['n_resamples'], 2000)
+        self.assertTrue(((table['lower'] < table['estimate']) & (table['estimate'] < table['upper'])).all())
+        np.testing.assert_allclose(table['boot_std_error'], table['std_error'], rtol=0.25)
+
+        serial = bootstrap(self.X, self.Y, 'ols', n_resamples=60, tol=0, n_workers=1)
+        parallel = bootstrap(self.X, self.Y, 'ols', n_resamples=60, tol=0, n_workers=2)
+        self.assertEqual(serial.attrs['n_resamples'], 60)
+        np.testing.assert_allclose(serial.attrs['samples'], parallel.attrs['samples'])
+
+        # Resample 0 refitted the slow way gives the same coefficients
+        rows = np.random.default_rng(np.random.SeedSequence(0).spawn(1)[0]).integers(0, len(self.Y), (1, 1000))[0]
+        refit = ModelManager().ols(self.X.iloc[rows], self.Y.iloc[rows])
+        np.testing.assert_allclose(serial.attrs['samples'].iloc[0], refit.params, rtol=1e-8)
+
+        figure = plot_bootstrap_intervals(table, figure=FigurePool().acquire('bootstrap'))
+        self.assertEqual(len(figure.axes[0].get_yticks()), 3)
+
+    def test_bca_and_warm_starts(self):
+        """RLM and curve fits refit from the full-data solution; BCa shifts skewed intervals."""
+        table = bootstrap(self.X, self.Y, 'rlm', n_resamples=60, tol=0, interval='bca', n_jackknife=20, n_workers=1)
+        self.assertEqual(table.attrs['failed'], 0)
+        self.assertTrue(((table['lower'] < table['estimate']) & (table['estimate'] < table['upper'])).all())
+
+        rng = np.random.default_rng(1)
+        x = np.linspace(0, 2, 80)
+        y = exponential(x, 1.5, 0.8, 0.3) + rng.normal(scale=0.05, size=80)
+        curves = bootstrap(x, y, 'exponential_fitting', n_resamples=200, interval='bca', n_workers=1)
+        self.assertEqual(list(curves.index), ['a', 'b', 'c'])
+        self.assertTrue(curves['std_error'].notna().all())
+        self.assertTrue((curves['lower'] < curves['upper']).all())
+
+        samples = np.exp(rng.normal(size=(4000, 1)))
+        jackknife = np.exp(rng.normal(scale=0.03, size=(50, 1)))
+        lower, upper = bca_interval(samples, np.array([1.0]), jackknife)
+        self.assertGreater(upper[0] - 1.0, 1.0 - lower[0])
+
+    def test_parameters(self):
+        """Parameters are found on statsmodels results, ensembles and curve fits; other models are refused."""
+        names, values, bse = parameters(ModelManager().rlm(self.X, self.Y))
+        self.assertEqual(names, ['const', 'a', 'b'])
+        self.assertEqual(bse.shape, (3,))
+        forest = ModelManager().random_forest(self.X, self.Y, n_estimators=5, n_jobs=1)
+        self.assertEqual(parameters(forest, ['a', 'b'])[0], ['a', 'b'])
+        table = bootstrap(self.X, self.Y, 'random_forest', params={'n_estimators': 5}, n_resamples=20, n_workers=1)
+        self.assertTrue(table['std_error'].isna().all())
+        with self.assertRaises(ValueError):
+            parameters(ModelManager().kmeans_clustering(self.X, n_clusters=2))
+        with self.assertRaises(ValueError):
+            bootstrap(self.X, self.Y, 'fit_everything')
+        with self.assertRaises(ValueError):
+            bootstrap(self.X, self.Y, 'ols', interval='normal')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from modeling_gui.cache import ModelCache, estimated_size, fingerprint
+from modeling_gui.models import ModelManager
+
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a classification frame and a manager with a disk-backed cache."""
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(200, 3)), columns=['a', 'b', 'c'])
+        self.Y = pd.Series(rng.integers(0, 2, 200).astype(str), name='label')
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = ModelCache(max_items=2, cache_dir=self.cache_dir)
+        self.model_manager = ModelManager(cache=self.cache)
+
+    def test_fingerprint_tracks_content_and_names(self):
+        """The fingerprint changes with values and column names but not with copies."""
+        self.assertEqual(fingerprint(self.X, self.Y), fingerprint(self.X.copy(), self.Y.copy()))
+        changed = self.X.copy()
+        changed.iloc[0, 0] += 1e-9
+        self.assertNotEqual(fingerprint(self.X), fingerprint(changed))
+        self.assertNotEqual(fingerprint(self.X), fingerprint(self.X.rename(columns={'a': 'z'})))
+
+    def test_repeat_run_hits_cache(self):
+        """Repeating a call returns the cached model; new parameters miss."""
+        first = self.model_manager.random_forest(self.X, self.Y, n_estimators=5, max_depth=3)
+        self.assertIsNone(self.model_manager.last_cache_hit)
+        second = self.model_manager.random_forest(self.X, self.Y, max_depth=3, n_estimators=5)
+        self.assertIs(first, second)
+        self.assertEqual(self.model_manager.last_cache_hit, 'memory')
+        self.model_manager.random_forest(self.X, self.Y, n_estimators=6, max_depth=3)
+        self.assertIsNone(self.model_manager.last_cache_hit)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_disk_cache_survives_new_session(self):
+        """A fresh cache on the same directory loads models from disk."""
+        self.model_manager.kmeans_clustering(self.X, n_clusters=3)
+        manager = ModelManager(cache=ModelCache(cache_dir=self.cache_dir))
+        model = manager.kmeans_clustering(self.X, n_clusters=3)
+        self.assertEqual(manager.last_cache_hit, 'disk')
+        self.assertEqual(model.n_clusters, 3)
+
+    def test_disk_size_cap(self):
+        """The disk cache is trimmed to its size cap."""
+        cache = ModelCache(cache_dir=self.cache_dir, max_disk_bytes=1)
+        cache.put("a", np.zeros(100))
+        cache.put("b", np.zeros(100))
+        self.assertLessEqual(len(list(cache.cache_dir.glob("*.joblib"))), 1)
+
+    def test_oversized_models_stay_in_memory(self):
+        """A model estimated above the disk cap is not written; smaller ones are, without leftovers."""
+        forest = self.model_manager.random_forest(self.X, self.Y, n_estimators=5, n_jobs=1)
+        self.assertGreater(estimated_size(forest), 5 * forest.estimators_[0].tree_.node_count * 8)
+        cache = ModelCache(cache_dir=self.cache_dir, max_disk_bytes=4000)
+        cache.clear(disk=True)
+        cache.put("large", np.zeros(1000))
+        cache.put("small", np.zeros(10))
+        self.assertEqual(sorted(p.name for p in cache.cache_dir.iterdir()), ["small.joblib"])
+        self.assertEqual(cache.get("large")[1], 'memory')
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import joblib
+import numpy as np
+import pandas as pd
+from modeling_gui.cli import load_spec, main, run_batch
+
+class TestBatchCli(unittest.TestCase):
+
+    def setUp(self):
+        """Write two CSV files and a spec with a regression, a forest and a broken job."""
+        self.directory = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        for day in ('day1', 'day2'):
+            data = pd.DataFrame(rng.normal(size=(100, 2)), columns=['a', 'b'])
+            data['c'] = 1.0 + 2.0 * data['a'] - data['b'] + rng.normal(scale=0.1, size=100)
+            data['label'] = np.where(data['a'] > 0, 'up', 'down')
+            data.to_csv(os.path.join(self.directory, f"{day}.csv"), index=False)
+        self.spec = {
+            'output_dir': 'out',
+            'workers': 2,
+            'jobs': [
+                {'name': 'ols', 'files': ['*.csv'], 'model': 'ols', 'x': ['a', 'b'], 'y': 'c'},
+                {'name': 'forest', 'files': 'day1.csv', 'model': 'random_forest', 'x': ['a', 'b'],
+                 'y': 'label', 'params': {'n_estimators': 5}, 'plot': 'png'},
+                {'name': 'broken', 'files': 'day1.csv', 'model': 'ols', 'x': ['missing'], 'y': 'c'},
+            ],
+        }
+        self.spec_path = os.path.join(self.directory, 'spec.json')
+        with open(self.spec_path, 'w') as f:
+            json.dump(self.spec, f)
+        self.output_dir = os.path.join(self.directory, 'out')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_spec_expansion(self):
+        """Globs expand to one task per file and unknown models are rejected."""
+        _, tasks = load_spec(self.spec_path)
+        self.assertEqual([task['id'] for task in tasks], ['ols/day1', 'ols/day2', 'forest/day1', 'broken/day1'])
+        self.spec['jobs'][0]['model'] = 'not_a_model'
+        with open(self.spec_path, 'w') as f:
+            json.dump(self.spec, f)
+        with self.assertRaises(ValueError):
+            load_spec(self.spec_path)
+        self.spec['jobs'][0]['model'] = 'save_model'  # Public, but not a fitting method
+        with open(self.spec_path, 'w') as f:
+            json.dump(self.spec, f)
+        with self.assertRaises(ValueError):
+            load_spec(self.spec_path)
+
+    def test_run_and_resume(self):
+        """Tasks write summaries, tables and models; failures are isolated; reruns resume."""
+        self.assertEqual(main([self.spec_path]), 1)  # The broken job fails
+        summary = json.load(open(os.path.join(self.output_dir, 'ols', 'day1', 'summary.json')))
+        self.assertEqual(summary['status'], 'ok')
+        self.assertGreater(summary['stats']['rsquared'], 0.99)
+        self.assertGreater(summary['peak_mb'], 0)
+        self.assertIn('rss_after_mb', summary)
+        table = pd.read_csv(os.path.join(self.output_dir, 'ols', 'day1', 'table.csv'), index_col=0)
+        self.assertAlmostEqual(table.loc['a', 'params'], 2.0, delta=0.1)
+        forest = joblib.load(os.path.join(self.output_dir, 'forest', 'day1', 'model.joblib'))
+        self.assertEqual(forest.n_jobs, 1)  # Pooled forests do not oversubscribe the machine
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'forest', 'day1', 'plot.png')))
+        broken = json.load(open(os.path.join(self.output_dir, 'broken', 'day1', 'summary.json')))
+        self.assertEqual(broken['status'], 'failed')
+        with open(os.path.join(self.output_dir, 'results.jsonl')) as f:
+            self.assertEqual(len(f.readlines()), 4)
+
+        # Only the failed task reruns
+        _, tasks = load_spec(self.spec_path)
+        summaries = run_batch(tasks, self.output_dir, workers=1)
+        self.assertEqual([s['id'] for s in summaries], ['broken/day1'])
+
+if __name__ == '__main__':
+    unittest.main()
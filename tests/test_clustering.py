@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from modeling_gui.clustering import compact_labels
+from modeling_gui.models import ModelManager
+
+class TestClustering(unittest.TestCase):
+
+    def setUp(self):
+        """Set up four well-separated blobs."""
+        rng = np.random.default_rng(0)
+        centers = np.array([[0, 0], [10, 0], [0, 10], [10, 10]])
+        points = np.vstack([rng.normal(c, 0.5, size=(500, 2)) for c in centers])
+        self.X = pd.DataFrame(points, columns=['x', 'y'])
+        self.model_manager = ModelManager()
+
+    def test_modes(self):
+        """Full and mini-batch modes find the blobs and return compact labels."""
+        for mode in ('full', 'minibatch'):
+            model = self.model_manager.kmeans_clustering(self.X, n_clusters=4, mode=mode, batch_size=256)
+            self.assertEqual(model.labels_.dtype, np.uint8)
+            self.assertEqual(sorted(np.bincount(model.labels_)), [500] * 4)
+        with self.assertRaises(Exception):
+            self.model_manager.kmeans_clustering(self.X, mode='bogus')
+
+    def test_compact_labels(self):
+        """Label dtypes grow only as the number of clusters requires."""
+        self.assertEqual(compact_labels([0, 255], 256).dtype, np.uint8)
+        self.assertEqual(compact_labels([0, 256], 257).dtype, np.uint16)
+
+    def test_sweep(self):
+        """The sweep returns elbow and silhouette curves that peak at the true k."""
+        curves = self.model_manager.kmeans_sweep(self.X, range(2, 7), sample_size=500, n_workers=2)
+        self.assertEqual(list(curves.index), [2, 3, 4, 5, 6])
+        self.assertTrue((np.diff(curves['inertia']) < 0).all())
+        self.assertEqual(curves.attrs['best_k'], 4)
+        self.assertEqual(self.model_manager.model.n_clusters, 4)
+        curves = self.model_manager.kmeans_sweep(self.X, [2, 4], mode='minibatch', sample_size=500)
+        self.assertEqual(curves.attrs['best_k'], 4)
+
+    def test_streamed(self):
+        """Streaming from a CSV labels every row of the file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'points.csv')
+            self.X.to_csv(path, index=False)
+            model = self.model_manager.kmeans_streamed(path, ['x', 'y'], n_clusters=4, chunksize=300,
+                                                       batch_size=100, n_passes=2)
+        self.assertEqual(model.n_rows_, len(self.X))
+        self.assertEqual(sorted(np.bincount(model.labels_)), [500] * 4)
+        self.assertGreater(model.inertia_, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+import pandas as pd
+from modeling_gui.comparison import compare_models, fold_features, held_out_metrics, make_folds
+from modeling_gui.models import ModelManager
+from modeling_gui.utils.data_preprocessing import Preprocessor
+
+
+class TestComparison(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a linear regression target and class labels on the same features."""
+        rng = np.random.default_rng(0)
+        n = 600
+        self.X = pd.DataFrame(rng.normal(size=(n, 3)), columns=['a', 'b', 'c'])
+        self.Y = 1.0 + 2.0 * self.X['a'] - self.X['b'] + rng.normal(scale=0.1, size=n)
+        self.labels = pd.Series(np.where(self.X['a'] + self.X['c'] > 0, 'up', 'down'), name='label')
+        self.params = {'random_forest': {'n_estimators': 10, 'max_depth': 4},
+                       'gradient_boost': {'n_estimators': 20, 'max_depth': 2}}
+
+    def test_folds(self):
+        """K-fold tests every row once; time-series folds only train on earlier rows."""
+        folds = make_folds(self.Y, cv=4)
+        tested = np.sort(np.concatenate([test for _, test in folds]))
+        np.testing.assert_array_equal(tested, np.arange(600))
+        for train, test in make_folds(self.Y, cv=4, splitter='timeseries'):
+            self.assertLess(train.max(), test.min())
+        for _, test in make_folds(self.labels, cv=3):
+            self.assertAlmostEqual((self.labels.iloc[test] == 'up').mean(), (self.labels == 'up').mean(), places=2)
+        with self.assertRaises(ValueError):
+            make_folds(self.Y, splitter='random')
+
+    def test_regression_comparison(self):
+        """Every model is scored on the same held-out folds, best first, with timings."""
+        rows = []
+        table = compare_models(self.X, self.Y, ['random_forest', 'ols', 'gradient_boost'], cv=3,
+                               params=self.params, n_workers=2, on_row=rows.append)
+        self.assertEqual(table['method'].iloc[0], 'ols')  # The target is linear
+        self.assertEqual(list(table['folds']), [3, 3, 3])
+        self.assertTrue((table['fit_seconds'] > 0).all())
+        self.assertEqual(len(rows), 9)
+        folds = table.attrs['folds']
+        for method in ('ols', 'random_forest', 'gradient_boost'):
+            self.assertEqual(list(folds.loc[folds['method'] == method, 'test_rows']), [200, 200, 200])
+
+        # Out-of-fold predictions reproduce the mean of the fold metrics for equal folds
+        predictions = table.attrs['predictions']
+        self.assertFalse(predictions.isna().any().any())
+        ols = table.set_index('method').loc['ols']
+        expected = held_out_metrics(self.Y, predictions['ols'], True)
+        self.assertAlmostEqual(ols['mae'], expected['mae'])
+        self.assertGreater(ols['r2'], 0.99)
+
+    def test_classification_comparison(self):
+        """Regression-only models are reported, not run, for class labels."""
+        manager = ModelManager()
+        table = manager.compare_models(self.X, self.labels, ['ols', 'random_forest'], cv=3,
+                                       params=self.params, n_workers=1)
+        self.assertEqual(list(table['method']), ['random_forest', 'ols'])
+        self.assertIn('accuracy', table.columns)
+        self.assertGreater(table['accuracy'].iloc[0], 0.8)
+        self.assertEqual(table['folds'].iloc[1], 0)
+        self.assertIn('numerical', table['error'].iloc[1])
+        self.assertIsNone(manager.model)  # Comparing does not replace the fitted model
+        with self.assertRaises(Exception):
+            manager.compare_models(self.X, self.labels, ['kmeans_clustering'])
+    def test_preprocessing_fitted_per_fold(self):
+        """Each fold's preprocessing uses statistics of its training rows only."""
+        X = pd.DataFrame({'a': np.r_[np.arange(8.0), 100.0, 200.0], 'city': ['x'] * 5 + ['z'] * 3 + ['y', 'y']})
+        train, test = np.arange(8), np.array([8, 9])
+        X_train, X_test = fold_features(X, train, test, Preprocessor(scale='standard'))
+        self.assertEqual(X_train.shape, (8, 2))  # a and city=z; 'y' is never seen while fitting
+        np.testing.assert_allclose(X_train[:, 0].mean(), 0.0, atol=1e-12)
+        np.testing.assert_allclose(X_train[:, 0].std(), 1.0)
+        np.testing.assert_allclose(X_test[:, 0], (X['a'].iloc[test] - 3.5) / np.arange(8.0).std())
+        np.testing.assert_array_equal(X_test[:, 1], [0.0, 0.0])
+
+        X = self.X.assign(c=np.where(self.X['c'] > 0, 'pos', 'neg'))
+        manager = ModelManager()
+        manager.fit_preprocessor(X)
+        table = manager.compare_models(X, self.Y, ['ols'], cv=3, n_workers=1)
+        self.assertEqual(table['error'].iloc[0], "")
+        self.assertGreater(table['r2'].iloc[0], 0.99)
+        self.assertIsNone(manager.model)
+
+if __name__ == '__main__':
+    unittest.main()
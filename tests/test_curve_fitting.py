@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+import pandas as pd
+from modeling_gui.curve_fitting import batch_curve_fit, exponential_guess, gaussian_guess, series_from_groups
+from modeling_gui.models import ModelManager
+
+class TestCurveFitting(unittest.TestCase):
+
+    def setUp(self):
+        """Set up noisy Gaussian and exponential series on a shared grid."""
+        rng = np.random.default_rng(0)
+        self.x = np.linspace(-5, 5, 150)
+        n = 40
+        self.gaussian_params = np.column_stack([
+            rng.uniform(1, 5, n), rng.uniform(-2, 2, n), rng.uniform(0.3, 1.5, n),
+        ])
+        a, x0, sigma = self.gaussian_params.T
+        self.gaussians = pd.DataFrame(
+            a * np.exp(-(self.x[:, None] - x0) ** 2 / (2 * sigma ** 2)) + rng.normal(0, 0.02, (150, n)),
+            columns=[f"s{i}" for i in range(n)],
+        )
+        self.rates = rng.uniform(-1, -0.1, n)
+        self.exponentials = 2 * np.exp(self.rates * self.x[:, None]) + 1 + rng.normal(0, 0.02, (150, n))
+        self.model_manager = ModelManager()
+
+    def test_initial_guesses(self):
+        """Vectorized starting values land near the true parameters."""
+        guess = gaussian_guess(np.broadcast_to(self.x[:, None], self.gaussians.shape), self.gaussians.to_numpy())
+        np.testing.assert_allclose(guess[:, 1], self.gaussian_params[:, 1], atol=0.2)
+        guess = exponential_guess(np.broadcast_to(self.x[:, None], self.exponentials.shape), self.exponentials)
+        np.testing.assert_allclose(guess[:, 1], self.rates, atol=0.2)
+
+    def test_batch_fit(self):
+        """Every series is fitted and the table carries params, errors and covariances."""
+        table = self.model_manager.batch_curve_fit(self.x, self.gaussians, kind='gaussian')
+        self.assertEqual(list(table.index), list(self.gaussians.columns))
+        np.testing.assert_allclose(table['params'].to_numpy(), self.gaussian_params, rtol=0.05, atol=0.02)
+        self.assertTrue((table['bse'] > 0).all().all())
+        self.assertEqual(list(table['cov'].columns), ['a:x0', 'a:sigma', 'x0:sigma'])
+        table = batch_curve_fit(self.x, self.exponentials, kind='exponential', block_size=16, n_workers=1)
+        np.testing.assert_allclose(table['params', 'b'], self.rates, atol=0.01)
+
+    def test_failures_are_reported(self):
+        """A series without enough points fails alone."""
+        Y = self.gaussians.copy()
+        Y.iloc[2:, 0] = np.nan
+        table = batch_curve_fit(self.x, Y, kind='gaussian', n_workers=1)
+        self.assertTrue(table['params'].iloc[0].isna().all())
+        self.assertIn("at least 3 points", table['stats', 'error'].iloc[0])
+        self.assertFalse(table['params'].iloc[1:].isna().any().any())
+
+    def test_process_pool(self):
+        """Blocks fitted in worker processes give the same table."""
+        serial = batch_curve_fit(self.x, self.gaussians, block_size=10, n_workers=1)
+        pooled = batch_curve_fit(self.x, self.gaussians, block_size=10, n_workers=2)
+        pd.testing.assert_frame_equal(serial, pooled)
+
+    def test_groups_and_single_series(self):
+        """Long data reshapes into one series per group; single fits return parameters."""
+        data = pd.DataFrame({
+            'group': np.repeat(['a', 'b'], [150, 100]),
+            'x': np.concatenate([self.x, self.x[:100]]),
+            'y': np.concatenate([self.gaussians['s0'], self.gaussians['s1'].iloc[:100]]),
+        })
+        x, Y = series_from_groups(data, 'x', 'y', 'group')
+        self.assertEqual(Y.shape, (150, 2))
+        table = batch_curve_fit(x, Y, n_workers=1)
+        self.assertEqual(table['stats', 'nobs'].tolist(), [150, 100])
+        params = self.model_manager.gaussian_fitting(self.x, self.gaussians['s0'])
+        np.testing.assert_allclose(params, table['params'].iloc[0], rtol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
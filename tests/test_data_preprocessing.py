@@ -0,0 +1,114 @@
+import unittest
+import numpy as np
+import pandas as pd
+from modeling_gui.models import ModelManager
+from modeling_gui.utils.data_preprocessing import (
+    FrequentItems, PreprocessedModel, Preprocessor, QuantileSketch, RunningMoments, handle_missing_values,
+    normalize_data,
+)
+
+
+class TestDataPreprocessing(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a table with skewed and gappy numeric columns and a categorical column."""
+        rng = np.random.default_rng(0)
+        n = 20_000
+        self.data = pd.DataFrame({
+            'a': rng.normal(5, 2, n),
+            'b': rng.lognormal(0, 1, n),
+            'city': rng.choice(['north', 'south', 'east'], n, p=[0.6, 0.3, 0.1]),
+        })
+        self.data.loc[rng.choice(n, 500, replace=False), 'a'] = np.nan
+        self.data.loc[rng.choice(n, 200, replace=False), 'city'] = None
+        self.data['y'] = 3 * self.data['a'].fillna(5) - self.data['b'] + (self.data['city'] == 'north') + rng.normal(size=n)
+
+    def test_running_moments_match_numpy(self):
+        """Moments merged chunk by chunk equal those of the whole column, ignoring NaN."""
+        values = self.data[['a', 'b']].to_numpy()
+        moments = RunningMoments(2)
+        for start in range(0, len(values), 3000):
+            moments.update(values[start:start + 3000])
+        np.testing.assert_array_equal(moments.count, np.sum(~np.isnan(values), axis=0))
+        np.testing.assert_allclose(moments.mean, np.nanmean(values, axis=0), rtol=1e-12)
+        np.testing.assert_allclose(moments.std, np.nanstd(values, axis=0), rtol=1e-10)
+
+    def test_sketch_quantiles(self):
+        """The sampled quantiles are within a percentile of the exact ones."""
+        values = self.data[['b']].to_numpy()
+        sketch = QuantileSketch(1, size=5000)
+        for start in range(0, len(values), 4000):
+            sketch.update(values[start:start + 4000])
+        estimate = sketch.quantiles([0.05, 0.5, 0.95])[:, 0]
+        ranks = np.searchsorted(np.sort(values[:, 0]), estimate) / len(values)
+        np.testing.assert_allclose(ranks, [0.05, 0.5, 0.95], atol=0.02)
+
+    def test_frequent_items(self):
+        """Heavy hitters are found in order and missing values are counted apart."""
+        counter = FrequentItems(capacity=2)
+        for start in range(0, len(self.data), 5000):
+            counter.update(self.data['city'].iloc[start:start + 5000])
+        self.assertEqual(counter.most_common(1), ['north'])
+        self.assertEqual(counter.mode, 'north')
+        self.assertEqual(counter.missing, 200)
+
+    def test_transform(self):
+        """Numeric columns are imputed and scaled, categories one-hot encoded, the input left as is."""
+        original = self.data.copy()
+        preprocessor = Preprocessor(impute='median', scale='standard', clip=(0.01, 0.99)).fit(
+            self.data[['a', 'b', 'city']], chunk_size=3000)
+        transformed = preprocessor.transform(self.data)
+        pd.testing.assert_frame_equal(self.data, original)
+        self.assertEqual(preprocessor.numeric_columns, ['a', 'b'])
+        self.assertEqual(preprocessor.categorical_columns, ['city'])
+        self.assertFalse(transformed[['a', 'b']].isna().any().any())
+        self.assertEqual([c for c in transformed.columns if c.startswith('city')], ['city=south', 'city=east'])
+        self.assertEqual(transformed['city=south'].sum(), (self.data['city'] == 'south').sum())
+        self.assertIn('city=north', Preprocessor(drop_reference=False).fit(self.data[['a', 'city']]).transform(self.data).columns)
+        self.assertLessEqual(transformed['b'].max(), (preprocessor.clip_upper_[1] - preprocessor.mean_[1]) / preprocessor.std_[1] + 1e-9)
+        pd.testing.assert_series_equal(transformed['y'], self.data['y'])
+        self.assertEqual(len(preprocessor.statistics()), 2)
+
+        ordinal = Preprocessor(impute=None, scale='minmax', encode='ordinal').fit(self.data[['a', 'city']])
+        encoded = ordinal.transform(self.data[['a', 'city']])
+        self.assertEqual(encoded['a'].isna().sum(), 500)
+        self.assertAlmostEqual(encoded['a'].min(), 0.0)
+        self.assertAlmostEqual(encoded['a'].max(), 1.0)
+        self.assertEqual(set(encoded['city'].unique()), {-1, 0, 1, 2})
+
+    def test_legacy_helpers(self):
+        """normalize_data and handle_missing_values keep their results."""
+        normalized = normalize_data(self.data.copy(), ['a', 'b'])
+        np.testing.assert_allclose(normalized[['a', 'b']].mean(), 0, atol=1e-12)
+        np.testing.assert_allclose(normalized[['a', 'b']].std(ddof=0), 1, rtol=1e-12)
+        filled = handle_missing_values(self.data.copy(), strategy='mode')
+        self.assertEqual(filled['city'].isna().sum(), 0)
+        self.assertEqual(filled['a'].isna().sum(), 0)
+        self.assertTrue((filled['city'][self.data['city'].isna()] == self.data['city'].mode().iloc[0]).all())
+        self.assertTrue((filled['a'][self.data['a'].isna()] == self.data['a'].mode().iloc[0]).all())
+
+    def test_model_manager_fits_through_preprocessor(self):
+        """Fits see transformed inputs and the fitted model predicts from raw ones."""
+        manager = ModelManager()
+        X = self.data[['a', 'b', 'city']]
+        preprocessor = manager.fit_preprocessor(X, impute='mean', scale='standard')
+        model = manager.random_forest(X, self.data['y'], n_estimators=10, max_depth=6)
+        self.assertIsInstance(model, PreprocessedModel)
+        self.assertIs(manager.model, model)
+        self.assertEqual(list(model.feature_names_in_), list(preprocessor.transform(X.head()).columns))
+        np.testing.assert_allclose(manager.predict(X.head()), model.model.predict(preprocessor.transform(X.head())))
+        self.assertGreater(model.score(X, self.data['y']), 0.8)
+
+    def test_ols_on_encoded_categories_is_full_rank(self):
+        """One-hot indicators without the reference level leave the OLS design full rank."""
+        manager = ModelManager()
+        X = self.data[['a', 'city']]
+        manager.fit_preprocessor(X)
+        results = manager.ols(X, self.data['y'])
+        exog = results.model.model.exog  # PreprocessedModel -> statsmodels results -> OLS
+        self.assertEqual(np.linalg.matrix_rank(exog), exog.shape[1])
+        self.assertEqual(len(results.params), 4)  # const, a and two of the three cities
+        self.assertAlmostEqual(results.params['city=south'], -1.0, delta=0.1)  # Compared with north
+
+if __name__ == '__main__':
+    unittest.main()
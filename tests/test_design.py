@@ -0,0 +1,83 @@
+import multiprocessing
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from modeling_gui.design import DesignCache, SharedArray, attach, share
+from modeling_gui.models import ModelManager
+
+
+def _column_sums(shared):
+    return attach(shared).sum(axis=0)
+
+
+class TestDesignCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a table with numeric features, an integer column and text labels."""
+        rng = np.random.default_rng(0)
+        n = 1000
+        self.data = pd.DataFrame({
+            'a': rng.normal(size=n),
+            'b': rng.integers(0, 10, n),
+            'c': rng.normal(size=n).astype(np.float32),
+            'label': rng.choice(['x', 'y'], n),
+        })
+        self.data['y'] = 2 * self.data['a'] - self.data['b'] + rng.normal(size=n)
+        self.cache = DesignCache()
+
+    def tearDown(self):
+        self.cache.clear()
+
+    def test_contiguous_typed_matrix(self):
+        """The selection becomes one C-contiguous matrix that X wraps without copying."""
+        design = self.cache.get(self.data, ['a', 'b', 'c'], 'y', dtype=np.float32)
+        self.assertEqual(design.values.dtype, np.float32)
+        self.assertTrue(design.values.flags.c_contiguous)
+        X = design.X
+        self.assertEqual(list(X.columns), ['a', 'b', 'c'])
+        self.assertTrue(np.shares_memory(X.to_numpy(), design.values))
+        np.testing.assert_allclose(X['a'], self.data['a'], rtol=1e-6)
+        self.assertEqual(design.Y.dtype, np.float64)
+        labels = self.cache.get(self.data, ['a'], 'label')
+        self.assertEqual(labels.Y.dtype, self.data['label'].dtype)
+        with self.assertRaises(ValueError):
+            self.cache.get(self.data, ['label'], 'y')
+
+    def test_reuse_and_invalidation(self):
+        """Matrices are reused per selection and dropped when the table changes."""
+        first = self.cache.get(self.data, ['a', 'b'], 'y')
+        self.assertIs(self.cache.get(self.data, ['a', 'b'], 'y'), first)
+        self.assertIsNot(self.cache.get(self.data, ['b', 'a'], 'y'), first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+        self.assertIsNot(self.cache.get(self.data.copy(), ['a', 'b'], 'y'), first)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_statsmodels_uses_the_constant_column(self):
+        """A matrix built with its constant fits the same OLS as sm.add_constant on the raw columns."""
+        design = self.cache.get(self.data, ['a', 'b'], 'y', add_const=True)
+        result = ModelManager().ols(design.X, design.Y)
+        reference = sm.OLS(self.data['y'], sm.add_constant(self.data[['a', 'b']])).fit()
+        self.assertEqual(list(result.params.index), ['const', 'a', 'b'])
+        np.testing.assert_allclose(result.params.values, reference.params.values, rtol=1e-10)
+        self.assertTrue(np.shares_memory(result.model.exog, design.values))
+
+    def test_shared_with_worker_processes(self):
+        """Workers map the matrix by file name; only a small handle is pickled."""
+        design = self.cache.get(self.data, ['a', 'b', 'c'], 'y')
+        if not design.shared:
+            self.skipTest("No space for shared memory-mapped files.")
+        handle = share(np.asarray(design.X)[:, 1:])
+        self.assertIsInstance(handle, SharedArray)
+        self.assertLess(len(pickle.dumps(handle)), 1000)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            sums = executor.submit(_column_sums, handle).result()
+        np.testing.assert_allclose(sums, design.values[:, 1:].sum(axis=0))
+        plain = np.ones(3)
+        self.assertIs(share(plain), plain)
+
+if __name__ == '__main__':
+    unittest.main()
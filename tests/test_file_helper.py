@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from modeling_gui.profiling import rss_mb
+from modeling_gui.utils.file_helper import CsvTail, format_load_report, load_csv
+
+class TestLoadCSV(unittest.TestCase):
+
+    def setUp(self):
+        """Write a CSV with float, integer and low-cardinality text columns."""
+        self.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        n = 2500
+        self.frame = pd.DataFrame({
+            'Feature1': rng.normal(size=n),
+            'Count': rng.integers(0, 100, n),
+            'Category': rng.choice(['A', 'B', 'C'], n),
+        })
+        self.path = os.path.join(self.tmp_dir, "data.csv")
+        self.frame.to_csv(self.path, index=False)
+
+    def test_default_load_is_unchanged(self):
+        """Without options the file is read with pandas' default dtypes."""
+        df = load_csv(self.path)
+        self.assertEqual(df['Feature1'].dtype, np.float64)
+        report = df.attrs['load_report']
+        self.assertEqual(report['rows'], len(self.frame))
+        # Memory is this load's own, not the process-lifetime peak
+        self.assertNotIn('max_rss_mb', report)
+        if rss_mb() is not None:
+            self.assertLess(abs(report['rss_growth_mb']), rss_mb())
+            self.assertIn("resident memory", format_load_report(report))
+
+    def test_compact_chunked_load(self):
+        """Compact mode downcasts columns and merges categoricals across chunks."""
+        df = load_csv(self.path, compact=True, chunksize=700)
+        self.assertEqual(df['Feature1'].dtype, np.float32)
+        self.assertEqual(df['Count'].dtype, np.int8)
+        self.assertIsInstance(df['Category'].dtype, pd.CategoricalDtype)
+        self.assertEqual(len(df), len(self.frame))
+        np.testing.assert_allclose(df['Feature1'], self.frame['Feature1'], rtol=1e-6)
+
+    def test_row_cap_and_sample(self):
+        """Row caps and random samples limit the rows kept."""
+        self.assertEqual(len(load_csv(self.path, max_rows=1000, chunksize=300)), 1000)
+        sampled = load_csv(self.path, sample_fraction=0.2, random_state=0)
+        self.assertLess(len(sampled), len(self.frame) * 0.3)
+
+    def test_columnar_cache_roundtrip(self):
+        """The second load memory-maps the cache and returns the same data."""
+        first = load_csv(self.path, compact=True, cache_dir=self.tmp_dir)
+        second = load_csv(self.path, compact=True, cache_dir=self.tmp_dir)
+        self.assertEqual(first.attrs['load_report']['source'], 'csv')
+        self.assertEqual(second.attrs['load_report']['source'], 'cache')
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(list(second['Category'].cat.categories), ['A', 'B', 'C'])
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            load_csv(os.path.join(self.tmp_dir, "missing.csv"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+class TestCsvTail(unittest.TestCase):
+
+    def setUp(self):
+        """Write the header and first rows of a growing log file."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "log.csv")
+        with open(self.path, "w") as f:
+            f.write("t,value\n1,0.5\n2,0.25\n")
+
+    def test_reads_only_new_complete_rows(self):
+        """Partial lines wait for the next read; the offset resumes a new reader."""
+        tail = CsvTail(self.path, block_size=8)
+        self.assertEqual(tail.read()['t'].tolist(), [1, 2])
+        with open(self.path, "a") as f:
+            f.write("3,0.125\n4,0.")
+        self.assertEqual(tail.read()['t'].tolist(), [3])
+        with open(self.path, "a") as f:
+            f.write("0625\n")
+        resumed = CsvTail(self.path, offset=tail.offset, columns=['value'])
+        frame = resumed.read()
+        self.assertEqual(frame.columns.tolist(), ['value'])
+        self.assertEqual(frame['value'].tolist(), [0.0625])
+        self.assertTrue(resumed.read().empty)
+
+    def test_truncated_file_restarts(self):
+        tail = CsvTail(self.path)
+        tail.read()
+        with open(self.path, "w") as f:
+            f.write("t,value\n9,1.0\n")
+        self.assertEqual(tail.read()['t'].tolist(), [9])
+        self.assertTrue(tail.restarted)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from modeling_gui.curve_fitting import gaussian
+from modeling_gui.grouped import batched_least_squares, grouped_fit, partition
+from modeling_gui.models import ModelManager
+
+
+class TestGroupedFit(unittest.TestCase):
+
+    def setUp(self):
+        """Set up 40 groups with their own slopes, missing values, a tiny group and a group without key."""
+        rng = np.random.default_rng(0)
+        n = 4000
+        self.keys = rng.integers(0, 40, n).astype(object)
+        slopes = rng.normal(size=(40, 2))
+        self.X = pd.DataFrame(rng.normal(size=(n, 2)), columns=['a', 'b'])
+        self.Y = pd.Series(1.0 + (self.X.to_numpy() * slopes[self.keys.astype(int)]).sum(axis=1)
+                           + rng.normal(scale=0.1, size=n))
+        self.X.iloc[::50, 0] = np.nan
+        self.keys[:3] = 'tiny'
+        self.keys[3] = None
+
+    def test_partition(self):
+        """Every group becomes one contiguous slice of the sorted rows."""
+        order, labels, starts = partition(['b', 'a', None, 'b', 'c', 'a'], mask=np.array([1, 1, 1, 1, 0, 1], bool))
+        self.assertEqual(list(labels), ['a', 'b', 'c'])
+        self.assertEqual(list(order), [1, 5, 0, 3])
+        self.assertEqual(list(starts), [0, 2, 4, 4])
+
+    def test_batched_ols(self):
+        """The batched solution matches statsmodels group by group, and small groups are skipped."""
+        table = ModelManager().grouped_fit(self.X, self.Y, self.keys, 'ols')
+        groups = table.attrs['groups'].set_index('group')
+        self.assertEqual(groups.loc['tiny', 'status'], 'skipped')
+        self.assertEqual((groups['status'] == 'fitted').sum(), 40)
+        self.assertNotIn(None, list(groups.index))
+
+        rows = (self.keys == 7) & self.X.notna().all(axis=1).to_numpy()
+        expected = sm.OLS(self.Y[rows], sm.add_constant(self.X[rows])).fit()
+        fitted = table[table['group'] == 7].set_index('term')
+        np.testing.assert_allclose(fitted['estimate'], expected.params, rtol=1e-9)
+        np.testing.assert_allclose(fitted['std_error'], expected.bse, rtol=1e-9)
+        self.assertAlmostEqual(groups.loc[7, 'rsquared'], expected.rsquared, places=10)
+        self.assertEqual(groups.loc[7, 'rows'], rows.sum())
+
+        # A regressor that is constant within a group gets a slope of 0; the intercept takes its part
+        Z = np.column_stack([np.ones(20), np.arange(20.0), 1.0 + 3.0 * np.arange(20.0)])
+        result = batched_least_squares(Z, np.array([0, 10, 20]), 2)
+        self.assertEqual(list(result['rank']), [2, 2])
+        np.testing.assert_allclose(result['params'][:, 1], 0.0, atol=1e-9)
+        np.testing.assert_allclose(result['params'][:, [0, 2]], [[1.0, 3.0]] * 2, atol=1e-9)
+
+    def test_pooled_methods(self):
+        """Ensembles and curves fit per group in and out of process; failed groups are reported, not raised."""
+        serial = grouped_fit(self.X.fillna(0), self.Y, self.keys, 'random_forest',
+                             params={'n_estimators': 5}, n_workers=1)
+        parallel = grouped_fit(self.X.fillna(0), self.Y, self.keys, 'random_forest',
+                               params={'n_estimators': 5}, n_workers=2)
+        self.assertEqual(len(serial), 2 * 41)
+        self.assertEqual(list(serial['group']), list(parallel['group']))
+        self.assertTrue((serial.attrs['groups']['status'] == 'fitted').all())
+
+        labels = pd.Series(np.where(self.Y > 1, 'high', 'low'))
+        labels[self.keys == 'tiny'] = 'low'
+        boosted = grouped_fit(self.X.fillna(0), labels, self.keys, 'gradient_boost',
+                              params={'n_estimators': 5}, n_workers=1)
+        groups = boosted.attrs['groups'].set_index('group')
+        self.assertEqual(boosted.attrs['metric'], 'accuracy')
+        self.assertEqual(groups.loc['tiny', 'status'], 'failed')
+        self.assertIn('class', groups.loc['tiny', 'message'])
+        with self.assertRaises(ValueError):
+            grouped_fit(self.X, labels, self.keys, 'ols')
+
+        x = np.tile(np.linspace(-3, 3, 30), 2)
+        y = np.concatenate([gaussian(x[:30], 2.0, 0.5, 1.0), gaussian(x[30:], 4.0, -0.5, 0.7)])
+        curves = grouped_fit(x, y, np.repeat(['p', 'q'], 30), 'gaussian_fitting', n_workers=1)
+        estimates = curves.pivot(index='group', columns='term', values='estimate')
+        np.testing.assert_allclose(estimates.loc['q', ['a', 'x0', 'sigma']], [4.0, -0.5, 0.7], rtol=1e-6)
+
+    def test_rlm_constant_regressor(self):
+        """A regressor constant within one group keeps the intercept and its own term, as in the other groups."""
+        rng = np.random.default_rng(1)
+        X = pd.DataFrame({'a': rng.normal(size=60), 'b': rng.normal(size=60)})
+        X.loc[30:, 'b'] = 2.0
+        Y = 1.0 + X['a'] + rng.normal(scale=0.1, size=60)
+        table = grouped_fit(X, Y, np.repeat(['A', 'B'], 30), 'rlm', n_workers=1)
+        groups = table.attrs['groups'].set_index('group')
+        self.assertEqual(list(groups['status']), ['fitted', 'fitted'])
+        self.assertIn('collinear', groups.loc['B', 'message'])
+        self.assertEqual(list(table['term']), ['const', 'a', 'b'] * 2)
+        fitted = table[table['group'] == 'B'].set_index('term')['estimate']
+        self.assertAlmostEqual(fitted['a'], 1.0, delta=0.1)
+        self.assertAlmostEqual(fitted['const'] + 2.0 * fitted['b'], 1.0, delta=0.1)
+
+if __name__ == '__main__':
+    unittest.main()
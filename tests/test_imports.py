@@ -0,0 +1,36 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = {'PyQt5', 'matplotlib', 'seaborn', 'statsmodels', 'sklearn', 'scipy'}
+
+def loaded_heavy_modules(statement):
+    """Run `statement` in a fresh interpreter and return the heavy top-level modules it loaded."""
+    probe = f"import sys\n{statement}\nprint(' '.join(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    output = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True).stdout
+    return HEAVY_MODULES & set(output.split())
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_package_and_model_manager_stay_light(self):
+        """Importing the package or creating a ModelManager loads no GUI or modelling backend."""
+        self.assertEqual(loaded_heavy_modules("import modeling_gui"), set())
+        self.assertEqual(loaded_heavy_modules("from modeling_gui import ModelManager; ModelManager()"), set())
+
+    def test_main_window_module_loads_only_qt(self):
+        """The GUI module needs PyQt5 but defers plotting and modelling libraries."""
+        self.assertEqual(loaded_heavy_modules("import modeling_gui.main"), {'PyQt5'})
+
+    def test_backends_load_on_first_use(self):
+        """Lazy attributes resolve and a fit imports its backend."""
+        statement = (
+            "import numpy as np\n"
+            "import modeling_gui\n"
+            "modeling_gui.ModelManager().ols(np.arange(10.0), np.arange(10.0) * 2)"
+        )
+        loaded = loaded_heavy_modules(statement)
+        self.assertIn('statsmodels', loaded)
+        self.assertFalse(loaded & {'PyQt5', 'matplotlib'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+import pandas as pd
+from modeling_gui.inspection import estimator_trees, permutation_importance, summarize, tree_nodes
+from modeling_gui.models import ModelManager
+from modeling_gui.visualization import FigurePool, plot_feature_importances, plot_tree_diagram
+
+
+class TestInspection(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a target driven by 'a' and 'b' with a noise column, and a forest fitted on it."""
+        rng = np.random.default_rng(0)
+        n = 1500
+        self.X = pd.DataFrame(rng.normal(size=(n, 3)), columns=['a', 'b', 'noise'])
+        self.Y = 3.0 * self.X['a'] + self.X['b'] + rng.normal(scale=0.1, size=n)
+        self.manager = ModelManager()
+        self.forest = self.manager.random_forest(self.X, self.Y, n_estimators=15, n_jobs=1)
+
+    def test_summary(self):
+        """Impurity importances match scikit-learn's and the summary is computed once per fit."""
+        summary = summarize(self.forest)
+        np.testing.assert_allclose(summary.importances.loc[['a', 'b', 'noise'], 'importance'],
+                                   self.forest.feature_importances_, atol=1e-12)
+        self.assertEqual(list(summary.importances.index[:2]), ['a', 'b'])
+        self.assertEqual(summary.n_trees, 15)
+        self.assertEqual(summary.leaves.sum(), summary.leaf_depths.sum())
+        self.assertEqual(summary.root_splits['a'], 15)
+        self.assertEqual(summary.splits.sum(), (summary.nodes - summary.leaves).sum())
+        self.assertIs(self.manager.tree_summary(), summary)
+
+        boosting = ModelManager().gradient_boost(self.X, self.Y, n_estimators=10, max_depth=2)
+        self.assertEqual(summarize(boosting).n_trees, 10)
+        with self.assertRaises(ValueError):
+            estimator_trees(ModelManager().kmeans_clustering(self.X, n_clusters=2))
+
+    def test_tree_nodes(self):
+        """Views stop at the requested depth and can be expanded from any node."""
+        nodes = tree_nodes(self.forest, tree=2, max_depth=2)
+        self.assertEqual(list(nodes['depth'].unique()), [0, 1, 2])
+        self.assertEqual(len(nodes), 7)
+        self.assertTrue(nodes.loc[nodes['depth'] == 2, 'truncated'].all())
+        self.assertEqual(nodes['samples'].iloc[0], self.forest.estimators_[2].tree_.n_node_samples[0])
+
+        child = int(nodes['left'].iloc[0])
+        below = tree_nodes(self.forest, tree=2, node=child, max_depth=1)
+        self.assertEqual(below['node'].iloc[0], child)
+        self.assertEqual(list(below['depth']), [1, 2, 2])
+        self.assertEqual(set(below['parent'].iloc[1:]), {child})
+        whole = tree_nodes(self.forest, tree=2, max_depth=None)
+        self.assertEqual(len(whole), self.forest.estimators_[2].tree_.node_count)
+        self.assertFalse(whole['truncated'].any())
+
+        figure = plot_tree_diagram(self.forest, max_depth=2, tree=2, figure=FigurePool().acquire('tree'))
+        self.assertEqual(len(figure.axes[0].texts), 7)
+
+    def test_permutation_importance(self):
+        """Shuffling an informative column costs more than shuffling noise, in and out of process."""
+        serial = permutation_importance(self.forest, self.X, self.Y, n_repeats=3, n_workers=1)
+        self.assertEqual(list(serial.index), ['a', 'b', 'noise'])
+        self.assertLess(abs(serial.loc['noise', 'importance']), 0.01)
+        self.assertGreater(serial.attrs['baseline'], 0.9)
+        parallel = self.manager.permutation_importance(self.X, self.Y, n_repeats=3, n_workers=2)
+        np.testing.assert_allclose(parallel['importance'], serial['importance'])
+
+        labels = pd.Series(np.where(self.X['a'] > 0, 'up', 'down'))
+        classifier = ModelManager().random_forest(self.X.to_numpy(), labels, n_estimators=5, n_jobs=1)
+        table = permutation_importance(classifier, self.X.to_numpy(), labels, n_repeats=2, n_workers=1)
+        self.assertEqual(table.index[0], 'x0')
+        figure = plot_feature_importances(table, figure=FigurePool().acquire('importances'))
+        self.assertEqual(len(figure.axes[0].patches), 3)
+
+if __name__ == '__main__':
+    unittest.main()
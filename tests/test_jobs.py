@@ -0,0 +1,51 @@
+import threading
+import unittest
+import numpy as np
+from modeling_gui.jobs import Job, JobQueue
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small regression problem and a single-worker queue."""
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(200, 3))
+        self.Y = self.X @ np.array([1.0, -2.0, 0.5]) + rng.normal(size=200)
+        self.progress = []
+        self.queue = JobQueue(on_progress=lambda job, done, total: self.progress.append((job.id, done, total)))
+
+    def test_jobs_finish_in_order_with_progress(self):
+        """Queued jobs run back to back and forests report batch progress."""
+        first = self.queue.submit("random_forest", self.X, self.Y, n_estimators=40, max_depth=3)
+        second = self.queue.submit("ols", self.X, self.Y)
+        second.future.result(timeout=60)
+        self.assertEqual(first.state, Job.FINISHED)
+        self.assertEqual(second.state, Job.FINISHED)
+        self.assertEqual(len(first.result.estimators_), 40)
+        self.assertEqual(self.progress[-1], (first.id, 40, 40))
+        self.assertEqual(self.queue.active(), [])
+
+    def test_cancel_stops_boosting_between_stages(self):
+        """Cancelling a running boosting job stops it at the next stage."""
+        started = threading.Event()
+        self.queue.on_progress = lambda job, done, total: started.set()
+        job = self.queue.submit("gradient_boost", self.X, self.Y, n_estimators=5000, max_depth=2)
+        pending = self.queue.submit("ols", self.X, self.Y)
+        started.wait(timeout=60)
+        self.queue.cancel()
+        job.future.result(timeout=60)
+        self.assertEqual(job.state, Job.CANCELLED)
+        self.assertLess(job.model_manager.model.n_estimators_, 5000)
+        self.assertEqual(pending.state, Job.CANCELLED)
+
+    def test_failures_are_captured(self):
+        """Errors raised by the model are stored on the job instead of propagating."""
+        job = self.queue.submit("ols", self.X, self.Y[:10])
+        job.future.result(timeout=60)
+        self.assertEqual(job.state, Job.FAILED)
+        self.assertIn("OLS Model Error", str(job.error))
+
+    def tearDown(self):
+        self.queue.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
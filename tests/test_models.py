@@ -24,16 +24,20 @@ class TestModelManager(unittest.TestCase):
 
     def test_gaussian_fit(self):
         """Test Gaussian fitting on sample data."""
-        mean, std_dev, gaussian = self.model_manager.gaussian_fit(self.X, self.Y)
-        self.assertIsNotNone(gaussian, "Gaussian fitting failed.")
-        self.assertGreater(mean, 0, "Gaussian mean is incorrect.")
-        self.assertGreater(std_dev, 0, "Gaussian std_dev is incorrect.")
+        x = np.linspace(0, 10, 50)
+        y = 4 * np.exp(-(x - 5) ** 2 / (2 * 1.5 ** 2))
+        amplitude, mean, std_dev = self.model_manager.gaussian_fitting(x, y)
+        self.assertAlmostEqual(amplitude, 4, places=5, msg="Gaussian amplitude is incorrect.")
+        self.assertAlmostEqual(mean, 5, places=5, msg="Gaussian mean is incorrect.")
+        self.assertAlmostEqual(abs(std_dev), 1.5, places=5, msg="Gaussian std_dev is incorrect.")
 
     def test_exponential_fit(self):
         """Test exponential fitting."""
-        params = self.model_manager.exponential_fit(self.X.flatten(), self.Y)
+        x = self.X.flatten().astype(float)
+        params = self.model_manager.exponential_fitting(x, 2 * np.exp(0.5 * x) + 1)
         self.assertEqual(len(params), 3, "Exponential fit should return 3 parameters.")
         self.assertGreater(params[0], 0, "Exponential fit parameter 'a' is incorrect.")
+        np.testing.assert_allclose(params, [2, 0.5, 1], rtol=1e-5)
     
     def tearDown(self):
         """Clean up any necessary data after tests."""
@@ -0,0 +1,67 @@
+import threading
+import time
+import unittest
+from unittest import mock
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PyQt5.QtWidgets import QApplication
+from modeling_gui.plot_panel import PlotPanel
+
+
+class TestPlotPanel(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a shown panel and record the thread of every Agg draw."""
+        self.app = QApplication.instance() or QApplication([])
+        self.panel = PlotPanel()
+        self.panel.resize(500, 400)
+        self.panel.show()
+        self.draw_threads = []
+        draw = FigureCanvasAgg.draw
+
+        def recording_draw(canvas, *args, **kwargs):
+            self.draw_threads.append(threading.current_thread())
+            return draw(canvas, *args, **kwargs)
+        patcher = mock.patch.object(FigureCanvasAgg, 'draw', recording_draw)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.panel.shutdown()
+        self.panel.close()
+
+    def wait(self, condition, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.01)
+        self.app.processEvents()
+        self.assertTrue(condition())
+
+    def test_rendered_off_the_gui_thread(self):
+        """Figures are drawn on the worker at the view's pixel size; the GUI thread only paints images."""
+        y = np.arange(20.0)
+        self.panel.render("Fit", "plot_fitted", y, y + 1)
+        self.wait(lambda: self.panel.count() == 1)
+        view = self.panel.widget(0)
+        self.assertIsNotNone(self.panel.figure("Fit"))
+        view.grab()  # Paints on the GUI thread
+        self.wait(lambda: view.image().size() == view.pixel_size())  # A first estimate is redone at the view's size
+
+        self.panel.resize(700, 500)
+        self.wait(lambda: view.image().size() == view.pixel_size())
+        view.grab()
+        self.assertGreaterEqual(len(self.draw_threads), 2)
+        self.assertNotIn(threading.main_thread(), self.draw_threads)
+
+    def test_render_failure(self):
+        """A plot that raises is reported and adds no tab."""
+        failures = []
+        self.panel.render_failed.connect(lambda title, message: failures.append((title, message)))
+        self.panel.render("Broken", lambda figure: 1 / 0)
+        self.wait(lambda: failures)
+        self.assertEqual(failures[0][0], "Broken")
+        self.assertEqual(self.panel.count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+import numpy as np
+import pandas as pd
+from modeling_gui.models import ModelManager
+from modeling_gui.profiling import PROFILER, Profiler, instrumented
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small regression problem and a scratch directory for logs."""
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(300, 2)), columns=['a', 'b'])
+        self.Y = pd.Series(self.X['a'] - self.X['b'] + rng.normal(size=300), name='y')
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, 'runs.jsonl')
+
+    def tearDown(self):
+        PROFILER.disable()
+        self.directory.cleanup()
+
+    def test_model_manager_runs_are_logged(self):
+        """Each call records times, memory, shapes and hyperparameters, nested calls included."""
+        PROFILER.enable(self.log_path)
+        manager = ModelManager()
+        manager.random_forest(self.X, self.Y, n_estimators=5, max_depth=2)
+        manager.predict(self.X)
+        with self.assertRaises(Exception):
+            manager.ols(self.X, self.Y.iloc[:10])
+        records = [json.loads(line) for line in open(self.log_path)]
+        names = [record['name'] for record in records]
+        self.assertEqual(names[-3:], ['ModelManager.random_forest', 'ModelManager.predict', 'ModelManager.ols'])
+        forest = records[-3]
+        self.assertEqual(forest['status'], 'ok')
+        self.assertEqual(forest['shapes'], {'X': [300, 2], 'Y': [300]})
+        self.assertEqual(forest['params']['n_estimators'], 5)
+        self.assertGreater(forest['wall_seconds'], 0)
+        self.assertGreaterEqual(forest['cpu_seconds'], 0)
+        self.assertEqual(records[-1]['status'], 'error')
+        self.assertEqual(PROFILER.records()[-1]['id'], records[-1]['id'])
+
+    def test_captures(self):
+        """cProfile dumps and tracemalloc peaks are attached to top-level runs only."""
+        profiler = Profiler()
+        profiler.enable(self.log_path, profile=True, trace_memory=True)
+        with profiler.span('outer'):
+            with profiler.span('inner'):
+                np.ones(1_000_000)
+        profiler.disable()
+        inner, outer = profiler.records()
+        self.assertEqual((inner['depth'], outer['depth']), (1, 0))
+        self.assertNotIn('profile', inner)
+        self.assertTrue(os.path.exists(outer['profile']))
+        self.assertGreater(outer['python_peak_mb'], 7)
+
+    def test_disabled_is_nearly_free(self):
+        """While disabled, instrumented calls skip all bookkeeping."""
+        @instrumented()
+        def add(a, b=1):
+            return a + b
+
+        def plain(a, b=1):
+            return a + b
+
+        recorded = len(PROFILER.records())
+        start = time.perf_counter()
+        for i in range(100_000):
+            plain(i)
+        baseline = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(100_000):
+            add(i)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(PROFILER.records()), recorded)
+        self.assertLess(elapsed - baseline, 0.5e-6 * 100_000)  # Below half a microsecond per call
+
+    def test_trimmed_slot_arguments(self):
+        """Instrumented Qt slots drop the extra arguments a signal sends."""
+        @instrumented(trim_args=True)
+        def clicked(self):
+            return self
+
+        self.assertEqual(clicked('window', False), 'window')
+
+if __name__ == '__main__':
+    unittest.main()
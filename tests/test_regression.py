@@ -0,0 +1,186 @@
+import unittest
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from statsmodels.regression.rolling import RollingOLS
+from modeling_gui.models import ModelManager
+import os
+import tempfile
+from modeling_gui.regression import CrossProducts, OnlineLeastSquares, least_squares, rolling_ols
+
+class TestRollingOLS(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a noisy linear series with a large offset in one regressor."""
+        rng = np.random.default_rng(0)
+        n = 400
+        self.X = pd.DataFrame({'a': rng.normal(size=n) + 100, 'b': rng.normal(size=n)})
+        self.Y = pd.Series(3 + 2 * self.X['a'] - self.X['b'] + rng.normal(size=n), name='y')
+        self.model_manager = ModelManager()
+
+    def test_matches_statsmodels_rolling_ols(self):
+        """Both engines reproduce statsmodels RollingOLS params, bse and R-squared."""
+        reference = RollingOLS(self.Y, sm.add_constant(self.X), window=30).fit()
+        for method in ('cumsum', 'recursive'):
+            result = rolling_ols(self.X, self.Y, window=30, method=method, chunk_size=97)
+            np.testing.assert_allclose(result['params'].values, reference.params.values, rtol=1e-6, atol=1e-8)
+            np.testing.assert_allclose(result['bse'].values, reference.bse.values, rtol=1e-5, atol=1e-8)
+            np.testing.assert_allclose(result[('stats', 'rsquared')].values, reference.rsquared.values, atol=1e-8)
+
+    def test_expanding_matches_full_sample_ols(self):
+        """The last expanding window equals an OLS fit on all rows."""
+        reference = sm.OLS(self.Y, sm.add_constant(self.X)).fit()
+        result = self.model_manager.rolling_ls(self.X, self.Y, expanding=True)
+        np.testing.assert_allclose(result['params'].iloc[-1].values, reference.params.values)
+        np.testing.assert_allclose(result['bse'].iloc[-1].values, reference.bse.values)
+
+    def test_missing_and_singular_windows(self):
+        """Windows with NaNs or collinear regressors are reported as NaN."""
+        X = self.X.copy()
+        X.iloc[10, 1] = np.nan
+        X.iloc[100:150, 0] = 1.0
+        result = rolling_ols(X, self.Y, window=20)
+        self.assertTrue(result['params'].iloc[10:30].isna().all().all())
+        self.assertTrue(result['params'].iloc[119:150].isna().all().all())
+        self.assertFalse(result['params'].iloc[30:100].isna().any().any())
+        self.assertEqual(result[('stats', 'nobs')].iloc[25], 19)
+
+class TestLeastSquares(unittest.TestCase):
+
+    def setUp(self):
+        """Set up two targets on regressors with a large offset, and row weights."""
+        rng = np.random.default_rng(1)
+        n = 3000
+        self.X = pd.DataFrame({'a': rng.normal(size=n) + 1e4, 'b': rng.normal(size=n)})
+        self.Y = pd.DataFrame({
+            'y1': 3 + 2 * self.X['a'] - self.X['b'] + rng.normal(size=n),
+            'y2': 0.1 * self.X['b'] + rng.normal(size=n),
+        })
+        self.weights = rng.uniform(0.5, 2.0, n)
+        self.model_manager = ModelManager()
+
+    def assert_matches(self, result, reference, target):
+        np.testing.assert_allclose(result.params[target].values, reference.params.values, rtol=1e-8)
+        np.testing.assert_allclose(result.bse[target].values, reference.bse.values, rtol=1e-8)
+        np.testing.assert_allclose(result.cov_params(target).values, reference.cov_params().values, rtol=1e-7)
+        np.testing.assert_allclose(result.conf_int(target=target).values, reference.conf_int().values, rtol=1e-8)
+        for name in ('rsquared', 'rsquared_adj', 'fvalue', 'llf', 'aic', 'bic', 'ssr', 'scale'):
+            self.assertAlmostEqual(getattr(result, name)[target], getattr(reference, name), delta=1e-8 * abs(getattr(reference, name)))
+
+    def test_matches_statsmodels_ols_and_wls(self):
+        """All targets are solved at once and agree with sm.OLS / sm.WLS."""
+        exog = sm.add_constant(self.X)
+        result = least_squares(self.X, self.Y, chunk_size=701)
+        weighted = least_squares(self.X, self.Y, weights=self.weights, chunk_size=701)
+        for target in self.Y:
+            self.assert_matches(result, sm.OLS(self.Y[target], exog).fit(), target)
+            self.assert_matches(weighted, sm.WLS(self.Y[target], exog, weights=self.weights).fit(), target)
+
+    def test_single_target_and_summary(self):
+        """One target gives statsmodels-shaped attributes, predictions and a text summary."""
+        reference = sm.OLS(self.Y['y1'], sm.add_constant(self.X)).fit()
+        result = self.model_manager.ols(self.X, self.Y['y1'], engine='sufficient')
+        self.assertIsInstance(result.rsquared, float)
+        np.testing.assert_allclose(result.params.values, reference.params.values, rtol=1e-8)
+        np.testing.assert_allclose(result.predict(self.X).values, reference.fittedvalues.values, rtol=1e-10)
+        text = self.model_manager.get_summary().as_text()
+        self.assertIn("OLS Regression Results", text)
+        self.assertIn("const", text)
+
+    def test_streamed_and_merged_accumulators(self):
+        """Chunked CSV passes and merged partial sums give the in-memory answer."""
+        reference = least_squares(self.X, self.Y, weights=self.weights)
+        data = pd.concat([self.X, self.Y], axis=1).assign(w=self.weights)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.csv')
+            data.to_csv(path, index=False)
+            streamed = self.model_manager.ols_streamed(path, ['a', 'b'], ['y1', 'y2'], weights_column='w', chunksize=500)
+        np.testing.assert_allclose(streamed.params.values, reference.params.values, rtol=1e-8)
+        np.testing.assert_allclose(streamed.bse.values, reference.bse.values, rtol=1e-8)
+
+        values = data.to_numpy()
+        halves = [CrossProducts().update(values[:1000, :4]), CrossProducts().update(values[1000:, :4])]
+        whole = CrossProducts().update(values[:, :4])
+        merged = halves[0].merge(halves[1])
+        np.testing.assert_allclose(merged.comoment, whole.comoment, rtol=1e-9)
+        np.testing.assert_allclose(merged.mean, whole.mean, rtol=1e-12)
+
+    def test_missing_rows_are_dropped(self):
+        """Rows with missing values are skipped, as with missing='drop' in statsmodels."""
+        X = self.X.copy()
+        X.iloc[5, 0] = np.nan
+        reference = sm.OLS(self.Y['y1'], sm.add_constant(X), missing='drop').fit()
+        result = least_squares(X, self.Y['y1'])
+        self.assertEqual(result.nobs, reference.nobs)
+        np.testing.assert_allclose(result.params.values, reference.params.values, rtol=1e-8)
+
+class TestOnlineLeastSquares(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a noisy linear series and a scratch directory for state files and logs."""
+        rng = np.random.default_rng(0)
+        n = 1500
+        self.X = pd.DataFrame({'a': rng.normal(size=n) + 50, 'b': rng.normal(size=n)})
+        self.Y = pd.Series(3 + 2 * self.X['a'] - self.X['b'] + rng.normal(size=n), name='y')
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_matches_ols_and_discounted_wls(self):
+        """Without forgetting the state equals OLS; with it, WLS with geometrically decaying weights."""
+        model = OnlineLeastSquares(['a', 'b'], 'y').update(self.X[:700], self.Y[:700]).update(self.X[700:], self.Y[700:])
+        reference = sm.OLS(self.Y, sm.add_constant(self.X)).fit()
+        np.testing.assert_allclose(model.params.values, reference.params.values, rtol=1e-9)
+        np.testing.assert_allclose(model.bse.values, reference.bse.values, rtol=1e-7)
+        self.assertAlmostEqual(model.rsquared, reference.rsquared, places=10)
+
+        forgetting = 0.99
+        model = OnlineLeastSquares(['a', 'b'], 'y', forgetting=forgetting).update(self.X, self.Y)
+        weights = forgetting ** np.arange(len(self.Y) - 1, -1, -1)
+        reference = sm.WLS(self.Y, sm.add_constant(self.X), weights=weights).fit()
+        np.testing.assert_allclose(model.params.values, reference.params.values, rtol=1e-8)
+        self.assertAlmostEqual(model.ssr, reference.ssr, places=6)
+
+    def test_trajectory_matches_expanding_ols(self):
+        """The kept trajectory holds the coefficients after each row, like an expanding window."""
+        model = OnlineLeastSquares(['a', 'b'], 'y', history=100).update(self.X, self.Y)
+        expanding = rolling_ols(self.X, self.Y, expanding=True)['params']
+        trajectory = model.trajectory()
+        self.assertEqual(len(trajectory), 100)
+        self.assertEqual(trajectory.index[-1], len(self.Y))
+        np.testing.assert_allclose(trajectory.values, expanding.values[-100:], rtol=1e-7)
+
+    def test_state_roundtrip(self):
+        """A saved state resumes exactly, before and after the first solve."""
+        path = os.path.join(self.directory.name, 'state.npz')
+        for rows in (2, 500):
+            first = OnlineLeastSquares(['a', 'b'], 'y', forgetting=0.999).update(self.X[:rows], self.Y[:rows])
+            first.save(path)
+            resumed = OnlineLeastSquares.load(path).update(self.X[rows:], self.Y[rows:])
+            whole = OnlineLeastSquares(['a', 'b'], 'y', forgetting=0.999).update(self.X, self.Y)
+            np.testing.assert_allclose(resumed.params.values, whole.params.values, rtol=1e-10)
+            self.assertEqual(resumed.nobs, len(self.Y))
+
+    def test_tailing_a_growing_csv(self):
+        """Each call reads only the complete rows appended since the last one, across sessions."""
+        path = os.path.join(self.directory.name, 'log.csv')
+        state_path = os.path.join(self.directory.name, 'state.npz')
+        data = self.X.assign(y=self.Y)
+        data[:600].to_csv(path, index=False)
+        with open(path, 'a') as f:
+            f.write(','.join(map(str, data.iloc[600])))  # The logger is mid-line
+        model = ModelManager().recursive_ls_online(path, ['a', 'b'], 'y', state_path=state_path)
+        self.assertEqual(model.nobs, 600)
+        with open(path, 'a') as f:
+            f.write('\n')
+        data[601:].to_csv(path, index=False, header=False, mode='a')
+        model = ModelManager().recursive_ls_online(path, ['a', 'b'], 'y', state_path=state_path)
+        self.assertEqual(model.nobs, len(data))
+        reference = sm.OLS(self.Y, sm.add_constant(self.X)).fit()
+        np.testing.assert_allclose(model.params.values, reference.params.values, rtol=1e-6)
+        with self.assertRaises(Exception):
+            ModelManager().recursive_ls_online(path, ['a'], 'y', state_path=state_path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+import joblib
+import numpy as np
+import pandas as pd
+from modeling_gui.models import ModelManager
+from modeling_gui.scoring import main, make_server, model_columns, predicts_inputs, score_file
+
+
+class TestScoring(unittest.TestCase):
+
+    def setUp(self):
+        """Write a CSV with an ID, two features, a category and a target, and fit models on it."""
+        self.directory = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        n = 5000
+        self.data = pd.DataFrame({
+            'id': np.arange(n),
+            'a': rng.normal(size=n),
+            'b': rng.normal(size=n),
+            'city': rng.choice(['north', 'south'], n),
+        })
+        self.data['y'] = 1.0 + 2.0 * self.data['a'] - self.data['b'] + rng.normal(scale=0.1, size=n)
+        self.input_path = os.path.join(self.directory, 'input.csv')
+        self.data.to_csv(self.input_path, index=False)
+        self.manager = ModelManager()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_ols_predicts_without_the_constant(self):
+        """statsmodels fits take new regressors as they were passed to the fit."""
+        model = self.manager.ols(self.data[['a', 'b']], self.data['y'])
+        expected = model.params['const'] + self.data[['a', 'b']].to_numpy() @ model.params[['a', 'b']].to_numpy()
+        np.testing.assert_allclose(model.predict(self.data[['a', 'b']]), expected)
+        np.testing.assert_allclose(self.manager.predict(self.data[['a', 'b']].to_numpy()), expected)
+        self.assertEqual(model_columns(model), ['a', 'b'])
+        # A single row may come as a 1-D array
+        np.testing.assert_allclose(model.predict(self.data[['a', 'b']].to_numpy()[0]), expected[:1])
+
+    def test_models_that_cannot_score_rows(self):
+        """Models whose predict does not take input rows are rejected before any worker starts."""
+        recursive = self.manager.recursive_ls(self.data[['a', 'b']], self.data['y'])
+        self.assertFalse(predicts_inputs(recursive))
+        self.assertTrue(predicts_inputs(self.manager.ols(self.data[['a', 'b']], self.data['y'])))
+        with self.assertRaisesRegex(ValueError, "cannot score new rows"):
+            score_file(recursive, self.input_path, os.path.join(self.directory, 'out.csv'), x_columns=['a', 'b'],
+                       workers=2)
+
+    def test_score_file_in_parallel(self):
+        """Chunks scored across processes come back in input order with the kept columns."""
+        model = self.manager.ols(self.data[['a', 'b']], self.data['y'])
+        model_path = os.path.join(self.directory, 'model.joblib')
+        joblib.dump(model, model_path)
+        output_path = os.path.join(self.directory, 'predictions.csv')
+        report = score_file(model_path, self.input_path, output_path, keep_columns=['id'], chunksize=700, workers=2)
+        self.assertEqual((report['rows'], report['chunks']), (5000, 8))
+        self.assertGreater(report['rows_per_second'], 0)
+        predictions = pd.read_csv(output_path)
+        self.assertEqual(list(predictions.columns), ['id', 'prediction'])
+        np.testing.assert_array_equal(predictions['id'], self.data['id'])
+        np.testing.assert_allclose(predictions['prediction'], model.predict(self.data[['a', 'b']]), rtol=1e-10)
+
+    def test_score_file_through_preprocessor(self):
+        """Raw columns of a preprocessed fit, categories included, are selected and transformed."""
+        X = self.data[['a', 'b', 'city']]
+        self.manager.fit_preprocessor(X)
+        model = self.manager.random_forest(X, self.data['y'], n_estimators=5, max_depth=4)
+        self.assertEqual(model_columns(model), ['a', 'b', 'city'])
+        output_path = os.path.join(self.directory, 'predictions.csv')
+        report = self.manager.predict_file(self.input_path, output_path, chunksize=2000, workers=1)
+        self.assertEqual(report['rows'], 5000)
+        np.testing.assert_allclose(pd.read_csv(output_path)['prediction'], model.predict(X))
+        with self.assertRaises(Exception):
+            self.manager.predict_file(self.input_path, output_path, x_columns=['missing'], workers=1)
+
+    def test_http_endpoint(self):
+        """Single rows and lists of rows are predicted by the warm model; bad requests get a 400."""
+        model = self.manager.ols(self.data[['a', 'b']], self.data['y'])
+        server = make_server(model, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            def post(payload):
+                request = urllib.request.Request(f"{url}/predict", data=json.dumps(payload).encode(),
+                                                 headers={'Content-Type': 'application/json'})
+                with urllib.request.urlopen(request) as response:
+                    return json.loads(response.read())
+
+            single = post({'a': 1.0, 'b': 2.0})['predictions']
+            expected = model.params['const'] + model.params['a'] + 2 * model.params['b']
+            self.assertAlmostEqual(single[0], expected)
+            self.assertEqual(len(post([{'a': 0.0, 'b': 0.0}, {'a': 1.0, 'b': 1.0}])['predictions']), 2)
+            with urllib.request.urlopen(f"{url}/health") as response:
+                self.assertEqual(json.loads(response.read())['columns'], ['a', 'b'])
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                post({'a': 1.0})
+            self.assertEqual(context.exception.code, 400)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_command_line(self):
+        """The command line scores a saved model and fails cleanly on unknown columns."""
+        model = self.manager.random_forest(self.data[['a', 'b']], self.data['y'], n_estimators=5, max_depth=4)
+        model_path = os.path.join(self.directory, 'model.joblib')
+        joblib.dump(model, model_path)
+        output_path = os.path.join(self.directory, 'predictions.csv')
+        self.assertEqual(main([model_path, '--input', self.input_path, '--output', output_path, '--workers', '1']), 0)
+        self.assertEqual(len(pd.read_csv(output_path)), 5000)
+        self.assertEqual(main([model_path, '--input', self.input_path, '--output', output_path, '--x', 'nope']), 1)
+
+if __name__ == '__main__':
+    unittest.main()
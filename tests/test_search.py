@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+import pandas as pd
+from modeling_gui.models import ModelManager
+from modeling_gui.search import _group_by_estimators, parameter_grid, sample_parameters
+
+class TestHyperparameterSearch(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small classification problem."""
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(300, 3)), columns=['a', 'b', 'c'])
+        self.Y = pd.Series(np.where(self.X['a'] + rng.normal(scale=0.5, size=300) > 0, 'yes', 'no'))
+        self.space = {'n_estimators': [5, 10, 20], 'max_depth': [2, 4]}
+        self.model_manager = ModelManager()
+
+    def test_candidates(self):
+        """Grids expand fully, random samples are distinct and warm-start groups share depth."""
+        self.assertEqual(len(parameter_grid(self.space)), 6)
+        sampled = sample_parameters(self.space, 4, random_state=0)
+        self.assertEqual(len({tuple(sorted(p.items())) for p in sampled}), 4)
+        groups = _group_by_estimators(parameter_grid(self.space))
+        self.assertEqual(sorted((fixed['max_depth'], sizes) for fixed, sizes in groups),
+                         [(2, [5, 10, 20]), (4, [5, 10, 20])])
+
+    def test_grid_and_halving_search(self):
+        """Searches stream rows, rank candidates and refit the best model."""
+        rows = []
+        leaderboard = self.model_manager.hyperparameter_search(
+            self.X, self.Y, 'random_forest', self.space, cv=3, n_workers=2, on_row=rows.append,
+        )
+        self.assertEqual(len(leaderboard), 6)
+        self.assertEqual(len(rows), 6)
+        self.assertTrue(leaderboard['mean_score'].is_monotonic_decreasing)
+        best = leaderboard.attrs['best_params']
+        self.assertEqual(self.model_manager.model.get_params()['max_depth'], best['max_depth'])
+
+        leaderboard = self.model_manager.hyperparameter_search(
+            self.X, self.Y, 'gradient_boost', {'n_estimators': [5, 10], 'learning_rate': [0.1, 0.3]},
+            strategy='halving', cv=2, n_workers=2,
+        )
+        self.assertGreater(leaderboard['round'].nunique(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
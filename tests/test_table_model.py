@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt
+from modeling_gui.table_model import _WINDOW_ROWS, DataFrameModel
+
+class TestDataFrameModel(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a model over a small frame with a missing value."""
+        self.frame = pd.DataFrame({
+            'Feature1': [5.1, np.nan, 4.7, 6.3],
+            'Category': pd.Categorical(['A', 'B', 'A', 'C']),
+        })
+        self.model = DataFrameModel(self.frame)
+
+    def cell(self, row, column):
+        return self.model.data(self.model.index(row, column))
+
+    def test_shape_and_cells(self):
+        """Cells are formatted on demand from the underlying frame."""
+        self.assertEqual((self.model.rowCount(), self.model.columnCount()), (4, 2))
+        self.assertEqual(self.cell(0, 0), "5.1")
+        self.assertEqual(self.cell(1, 0), "")
+        self.assertEqual(self.model.headerData(1, Qt.Horizontal), "Category")
+
+    def test_sort_keeps_missing_last(self):
+        """Sorting reorders row positions with missing values at the end."""
+        self.model.sort(0, Qt.DescendingOrder)
+        self.assertEqual(list(self.model.row_positions()), [3, 0, 2, 1])
+        self.model.sort(1, Qt.AscendingOrder)
+        self.assertEqual([self.cell(i, 1) for i in range(4)], ['A', 'A', 'B', 'C'])
+
+    def test_filter(self):
+        """Numeric comparisons and text filters select matching rows."""
+        self.model.set_filter(0, "> 5")
+        self.assertEqual(list(self.model.row_positions()), [0, 3])
+        self.assertEqual(self.model.headerData(1, Qt.Vertical), "3")
+        self.model.set_filter(1, "a")
+        self.assertEqual(list(self.model.row_positions()), [0, 2])
+        self.model.set_filter(1, "")
+        self.assertEqual(self.model.rowCount(), 4)
+        with self.assertRaises(ValueError):
+            self.model.set_filter(0, "> abc")
+
+    def test_filter_keeps_sort(self):
+        """A filter applied after a sort keeps the sorted order, and so does clearing it."""
+        self.model.sort(0, Qt.DescendingOrder)
+        self.model.set_filter(1, "a")
+        self.assertEqual(list(self.model.row_positions()), [0, 2])
+        self.model.set_filter(1, "")
+        self.assertEqual(list(self.model.row_positions()), [3, 0, 2, 1])
+
+    def test_cached_rows_are_bounded(self):
+        """Only a window of visible rows per column is converted, however many rows the frame has."""
+        n = 10 * _WINDOW_ROWS
+        model = DataFrameModel(pd.DataFrame({'x': np.arange(n, dtype=float), 'label': [f"row {i}" for i in range(n)]}))
+        model.sort(0, Qt.DescendingOrder)
+        for row in (0, n // 2, n - 1):
+            self.assertEqual(model.data(model.index(row, 1)), f"row {n - 1 - row}")
+        self.assertTrue(all(len(array) <= _WINDOW_ROWS for _, array in model._windows.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from matplotlib.image import AxesImage
+from modeling_gui.models import ModelManager
+from modeling_gui.regression import OnlineLeastSquares
+from modeling_gui.visualization import FigurePool, plot_clusters, plot_data, plot_result, scatter_points
+
+class TestVisualization(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small linear data set and a scratch directory for exports."""
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame({'x': rng.normal(size=200)})
+        self.Y = pd.Series(3.0 * self.X['x'] + rng.normal(scale=0.1, size=200), name='y')
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_figure_pool(self):
+        """Figures are reused per key and the least recently used ones are dropped."""
+        pool = FigurePool(max_figures=2)
+        first = pool.acquire('a')
+        first.add_subplot()
+        self.assertIs(pool.acquire('a'), first)
+        self.assertEqual(len(first.axes), 0)  # Cleared on reuse
+        pool.acquire('b')
+        pool.acquire('c')
+        self.assertEqual(len(pool), 2)
+        self.assertIsNot(pool.acquire('a'), first)
+
+    def test_density_binning(self):
+        """Large scatters become a single density image instead of a marker per point."""
+        pool = FigurePool()
+        ax = pool.acquire('small').add_subplot()
+        self.assertNotIsInstance(scatter_points(ax, self.X, self.Y), AxesImage)
+        rng = np.random.default_rng(1)
+        x = rng.normal(size=100_000)
+        ax = pool.acquire('large').add_subplot()
+        image = scatter_points(ax, x, x + rng.normal(size=100_000), max_points=10_000, bins=50)
+        self.assertIsInstance(image, AxesImage)
+        self.assertEqual(image.get_array().shape, (50, 50))
+        self.assertEqual(image.get_array().sum(), 100_000)
+
+    def test_headless_export(self):
+        """Plots save to PNG and SVG without a display."""
+        for suffix in ('png', 'svg'):
+            path = os.path.join(self.directory, f"data.{suffix}")
+            plot_data(self.X, self.Y, path=path)
+            self.assertGreater(os.path.getsize(path), 0)
+
+    def test_plot_result_dispatch(self):
+        """ModelManager results are routed to their standard plot."""
+        model_manager = ModelManager()
+        result = model_manager.ols(self.X, self.Y)
+        figure = plot_result('ols', result, self.X, self.Y)
+        self.assertEqual(figure.axes[0].get_title(), "Actual vs Fitted")
+        model = model_manager.kmeans_clustering(pd.concat([self.X, self.Y], axis=1), n_clusters=2)
+        figure = plot_result('kmeans_clustering', model, pd.concat([self.X, self.Y], axis=1))
+        self.assertEqual(figure.axes[0].get_title(), "KMeans Clusters")
+        online = OnlineLeastSquares(['x'], 'y').update(self.X, self.Y)
+        figure = plot_result('recursive_ls_online', online, self.X, self.Y)
+        self.assertEqual(len(figure.axes[0].get_lines()), 2)  # One trajectory per coefficient
+        self.assertIsNone(plot_result('rolling_ls', pd.DataFrame(), self.X, self.Y))
+
+    def test_plot_clusters_single_feature(self):
+        """One-feature clusterings are drawn along a line."""
+        model = ModelManager().kmeans_clustering(self.X, n_clusters=2)
+        figure = plot_clusters(self.X, model.labels_, model.cluster_centers_)
+        self.assertEqual(figure.axes[0].get_ylabel(), "Feature 2")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from modeling_gui.design import SharedArray, share
+from modeling_gui.models import ModelManager
+from modeling_gui.workspace import Workspace
+
+
+class TestWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        """Set up an empty workspace directory and a CSV file with numeric and text columns."""
+        self.directory = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.directory, 'sales.csv')
+        rng = np.random.default_rng(0)
+        n = 500
+        self.df = pd.DataFrame({
+            'x': rng.normal(size=n),
+            'y': rng.normal(size=n),
+            'region': rng.choice(['north', 'south'], size=n),
+        })
+        self.df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_datasets_persist(self):
+        """Loaded CSVs are reopened from the workspace, in this session and the next, without parsing."""
+        workspace = Workspace(os.path.join(self.directory, 'ws'))
+        name, df = workspace.load_csv(self.csv_path)
+        self.assertEqual(name, 'sales')
+        self.assertEqual(df.attrs['load_report']['source'], 'csv')
+        np.testing.assert_allclose(df['x'], self.df['x'])
+        self.assertEqual(list(df['region']), list(self.df['region']))
+        workspace.active = name
+
+        reopened = Workspace(os.path.join(self.directory, 'ws'))
+        self.assertEqual(reopened.names, ['sales'])
+        self.assertEqual(reopened.active, 'sales')
+        with mock.patch('modeling_gui.workspace.load_csv') as parse:
+            again, df = reopened.load_csv(self.csv_path)
+        parse.assert_not_called()
+        self.assertEqual(again, 'sales')
+        self.assertEqual(df.attrs['load_report']['source'], 'workspace')
+        self.assertFalse(df['x'].to_numpy().flags.owndata)
+
+        # Reloading a changed file replaces its earlier version; another file of the same name is numbered
+        time.sleep(0.01)
+        self.df.head(50).to_csv(self.csv_path, index=False)
+        name, df = reopened.load_csv(self.csv_path)
+        self.assertEqual((name, len(df)), ('sales', 50))
+        other_path = os.path.join(self.directory, 'other', 'sales.csv')
+        os.makedirs(os.path.dirname(other_path))
+        self.df.to_csv(other_path, index=False)
+        other, _ = reopened.load_csv(other_path, max_rows=10)
+        self.assertEqual(other, 'sales (2)')
+        self.assertEqual(len(os.listdir(os.path.join(self.directory, 'ws', 'datasets'))), 2)
+        reopened.remove('sales (2)')
+        self.assertEqual(Workspace(os.path.join(self.directory, 'ws')).names, ['sales'])
+
+    def test_memory_budget(self):
+        """The least recently used datasets are closed beyond the budget and reopened on demand."""
+        workspace = Workspace(os.path.join(self.directory, 'ws'), memory_budget=10 ** 9)
+        size = 8 * 1000 * 2
+        for name in ['a', 'b', 'c']:
+            workspace.add(name, pd.DataFrame(np.ones((1000, 2)), columns=['u', 'v']))
+        workspace.get('a')
+        self.assertEqual(workspace.memory_usage(), 3 * size)
+        workspace.memory_budget = 2 * size
+        table = workspace.datasets().set_index('name')
+        self.assertEqual(table['open'].to_dict(), {'a': True, 'b': False, 'c': True})
+        self.assertEqual(workspace.get('b')['u'].sum(), 1000)
+        self.assertEqual(workspace.trim(), [])
+        self.assertFalse(workspace.datasets().set_index('name').loc['c', 'open'])
+
+    def test_dataset_ref(self):
+        """Workers open datasets from a picklable reference, and their columns are shared, not copied."""
+        workspace = Workspace(os.path.join(self.directory, 'ws'))
+        name, df = workspace.load_csv(self.csv_path)
+        ref = pickle.loads(pickle.dumps(workspace.ref(name)))
+        opened = ref.open()
+        np.testing.assert_array_equal(opened['y'], df['y'])
+        self.assertIsInstance(share(opened['x'].to_numpy()), SharedArray)
+        with self.assertRaises(KeyError):
+            workspace.ref('missing')
+
+    def test_models(self):
+        """Session models are kept in memory; saved ones are listed and reopened by later sessions."""
+        directory = os.path.join(self.directory, 'ws')
+        workspace = Workspace(directory)
+        X, Y = self.df[['x']], 2 * self.df['y']
+        ols = ModelManager().ols(X, Y)
+        workspace.add_model('#1 OLS', ols, info='job')
+        forest = ModelManager().random_forest(X, Y, n_estimators=5, n_jobs=1)
+        workspace.add_model('forest', forest, persist=True)
+        elsewhere = os.path.join(self.directory, 'saved')
+        ModelManager().save_model(elsewhere, model=forest)
+        workspace.register_model('saved forest', elsewhere)
+        self.assertEqual(workspace.model_names, ['forest', 'saved forest', '#1 OLS'])
+        self.assertEqual(workspace.model_info('#1 OLS'), 'job')
+
+        reopened = Workspace(directory)
+        self.assertEqual(reopened.model_names, ['forest', 'saved forest'])
+        np.testing.assert_allclose(reopened.model('forest').predict(X), forest.predict(X), rtol=1e-12)
+        reopened.remove_model('forest')
+        reopened.remove_model('saved forest')
+        self.assertFalse(os.path.exists(os.path.join(directory, 'models', 'forest')))
+        self.assertTrue(os.path.exists(elsewhere))
+        with self.assertRaises(KeyError):
+            reopened.model('forest')
+
+if __name__ == '__main__':
+    unittest.main()